@@ -0,0 +1,82 @@
+# django_backend/analyzer/arrays.py
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# 캔들 블록의 필드 순서. 블록은 (..., len(FIELDS), 분 개수) 형태의 float64 배열입니다.
+FIELDS = ('open', 'high', 'low', 'close', 'volume', 'value')
+OPEN, HIGH, LOW, CLOSE, VOLUME, VALUE = range(len(FIELDS))
+
+MINUTE = np.timedelta64(1, 'm')
+
+
+def forward_fill(values):
+    """
+    1차원 배열의 NaN을 직전 유효 값으로 채웁니다. 첫 유효 값 이전의 NaN은 그대로 둡니다.
+    """
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    filled[:np.argmax(valid) if valid.any() else len(values)] = np.nan
+    return filled
+
+
+def fill_missing_candles(ohlcv):
+    """
+    (len(FIELDS), n) 형태의 1분봉 블록에서 누락/NULL 캔들을 보정한 복사본을 반환합니다.
+
+    - 가격: 직전 종가로 채운 평평한 캔들 (SQL 집계의 LAST_VALUE IGNORE NULLS 보정과 같은 의미)
+    - 거래량/거래대금: 0
+    """
+    filled = ohlcv.copy()
+    previous_close = forward_fill(ohlcv[CLOSE])
+    for field in (OPEN, HIGH, LOW, CLOSE):
+        missing = np.isnan(filled[field])
+        filled[field, missing] = previous_close[missing]
+    for field in (VOLUME, VALUE):
+        np.nan_to_num(filled[field], copy=False, nan=0.0)
+    return filled
+
+
+def resample(ohlcv, timeframe):
+    """
+    보정된 1분봉 블록을 timeframe분봉으로 집계합니다.
+    블록의 첫 분은 timeframe 경계에 맞춰져 있어야 하며, 마지막 버킷이 모자라면 진행 중인 캔들로 집계됩니다.
+
+    :param ohlcv: fill_missing_candles를 거친 (len(FIELDS), n) 배열
+    :param timeframe: 집계할 분 간격
+    :return: (len(FIELDS), ceil(n / timeframe)) 배열
+    """
+    if timeframe == 1:
+        return ohlcv
+    n = ohlcv.shape[1]
+    n_buckets = -(-n // timeframe)
+    padded = np.full((ohlcv.shape[0], n_buckets * timeframe), np.nan)
+    padded[:, :n] = ohlcv
+    buckets = padded.reshape(ohlcv.shape[0], n_buckets, timeframe)
+
+    result = np.empty((ohlcv.shape[0], n_buckets))
+    result[OPEN] = buckets[OPEN, :, 0]
+    with warnings.catch_warnings():
+        # 첫 유효 캔들 이전의 빈 버킷은 NaN으로 남깁니다
+        warnings.simplefilter('ignore', RuntimeWarning)
+        result[HIGH] = np.nanmax(buckets[HIGH], axis=1)
+        result[LOW] = np.nanmin(buckets[LOW], axis=1)
+    last = np.minimum(timeframe, n - np.arange(n_buckets) * timeframe) - 1
+    result[CLOSE] = buckets[CLOSE, np.arange(n_buckets), last]
+    result[VOLUME] = np.nansum(buckets[VOLUME], axis=1)
+    result[VALUE] = np.nansum(buckets[VALUE], axis=1)
+    return result
+
+
+def to_frame(ohlcv, start, timeframe=1):
+    """
+    블록을 지표 함수가 사용하는 DataFrame(date_time, open, high, low, close, volume, value)으로 변환합니다.
+
+    :param start: 블록 첫 캔들의 시각 (numpy datetime64[m])
+    """
+    df = pd.DataFrame(dict(zip(FIELDS, ohlcv)))
+    df.insert(0, 'date_time', start + np.arange(ohlcv.shape[1]) * timeframe * MINUTE)
+    return df
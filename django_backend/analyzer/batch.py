@@ -0,0 +1,167 @@
+# django_backend/analyzer/batch.py
+import json
+import logging
+import math
+import multiprocessing
+import os
+import time as t
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from django_backend.analyzer.arrays import FIELDS, fill_missing_candles, resample, to_frame
+from django_backend.analyzer.indicators import get_indicator_function
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스에서 공유 메모리에 연결된 블록 (initializer에서 설정)
+_shared = {}
+
+
+def normalize_specs(specs):
+    """
+    지표 명세를 (이름, 파라미터 dict) 튜플 리스트로 정규화합니다.
+
+    허용 형식: 'rsi', ('rsi', {'period': 14}), {'indicator': 'rsi', 'params': {'period': 14}}
+    """
+    normalized = []
+    for spec in specs:
+        if isinstance(spec, str):
+            name, params = spec, {}
+        elif isinstance(spec, dict):
+            name, params = spec['indicator'], spec.get('params', {})
+        else:
+            name, params = spec
+        get_indicator_function(name)  # 지원하지 않는 지표는 워커로 보내기 전에 실패
+        normalized.append((name, dict(params)))
+    return normalized
+
+
+def align_start(start, timeframes):
+    """
+    모든 timeframe의 버킷 경계가 맞도록 블록 시작 시각(datetime64[m])을 내림합니다.
+    """
+    step = math.lcm(*timeframes)
+    minutes = start.astype('datetime64[m]').astype(np.int64)
+    return (minutes - minutes % step).astype('datetime64[m]')
+
+
+def compute_market(ohlcv, start, market, timeframes, specs, tail=1):
+    """
+    한 종목의 1분봉 블록에 대해 모든 (timeframe, 지표) 조합을 계산합니다.
+
+    :return: market, timeframe, indicator, params, date_time 및 지표 컬럼을 가진 DataFrame
+    """
+    filled = fill_missing_candles(ohlcv)
+    frames = []
+    for timeframe in timeframes:
+        df = to_frame(resample(filled, timeframe), start, timeframe)
+        for name, params in specs:
+            result = get_indicator_function(name)(df, **params).tail(tail)
+            result.insert(0, 'date_time', df['date_time'].iloc[-len(result):].values)
+            result.insert(0, 'params', json.dumps(params, sort_keys=True))
+            result.insert(0, 'indicator', name)
+            result.insert(0, 'timeframe', timeframe)
+            result.insert(0, 'market', market)
+            frames.append(result)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _attach_shared_block(name, shape, dtype):
+    """
+    워커 initializer. 부모가 만든 공유 메모리에 연결해 복사 없이 읽기 전용 뷰를 만듭니다.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    block = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    block.flags.writeable = False
+    _shared['shm'] = shm
+    _shared['block'] = block
+
+
+def _compute_shared_market(index, start, market, timeframes, specs, tail):
+    return compute_market(_shared['block'][index], start, market, timeframes, specs, tail)
+
+
+def compute_batch(block, start, markets, timeframes, specs, tail=1, workers=None):
+    """
+    여러 종목의 1분봉 블록에 대해 지표를 일괄 계산합니다.
+
+    블록은 공유 메모리에 한 번만 올리고 워커는 종목 인덱스만 전달받으므로,
+    종목 수와 무관하게 입력 배열이 pickle로 복사되지 않습니다.
+
+    :param block: (len(markets), len(FIELDS), 분 개수) float64 배열. 누락 분은 NaN
+    :param start: 블록 첫 분의 시각 (datetime64[m], align_start로 정렬된 값)
+    :param markets: 종목 코드 리스트 (block의 첫 번째 축 순서)
+    :param timeframes: 분봉 단위 리스트 (예: [1, 5, 15])
+    :param specs: 지표 명세 리스트 (normalize_specs 참고)
+    :param tail: 각 조합에서 반환할 최근 캔들 개수
+    :param workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 계산).
+                    daemon 프로세스(Celery prefork 워커) 안에서는 자식 프로세스를 만들 수 없으므로 항상 순차 계산합니다
+    :return: 통합 결과 DataFrame
+    """
+    specs = normalize_specs(specs)
+    workers = workers or os.cpu_count()
+    if workers > 1 and multiprocessing.current_process().daemon:
+        logger.info("daemon 프로세스에서 호출되어 프로세스 풀 대신 순차 계산합니다.")
+        workers = 1
+    if block.shape[:2] != (len(markets), len(FIELDS)):
+        raise ValueError(f"Invalid block shape: {block.shape}")
+
+    if workers == 1 or len(markets) == 1:
+        frames = [compute_market(block[i], start, market, timeframes, specs, tail) for i, market in enumerate(markets)]
+        return pd.concat(frames, ignore_index=True)
+
+    block = np.ascontiguousarray(block, dtype=np.float64)
+    shm = shared_memory.SharedMemory(create=True, size=block.nbytes)
+    try:
+        np.ndarray(block.shape, dtype=block.dtype, buffer=shm.buf)[:] = block
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(markets)),
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_attach_shared_block,
+            initargs=(shm.name, block.shape, block.dtype.str),
+        ) as pool:
+            futures = [
+                pool.submit(_compute_shared_market, i, start, market, timeframes, specs, tail)
+                for i, market in enumerate(markets)
+            ]
+            frames = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.concat(frames, ignore_index=True)
+
+
+def benchmark_speedup(n_markets=100, n_minutes=60 * 24 * 7, timeframes=(1, 5, 15, 60), specs=None,
+                      worker_counts=None, seed=0):
+    """
+    합성 랜덤워크 데이터로 워커 수별 compute_batch 소요 시간과 속도 향상을 측정합니다.
+
+    :return: {'workers': [...], 'seconds': [...], 'speedup': [...]}
+    """
+    specs = specs or ['sma', 'ema', 'rsi', 'bollinger_bands', 'macd']
+    worker_counts = worker_counts or sorted({1, 2, 4, os.cpu_count()})
+    rng = np.random.default_rng(seed)
+
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 1e-3, (n_markets, n_minutes)), axis=1))
+    spread = np.abs(rng.normal(0, 5e-4, (n_markets, n_minutes))) * close
+    volume = rng.gamma(2.0, 1.0, (n_markets, n_minutes))
+    block = np.stack([close, close + spread, close - spread, close, volume, volume * close], axis=1)
+    start = align_start(np.datetime64('2024-01-01T00:00'), timeframes)
+    markets = [f"KRW-SYN{i}" for i in range(n_markets)]
+
+    seconds = []
+    for workers in worker_counts:
+        started = t.perf_counter()
+        compute_batch(block, start, markets, timeframes, specs, workers=workers)
+        seconds.append(t.perf_counter() - started)
+        logger.info(f"workers={workers}: {seconds[-1]:.3f}s")
+
+    return {
+        'workers': list(worker_counts),
+        'seconds': seconds,
+        'speedup': [seconds[0] / elapsed for elapsed in seconds],
+    }
+
@@ -0,0 +1,215 @@
+# django_backend/analyzer/benchmarks.py
+"""
+analyzer 성능 벤치마크.
+
+합성 1분봉(analyzer.synthetic)으로 데이터 보정, 분봉 집계, 등록된 모든 지표와 파라미터 스윕의
+소요 시간을 크기별(기본 1k / 100k / 10M)로 측정하고 결과를 JSON으로 저장합니다.
+결과 파일은 커밋 해시로 구분되므로 compare_results로 커밋 간 회귀를 비교할 수 있습니다.
+
+실행:
+    python -m django_backend.analyzer.benchmarks
+    python -m django_backend.analyzer.benchmarks --sizes 1000 100000 --db   # DB 로드 포함
+    python -m django_backend.analyzer.benchmarks --compare <기준 JSON> <비교 JSON>
+    python -m django_backend.analyzer.benchmarks --batch --workers 1 2 4   # 워커 수별 일괄 지표 계산 속도 향상
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time as t
+from datetime import datetime
+
+import numpy as np
+
+from django_backend.analyzer.arrays import fill_missing_candles, resample, to_frame
+from django_backend.analyzer.indicators import INDICATORS, SWEEPS
+from django_backend.analyzer.synthetic import generate_ohlcv
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+RESULT_DIR = os.path.join(os.path.dirname(__file__), 'benchmark_results')
+
+RESAMPLE_TIMEFRAMES = (5, 15, 60)
+SWEEP_PERIODS = np.arange(5, 45, 5)  # 8개 파라미터
+# DB 로드는 행 삽입 비용이 크므로 이 크기까지만 측정
+DB_MAX_SIZE = 100_000
+
+
+def _measure(func, repeat):
+    """
+    func를 repeat번 실행해 가장 짧은 소요 시간(초)과 마지막 결과를 반환합니다.
+    """
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = t.perf_counter()
+        result = func()
+        best = min(best, t.perf_counter() - started)
+    return best, result
+
+
+def _repeat_for(size):
+    return 5 if size <= 100_000 else 1
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(__file__), text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def benchmark_size(size, seed=0, include_db=False):
+    """
+    한 크기에 대한 모든 벤치마크를 실행합니다.
+
+    :return: {케이스 이름: {'seconds': 초, 'candles_per_second': 처리량}}
+    """
+    repeat = _repeat_for(size)
+    results = {}
+
+    def record(name, func):
+        seconds, value = _measure(func, repeat)
+        results[name] = {'seconds': seconds, 'candles_per_second': size / seconds if seconds else None}
+        return value
+
+    block = record('generate', lambda: generate_ohlcv(size, seed=seed))[0]
+    filled = record('fill_missing_candles', lambda: fill_missing_candles(block))
+    for timeframe in RESAMPLE_TIMEFRAMES:
+        record(f'resample_{timeframe}m', lambda: resample(filled, timeframe))
+
+    start = np.datetime64('2024-01-01T00:00', 'm')
+    df = record('to_frame', lambda: to_frame(filled, start))
+    for name, func in INDICATORS.items():
+        record(f'indicator_{name}', lambda: func(df))
+    close = filled[3]
+    for name, func in SWEEPS.items():
+        record(f'sweep_{name}_{len(SWEEP_PERIODS)}', lambda: func(close, SWEEP_PERIODS))
+
+    if include_db and size <= DB_MAX_SIZE:
+        results.update(benchmark_db_load(block, size))
+    return results
+
+
+def benchmark_db_load(block, size):
+    """
+    합성 캔들을 임시 종목으로 DB에 넣고 TechnicalAnalyzer 로드 경로를 측정한 뒤 삭제합니다.
+    Django 설정이 로드된 상태에서만 호출할 수 있습니다.
+    """
+    from django_backend.analyzer.services import TechnicalAnalyzer
+    from django_backend.analyzer.synthetic import to_model_rows
+    from django_backend.data_provider.models import UpbitData
+
+    market = f"BENCH-{size}"
+    start = np.datetime64('2024-01-01T00:00', 'm')
+    end = (start + (size - 1) * np.timedelta64(1, 'm')).astype(datetime)
+    UpbitData.objects.filter(market=market).delete()
+    UpbitData.objects.bulk_create(
+        [UpbitData(**row) for row in to_model_rows(block[None], start, [market])], batch_size=10_000
+    )
+    try:
+        analyzer = TechnicalAnalyzer(market=market, cache=None)
+        results = {}
+        for name, func in (
+            ('load_data', lambda: analyzer.load_data(period=size, to=end)),
+            ('load_market_block', lambda: TechnicalAnalyzer.load_market_block([market], size, to=end)),
+        ):
+            seconds, _ = _measure(func, _repeat_for(size))
+            results[name] = {'seconds': seconds, 'candles_per_second': size / seconds}
+        return results
+    finally:
+        UpbitData.objects.filter(market=market).delete()
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, include_db=False, output_dir=RESULT_DIR):
+    """
+    전체 벤치마크를 실행하고 결과를 JSON 파일로 저장합니다.
+
+    :return: (결과 dict, 저장된 파일 경로)
+    """
+    commit = _git_commit()
+    created_at = datetime.now()
+    report = {
+        'commit': commit,
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'results': {str(size): benchmark_size(size, seed=seed, include_db=include_db) for size in sizes},
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, f"{created_at:%Y%m%dT%H%M%S}_{commit}.json")
+    with open(file_path, 'w') as f:
+        json.dump(report, f, indent=4)
+    return report, file_path
+
+
+def compare_results(base_path, head_path, threshold=1.2):
+    """
+    두 결과 파일을 비교해 케이스별 소요 시간 비율(head / base)을 반환합니다.
+
+    :param threshold: 이 비율 이상 느려진 케이스를 회귀로 표시
+    :return: [{'size', 'case', 'base', 'head', 'ratio', 'regression'}, ...]
+    """
+    with open(base_path) as f:
+        base = json.load(f)['results']
+    with open(head_path) as f:
+        head = json.load(f)['results']
+
+    rows = []
+    for size, cases in head.items():
+        for case, measured in cases.items():
+            if case not in base.get(size, {}):
+                continue
+            ratio = measured['seconds'] / base[size][case]['seconds']
+            rows.append({
+                'size': int(size),
+                'case': case,
+                'base': base[size][case]['seconds'],
+                'head': measured['seconds'],
+                'ratio': ratio,
+                'regression': ratio >= threshold,
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="analyzer 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db', action='store_true', help="DB 로드 벤치마크 포함 (Django 설정 필요)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'))
+    parser.add_argument('--batch', action='store_true', help="워커 수별 compute_batch 속도 향상 측정")
+    parser.add_argument('--workers', type=int, nargs='+', help="--batch에서 비교할 워커 수 (기본값: 1, 2, 4, CPU 수)")
+    args = parser.parse_args()
+
+    if args.batch:
+        from django_backend.analyzer.batch import benchmark_speedup
+
+        print(json.dumps(benchmark_speedup(worker_counts=args.workers, seed=args.seed), indent=4))
+        return
+
+    if args.compare:
+        for row in compare_results(*args.compare):
+            mark = ' <-- regression' if row['regression'] else ''
+            print(f"{row['size']:>10} {row['case']:<32} {row['base']:.4f}s -> {row['head']:.4f}s x{row['ratio']:.2f}{mark}")
+        return
+
+    if args.db:
+        import django
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_backend.config.settings")
+        django.setup()
+
+    report, file_path = run_benchmarks(sizes=args.sizes, seed=args.seed, include_db=args.db)
+    for size, cases in report['results'].items():
+        for case, measured in cases.items():
+            print(f"{size:>10} {case:<32} {measured['seconds']:.4f}s")
+    print(f"결과 저장: {file_path}")
+
+
+if __name__ == "__main__":
+    main()
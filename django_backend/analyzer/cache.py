@@ -0,0 +1,212 @@
+# django_backend/analyzer/cache.py
+import json
+import logging
+import pickle
+import threading
+import time as t
+from collections import OrderedDict
+
+import pytz
+import redis
+from django.conf import settings
+from django.db.models import Max
+
+from django_backend.config.utils import generate_last_candle_key
+from django_backend.data_provider.models import UpbitData
+
+logger = logging.getLogger(__name__)
+
+
+class IndicatorCache:
+    """
+    지표 계산 결과 캐시.
+
+    키는 (market, timeframe, indicator, params, 마지막 캔들 시각)으로 구성됩니다.
+    새 캔들이 수집되면 마지막 캔들 시각이 바뀌므로 이전 결과는 자동으로 사용되지 않으며,
+    해당 종목의 오래된 항목은 프로세스 내 캐시에서 즉시 제거됩니다.
+
+    - 1차: 프로세스 내 LRU (max_size로 크기 제한)
+    - 2차: Redis (선택, 워커 간 공유. TTL 적용)
+
+    NOTE: 반환되는 DataFrame은 캐시와 공유되는 객체이므로 호출자가 수정하면 안 됩니다.
+    """
+
+    KEY_PREFIX = "analyzer:indicator"
+
+    def __init__(self, max_size=None, use_redis=None, ttl=None, provider_name="upbit"):
+        self.max_size = settings.INDICATOR_CACHE_SIZE if max_size is None else max_size
+        self.use_redis = settings.INDICATOR_CACHE_USE_REDIS if use_redis is None else use_redis
+        self.ttl = settings.INDICATOR_CACHE_TTL if ttl is None else ttl
+        self.provider_name = provider_name
+        self.kst = pytz.timezone('Asia/Seoul')
+        self.logger = logger
+
+        self._entries = OrderedDict()  # key -> (value, 계산 소요 시간)
+        self._latest_candle = {}  # market -> 이 프로세스에서 관측한 마지막 캔들 시각
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "saved_seconds": 0.0,
+        }
+
+        self.redis_client = None
+        if self.use_redis:
+            self.redis_client = redis.StrictRedis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+            )
+
+    @staticmethod
+    def make_key(market, timeframe, indicator, params, last_candle):
+        """
+        캐시 키를 생성합니다. params는 정렬된 JSON으로 정규화하여 인자 순서와 무관하게 만듭니다.
+        """
+        return (market, int(timeframe), indicator, json.dumps(params or {}, sort_keys=True, default=str), last_candle)
+
+    def _redis_key(self, key):
+        market, timeframe, indicator, params, last_candle = key
+        return f"{self.KEY_PREFIX}:{market}:{timeframe}m:{indicator}:{params}:{last_candle}"
+
+    def get_last_candle_time(self, market):
+        """
+        종목의 마지막 수집 캔들 시각(epoch 초)을 반환합니다.
+        Redis에 기록된 값을 우선 사용하고, 없으면 DB에서 조회합니다.
+        """
+        last_candle = None
+        if self.redis_client is not None:
+            try:
+                value = self.redis_client.get(generate_last_candle_key(self.provider_name, market))
+                if value is not None:
+                    last_candle = int(value)
+            except redis.RedisError as e:
+                self.logger.warning(f"Redis에서 마지막 캔들 시각 조회 실패, DB 조회로 대체합니다: {e}")
+
+        if last_candle is None:
+            latest = UpbitData.objects.filter(market=market).aggregate(latest=Max('date_time'))['latest']
+            if latest is not None:
+                if latest.tzinfo is None:
+                    latest = self.kst.localize(latest)
+                last_candle = int(latest.timestamp())
+
+        self._observe_candle(market, last_candle)
+        return last_candle
+
+    def _observe_candle(self, market, last_candle):
+        """
+        새 캔들이 관측되면 해당 종목의 이전 캔들 기준 항목을 제거합니다.
+        """
+        if last_candle is None:
+            return
+        with self._lock:
+            previous = self._latest_candle.get(market)
+            self._latest_candle[market] = last_candle if previous is None else max(previous, last_candle)
+        if previous is not None and last_candle > previous:
+            self.invalidate(market, before=last_candle)
+
+    def get(self, key):
+        """
+        캐시된 결과를 반환합니다. 없으면 None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["saved_seconds"] += entry[1]
+                return entry[0]
+
+        if self.redis_client is not None:
+            try:
+                payload = self.redis_client.get(self._redis_key(key))
+            except redis.RedisError as e:
+                self.logger.warning(f"Redis 지표 캐시 조회 실패: {e}")
+                payload = None
+            if payload is not None:
+                value, elapsed = pickle.loads(payload)
+                self._store_local(key, value, elapsed)
+                with self._lock:
+                    self._stats["redis_hits"] += 1
+                    self._stats["saved_seconds"] += elapsed
+                return value
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, value, elapsed=0.0):
+        """
+        결과를 저장합니다.
+
+        :param elapsed: 결과 계산에 걸린 시간(초). 적중 시 절약된 계산 시간 집계에 사용됩니다.
+        """
+        self._store_local(key, value, elapsed)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.set(self._redis_key(key), pickle.dumps((value, elapsed)), ex=self.ttl)
+            except redis.RedisError as e:
+                self.logger.warning(f"Redis 지표 캐시 저장 실패: {e}")
+
+    def _store_local(self, key, value, elapsed):
+        with self._lock:
+            self._entries[key] = (value, elapsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def get_or_compute(self, market, timeframe, indicator, params, compute):
+        """
+        캐시된 결과가 있으면 반환하고, 없으면 compute()를 호출해 계산 후 저장합니다.
+        마지막 캔들 시각을 알 수 없으면(데이터 없음) 캐시를 사용하지 않습니다.
+        """
+        last_candle = self.get_last_candle_time(market)
+        if last_candle is None:
+            return compute()
+
+        key = self.make_key(market, timeframe, indicator, params, last_candle)
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        started = t.perf_counter()
+        value = compute()
+        self.set(key, value, t.perf_counter() - started)
+        return value
+
+    def invalidate(self, market=None, before=None):
+        """
+        프로세스 내 캐시 항목을 제거합니다.
+
+        :param market: 제거할 종목 (None이면 전체)
+        :param before: 지정 시 이 캔들 시각보다 오래된 항목만 제거
+        :return: 제거된 항목 수
+        """
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (market is None or key[0] == market) and (before is None or key[4] < before)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+        return len(stale)
+
+    def stats(self):
+        """
+        적중/미적중 카운터와 절약된 계산 시간을 반환합니다.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["redis_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+# 프로세스 단위로 공유되는 기본 캐시
+indicator_cache = IndicatorCache()
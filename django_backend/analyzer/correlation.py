@@ -0,0 +1,134 @@
+# django_backend/analyzer/correlation.py
+import numpy as np
+
+
+def bucket_close(close, timeframe):
+    """
+    (종목 수, 분 개수) 1분봉 종가를 timeframe분봉 종가로 집계합니다.
+    버킷 안의 마지막 유효 종가를 사용하며, 버킷 전체가 NULL이면 NaN입니다.
+    분 개수는 timeframe의 배수여야 합니다.
+    """
+    if timeframe == 1:
+        return close
+    n_markets, n_minutes = close.shape
+    buckets = close.reshape(n_markets, n_minutes // timeframe, timeframe)
+    last_valid = np.where(~np.isnan(buckets), np.arange(timeframe), -1).max(axis=-1)
+    result = np.take_along_axis(buckets, np.maximum(last_valid, 0)[..., None], axis=-1)[..., 0]
+    result[last_valid < 0] = np.nan
+    return result
+
+
+def log_returns(close):
+    """
+    (종목 수, 캔들 수) 종가에서 (캔들 수 - 1, 종목 수) 로그수익률 행렬을 만듭니다.
+
+    NOTE: 누락(NULL) 캔들에 걸친 수익률은 0으로 채우지 않고 NaN으로 남깁니다.
+    여러 캔들에 걸친 수익률이나 0 수익률은 분산과 상관계수를 왜곡하기 때문입니다.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.diff(np.log(close), axis=1).T
+
+
+class RollingCovariance:
+    """
+    최근 window개 수익률 행에 대한 종목 간 공분산/상관계수를 증분 계산하는 클래스.
+
+    종목 쌍마다 두 종목이 모두 유효한 행만 사용하는 pairwise-complete 통계를 위해 다음 합계를 유지합니다.
+        count[i, j]  = sum(m_i * m_j)
+        sum[i, j]    = sum(r_i * m_j)
+        sum_sq[i, j] = sum(r_i^2 * m_j)
+        cross[i, j]  = sum(r_i * r_j)        (NaN은 0으로 취급)
+    새 행이 들어오면 더하고 window를 벗어난 행은 빼므로 갱신 비용은 O(종목 수^2)입니다.
+    덧셈/뺄셈 누적 오차를 막기 위해 window번 갱신마다 버퍼에서 합계를 다시 계산합니다.
+    """
+
+    def __init__(self, n_markets, window):
+        self.n_markets = n_markets
+        self.window = window
+        self._buffer = np.full((window, n_markets), np.nan)  # 원형 버퍼
+        self._position = 0
+        self._size = 0
+        self._updates = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        shape = (self.n_markets, self.n_markets)
+        self.count = np.zeros(shape)
+        self.sum = np.zeros(shape)
+        self.sum_sq = np.zeros(shape)
+        self.cross = np.zeros(shape)
+
+    def _accumulate(self, rows, sign):
+        """
+        (행 수, 종목 수) 수익률 행들을 합계에 더하거나(sign=1) 뺍니다(sign=-1).
+        """
+        mask = (~np.isnan(rows)).astype(float)
+        values = np.nan_to_num(rows)
+        self.count += sign * (mask.T @ mask)
+        self.sum += sign * (values.T @ mask)
+        self.sum_sq += sign * ((values * values).T @ mask)
+        self.cross += sign * (values.T @ values)
+
+    def extend(self, rows):
+        """
+        수익률 행들을 시간 순서대로 추가합니다.
+
+        :param rows: (행 수, 종목 수) 배열
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype=float))
+        if len(rows) >= self.window:
+            # 새 행만으로 window가 채워지면 처음부터 다시 계산
+            self._buffer[:] = rows[-self.window:]
+            self._position, self._size = 0, self.window
+            self.recompute()
+            return
+
+        for row in rows:
+            if self._size == self.window:
+                self._accumulate(self._buffer[self._position][None, :], -1)
+            else:
+                self._size += 1
+            self._buffer[self._position] = row
+            self._accumulate(row[None, :], 1)
+            self._position = (self._position + 1) % self.window
+            self._updates += 1
+
+        if self._updates >= self.window:
+            self.recompute()
+
+    def recompute(self):
+        """
+        버퍼에 있는 행들로 합계를 다시 계산합니다.
+        """
+        self._reset_sums()
+        self._accumulate(self.returns(), 1)
+        self._updates = 0
+
+    def returns(self):
+        """
+        window 안의 수익률 행렬을 시간 순서대로 반환합니다. (행 수, 종목 수)
+        """
+        if self._size < self.window:
+            return self._buffer[:self._size].copy()
+        return np.roll(self._buffer, -self._position, axis=0)
+
+    def covariance(self):
+        """
+        pairwise-complete 표본 공분산 행렬. 공통 유효 행이 2개 미만인 쌍은 NaN입니다.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_product = self.sum * self.sum.T / self.count
+            cov = (self.cross - mean_product) / (self.count - 1)
+        cov[self.count < 2] = np.nan
+        return cov
+
+    def correlation(self):
+        """
+        pairwise-complete 상관계수 행렬. 각 쌍의 분산도 두 종목이 모두 유효한 행에서 계산합니다.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # var[i, j]: 종목 j도 유효한 행에서의 종목 i 분산
+            var = self.sum_sq - self.sum * self.sum / self.count
+            corr = (self.cross - self.sum * self.sum.T / self.count) / np.sqrt(var * var.T)
+        corr[self.count < 2] = np.nan
+        return np.clip(corr, -1.0, 1.0)
@@ -0,0 +1,262 @@
+# django_backend/analyzer/indicators.py
+import numpy as np
+import pandas as pd
+
+from django_backend.analyzer.arrays import forward_fill
+
+# 지표 이름 -> 계산 함수. 모든 함수는 open/high/low/close/volume 컬럼을 가진 DataFrame을 받아
+# 입력과 같은 인덱스를 가진 DataFrame을 반환합니다.
+INDICATORS = {}
+
+
+def register_indicator(name):
+    """
+    지표 계산 함수를 이름으로 등록하는 데코레이터.
+    등록된 이름은 TechnicalAnalyzer.get_indicator 및 캐시 키에 사용됩니다.
+    """
+    def decorator(func):
+        INDICATORS[name] = func
+        return func
+    return decorator
+
+
+def get_indicator_function(name):
+    """
+    이름으로 등록된 지표 계산 함수를 반환합니다.
+    """
+    if name not in INDICATORS:
+        raise ValueError(f"Unsupported indicator: {name}")
+    return INDICATORS[name]
+
+
+def _check_period(*periods):
+    for period in periods:
+        if period <= 0:
+            raise ValueError(f"Invalid period: {period}")
+
+
+@register_indicator("sma")
+def sma(df, period=20, column="close"):
+    """단순 이동평균"""
+    _check_period(period)
+    return pd.DataFrame({"sma": df[column].rolling(period).mean()}, index=df.index)
+
+
+@register_indicator("ema")
+def ema(df, period=20, column="close"):
+    """지수 이동평균 (alpha = 2 / (period + 1))"""
+    _check_period(period)
+    return pd.DataFrame({"ema": df[column].ewm(span=period, adjust=False).mean()}, index=df.index)
+
+
+@register_indicator("rsi")
+def rsi(df, period=14, column="close"):
+    """Wilder 방식 RSI"""
+    _check_period(period)
+    delta = df[column].diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    rs = gain / loss
+    return pd.DataFrame({"rsi": 100 - 100 / (1 + rs)}, index=df.index)
+
+
+@register_indicator("bollinger_bands")
+def bollinger_bands(df, period=20, num_std=2.0, column="close"):
+    """볼린저 밴드 (모집단 표준편차 사용)"""
+    _check_period(period)
+    rolling = df[column].rolling(period)
+    middle = rolling.mean()
+    std = rolling.std(ddof=0)
+    return pd.DataFrame({
+        "middle_band": middle,
+        "upper_band": middle + num_std * std,
+        "lower_band": middle - num_std * std,
+    }, index=df.index)
+
+
+@register_indicator("macd")
+def macd(df, fast_period=12, slow_period=26, signal_period=9, column="close"):
+    """MACD 라인, 시그널 라인, 히스토그램"""
+    _check_period(fast_period, slow_period, signal_period)
+    close = df[column]
+    macd_line = close.ewm(span=fast_period, adjust=False).mean() - close.ewm(span=slow_period, adjust=False).mean()
+    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+    return pd.DataFrame({
+        "macd_line": macd_line,
+        "signal_line": signal_line,
+        "histogram": macd_line - signal_line,
+    }, index=df.index)
+
+
+# ---------------------------------------------------------------------------
+# 파라미터 스윕: 여러 파라미터에 대한 지표를 한 번에 계산해 (캔들 수 x 파라미터 수) 2차원 배열로 반환합니다.
+# 입력은 1차원 가격 배열이며, NaN은 직전 값으로 채운 뒤 계산합니다 (첫 유효 값 이전은 NaN).
+# ---------------------------------------------------------------------------
+
+SWEEPS = {}
+
+# EMA 블록 스캔 크기. 블록 내부는 행렬곱, 블록 간에는 이전 블록 마지막 값을 전파합니다.
+EWM_BLOCK_SIZE = 32
+
+
+def register_sweep(name):
+    """
+    파라미터 스윕 함수를 이름으로 등록하는 데코레이터.
+    """
+    def decorator(func):
+        SWEEPS[name] = func
+        return func
+    return decorator
+
+
+def get_sweep_function(name):
+    """
+    이름으로 등록된 파라미터 스윕 함수를 반환합니다.
+    """
+    if name not in SWEEPS:
+        raise ValueError(f"Unsupported sweep: {name}")
+    return SWEEPS[name]
+
+
+def _prepare_sweep_input(values, *periods):
+    periods = [np.atleast_1d(np.asarray(p, dtype=np.int64)) for p in periods]
+    for p in periods:
+        _check_period(*p)
+    values = forward_fill(np.asarray(values, dtype=np.float64))
+    valid = ~np.isnan(values)
+    first = int(np.argmax(valid)) if valid.any() else len(values)
+    return (values, first, *periods)
+
+
+def _ewm_sweep(values, alphas, dtype=np.float64):
+    """
+    여러 alpha에 대한 지수가중이동평균 (pandas ewm(adjust=False)와 동일한 점화식).
+
+    y[t] = alpha * x[t] + (1 - alpha) * y[t - 1], y[0] = x[0]
+
+    시계열을 EWM_BLOCK_SIZE 길이의 블록으로 나누어 블록 내부 점화식은 감쇠 행렬과의 행렬곱으로,
+    블록 간 연결은 (블록 수)번의 벡터 연산으로 계산하므로 파이썬 반복은 캔들 수가 아닌 블록 수에 비례합니다.
+    """
+    n, n_params, size = len(values), len(alphas), EWM_BLOCK_SIZE
+    if n == 0:
+        return np.empty((0, n_params), dtype=dtype)
+    n_blocks = -(-n // size)
+    padded = np.empty(n_blocks * size)
+    padded[:n] = values
+    padded[n:] = values[-1]
+    blocks = padded.reshape(n_blocks, size)
+
+    alphas = np.asarray(alphas, dtype=np.float64)
+    lags = np.arange(size)[:, None, None] - np.arange(size)[None, :, None]
+    # 블록 내부 누적: local[k, i, p] = sum_{j<=i} alpha_p * beta_p^(i-j) * x[k, j]
+    # 모든 파라미터의 감쇠 행렬을 (j, i * n_params + p) 형태로 이어 붙여 한 번의 행렬곱으로 계산합니다.
+    decay = np.where(lags >= 0, alphas * (1 - alphas) ** np.maximum(lags, 0), 0.0)
+    local = (blocks @ decay.transpose(1, 0, 2).reshape(size, size * n_params)).reshape(n_blocks, size, n_params)
+    # 이전 블록 마지막 값의 기여: beta^(i+1) * y[k-1, -1]
+    carry_decay = (1 - alphas)[None, :] ** np.arange(1, size + 1)[:, None]
+    carry = np.full(n_params, values[0])
+    for k in range(n_blocks):
+        local[k] += carry_decay * carry
+        carry = local[k, -1]
+    return local.reshape(n_blocks * size, n_params)[:n].astype(dtype, copy=False)
+
+
+@register_sweep("sma")
+def sma_sweep(values, periods, dtype=np.float64):
+    """
+    여러 기간의 단순 이동평균. 누적합을 공유하여 기간마다 O(n)으로 계산합니다.
+
+    :return: (len(values), len(periods)) 배열
+    """
+    values, first, periods = _prepare_sweep_input(values, periods)
+    out = np.full((len(values), len(periods)), np.nan, dtype=dtype)
+    x = values[first:]
+    # 가격 수준을 빼서 누적합의 자릿수 손실을 줄임
+    offset = x[0] if len(x) else 0.0
+    cumsum = np.concatenate(([0.0], np.cumsum(x - offset)))
+    for j, period in enumerate(periods):
+        if period <= len(x):
+            out[first + period - 1:, j] = (cumsum[period:] - cumsum[:-period]) / period + offset
+    return out
+
+
+@register_sweep("ema")
+def ema_sweep(values, periods, dtype=np.float64):
+    """
+    여러 기간의 지수 이동평균 (alpha = 2 / (period + 1)).
+
+    :return: (len(values), len(periods)) 배열
+    """
+    values, first, periods = _prepare_sweep_input(values, periods)
+    out = np.full((len(values), len(periods)), np.nan, dtype=dtype)
+    out[first:] = _ewm_sweep(values[first:], 2.0 / (periods + 1.0), dtype=dtype)
+    return out
+
+
+@register_sweep("rsi")
+def rsi_sweep(values, periods, dtype=np.float64):
+    """
+    여러 기간의 Wilder RSI. 상승/하락폭 계산은 모든 기간이 공유합니다.
+
+    :return: (len(values), len(periods)) 배열
+    """
+    values, first, periods = _prepare_sweep_input(values, periods)
+    out = np.full((len(values), len(periods)), np.nan, dtype=dtype)
+    delta = np.diff(values[first:])
+    if len(delta) == 0:
+        return out
+    alphas = 1.0 / periods
+    gain = _ewm_sweep(np.clip(delta, 0, None), alphas)
+    loss = _ewm_sweep(np.clip(-delta, 0, None), alphas)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    # 손실이 0이면 RSI는 100
+    rsi[(loss == 0) & (gain > 0)] = 100.0
+    out[first + 1:] = rsi
+    for j, period in enumerate(periods):
+        out[:first + period, j] = np.nan
+    return out
+
+
+@register_sweep("bollinger_bands")
+def bollinger_sweep(values, periods, num_stds=2.0, dtype=np.float64):
+    """
+    여러 기간 x 여러 폭의 볼린저 밴드 (모집단 표준편차).
+    기간별 이동평균/표준편차는 누적합(x, x^2)을 공유하고, 폭이 다른 밴드는 같은 표준편차를 재사용합니다.
+
+    :return: {
+        'params': [(period, num_std), ...] 열 순서,
+        'middle_band', 'upper_band', 'lower_band': (len(values), len(params)) 배열
+    }
+    """
+    values, first, periods = _prepare_sweep_input(values, periods)
+    num_stds = np.atleast_1d(np.asarray(num_stds, dtype=np.float64))
+    n, n_widths = len(values), len(num_stds)
+    shape = (n, len(periods) * n_widths)
+    middle = np.full(shape, np.nan, dtype=dtype)
+    upper = np.full(shape, np.nan, dtype=dtype)
+    lower = np.full(shape, np.nan, dtype=dtype)
+
+    x = values[first:]
+    offset = x[0] if len(x) else 0.0
+    shifted = x - offset
+    cumsum = np.concatenate(([0.0], np.cumsum(shifted)))
+    cumsum_sq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    for i, period in enumerate(periods):
+        if period > len(x):
+            continue
+        mean = (cumsum[period:] - cumsum[:-period]) / period
+        variance = (cumsum_sq[period:] - cumsum_sq[:-period]) / period - mean * mean
+        std = np.sqrt(np.clip(variance, 0, None))
+        rows = slice(first + period - 1, None)
+        columns = slice(i * n_widths, (i + 1) * n_widths)
+        middle[rows, columns] = (mean + offset)[:, None]
+        upper[rows, columns] = (mean + offset)[:, None] + std[:, None] * num_stds
+        lower[rows, columns] = (mean + offset)[:, None] - std[:, None] * num_stds
+
+    return {
+        'params': [(int(period), float(width)) for period in periods for width in num_stds],
+        'middle_band': middle,
+        'upper_band': upper,
+        'lower_band': lower,
+    }
@@ -1,21 +1,44 @@
+import numpy as np
 import pandas as pd
+import json
 import logging
+import redis
+from datetime import datetime
+from django.conf import settings
 from django.utils import timezone
 from django.db import connection
+from django.db.models import Max
 from django_backend.data_provider.models import UpbitData
+from django_backend.analyzer.cache import indicator_cache
+from django_backend.analyzer.indicators import get_indicator_function, get_sweep_function
+from django_backend.analyzer.arrays import CLOSE, FIELDS, MINUTE, fill_missing_candles, resample, to_frame
+from django_backend.analyzer.batch import align_start, compute_batch
+from django_backend.analyzer.correlation import RollingCovariance, bucket_close, log_returns
 
 logger = logging.getLogger(__name__)
 
 class TechnicalAnalyzer:
     """
     데이터 로드 및 1분봉 데이터를 활용한 N분봉 집계 기능 제공 클래스.
-    기존 기술적 분석 지표 계산 함수들은 제거하였습니다.
+    지표 계산은 analyzer.indicators에 등록된 함수를 get_indicator로 호출하며,
+    결과는 마지막 캔들 시각 기준으로 IndicatorCache에 캐시됩니다.
     """
 
-    def __init__(self, market="KRW-BTC"):
+    # DB 컬럼명 -> 지표 계산에 사용하는 컬럼명
+    OHLCV_COLUMNS = {
+        'opening_price': 'open',
+        'high_price': 'high',
+        'low_price': 'low',
+        'closing_price': 'close',
+        'acc_volume': 'volume',
+        'acc_price': 'value',
+    }
+
+    def __init__(self, market="KRW-BTC", cache=indicator_cache):
         self.market = market
         self.logger = logger
         self.df = None  # 1분봉 캔들 데이터를 저장할 DataFrame
+        self.cache = cache  # None이면 캐시를 사용하지 않음
 
     def load_data(self, period=500, to=None):
         """
@@ -30,30 +53,134 @@ class TechnicalAnalyzer:
             
         candles = UpbitData.objects.filter(
             market=self.market,
-            candle_date_time_utc__lte=to
-        ).order_by('-candle_date_time_utc')[:period]
+            date_time__lte=to
+        ).order_by('-date_time')[:period]
         
         candle_list = list(candles.values(
-            'market', 'candle_date_time_utc', 'candle_date_time_kst',
-            'opening_price', 'high_price', 'low_price', 'trade_price',
-            'timestamp', 'candle_acc_trade_price', 'candle_acc_trade_volume'
+            'market', 'date_time', 'opening_price', 'high_price', 'low_price',
+            'closing_price', 'acc_price', 'acc_volume'
         ))
         
-        df = pd.DataFrame(candle_list)
-        df = df.sort_values('candle_date_time_utc')
-        df = df.rename(columns={
-            'trade_price': 'close',
-            'opening_price': 'open',
-            'high_price': 'high',
-            'low_price': 'low',
-            'candle_acc_trade_volume': 'volume',
-            'candle_acc_trade_price': 'value'
-        })
+        df = self._to_ohlcv_frame(candle_list, time_column='date_time')
         
         self.df = df
         self.logger.info(f"{self.market} 캔들 데이터 {len(df)}개 로드 완료")
         return df
 
+    def load_timeframe_data(self, timeframe=1, period=500):
+        """
+        timeframe분봉 캔들 period개를 시간 오름차순 DataFrame으로 반환합니다.
+        1분봉은 load_data를, 그 외에는 1분봉 블록을 보정/집계(analyzer.arrays)해 사용합니다.
+        load_data와 같이 마지막으로 수집된 캔들까지를 사용하며, 버킷은 epoch 기준 timeframe분 경계로 나뉩니다
+        (마지막 버킷은 진행 중인 캔들일 수 있음).
+        """
+        if timeframe == 1:
+            return self.load_data(period=period)
+        last = UpbitData.objects.filter(market=self.market).aggregate(last=Max('date_time'))['last']
+        if last is None:
+            return self._to_ohlcv_frame([], time_column='date_time')
+        block, start = self.load_market_block([self.market], period * timeframe, to=last, timeframes=(timeframe,))
+        df = to_frame(resample(fill_missing_candles(block[0]), timeframe), start, timeframe)
+        # 첫 유효 캔들 이전의 빈 버킷은 제외
+        df = df[df['close'].notna()].tail(period).reset_index(drop=True)
+        df.insert(0, 'market', self.market)
+        return df
+
+    def get_indicator(self, indicator, timeframe=1, candle_count=500, **params):
+        """
+        지표를 계산합니다. 같은 종목/분봉/지표/파라미터에 대해 마지막 캔들이 바뀌지 않았다면
+        캐시된 결과를 반환합니다.
+
+        :param indicator: 지표 이름 (analyzer.indicators.INDICATORS에 등록된 이름)
+        :param timeframe: 분봉 단위 (예: 5분봉이면 5)
+        :param candle_count: 계산에 사용할 캔들 개수
+        :param params: 지표 함수에 전달할 파라미터 (예: period=14)
+        :return: 지표 DataFrame
+        """
+        func = get_indicator_function(indicator)
+
+        def compute():
+            df = self.load_timeframe_data(timeframe=timeframe, period=candle_count)
+            return func(df, **params)
+
+        if self.cache is None:
+            return compute()
+        cache_params = dict(params, candle_count=candle_count)
+        return self.cache.get_or_compute(self.market, timeframe, indicator, cache_params, compute)
+
+    def get_indicator_sweep(self, indicator, timeframe=1, candle_count=500, column='close', **params):
+        """
+        여러 파라미터에 대한 지표를 데이터 한 번 로드로 계산합니다 (연구/튜닝용).
+
+        :param indicator: 스윕 이름 (analyzer.indicators.SWEEPS에 등록된 이름)
+        :param column: 계산에 사용할 가격 컬럼
+        :param params: 스윕 함수 파라미터 (예: periods=range(5, 201))
+        :return: (캔들 수 x 파라미터 수) 배열 (볼린저 밴드는 밴드별 배열을 담은 dict)
+        """
+        df = self.load_timeframe_data(timeframe=timeframe, period=candle_count)
+        return get_sweep_function(indicator)(df[column].to_numpy(dtype=float), **params)
+
+    @classmethod
+    def load_market_block(cls, markets, minutes, to=None, timeframes=(1,)):
+        """
+        여러 종목의 1분봉을 한 번의 쿼리로 로드해 공통 시간축에 정렬된 배열로 반환합니다.
+        누락된 분과 NULL 캔들은 NaN으로 남습니다.
+
+        :param markets: 종목 코드 리스트
+        :param minutes: 로드할 분 개수 (시작 시각은 timeframes 경계에 맞춰 내림)
+        :param to: 조회 종료 시점 (기본값: 현재 시간)
+        :param timeframes: 이후 집계할 분봉 단위 리스트
+        :return: (block, start) - block은 (len(markets), len(FIELDS), 분 개수) 배열, start는 첫 분 시각
+        """
+        if to is None:
+            to = timezone.now()
+        end = np.datetime64(to.replace(tzinfo=None), 'm')
+        start = align_start(end - (minutes - 1) * MINUTE, timeframes)
+        n_minutes = int((end - start) // MINUTE) + 1
+
+        rows = UpbitData.objects.filter(
+            market__in=markets,
+            date_time__gte=start.astype(datetime),
+            date_time__lte=to
+        ).order_by().values_list('market', 'date_time', *cls.OHLCV_COLUMNS)
+        df = pd.DataFrame.from_records(list(rows), columns=['market', 'date_time', *cls.OHLCV_COLUMNS])
+
+        block = np.full((len(markets), len(FIELDS), n_minutes), np.nan)
+        if not df.empty:
+            market_index = df['market'].map({market: i for i, market in enumerate(markets)}).to_numpy()
+            minute_index = (df['date_time'].to_numpy(dtype='datetime64[m]') - start) // MINUTE
+            # OHLCV_COLUMNS는 FIELDS와 같은 순서로 정의되어 있음
+            block[market_index, :, minute_index.astype(int)] = df[list(cls.OHLCV_COLUMNS)].to_numpy(dtype=float)
+        return block, start
+
+    @classmethod
+    def analyze_markets(cls, markets, timeframes, specs, candle_count=500, tail=1, to=None, workers=None):
+        """
+        여러 종목 x 분봉 x 지표 조합을 일괄 계산합니다.
+        데이터는 한 번의 쿼리로 로드하고 계산은 프로세스 풀에 분산합니다 (analyzer.batch 참고).
+
+        :param markets: 종목 코드 리스트
+        :param timeframes: 분봉 단위 리스트 (예: [1, 5, 15])
+        :param specs: 지표 명세 리스트 (예: ['rsi', ('ema', {'period': 20})])
+        :param candle_count: 가장 큰 분봉 기준으로 계산에 사용할 캔들 개수
+        :param tail: 조합별로 반환할 최근 캔들 개수
+        :param workers: 프로세스 수 (None이면 CPU 수. Celery 워커 등 daemon 프로세스 안에서는 항상 순차 계산)
+        :return: market, timeframe, indicator, params, date_time 및 지표 컬럼을 가진 DataFrame
+        """
+        block, start = cls.load_market_block(markets, candle_count * max(timeframes), to=to, timeframes=timeframes)
+        logger.info(f"{len(markets)}개 종목 캔들 데이터 로드 완료 (분 개수: {block.shape[2]})")
+        return compute_batch(block, start, markets, timeframes, specs, tail=tail, workers=workers)
+
+    @classmethod
+    def _to_ohlcv_frame(cls, rows, time_column):
+        """
+        DB 조회 결과(dict 리스트)를 시간 오름차순 OHLCV DataFrame으로 변환합니다.
+        """
+        columns = ['market', time_column, *cls.OHLCV_COLUMNS]
+        df = pd.DataFrame(rows, columns=columns)
+        df = df.sort_values(time_column).reset_index(drop=True)
+        return df.rename(columns=cls.OHLCV_COLUMNS)
+
     @staticmethod
     def dictfetchall(cursor):
         """
@@ -154,3 +281,114 @@ class TechnicalAnalyzer:
             cursor.execute(query, params)
             results = TechnicalAnalyzer.dictfetchall(cursor)
         return results
+
+
+class MarketCorrelationService:
+    """
+    여러 종목의 정렬된 수익률 행렬과 이동 공분산/상관계수를 계산해 Redis에 캐시하는 클래스.
+
+    update()는 마지막으로 반영한 완성 캔들 이후의 데이터만 조회해 RollingCovariance에 더하므로,
+    같은 프로세스에서 반복 호출하면 원본 캔들 전체를 다시 계산하지 않습니다.
+    포트폴리오 전략은 get_cached_matrices()로 Redis에 저장된 최신 행렬만 읽으면 됩니다.
+    """
+
+    KEY_PREFIX = "analyzer:correlation"
+
+    def __init__(self, markets, timeframe=1, window=240):
+        """
+        :param markets: 종목 코드 리스트 (행렬의 행/열 순서)
+        :param timeframe: 수익률을 계산할 분봉 단위
+        :param window: 이동 통계에 사용할 수익률 개수
+        """
+        self.markets = list(markets)
+        self.timeframe = timeframe
+        self.window = window
+        self.logger = logger
+        self.rolling = None
+        self.last_bucket = None  # 마지막으로 반영한 완성 버킷 번호 (epoch 분 // timeframe)
+
+        self.redis_client = redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+        )
+
+    @classmethod
+    def generate_key(cls, timeframe, window):
+        return f"{cls.KEY_PREFIX}:{timeframe}m:{window}"
+
+    def update(self, to=None):
+        """
+        to 시점까지 완성된 캔들을 반영하고 최신 행렬을 Redis에 저장합니다.
+
+        :param to: 현재 시각 (기본값: 현재 시간). to가 속한 분의 1분봉은 아직 진행 중(또는 미수집)이므로
+                   그 직전 분까지의 캔들만 확정된 것으로 간주합니다
+        :return: 새로 반영된 수익률 행 수
+        """
+        if to is None:
+            to = timezone.now()
+        end = np.datetime64(to.replace(tzinfo=None), 'm').astype(np.int64)
+        last_complete = end // self.timeframe - 1
+
+        if self.last_bucket is not None and last_complete <= self.last_bucket:
+            return 0
+        if self.last_bucket is None or last_complete - self.last_bucket > self.window:
+            # 처음이거나 공백이 window보다 길면 window + 1개 캔들로 새로 계산
+            self.rolling = RollingCovariance(len(self.markets), self.window)
+            first_bucket = last_complete - self.window
+        else:
+            # 직전 버킷 종가부터 다시 읽어 첫 수익률을 계산
+            first_bucket = self.last_bucket
+
+        n_minutes = int(last_complete - first_bucket + 1) * self.timeframe
+        block_end = ((last_complete + 1) * self.timeframe - 1).astype('datetime64[m]').astype(datetime)
+        block, _ = TechnicalAnalyzer.load_market_block(
+            self.markets, n_minutes, to=block_end, timeframes=(self.timeframe,)
+        )
+        rows = log_returns(bucket_close(block[:, CLOSE], self.timeframe))
+        self.rolling.extend(rows)
+        self.last_bucket = last_complete
+        self._save_to_redis()
+        return len(rows)
+
+    def _save_to_redis(self):
+        """
+        최신 수익률 행렬과 공분산/상관계수 행렬을 float64 바이트로 저장합니다.
+        """
+        as_of = ((self.last_bucket + 1) * self.timeframe).astype('datetime64[m]')
+        returns = self.rolling.returns()
+        mapping = {
+            "markets": json.dumps(self.markets),
+            "as_of": str(as_of),
+            "rows": len(returns),
+            "returns": returns.astype(np.float64).tobytes(),
+            "covariance": self.rolling.covariance().tobytes(),
+            "correlation": self.rolling.correlation().tobytes(),
+        }
+        try:
+            self.redis_client.hset(self.generate_key(self.timeframe, self.window), mapping=mapping)
+        except redis.RedisError as e:
+            self.logger.error(f"상관계수 행렬을 Redis에 저장하지 못했습니다: {e}")
+
+    @classmethod
+    def get_cached_matrices(cls, timeframe=1, window=240, redis_client=None):
+        """
+        Redis에 캐시된 최신 행렬을 조회합니다.
+
+        :return: {'markets', 'as_of', 'returns', 'covariance', 'correlation'} 또는 캐시가 없으면 None
+                 as_of는 마지막 반영 캔들이 닫힌 시각입니다.
+        """
+        if redis_client is None:
+            redis_client = redis.StrictRedis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+        data = redis_client.hgetall(cls.generate_key(timeframe, window))
+        if not data:
+            return None
+        markets = json.loads(data[b"markets"])
+        n = len(markets)
+        return {
+            "markets": markets,
+            "as_of": data[b"as_of"].decode(),
+            "returns": np.frombuffer(data[b"returns"]).reshape(int(data[b"rows"]), n),
+            "covariance": np.frombuffer(data[b"covariance"]).reshape(n, n),
+            "correlation": np.frombuffer(data[b"correlation"]).reshape(n, n),
+        }
@@ -0,0 +1,118 @@
+# django_backend/analyzer/synthetic.py
+import numpy as np
+import pandas as pd
+
+from django_backend.analyzer.arrays import FIELDS, to_frame
+
+# 국면별 (분당 평균 로그수익률, 분당 변동성)
+REGIMES = {
+    'bull': (2e-5, 8e-4),
+    'bear': (-2e-5, 9e-4),
+    'sideways': (0.0, 5e-4),
+    'volatile': (0.0, 2e-3),
+}
+
+
+def regime_path(n_minutes, rng, schedule=None, mean_length=720):
+    """
+    분마다의 국면 번호(REGIMES 순서) 배열을 만듭니다.
+
+    :param schedule: [('bull', 70), ('bear', 70), ...] 형태의 고정 순서. None이면 무작위 전환
+    :param mean_length: 무작위 전환 시 국면 평균 지속 시간(분, 기하분포)
+    """
+    names = list(REGIMES)
+    if schedule is not None:
+        ids = np.repeat([names.index(name) for name, _ in schedule], [length for _, length in schedule])
+        if len(ids) < n_minutes:
+            ids = np.concatenate([ids, np.full(n_minutes - len(ids), ids[-1] if len(ids) else 0)])
+        return ids[:n_minutes]
+
+    # 평균 길이의 두 배만큼 국면을 뽑으면 대부분 한 번에 충분하며, 모자라면 다시 뽑음
+    ids = np.empty(0, dtype=np.int64)
+    while len(ids) < n_minutes:
+        count = max(2 * n_minutes // mean_length, 1)
+        lengths = rng.geometric(1.0 / mean_length, size=count)
+        ids = np.concatenate([ids, np.repeat(rng.integers(len(names), size=count), lengths)])
+    return ids[:n_minutes]
+
+
+def generate_ohlcv(n_minutes, n_markets=1, seed=0, start_price=50000.0, schedule=None, mean_regime_length=720,
+                   correlation=0.5, gap_probability=1e-4, gap_scale=0.02, null_probability=1e-3,
+                   outage_probability=2e-5, outage_length=30):
+    """
+    재현 가능한(seed 고정) 합성 1분봉 블록을 벡터 연산으로 생성합니다.
+
+    - 국면(REGIMES) 전환에 따른 추세/변동성 변화 (모든 종목이 같은 국면을 공유)
+    - 종목 간 상관관계 (공통 요인 비중 correlation)
+    - 가격 갭 (gap_probability 확률로 gap_scale 크기의 점프)
+    - NULL 분: 개별 누락(null_probability)과 연속 장애 구간(outage_probability, outage_length)
+      → 데이터 수집기가 NULL로 저장한 캔들처럼 모든 필드가 NaN
+
+    :return: (n_markets, len(FIELDS), n_minutes) float64 배열
+    """
+    rng = np.random.default_rng(seed)
+    drift, vol = np.array(list(REGIMES.values())).T
+    regimes = regime_path(n_minutes, rng, schedule, mean_regime_length)
+
+    shocks = np.sqrt(correlation) * rng.standard_normal(n_minutes)
+    shocks = shocks + np.sqrt(1 - correlation) * rng.standard_normal((n_markets, n_minutes))
+    returns = drift[regimes] + vol[regimes] * shocks
+    gaps = rng.random((n_markets, n_minutes)) < gap_probability
+    returns[gaps] += rng.normal(0, gap_scale, gaps.sum())
+
+    close = start_price * np.exp(np.cumsum(returns, axis=1))
+    block = np.empty((n_markets, len(FIELDS), n_minutes))
+    open_ = block[:, 0]
+    open_[:, 0] = start_price
+    open_[:, 1:] = close[:, :-1]
+    wick = np.abs(rng.standard_normal((2, n_markets, n_minutes))) * vol[regimes] * 0.5
+    block[:, 1] = np.maximum(open_, close) * (1 + wick[0])
+    block[:, 2] = np.minimum(open_, close) * (1 - wick[1])
+    block[:, 3] = close
+    # 변동이 클수록 거래량 증가
+    block[:, 4] = rng.gamma(2.0, 1.0, (n_markets, n_minutes)) * (1 + np.abs(returns) / vol[regimes])
+    block[:, 5] = block[:, 4] * (block[:, 1] + block[:, 2] + close) / 3
+
+    missing = rng.random((n_markets, n_minutes)) < null_probability
+    outage_starts = np.flatnonzero(rng.random(n_markets * n_minutes) < outage_probability)
+    positions = outage_starts[:, None] + np.arange(outage_length)
+    # 장애 구간이 다음 종목으로 넘어가지 않도록 자름
+    row_end = (outage_starts // n_minutes + 1)[:, None] * n_minutes
+    missing.reshape(-1)[positions[positions < row_end]] = True
+    block.transpose(1, 0, 2)[:, missing] = np.nan
+    return block
+
+
+def generate_frame(n_minutes, market="KRW-SYN", start="2024-01-01T00:00", **kwargs):
+    """
+    한 종목의 합성 1분봉을 DataFrame(date_time, open, high, low, close, volume, value, market)으로 반환합니다.
+    kwargs는 generate_ohlcv에 전달됩니다.
+    """
+    block = generate_ohlcv(n_minutes, n_markets=1, **kwargs)
+    df = to_frame(block[0], np.datetime64(start, 'm'))
+    df['market'] = market
+    return df
+
+
+def to_model_rows(block, start, markets):
+    """
+    블록을 UpbitData 생성 인자(dict) 리스트로 변환합니다. NaN은 None(NULL)으로 저장됩니다.
+    """
+    n_minutes = block.shape[2]
+    times = pd.to_datetime(np.datetime64(start, 'm') + np.arange(n_minutes) * np.timedelta64(1, 'm')).to_pydatetime()
+    rows = []
+    for i, market in enumerate(markets):
+        values = block[i].T.astype(object)
+        values[np.isnan(block[i].T)] = None
+        for date_time, (open_, high, low, close, volume, value) in zip(times, values):
+            rows.append({
+                "market": market,
+                "date_time": date_time,
+                "opening_price": open_,
+                "high_price": high,
+                "low_price": low,
+                "closing_price": close,
+                "acc_price": value,
+                "acc_volume": volume,
+            })
+    return rows
@@ -0,0 +1,24 @@
+# django_backend/analyzer/tasks.py
+from celery import shared_task
+from django_backend.analyzer.services import MarketCorrelationService
+from django_backend.data_provider.services import UpbitDataProvider
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스별로 유지되는 서비스 (같은 프로세스가 다시 실행하면 증분 갱신)
+_correlation_services = {}
+
+
+@shared_task
+def update_correlation_matrices(timeframe=1, window=240):
+    """
+    수집 중인 전체 종목의 상관계수/공분산 행렬을 갱신하는 Celery 작업.
+    """
+    markets = list(UpbitDataProvider.AVAILABLE_CURRENCY.values())
+    key = (tuple(markets), timeframe, window)
+    if key not in _correlation_services:
+        _correlation_services[key] = MarketCorrelationService(markets, timeframe=timeframe, window=window)
+    updated = _correlation_services[key].update()
+    logger.info(f"{timeframe}분봉 상관계수 행렬 갱신: 새 수익률 {updated}개")
+    return updated
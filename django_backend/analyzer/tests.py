@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from analyzer.services import TechnicalAnalyzer
+from django_backend.analyzer.synthetic import generate_frame
 
 class TechnicalAnalyzerTestCase(TestCase):
     def setUp(self):
@@ -13,78 +14,20 @@ class TechnicalAnalyzerTestCase(TestCase):
         """
         self.analyzer = TechnicalAnalyzer(market="TEST-BTC")
         
-        # 테스트용 데이터 생성 - 1분봉 200개 (가상 데이터)
-        base_time = timezone.now()
-        candles = []
-        
-        # 가격 패턴 생성 (상승 -> 하락 -> 상승)
-        prices = []
-        # 시작 가격
-        start_price = 50000
-        
-        # 상승 트렌드 (70개)
-        for i in range(70):
-            # 약간의 노이즈 추가
-            noise = np.random.normal(0, 200)
-            price = start_price + i * 100 + noise
-            prices.append(price)
-        
-        # 하락 트렌드 (70개)
-        for i in range(70):
-            noise = np.random.normal(0, 200)
-            price = start_price + 7000 - i * 100 + noise
-            prices.append(price)
-        
-        # 횡보 트렌드 (60개)
-        for i in range(60):
-            noise = np.random.normal(0, 500)
-            price = start_price + 0 + noise
-            prices.append(price)
-            
-        # 캔들 데이터 생성
-        for i in range(200):
-            candle_time = base_time - timedelta(minutes=200-i)
-            
-            # 현재 종가
-            close = prices[i]
-            
-            # 시가는 이전 종가에 약간의 변화를 줌
-            if i == 0:
-                open_price = close - np.random.normal(0, 50)
-            else:
-                open_price = prices[i-1] + np.random.normal(0, 50)
-            
-            # 고가는 시가와 종가 중 높은 값보다 약간 더 높게
-            high = max(open_price, close) + abs(np.random.normal(0, 100))
-            
-            # 저가는 시가와 종가 중 낮은 값보다 약간 더 낮게
-            low = min(open_price, close) - abs(np.random.normal(0, 100))
-            
-            # 거래량은 가격 변화가 클수록 증가하도록
-            if i == 0:
-                volume = abs(np.random.normal(100, 30))
-            else:
-                price_change = abs(close - prices[i-1])
-                volume = price_change * 0.1 + abs(np.random.normal(100, 30))
-            
-            # 거래대금
-            value = close * volume
-            
-            candles.append({
-                'market': 'TEST-BTC',
-                'candle_date_time_utc': candle_time,
-                'candle_date_time_kst': candle_time + timedelta(hours=9),
-                'timestamp': int(candle_time.timestamp() * 1000),
-                'open': open_price,
-                'high': high,
-                'low': low,
-                'close': close,
-                'volume': volume,
-                'value': value
-            })
-        
-        # DataFrame 생성
-        self.test_df = pd.DataFrame(candles)
+        # 테스트용 데이터 생성 - 1분봉 200개 (상승 70 -> 하락 70 -> 횡보 60, 시드 고정)
+        base_time = timezone.now().replace(second=0, microsecond=0)
+        self.test_df = generate_frame(
+            200,
+            market='TEST-BTC',
+            start=base_time - timedelta(minutes=200),
+            seed=42,
+            schedule=[('bull', 70), ('bear', 70), ('sideways', 60)],
+            null_probability=0,
+            outage_probability=0,
+        )
+        self.test_df['candle_date_time_utc'] = self.test_df['date_time']
+        self.test_df['candle_date_time_kst'] = self.test_df['date_time'] + timedelta(hours=9)
+        self.test_df['timestamp'] = self.test_df['date_time'].astype('int64') // 10**6
         
         # TechnicalAnalyzer 인스턴스의 내부 데이터 설정
         self.analyzer.df = self.test_df
@@ -262,3 +205,297 @@ class TechnicalAnalyzerTestCase(TestCase):
         # 잘못된 파라미터
         with self.assertRaises(Exception):
             self.analyzer.calculate_rsi(period=-1)  # 음수 기간은 오류
+
+
+class IndicatorCacheTestCase(TestCase):
+    def setUp(self):
+        """
+        Redis 없이 프로세스 내 LRU만 사용하는 캐시와 1분봉 데이터 준비
+        """
+        from django_backend.analyzer.cache import IndicatorCache
+        from django_backend.data_provider.models import UpbitData
+
+        self.cache = IndicatorCache(max_size=2, use_redis=False)
+        self.analyzer = TechnicalAnalyzer(market="KRW-BTC", cache=self.cache)
+        self.start_time = datetime(2024, 10, 19, 5, 10)
+        for i in range(30):
+            UpbitData.objects.create(
+                market="KRW-BTC",
+                date_time=self.start_time + timedelta(minutes=i),
+                opening_price=10000 + i,
+                high_price=10010 + i,
+                low_price=9990 + i,
+                closing_price=10000 + i,
+                acc_price=1000 + i,
+                acc_volume=10 + i
+            )
+
+    def test_hit_and_miss(self):
+        """같은 지표/파라미터는 두 번째 호출부터 캐시 적중"""
+        first = self.analyzer.get_indicator('ema', candle_count=30, period=5)
+        second = self.analyzer.get_indicator('ema', candle_count=30, period=5)
+
+        self.assertIs(first, second)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+        # 파라미터가 다르면 별도 항목
+        self.analyzer.get_indicator('ema', candle_count=30, period=10)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+    def test_lru_eviction(self):
+        """최대 크기를 넘으면 가장 오래 사용되지 않은 항목 제거"""
+        for period in (3, 4, 5):
+            self.analyzer.get_indicator('sma', candle_count=30, period=period)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_invalidated_by_new_candle(self):
+        """새 캔들이 수집되면 이전 결과는 사용되지 않음"""
+        from django_backend.data_provider.models import UpbitData
+
+        before = self.analyzer.get_indicator('sma', candle_count=30, period=5)
+        UpbitData.objects.create(
+            market="KRW-BTC",
+            date_time=self.start_time + timedelta(minutes=30),
+            opening_price=20000, high_price=20000, low_price=20000,
+            closing_price=20000, acc_price=1000, acc_volume=10
+        )
+        after = self.analyzer.get_indicator('sma', candle_count=30, period=5)
+
+        self.assertIsNot(before, after)
+        self.assertNotEqual(before['sma'].iloc[-1], after['sma'].iloc[-1])
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+        self.assertEqual(self.cache.stats()['size'], 1)
+
+
+class BatchAnalyzerTestCase(TestCase):
+    def setUp(self):
+        """
+        두 종목의 1분봉 데이터 준비 (한 종목은 중간에 NULL 캔들 포함)
+        """
+        from django_backend.data_provider.models import UpbitData
+
+        self.start_time = datetime(2024, 10, 19, 5, 0)
+        for market in ("KRW-BTC", "KRW-ETH"):
+            for i in range(60):
+                price = None if market == "KRW-ETH" and 20 <= i < 25 else 10000 + i
+                UpbitData.objects.create(
+                    market=market,
+                    date_time=self.start_time + timedelta(minutes=i),
+                    opening_price=price, high_price=price, low_price=price,
+                    closing_price=price, acc_price=price and 1000, acc_volume=price and 10
+                )
+
+    def test_load_market_block(self):
+        """한 번의 쿼리로 종목별 배열이 공통 시간축에 정렬됨"""
+        block, start = TechnicalAnalyzer.load_market_block(
+            ["KRW-BTC", "KRW-ETH"], 60, to=self.start_time + timedelta(minutes=59), timeframes=(1, 5)
+        )
+
+        self.assertEqual(block.shape, (2, 6, 60))
+        self.assertEqual(start, np.datetime64(self.start_time, 'm'))
+        self.assertEqual(block[0, 3, -1], 10059)
+        self.assertTrue(np.isnan(block[1, 3, 20:25]).all())
+
+    def test_analyze_markets(self):
+        """종목 x 분봉 x 지표 결과가 하나의 테이블로 반환됨"""
+        result = TechnicalAnalyzer.analyze_markets(
+            ["KRW-BTC", "KRW-ETH"], [1, 5], ['rsi', ('sma', {'period': 3})],
+            candle_count=12, to=self.start_time + timedelta(minutes=59), workers=1
+        )
+
+        self.assertEqual(len(result), 2 * 2 * 2)
+        sma = result[(result['market'] == "KRW-BTC") & (result['timeframe'] == 5) & (result['indicator'] == 'sma')]
+        # 마지막 세 개의 5분봉 종가: 10049, 10054, 10059
+        self.assertAlmostEqual(sma['sma'].iloc[0], 10054)
+
+    def test_timeframe_indicator(self):
+        """5분봉 지표는 1분봉을 집계해 계산하고 NULL 캔들은 직전 종가로 보정됨"""
+        analyzer = TechnicalAnalyzer(market="KRW-BTC", cache=None)
+        df = analyzer.load_timeframe_data(timeframe=5, period=4)
+
+        self.assertEqual(df['close'].tolist(), [10044, 10049, 10054, 10059])
+        self.assertEqual(df['open'].iloc[0], 10040)
+        self.assertEqual(df['volume'].iloc[-1], 50)
+        self.assertEqual(df['date_time'].iloc[-1], pd.Timestamp(self.start_time + timedelta(minutes=55)))
+        self.assertAlmostEqual(analyzer.get_indicator('sma', timeframe=5, candle_count=12, period=3)['sma'].iloc[-1],
+                               10054)
+
+        eth = TechnicalAnalyzer(market="KRW-ETH", cache=None).load_timeframe_data(timeframe=5, period=12)
+        self.assertEqual(len(eth), 12)
+        self.assertEqual(eth['close'].iloc[4], 10019)  # 20~24분 NULL -> 직전 종가
+        self.assertEqual(eth['volume'].iloc[4], 0)
+
+    def test_process_pool_matches_serial(self):
+        """프로세스 풀 계산 결과가 순차 계산과 동일"""
+        from django_backend.analyzer.batch import compute_batch
+
+        block, start = TechnicalAnalyzer.load_market_block(
+            ["KRW-BTC", "KRW-ETH"], 60, to=self.start_time + timedelta(minutes=59)
+        )
+        serial = compute_batch(block, start, ["KRW-BTC", "KRW-ETH"], [1, 5], ['ema', 'macd'], tail=3, workers=1)
+        parallel = compute_batch(block, start, ["KRW-BTC", "KRW-ETH"], [1, 5], ['ema', 'macd'], tail=3, workers=2)
+
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_daemon_process_falls_back_to_serial(self):
+        """daemon 프로세스(Celery prefork 워커)에서는 프로세스 풀을 만들지 않음"""
+        import multiprocessing
+        from unittest.mock import patch
+        from django_backend.analyzer import batch
+
+        block, start = TechnicalAnalyzer.load_market_block(
+            ["KRW-BTC", "KRW-ETH"], 60, to=self.start_time + timedelta(minutes=59)
+        )
+        process = multiprocessing.current_process()
+        with patch.dict(process._config, {'daemon': True}), \
+                patch.object(batch, 'ProcessPoolExecutor', side_effect=AssertionError("pool created")):
+            result = batch.compute_batch(block, start, ["KRW-BTC", "KRW-ETH"], [1, 5], ['ema'], workers=None)
+
+        self.assertEqual(len(result), 2 * 2)
+
+
+class IndicatorSweepTestCase(TestCase):
+    def setUp(self):
+        """
+        NULL 구간이 포함된 종가 시계열 준비
+        """
+        rng = np.random.default_rng(0)
+        self.close = 50000 * np.exp(np.cumsum(rng.normal(0, 1e-3, 3000)))
+        self.close[500:510] = np.nan
+        self.df = pd.DataFrame({'close': pd.Series(self.close).ffill()})
+
+    def test_ema_sweep_matches_single(self):
+        """EMA 스윕의 각 열은 단일 EMA 계산과 같음"""
+        from django_backend.analyzer.indicators import ema, ema_sweep
+
+        periods = [5, 20, 200]
+        sweep = ema_sweep(self.close, periods)
+
+        self.assertEqual(sweep.shape, (3000, 3))
+        for j, period in enumerate(periods):
+            np.testing.assert_allclose(sweep[:, j], ema(self.df, period)['ema'], rtol=1e-12)
+
+    def test_rsi_sweep_matches_single(self):
+        """RSI 스윕의 각 열은 단일 RSI 계산과 같음 (워밍업 구간 NaN 포함)"""
+        from django_backend.analyzer.indicators import rsi, rsi_sweep
+
+        periods = [7, 14]
+        sweep = rsi_sweep(self.close, periods)
+
+        for j, period in enumerate(periods):
+            np.testing.assert_allclose(sweep[:, j], rsi(self.df, period)['rsi'], atol=1e-9)
+
+    def test_bollinger_sweep_matches_single(self):
+        """기간 x 폭 조합의 열 순서와 값 확인"""
+        from django_backend.analyzer.indicators import bollinger_bands, bollinger_sweep
+
+        sweep = bollinger_sweep(self.close, [10, 20], [1.0, 2.0])
+
+        self.assertEqual(sweep['params'], [(10, 1.0), (10, 2.0), (20, 1.0), (20, 2.0)])
+        single = bollinger_bands(self.df, 20, 2.0)
+        np.testing.assert_allclose(sweep['middle_band'][:, 3], single['middle_band'], rtol=1e-9)
+        np.testing.assert_allclose(sweep['upper_band'][:, 3], single['upper_band'], rtol=1e-9)
+        np.testing.assert_allclose(sweep['lower_band'][:, 3], single['lower_band'], rtol=1e-9)
+
+    def test_invalid_period(self):
+        """0 이하 기간은 오류"""
+        from django_backend.analyzer.indicators import sma_sweep
+
+        with self.assertRaises(ValueError):
+            sma_sweep(self.close, [0, 5])
+
+
+class MarketCorrelationTestCase(TestCase):
+    def setUp(self):
+        """
+        상관관계가 있는 세 종목의 수익률과 NULL 구간 준비
+        """
+        rng = np.random.default_rng(1)
+        common = rng.normal(0, 1e-3, 400)
+        self.returns = np.column_stack([
+            common + rng.normal(0, 5e-4, 400),
+            common + rng.normal(0, 5e-4, 400),
+            rng.normal(0, 1e-3, 400),
+        ])
+        self.returns[50:60, 1] = np.nan
+
+    def test_rolling_matches_pandas(self):
+        """증분 계산 결과가 pandas pairwise 공분산/상관계수와 같음"""
+        from django_backend.analyzer.correlation import RollingCovariance
+
+        rolling = RollingCovariance(n_markets=3, window=100)
+        for start in range(0, 400, 7):
+            rolling.extend(self.returns[start:start + 7])
+
+        expected = pd.DataFrame(self.returns[-100:])
+        np.testing.assert_allclose(rolling.covariance(), expected.cov().to_numpy(), rtol=1e-9)
+        np.testing.assert_allclose(rolling.correlation(), expected.corr().to_numpy(), rtol=1e-9)
+
+        # NULL 구간이 window 안에 있을 때도 pairwise-complete 기준으로 일치
+        rolling.extend(self.returns[:60])
+        expected = pd.DataFrame(np.vstack([self.returns[-40:], self.returns[:60]]))
+        np.testing.assert_allclose(rolling.correlation(), expected.corr().to_numpy(), rtol=1e-9)
+
+    def test_service_incremental_update(self):
+        """두 번째 갱신은 새로 완성된 캔들만 반영"""
+        from django_backend.analyzer.services import MarketCorrelationService
+        from django_backend.data_provider.models import UpbitData
+
+        start_time = datetime(2024, 10, 19, 5, 0)
+        prices = 10000 * np.exp(np.cumsum(np.nan_to_num(self.returns[:120]), axis=0))
+        prices[np.isnan(self.returns[:120])] = np.nan
+        for i in range(120):
+            for j, market in enumerate(("KRW-BTC", "KRW-ETH", "KRW-DOGE")):
+                price = None if np.isnan(prices[i, j]) else float(prices[i, j])
+                UpbitData.objects.create(
+                    market=market, date_time=start_time + timedelta(minutes=i),
+                    opening_price=price, high_price=price, low_price=price,
+                    closing_price=price, acc_price=price, acc_volume=1.0
+                )
+
+        service = MarketCorrelationService(["KRW-BTC", "KRW-ETH", "KRW-DOGE"], timeframe=5, window=10)
+        self.assertEqual(service.update(to=start_time + timedelta(minutes=100)), 10)
+        # 104분은 진행 중이므로 100~104분 버킷은 아직 반영하지 않음
+        self.assertEqual(service.update(to=start_time + timedelta(minutes=104, seconds=59)), 0)
+        self.assertEqual(service.update(to=start_time + timedelta(minutes=110)), 2)
+
+        corr = service.rolling.correlation()
+        self.assertGreater(corr[0, 1], 0.5)
+        self.assertAlmostEqual(corr[0, 0], 1.0)
+
+
+class SyntheticCandleTestCase(TestCase):
+    def test_seeded_and_vectorized(self):
+        """같은 시드는 같은 데이터, 여러 종목/NULL 분 포함"""
+        from django_backend.analyzer.synthetic import generate_ohlcv
+
+        block = generate_ohlcv(50_000, n_markets=3, seed=7, null_probability=0.01)
+        again = generate_ohlcv(50_000, n_markets=3, seed=7, null_probability=0.01)
+
+        self.assertEqual(block.shape, (3, 6, 50_000))
+        self.assertTrue(np.array_equal(block, again, equal_nan=True))
+        # NULL 분은 모든 필드가 NaN
+        missing = np.isnan(block[:, 3])
+        self.assertAlmostEqual(missing.mean(), 0.01, delta=0.005)
+        self.assertTrue(np.isnan(block.transpose(1, 0, 2)[:, missing]).all())
+
+        valid = ~missing
+        self.assertTrue((block[:, 1][valid] >= block[:, 3][valid]).all())
+        self.assertTrue((block[:, 2][valid] <= block[:, 3][valid]).all())
+
+    def test_regime_schedule(self):
+        """고정 국면 순서에 따라 추세가 나타남"""
+        from django_backend.analyzer.synthetic import generate_ohlcv
+
+        block = generate_ohlcv(
+            40_000, seed=1, schedule=[('bull', 20_000), ('bear', 20_000)],
+            gap_probability=0, null_probability=0, outage_probability=0
+        )
+        close = block[0, 3]
+        self.assertGreater(close[19_999], close[0])
+        self.assertLess(close[-1], close[19_999])
@@ -1 +1,5 @@
-# django_backend/config/__init__.py
\ No newline at end of file
+# django_backend/config/__init__.py
+# Django 프로세스(web, 관리 명령)에서 보내는 작업도 설정된 Celery 앱(브로커, 큐 라우팅)을 사용하도록 먼저 로드
+from django_backend.config.celery import app as celery_app
+
+__all__ = ('celery_app',)
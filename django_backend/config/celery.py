@@ -22,6 +22,9 @@ def debug_task(self):
 @worker_ready.connect
 def at_start(sender, **kwargs):
     print("Celery worker is ready.")
+    # 워커 풀마다 이 신호를 받으므로 백필(bulk) 큐를 소비하는 워커만 누락 데이터 수집을 시작
+    if "bulk" not in {queue.name for queue in sender.task_consumer.queues}:
+        return
     with sender.app.connection() as conn:
-        sender.app.send_task('data_provider.tasks.fetch_missing_upbit_data', 
+        sender.app.send_task('django_backend.data_provider.tasks.fetch_missing_upbit_data',
                              connection=conn)
\ No newline at end of file
@@ -0,0 +1,219 @@
+# django_backend/config/rate_limiter.py
+import logging
+import threading
+import time as t
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (낮을수록 우선): 주문 > 실시간 데이터 > 과거 데이터 백필
+PRIORITY_ORDER = 0
+PRIORITY_LIVE = 1
+PRIORITY_BACKFILL = 2
+
+# 토큰 버킷 (Redis 해시 tokens/updated_ms). 시각은 Redis TIME을 사용해 워커 간 시계 차이를 없앱니다.
+# reserve는 우선순위별로 남겨 두어야 하는 토큰 수이며, 토큰이 cost + reserve 이상일 때만 가져갑니다.
+# 반환값: {획득 여부(1/0), 대기해야 할 시간(ms)}
+ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_ms')
+local tokens = tonumber(state[1]) or capacity
+local updated_ms = tonumber(state[2]) or now_ms
+tokens = math.min(capacity, tokens + math.max(0, now_ms - updated_ms) * rate / 1000)
+local acquired = 0
+local wait_ms = 0
+if tokens - cost >= reserve then
+    tokens = tokens - cost
+    acquired = 1
+else
+    wait_ms = math.ceil((cost + reserve - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_ms', now_ms)
+redis.call('PEXPIRE', KEYS[1], 60000)
+return {acquired, wait_ms}
+"""
+
+# 서버가 알려준 남은 요청 수(또는 429 이후 패널티)로 토큰 수를 낮춥니다. 토큰을 늘리지는 않습니다.
+CLAMP_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens == nil or tokens > limit then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(limit), 'updated_ms', now_ms)
+    redis.call('PEXPIRE', KEYS[1], 60000)
+end
+return 1
+"""
+
+
+class RateLimitTimeout(Exception):
+    """
+    timeout 안에 요청 토큰을 얻지 못했을 때 발생합니다.
+    """
+
+
+def parse_remaining_req(value):
+    """
+    업비트 Remaining-Req 헤더를 파싱합니다.
+
+    :param value: 예: 'group=default; min=1800; sec=29'
+    :return: (group, 초당 남은 요청 수) 또는 None
+    """
+    if not value:
+        return None
+    fields = dict(
+        part.strip().split("=", 1) for part in value.split(";") if "=" in part
+    )
+    if "group" not in fields or "sec" not in fields:
+        return None
+    return fields["group"], int(fields["sec"])
+
+
+class RateLimiter:
+    """
+    모든 워커가 공유하는 업비트 API 요청 제한기 (Redis 토큰 버킷).
+
+    - API 그룹(settings.UPBIT_RATE_LIMITS의 candle, orderbook, trade, default, order 등)마다 별도 버킷을 사용합니다
+    - 우선순위 레인: 낮은 우선순위 요청은 버킷에 settings.RATE_LIMIT_RESERVE 비율만큼 토큰이 남아 있을 때만 진행하므로,
+      백필이 몰려도 주문과 실시간 수집이 사용할 여유가 남습니다
+    - 응답의 Remaining-Req 헤더(초당 남은 요청 수)로 버킷을 서버 상태에 맞춰 낮추고, 429 응답 후에는 버킷을 비웁니다
+    - Redis에 연결할 수 없으면 그룹 제한 속도에 맞춰 프로세스 안에서만 대기합니다
+    """
+
+    KEY_PREFIX = "ratelimit:upbit"
+
+    def __init__(self, redis_client=None, limits=None, reserve=None):
+        self.logger = logger
+        self.redis_client = redis_client or redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.limits = limits or settings.UPBIT_RATE_LIMITS
+        self.reserve = reserve or settings.RATE_LIMIT_RESERVE
+        self._acquire_script = None
+        self._clamp_script = None
+        self.waits = {}  # group -> 누적 대기 시간 (초)
+
+    def key(self, group):
+        return f"{self.KEY_PREFIX}:{group}"
+
+    def _try_acquire(self, group, cost, reserve):
+        """
+        토큰을 한 번 시도합니다.
+
+        :return: (획득 여부, 대기해야 할 시간(초))
+        """
+        if self._acquire_script is None:
+            self._acquire_script = self.redis_client.register_script(ACQUIRE_SCRIPT)
+        rate = self.limits[group]
+        acquired, wait_ms = self._acquire_script(keys=[self.key(group)], args=[rate, rate, cost, reserve])
+        return bool(int(acquired)), int(wait_ms) / 1000
+
+    def _clamp(self, group, limit):
+        if self._clamp_script is None:
+            self._clamp_script = self.redis_client.register_script(CLAMP_SCRIPT)
+        self._clamp_script(keys=[self.key(group)], args=[limit])
+
+    def acquire(self, group, priority=PRIORITY_LIVE, cost=1, timeout=None):
+        """
+        group 버킷에서 cost개 토큰을 얻을 때까지 대기합니다.
+
+        :param priority: PRIORITY_ORDER / PRIORITY_LIVE / PRIORITY_BACKFILL
+        :param timeout: 최대 대기 시간 (초). 초과하면 RateLimitTimeout
+        :return: 대기한 시간 (초)
+        """
+        if group not in self.limits:
+            raise ValueError(f"Unknown rate limit group: {group}")
+        reserve = self.limits[group] * self.reserve.get(priority, 0.0)
+        started = t.monotonic()
+        while True:
+            try:
+                acquired, wait = self._try_acquire(group, cost, reserve)
+            except redis.RedisError as e:
+                # 공유 버킷을 사용할 수 없으면 이 프로세스만이라도 그룹 제한 속도를 지킴
+                self.logger.warning(f"요청 제한기 Redis 오류, 로컬 대기로 진행합니다: {e}")
+                acquired, wait = True, cost / self.limits[group]
+                t.sleep(wait)
+            waited = t.monotonic() - started
+            if acquired:
+                if waited > 0:
+                    self.waits[group] = self.waits.get(group, 0.0) + waited
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise RateLimitTimeout(f"{group} 요청 토큰을 {timeout}초 안에 얻지 못했습니다.")
+            t.sleep(wait)
+
+    def observe(self, response, group=None):
+        """
+        응답 헤더와 상태 코드로 버킷을 서버 상태에 맞춥니다.
+
+        :param group: 429 응답에 Remaining-Req 헤더가 없을 때 사용할 그룹
+        """
+        try:
+            parsed = parse_remaining_req(response.headers.get("Remaining-Req"))
+            if parsed is not None and parsed[0] in self.limits:
+                group = parsed[0]
+                self._clamp(group, parsed[1])
+            if response.status_code == 429 and group in self.limits:
+                self.logger.warning(f"업비트 요청 제한 초과(429): {group}")
+                self._clamp(group, 0)
+        except redis.RedisError as e:
+            self.logger.warning(f"요청 제한기 갱신 실패: {e}")
+
+
+class LocalRateLimiter(RateLimiter):
+    """
+    RateLimiter와 같은 규칙을 프로세스 메모리에서 적용하는 제한기 (단일 프로세스 실행/테스트용).
+    """
+
+    def __init__(self, limits=None, reserve=None):
+        self.logger = logger
+        self.limits = limits or settings.UPBIT_RATE_LIMITS
+        self.reserve = reserve or settings.RATE_LIMIT_RESERVE
+        self.waits = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, group):
+        rate = self.limits[group]
+        now = t.monotonic()
+        tokens, updated = self._buckets.get(group, (rate, now))
+        tokens = min(rate, tokens + (now - updated) * rate)
+        return tokens, now
+
+    def _try_acquire(self, group, cost, reserve):
+        with self._lock:
+            tokens, now = self._refill(group)
+            if tokens - cost >= reserve:
+                self._buckets[group] = (tokens - cost, now)
+                return True, 0.0
+            self._buckets[group] = (tokens, now)
+            return False, (cost + reserve - tokens) / self.limits[group]
+
+    def _clamp(self, group, limit):
+        with self._lock:
+            tokens, now = self._refill(group)
+            self._buckets[group] = (min(tokens, limit), now)
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """
+    프로세스에서 공유하는 RateLimiter (처음 호출할 때 생성).
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
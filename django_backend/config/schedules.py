@@ -0,0 +1,53 @@
+# django_backend/config/schedules.py
+import math
+from datetime import timedelta
+
+from celery import schedules
+
+
+class minute_offset(schedules.BaseSchedule):
+    """
+    매 분 경계(캔들 마감) 후 offset초에 실행되는 Celery beat 스케줄.
+
+    schedule(60.0)은 beat 시작 시각 기준으로 60초마다 실행되어 캔들 마감과의 간격이 임의(0~60초)이고,
+    실행 지연이 다음 실행 시각에 누적됩니다. 이 스케줄은 다음 실행 시각을 항상 벽시계의 분 경계에서 계산하므로
+    지연이 누적되지 않습니다.
+
+    :param offset: 분 경계 후 실행까지의 시간 (초, 0 이상 60 미만)
+    """
+
+    def __init__(self, offset=2.0, nowfun=None, app=None):
+        if not 0 <= offset < 60:
+            raise ValueError(f"offset must be in [0, 60): {offset}")
+        self.offset = float(offset)
+        super().__init__(nowfun=nowfun, app=app)
+
+    def next_run_at(self, after):
+        """
+        after 이후(after 포함하지 않음) 첫 실행 시각.
+        """
+        timestamp = after.timestamp() - self.offset
+        return after + timedelta(seconds=(math.floor(timestamp / 60) + 1) * 60 - timestamp)
+
+    def remaining_estimate(self, last_run_at):
+        return self.next_run_at(self.maybe_make_aware(last_run_at)) - self.now()
+
+    def is_due(self, last_run_at):
+        """
+        :return: (실행 여부, 다음 확인까지 남은 시간(초))
+        """
+        now = self.now()
+        if self.next_run_at(self.maybe_make_aware(last_run_at)) <= now:
+            return schedules.schedstate(is_due=True, next=(self.next_run_at(now) - now).total_seconds())
+        return schedules.schedstate(is_due=False, next=max(self.remaining_estimate(last_run_at).total_seconds(), 0.0))
+
+    def __repr__(self):
+        return f"<minute_offset: +{self.offset:g}s>"
+
+    def __eq__(self, other):
+        if isinstance(other, minute_offset):
+            return self.offset == other.offset
+        return NotImplemented
+
+    def __reduce__(self):
+        return self.__class__, (self.offset, self.nowfun)
@@ -14,6 +14,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 from celery.schedules import crontab
+from django_backend.config.schedules import minute_offset
 
 from dotenv import load_dotenv
 
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
     'django_backend.trader',
     'django_backend.strategy',
     'django_backend.analyzer',
+    'django_backend.operation',
 ]
 
 MIDDLEWARE = [
@@ -146,17 +148,124 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Seoul'
 
+# 지연 시간 등급별 Celery 큐. 등급마다 별도 워커 풀이 소비하므로(docker-compose.yml의 celery_* 서비스)
+# 오래 걸리는 백필이 주문이나 실시간 수집의 워커 슬롯을 차지하지 않습니다.
+# - orders: 주문 전송/취소. 워커 장애 시 같은 주문이 다시 전송되지 않도록 실행 전에 ack합니다
+# - live: 실시간 수집, 운영 틱, 체결 조회. 분 단위로 다시 실행되므로 재전달하지 않습니다
+# - analysis: 지표/상관계수/예측. 다시 실행해도 안전하므로 완료 후 ack합니다
+# - bulk: 누락 데이터 백필, 주문 내역 동기화, 백테스트. 한 번에 하나씩 가져가고 완료 후 ack합니다
+# time_limit(초)을 넘으면 작업을 강제 종료하고, soft_time_limit에서는 작업 안에서 SoftTimeLimitExceeded가 발생합니다.
+CELERY_TASK_TIERS = {
+    "orders": {
+        "queues": ["orders"],
+        "acks_late": False,
+        "soft_time_limit": 10,
+        "time_limit": 15,
+        "tasks": [
+            "django_backend.trader.tasks.send_order_task",
+            "django_backend.trader.tasks.send_orders_task",
+            "django_backend.trader.tasks.send_instrumented_order_task",
+            "django_backend.trader.tasks.cancel_order_task",
+            "django_backend.trader.tasks.cancel_all_orders_task",
+            "django_backend.operation.tasks.order_stage_task",
+        ],
+    },
+    "live": {
+        "queues": ["live"],
+        "acks_late": False,
+        "soft_time_limit": 58,  # 호가/체결 수집기는 55초 동안 실행됨
+        "time_limit": 60,
+        "tasks": [
+            "django_backend.data_provider.tasks.fetch_upbit_data",
+            "django_backend.data_provider.tasks.collect_orderbook_snapshots",
+            "django_backend.data_provider.tasks.collect_trade_ticks",
+            "django_backend.strategy.tasks.dispatch_candle_closed_task",
+            "django_backend.operation.tasks.run_operation_tick",
+            "django_backend.operation.tasks.collect_stage_task",
+            "django_backend.operation.tasks.strategy_stage_task",
+            "django_backend.trader.tasks.get_account_info_task",
+            "django_backend.trader.tasks.poll_order_fills_task",
+        ],
+    },
+    "analysis": {
+        "queues": ["analysis"],
+        "acks_late": True,
+        "soft_time_limit": 120,
+        "time_limit": 150,
+        "tasks": [
+            "django_backend.analyzer.tasks.update_correlation_matrices",
+            "django_backend.strategy.tasks.predict_markets_task",
+            "django_backend.operation.tasks.operation_backpressure_stats_task",
+        ],
+    },
+    "bulk": {
+        "queues": ["bulk", "backtest"],  # backtest: BACKTEST_QUEUE (워크포워드 최적화가 직접 지정)
+        "acks_late": True,
+        "soft_time_limit": 4 * 60 * 60 - 60,  # 백필 락(LOCK_EXPIRE)보다 먼저 종료
+        "time_limit": 4 * 60 * 60,
+        "tasks": [
+            "django_backend.data_provider.tasks.fetch_missing_upbit_data",
+            "django_backend.trader.tasks.sync_order_history_task",
+            "django_backend.strategy.tasks.run_backtest_chunk_task",
+        ],
+    },
+}
+CELERY_TASK_DEFAULT_QUEUE = "analysis"  # 등급을 지정하지 않은 작업
+CELERY_TASK_ROUTES = {
+    task: {"queue": tier["queues"][0]} for tier in CELERY_TASK_TIERS.values() for task in tier["tasks"]
+}
+CELERY_TASK_ANNOTATIONS = {
+    task: {key: tier[key] for key in ("acks_late", "soft_time_limit", "time_limit")}
+    for tier in CELERY_TASK_TIERS.values() for task in tier["tasks"]
+}
+CELERY_TASK_REJECT_ON_WORKER_LOST = True  # acks_late 작업은 워커가 죽으면 다시 전달
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # 긴 작업 뒤에 짧은 작업이 묶여 기다리지 않도록 워커 프로세스당 1개만 미리 가져옴
+
+# 1분봉 수집 설정
+INGESTION_OFFSET_SECONDS = 2.0  # 분 경계(캔들 마감) 후 수집을 시작할 시간 (초)
+INGESTION_RETRY_INTERVAL = 0.5  # 캔들이 아직 조회되지 않을 때 다시 조회할 간격 (초)
+INGESTION_DEADLINE_SECONDS = 45  # 캔들 마감 후 이 시간까지 받지 못하면 포기하고 백필에 맡김 (초)
+INGESTION_LAG_HISTORY = 1440  # 종목별로 보관할 캔들 지연 기록 수 (1일)
+OPERATION_TICK_OFFSET_SECONDS = 5.0  # 분 경계 후 운영 틱을 실행할 시간 (초, 수집 이후이고 OPERATION_MAX_TICK_AGE_MS 안)
+
 CELERY_BEAT_SCHEDULE = {
     'fetch-upbit-data-every-minute': {
         'task': 'django_backend.data_provider.tasks.fetch_upbit_data',
-        'schedule': 60.0,  # 1분마다 실행
-        'options': {'queue': 'data_fetch'}
+        'schedule': minute_offset(INGESTION_OFFSET_SECONDS),  # 매 분 경계 + 오프셋에 실행 (beat 시작 시각과 무관)
+        'options': {'expires': 50},  # 다음 분 실행과 겹치지 않도록 늦게 시작하는 작업은 버림
     },
     'fetch-missing-upbit-data': {
         'task': 'django_backend.data_provider.tasks.fetch_missing_upbit_data',
         'schedule': crontab(minute = 0), # 자정마다 실행
         #'schedule': 60.0,
-        'options': {'queue': 'data_fetch'}
+    },
+    'collect-orderbook-snapshots-every-minute': {
+        'task': 'django_backend.data_provider.tasks.collect_orderbook_snapshots',
+        'schedule': 60.0,
+        'kwargs': {'duration': 55},
+    },
+    'collect-trade-ticks-every-minute': {
+        'task': 'django_backend.data_provider.tasks.collect_trade_ticks',
+        'schedule': 60.0,
+        'kwargs': {'duration': 55},
+    },
+    'sync-order-history-daily': {
+        'task': 'django_backend.trader.tasks.sync_order_history_task',
+        'schedule': crontab(hour=0, minute=10),  # 매일 00:10
+    },
+    'run-operation-tick-every-minute': {
+        'task': 'django_backend.operation.tasks.run_operation_tick',
+        'schedule': minute_offset(OPERATION_TICK_OFFSET_SECONDS),  # 매 분 수집 직후 실행 (OPERATION_MARKETS가 비어 있으면 아무것도 하지 않음)
+        'options': {'expires': 55},  # 다음 틱까지 실행되지 못한 작업은 버림
+    },
+    'poll-order-fills': {
+        'task': 'django_backend.trader.tasks.poll_order_fills_task',
+        'schedule': 10.0,  # 10초마다 실행
+    },
+    'update-correlation-matrices-every-minute': {
+        'task': 'django_backend.analyzer.tasks.update_correlation_matrices',
+        'schedule': 60.0,
+        'kwargs': {'timeframe': 1, 'window': 240},
     },
 }
 
@@ -201,4 +310,92 @@ REDIS_SAVE_DAYS = 365
 # Redis 설정
 REDIS_HOST = os.environ["REDIS_HOST"]
 REDIS_PORT = int(os.environ["REDIS_PORT"])
-REDIS_DB = int(os.environ["REDIS_DB"])
\ No newline at end of file
+REDIS_DB = int(os.environ["REDIS_DB"])
+
+# 지표 캐시 설정
+INDICATOR_CACHE_SIZE = 512  # 프로세스 내 LRU 최대 항목 수
+INDICATOR_CACHE_USE_REDIS = True  # 워커 간 공유를 위한 Redis 2차 캐시 사용 여부
+INDICATOR_CACHE_TTL = 60 * 10  # Redis 캐시 항목 만료 시간 (초)
+
+
+# 이벤트 스트림 설정
+CANDLE_CLOSED_STREAM = "upbit:events:candle_closed"  # 데이터 수집기가 캔들 마감 시 발행
+SIGNAL_STREAM = "strategy:events:signal"  # 전략 런타임이 생성한 매매 신호
+EVENT_STREAM_MAXLEN = 10000  # 스트림별 최대 보관 이벤트 수 (근사값)
+
+# 전략 런타임 설정
+# 예: [{'class': 'django_backend.strategy.strategies.sma_cross.SmaCrossStrategy', 'market': 'KRW-BTC', 'timeframe': 5, 'kwargs': {}}]
+STRATEGY_REGISTRY = []
+STRATEGY_LATENCY_TARGET_MS = 100  # 캔들 마감 -> 신호 생성 목표 지연 시간
+
+# 예측 모델 레지스트리 설정 (워커 프로세스별)
+# 예: {'lstm_5m': {'class': 'django_backend.strategy.models.lstm.LstmModel', 'kwargs': {'window': 60}}}
+MODEL_REGISTRY = {}
+MODEL_REGISTRY_MAX_MODELS = 4  # 프로세스에 동시에 올려둘 최대 모델 수
+MODEL_REGISTRY_MAX_MEMORY_MB = 1024  # 로드된 모델의 추정 메모리 합계 상한
+
+# 백테스트/최적화 설정
+BACKTEST_QUEUE = "backtest"  # 워크포워드 최적화 작업을 처리할 Celery 큐 (데이터 수집 큐와 분리)
+
+# 호가 스냅샷 수집 설정
+ORDERBOOK_DATA_DIR = BASE_DIR / "market_data" / "orderbook"  # 종목/일 단위 호가 파일 저장 위치
+ORDERBOOK_DEPTH = 15  # 저장할 호가 단계 수 (업비트 최대 15단계)
+ORDERBOOK_MARKETS = ["KRW-BTC", "KRW-ETH", "KRW-DOGE"]
+ORDERBOOK_POLL_INTERVAL = 1.0  # 조회 간격 (초)
+
+# 체결(틱) 데이터 수집 설정
+TICK_DATA_DIR = BASE_DIR / "market_data" / "ticks"  # 종목/일 단위 압축 체결 파일 저장 위치
+TICK_MARKETS = ["KRW-BTC", "KRW-ETH", "KRW-DOGE"]
+TICK_BLOCK_SIZE = 4096  # 압축 블록 하나의 최대 체결 수 (범위 조회 시 메모리에 올라가는 단위)
+TICK_PRICE_DECIMALS = 4  # 가격 정수 인코딩 소수 자릿수 (표현할 수 없는 가격은 float64로 저장)
+TICK_POLL_INTERVAL = 1.0  # 조회 간격 (초)
+
+# 주문 게이트웨이 설정
+ORDER_REQUEST_STREAM = "trader:orders:request"  # 주문 게이트웨이가 구독하는 주문 요청 스트림
+ORDER_RESULT_STREAM = "trader:orders:result"  # 주문 전송 결과와 단계별 지연 시간
+ORDER_GATEWAY_GROUP = "order_gateway"
+ORDER_GATEWAY_CONSUMER = "gateway-1"
+ORDER_GATEWAY_WORKERS = 4  # 동시에 전송할 수 있는 주문 수 (HTTP 연결 풀 크기)
+ORDER_GATEWAY_TIMEOUT = 3  # 주문 HTTP 요청 타임아웃 (초)
+ORDER_GATEWAY_MAX_AGE_MS = 3000  # 요청 후 이 시간이 지난 주문은 전송하지 않음
+ORDER_GATEWAY_KEEPALIVE_SECONDS = 20  # 유휴 상태에서 연결을 다시 데우는 간격
+ORDER_GATEWAY_OVERHEAD_TARGET_MS = 5  # HTTP 구간을 제외한 내부 처리 목표 시간
+
+# 업비트 API 요청 설정
+# 요청 그룹별 초당 제한 (Remaining-Req 헤더의 group 이름). 시세 API는 IP 단위, Exchange API는 계정 단위
+UPBIT_RATE_LIMITS = {
+    "market": 10,
+    "candle": 10,
+    "trade": 10,
+    "ticker": 10,
+    "orderbook": 10,
+    "default": 30,  # 주문 외 Exchange API (취소, 조회 등)
+    "order": 8,  # 주문 생성
+}
+# 우선순위별로 버킷에 남겨 둘 토큰 비율 (0: 주문, 1: 실시간 수집, 2: 백필). 낮은 우선순위가 높은 우선순위의 여유를 쓰지 않게 함
+RATE_LIMIT_RESERVE = {0: 0.0, 1: 0.2, 2: 0.5}
+UPBIT_MAX_CONCURRENT_REQUESTS = 10  # 일괄 요청 시 동시에 실행할 최대 요청 수
+UPBIT_REQUEST_TIMEOUT = 3  # HTTP 요청 타임아웃 (초)
+
+# 계좌/주문 상태 저장소 설정
+ACCOUNT_STATE_MAX_STALENESS = 0.1  # 상태 저장소 읽기에서 프로세스 내부 사본을 사용할 최대 시간 (초)
+ACCOUNT_RECONCILE_INTERVAL = 60  # GET /accounts로 잔고를 다시 맞추는 간격 (초)
+ORDER_POLL_MIN_INTERVAL = 0.5  # 미체결 주문 최소 조회 간격 (초). 변화가 없으면 RESULT_CHECK_INTERVAL까지 늘어남
+
+# 주문 내역 동기화 설정
+ORDER_SYNC_INITIAL_DAYS = 90  # 처음 동기화할 때 가져올 기간 (일)
+ORDER_SYNC_OVERLAP_HOURS = 24  # 기준 시각 이전 구간을 다시 조회할 시간 (기준 시각 전에 생성되어 이후 종료된 주문 반영)
+
+# 주문 실행 계측 설정
+ORDER_EXECUTION_FILL_TIMEOUT = 600  # 전송 후 이 시간(초)이 지나도 종료되지 않은 주문은 체결 조회를 멈춤
+ORDER_LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000]  # 지연 히스토그램 구간 상한 (ms)
+ORDER_SLIPPAGE_BUCKETS_BPS = [-50, -20, -10, -5, -2, -1, 0, 1, 2, 5, 10, 20, 50]  # 슬리피지 히스토그램 구간 상한 (bp)
+
+# 운영 파이프라인 설정
+OPERATION_MARKETS = []  # 파이프라인으로 운영할 종목 (예: ["KRW-BTC"])
+OPERATION_DISTRIBUTED = False  # True이면 단계별 작업을 Celery 체인으로 나눠 실행 (기본은 한 워커에서 실행)
+OPERATION_TICK_BUDGET_MS = 1000  # 틱 하나(데이터 -> 주문)의 지연 예산
+OPERATION_STAGE_BUDGETS_MS = {"data": 400, "analysis": 200, "strategy": 100, "order": 300}  # 단계별 지연 예산
+OPERATION_ORDER_AMOUNT = 10000  # 매수 신호 하나의 주문 금액 (KRW)
+OPERATION_MAX_TICK_AGE_MS = 20000  # 캔들 마감 후 이 시간이 지난 틱으로는 처리/주문하지 않음
+OPERATION_MONITORED_QUEUES = ["orders", "live", "analysis", "bulk", "backtest"]  # 대기 메시지 수를 노출할 Celery 큐
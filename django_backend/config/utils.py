@@ -12,3 +12,11 @@ def generate_redis_key(provider_name, market, timeframe='1m'):
 
 # NOTE: 현재는 'upbit'에 대해서만 이 함수를 사용하고 있지만, 
 # 향후 다른 데이터 제공자(ex: 'binance')를 포함하도록 로직을 확장해야 함.
+
+
+def generate_last_candle_key(provider_name, market, timeframe='1m'):
+    """
+    마지막으로 수집된 캔들 시각(epoch 초)을 저장하는 Redis 키를 생성하는 함수.
+    데이터 수집기가 갱신하고, 지표 캐시가 무효화 기준으로 사용합니다.
+    """
+    return f"{generate_redis_key(provider_name, market, timeframe)}:last_candle"
@@ -0,0 +1,452 @@
+# django_backend/controller/simulator/exchange.py
+import heapq
+import itertools
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from django_backend.analyzer.arrays import CLOSE, HIGH, LOW, OPEN, VOLUME
+from django_backend.trader.abstract_trader import AbstractTrader
+
+logger = logging.getLogger(__name__)
+
+EPSILON = 1e-12  # 잔량 0 판단 기준
+
+
+class _Order:
+    """
+    매칭 엔진 내부 주문 표현. 응답은 _order_response에서 업비트 형식 dict로 변환합니다.
+    """
+
+    __slots__ = (
+        'uuid', 'market', 'side', 'ord_type', 'price', 'volume', 'time_in_force', 'created_at', 'state',
+        'remaining_volume', 'remaining_amount', 'executed_volume', 'executed_funds', 'paid_fee', 'locked',
+        'trade_count', 'sequence',
+    )
+
+    def __init__(self, market, side, ord_type, price, volume, time_in_force, created_at, sequence):
+        self.uuid = str(uuid.uuid4())
+        self.market = market
+        self.side = side
+        self.ord_type = ord_type
+        self.price = price
+        self.volume = volume
+        self.time_in_force = time_in_force
+        self.created_at = created_at
+        self.state = 'wait'
+        self.remaining_volume = volume if volume is not None else 0.0
+        # 시장가/최유리 매수는 수량 대신 총액(price)으로 체결
+        self.remaining_amount = price if side == 'bid' and ord_type in ('price', 'best') else None
+        self.executed_volume = 0.0
+        self.executed_funds = 0.0
+        self.paid_fee = 0.0
+        self.locked = 0.0
+        self.trade_count = 0
+        self.sequence = sequence
+
+    @property
+    def is_filled(self):
+        if self.remaining_amount is not None:
+            return self.remaining_amount <= EPSILON
+        return self.remaining_volume <= EPSILON
+
+
+class SimulatedTrader(AbstractTrader):
+    """
+    업비트 주문 규칙을 따르는 모의 거래소 (오프라인 주문 로직 테스트용).
+
+    재생한 캔들(on_candle) 또는 호가(on_orderbook)를 외부 유동성으로 사용하는 메모리 매칭 엔진입니다.
+
+    - 주문 타입: limit(지정가), price(시장가 매수, 총액), market(시장가 매도, 수량), best(최유리 지정가)
+    - time_in_force: ioc(즉시 체결 후 잔량 취소), fok(전량 체결 불가 시 취소). limit/best에서만 사용 가능
+    - 새 주문은 현재 외부 유동성에 대해 즉시 체결(taker)되고, 지정가 잔량은 호가창에 대기합니다
+    - 대기 주문은 이후 캔들/호가가 가격을 지나면 자신의 지정가로 체결(maker)됩니다
+    - 종목별 대기 주문은 (가격, 접수 순서) 힙으로 관리하므로 매칭 비용은 체결 건수에 비례합니다
+    - 주문 금액과 수수료는 KRW 잔고에서, 매도 수량은 코인 잔고에서 잠금(locked) 처리됩니다
+
+    NOTE: 호가 단위(tick size)와 자기 주문 간 체결은 모의하지 않습니다.
+    """
+
+    def __init__(self, balances=None, fee_rate=0.0005, min_price=5000, on_trade=None):
+        """
+        :param balances: 초기 잔고 (예: {'KRW': 1_000_000, 'BTC': 0.1})
+        :param fee_rate: 거래 수수료율
+        :param min_price: 최소 주문 금액 (KRW)
+        :param on_trade: 체결마다 호출되는 콜백 (order_response, trade dict)
+        """
+        self.logger = logger
+        self.fee_rate = fee_rate
+        self.min_price = min_price
+        self.on_trade = on_trade
+
+        self.balances = defaultdict(float)
+        self.locked = defaultdict(float)
+        self.avg_buy_price = defaultdict(float)
+        for currency, balance in (balances or {'KRW': 1_000_000}).items():
+            self.balances[currency] = float(balance)
+
+        self.now = datetime(1970, 1, 1)
+        self.orders = {}  # uuid -> _Order
+        self.open_orders = {}  # uuid -> _Order (state == 'wait')
+        self.closed_orders = []
+        # 종목별 대기 주문 힙. 매수는 (-가격, 순서), 매도는 (가격, 순서)
+        self._bids = defaultdict(list)
+        self._asks = defaultdict(list)
+        # 종목별 외부 유동성: [[가격, 잔량], ...] (매도 호가는 오름차순, 매수 호가는 내림차순)
+        self._ask_levels = {}
+        self._bid_levels = {}
+        self._sequence = itertools.count()
+        self.event_count = 0
+
+    # ------------------------------------------------------------------
+    # 시장 데이터
+    # ------------------------------------------------------------------
+
+    def on_orderbook(self, market, orderbook_units, timestamp=None):
+        """
+        호가 스냅샷을 반영하고 교차된 대기 주문을 체결합니다.
+
+        :param orderbook_units: 업비트 호가 형식 [{'ask_price', 'bid_price', 'ask_size', 'bid_size'}, ...]
+        """
+        self.event_count += 1
+        if timestamp is not None:
+            self.now = timestamp
+        self._ask_levels[market] = [[float(u['ask_price']), float(u['ask_size'])] for u in orderbook_units]
+        self._bid_levels[market] = [[float(u['bid_price']), float(u['bid_size'])] for u in orderbook_units]
+        self._match_resting(market, 'bid', self._ask_levels[market])
+        self._match_resting(market, 'ask', self._bid_levels[market])
+
+    def on_candle(self, market, open_price, high_price, low_price, close_price, volume, timestamp=None):
+        """
+        캔들 하나를 반영합니다. 가격 범위(저가~고가)에 걸린 대기 주문을 캔들 거래량 한도 안에서 체결하고,
+        이후 새 주문은 종가에서 거래량만큼 체결될 수 있습니다.
+        """
+        self.event_count += 1
+        if timestamp is not None:
+            self.now = timestamp
+        if np.isnan(close_price):
+            return
+        volume = float(volume) if volume and not np.isnan(volume) else 0.0
+        # 매수 대기 주문은 저가 이상 가격, 매도 대기 주문은 고가 이하 가격에서 체결 가능
+        self._match_resting(market, 'bid', [[float(low_price), volume]])
+        self._match_resting(market, 'ask', [[float(high_price), volume]])
+        self._ask_levels[market] = [[float(close_price), volume]]
+        self._bid_levels[market] = [[float(close_price), volume]]
+
+    def replay_candles(self, market, ohlcv, start, callback=None):
+        """
+        (len(FIELDS), n) 1분봉 배열을 순서대로 재생합니다.
+
+        :param start: 첫 캔들 시각 (numpy datetime64[m])
+        :param callback: 캔들마다 호출되는 함수 (trader, index). 전략의 주문 로직을 여기서 실행합니다
+        """
+        times = (np.datetime64(start, 'm') + np.arange(ohlcv.shape[1]) * np.timedelta64(1, 'm')).astype(datetime)
+        columns = ohlcv[[OPEN, HIGH, LOW, CLOSE, VOLUME]].T.tolist()
+        for index, (row, timestamp) in enumerate(zip(columns, times)):
+            self.on_candle(market, *row, timestamp=timestamp)
+            if callback is not None:
+                callback(self, index)
+
+    def replay_orderbooks(self, market, records, callback=None):
+        """
+        data_provider.orderbook 레코드 배열(OrderbookReader.read 결과)을 순서대로 재생합니다.
+
+        :param callback: 스냅샷마다 호출되는 함수 (trader, index)
+        """
+        from django_backend.data_provider.orderbook import ms_to_kst_datetime, to_orderbook_units
+
+        for index, record in enumerate(records):
+            self.on_orderbook(market, to_orderbook_units(record), timestamp=ms_to_kst_datetime(record['timestamp']))
+            if callback is not None:
+                callback(self, index)
+
+    def _match_resting(self, market, side, levels):
+        """
+        외부 유동성(levels)과 교차하는 대기 주문을 가격-시간 우선순위로 지정가 체결합니다.
+        """
+        heap = self._bids[market] if side == 'bid' else self._asks[market]
+        level_index = 0
+        while heap and level_index < len(levels):
+            key, _, order = heap[0]
+            if order.state != 'wait':
+                heapq.heappop(heap)  # 취소/체결 완료된 주문의 지연 삭제
+                continue
+            level_price, level_size = levels[level_index]
+            if level_size <= EPSILON:
+                level_index += 1
+                continue
+            crosses = order.price >= level_price if side == 'bid' else order.price <= level_price
+            if not crosses:
+                break
+            quantity = min(order.remaining_volume, level_size)
+            levels[level_index][1] -= quantity
+            self._fill(order, order.price, quantity)
+            if order.state != 'wait':
+                heapq.heappop(heap)
+
+    # ------------------------------------------------------------------
+    # AbstractTrader
+    # ------------------------------------------------------------------
+
+    def send_request(self, market, side, price=None, volume=None, ord_type='best', time_in_force='ioc'):
+        """
+        주문을 접수합니다. 파라미터와 응답 형식은 UpbitTrader.send_request와 같으며,
+        오류는 업비트와 같은 {'error': {'name', 'message'}} 형식으로 반환합니다.
+        """
+        self.event_count += 1
+        price = float(price) if price is not None else None
+        volume = float(volume) if volume is not None else None
+        error = self._validate(market, side, price, volume, ord_type, time_in_force)
+        if error is not None:
+            return error
+
+        order = _Order(market, side, ord_type, price, volume, time_in_force, self.now, next(self._sequence))
+        error = self._lock_funds(order)
+        if error is not None:
+            return error
+        self.orders[order.uuid] = order
+        self.open_orders[order.uuid] = order
+
+        if time_in_force == 'fok' and not self._can_fill_completely(order):
+            self._close(order, 'cancel')
+            return self._order_response(order)
+
+        self._take(order)
+        if order.state == 'wait':
+            if ord_type == 'limit' and time_in_force is None:
+                heap = self._bids[market] if side == 'bid' else self._asks[market]
+                heapq.heappush(heap, (-price if side == 'bid' else price, order.sequence, order))
+            else:
+                # 시장가/최유리/IOC 주문의 미체결 잔량은 취소
+                self._close(order, 'cancel')
+        return self._order_response(order)
+
+    def cancel_request(self, request_id):
+        """
+        대기 주문을 취소합니다. 호가창 힙에서는 다음 매칭 때 지연 삭제됩니다.
+        """
+        order = self.open_orders.get(request_id)
+        if order is None:
+            return {"error": {"name": "order_not_found", "message": "주문을 찾지 못했습니다."}}
+        self._close(order, 'cancel')
+        return self._order_response(order)
+
+    def cancel_all_requests(self, market=None):
+        """
+        대기 중인 모든 주문(또는 한 종목의 주문)을 취소합니다.
+        """
+        return [
+            self.cancel_request(order.uuid)
+            for order in list(self.open_orders.values())
+            if market is None or order.market == market
+        ]
+
+    def get_account_info(self):
+        """
+        업비트 계좌 조회와 같은 형식의 잔고 리스트를 반환합니다.
+        """
+        return [
+            {
+                "currency": currency,
+                "balance": str(self.balances[currency]),
+                "locked": str(self.locked[currency]),
+                "avg_buy_price": str(self.avg_buy_price[currency]),
+                "avg_buy_price_modified": False,
+                "unit_currency": "KRW",
+            }
+            for currency in sorted(set(self.balances) | set(self.locked))
+            if self.balances[currency] > EPSILON or self.locked[currency] > EPSILON
+        ]
+
+    def get_order_info(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None:
+            return {"error": {"name": "order_not_found", "message": "주문을 찾지 못했습니다."}}
+        return self._order_response(order)
+
+    def get_open_orders(self, market=None):
+        return [
+            self._order_response(order) for order in self.open_orders.values()
+            if market is None or order.market == market
+        ]
+
+    def get_closed_orders(self, market=None):
+        return [
+            self._order_response(order) for order in self.closed_orders
+            if market is None or order.market == market
+        ]
+
+    # ------------------------------------------------------------------
+    # 주문 처리
+    # ------------------------------------------------------------------
+
+    def _validate(self, market, side, price, volume, ord_type, time_in_force):
+        def error(name, message):
+            return {"error": {"name": name, "message": message}}
+
+        if side not in ('bid', 'ask'):
+            return error("validation_error", f"side는 bid 또는 ask여야 합니다: {side}")
+        if time_in_force not in (None, 'ioc', 'fok'):
+            return error("validation_error", f"지원하지 않는 time_in_force: {time_in_force}")
+        if ord_type == 'limit':
+            if price is None or volume is None or price <= 0 or volume <= 0:
+                return error("validation_error", "지정가 주문에는 price와 volume이 필요합니다.")
+            total = price * volume
+        elif ord_type in ('price', 'market'):
+            if time_in_force is not None:
+                return error("validation_error", "시장가 주문은 time_in_force를 지원하지 않습니다.")
+            if (ord_type == 'price') != (side == 'bid'):
+                return error("validation_error", "price 타입은 매수, market 타입은 매도에만 사용합니다.")
+            if ord_type == 'price' and (price is None or price <= 0):
+                return error("validation_error", "시장가 매수에는 price(총액)가 필요합니다.")
+            if ord_type == 'market' and (volume is None or volume <= 0):
+                return error("validation_error", "시장가 매도에는 volume이 필요합니다.")
+            total = price if ord_type == 'price' else volume * self._reference_price(market, side)
+        elif ord_type == 'best':
+            if time_in_force is None:
+                return error("validation_error", "최유리 지정가 주문에는 time_in_force가 필요합니다.")
+            if side == 'bid' and (price is None or price <= 0):
+                return error("validation_error", "최유리 매수에는 price(총액)가 필요합니다.")
+            if side == 'ask' and (volume is None or volume <= 0):
+                return error("validation_error", "최유리 매도에는 volume이 필요합니다.")
+            total = price if side == 'bid' else volume * self._reference_price(market, side)
+        else:
+            return error("validation_error", f"지원하지 않는 ord_type: {ord_type}")
+
+        if total < self.min_price:
+            return error(f"under_min_total_{side}", f"최소 주문 금액은 {self.min_price}원입니다.")
+        return None
+
+    def _reference_price(self, market, side):
+        levels = self._bid_levels.get(market) if side == 'ask' else self._ask_levels.get(market)
+        return levels[0][0] if levels else float('inf')
+
+    def _lock_funds(self, order):
+        base, coin = order.market.split('-')
+        if order.side == 'bid':
+            amount = order.remaining_amount if order.remaining_amount is not None else order.price * order.volume
+            required, currency = amount * (1 + self.fee_rate), base
+        else:
+            required, currency = order.volume, coin
+        if self.balances[currency] + EPSILON < required:
+            return {"error": {"name": f"insufficient_funds_{order.side}", "message": "주문가능한 금액이 부족합니다."}}
+        self.balances[currency] -= required
+        self.locked[currency] += required
+        order.locked = required
+        return None
+
+    def _opposite_levels(self, order):
+        return self._ask_levels.get(order.market, []) if order.side == 'bid' else self._bid_levels.get(order.market, [])
+
+    def _executable_levels(self, order):
+        """
+        주문이 taker로 체결될 수 있는 외부 유동성 호가를 우선순위 순서로 반환합니다.
+        """
+        levels = self._opposite_levels(order)
+        if order.ord_type == 'best':
+            return levels[:1]
+        if order.ord_type == 'limit':
+            if order.side == 'bid':
+                return [level for level in levels if level[0] <= order.price]
+            return [level for level in levels if level[0] >= order.price]
+        return levels
+
+    def _can_fill_completely(self, order):
+        remaining_amount, remaining_volume = order.remaining_amount, order.remaining_volume
+        for price, size in self._executable_levels(order):
+            if remaining_amount is not None:
+                remaining_amount -= price * size
+                if remaining_amount <= EPSILON:
+                    return True
+            else:
+                remaining_volume -= size
+                if remaining_volume <= EPSILON:
+                    return True
+        return False
+
+    def _take(self, order):
+        for level in self._executable_levels(order):
+            price, size = level
+            if size <= EPSILON:
+                continue
+            if order.remaining_amount is not None:
+                quantity = min(size, order.remaining_amount / price)
+            else:
+                quantity = min(size, order.remaining_volume)
+            level[1] -= quantity
+            self._fill(order, price, quantity)
+            if order.state != 'wait':
+                break
+
+    def _fill(self, order, price, quantity):
+        base, coin = order.market.split('-')
+        funds = price * quantity
+        fee = funds * self.fee_rate
+        if order.side == 'bid':
+            # 지정가 매수는 지정가 기준으로 잠갔으므로 더 낮은 가격에 체결되면 차액을 바로 돌려줌
+            reserved = (order.price * quantity if order.ord_type == 'limit' else funds) * (1 + self.fee_rate)
+            self.locked[base] -= reserved
+            order.locked -= reserved
+            self.balances[base] += reserved - funds - fee
+            held = self.balances[coin] + self.locked[coin]
+            self.avg_buy_price[coin] = (self.avg_buy_price[coin] * held + funds) / (held + quantity)
+            self.balances[coin] += quantity
+        else:
+            self.locked[coin] -= quantity
+            order.locked -= quantity
+            self.balances[base] += funds - fee
+
+        order.executed_volume += quantity
+        order.executed_funds += funds
+        order.paid_fee += fee
+        order.trade_count += 1
+        if order.remaining_amount is not None:
+            order.remaining_amount -= funds
+        else:
+            order.remaining_volume -= quantity
+
+        if self.on_trade is not None:
+            self.on_trade(self._order_response(order), {
+                "market": order.market, "side": order.side, "price": price, "volume": quantity,
+                "funds": funds, "fee": fee, "created_at": self.now,
+            })
+        if order.is_filled:
+            self._close(order, 'done')
+
+    def _close(self, order, state):
+        """
+        주문을 종료하고 남은 잠금 금액/수량을 잔고로 돌려줍니다.
+        """
+        base, coin = order.market.split('-')
+        currency = base if order.side == 'bid' else coin
+        self.locked[currency] -= order.locked
+        self.balances[currency] += order.locked
+        order.locked = 0.0
+        order.state = state
+        del self.open_orders[order.uuid]
+        self.closed_orders.append(order)
+
+    def _order_response(self, order):
+        avg_price = order.executed_funds / order.executed_volume if order.executed_volume else 0.0
+        return {
+            "uuid": order.uuid,
+            "side": order.side,
+            "ord_type": order.ord_type,
+            "price": str(order.price) if order.price is not None else None,
+            "avg_price": str(avg_price),
+            "state": order.state,
+            "market": order.market,
+            "created_at": order.created_at.isoformat(),
+            "volume": str(order.volume) if order.volume is not None else None,
+            "remaining_volume": str(max(order.remaining_volume, 0.0)) if order.volume is not None else None,
+            "reserved_fee": str(order.paid_fee + (order.locked * self.fee_rate / (1 + self.fee_rate)
+                                                  if order.side == 'bid' else 0.0)),
+            "remaining_fee": str(order.locked * self.fee_rate / (1 + self.fee_rate) if order.side == 'bid' else 0.0),
+            "paid_fee": str(order.paid_fee),
+            "locked": str(order.locked),
+            "executed_volume": str(order.executed_volume),
+            "trade_count": order.trade_count,
+        }
@@ -0,0 +1,191 @@
+# django_backend/controller/simulator/monte_carlo.py
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('bootstrap', 'block_bootstrap', 'permutation', 'randomized_entry')
+
+
+def returns_from_backtest(result, source='trades'):
+    """
+    Simulator.run 결과에서 리샘플링에 사용할 수익률 배열을 꺼냅니다.
+
+    :param source: 'trades'(왕복 거래 수익률) 또는 'candles'(캔들별 자산 변화율)
+    """
+    if source == 'trades':
+        return result['trades']['return'].to_numpy(dtype=np.float64)
+    if source == 'candles':
+        equity = result['equity']
+        return np.diff(equity) / equity[:-1]
+    raise ValueError(f"Unsupported source: {source}")
+
+
+def max_drawdowns(returns):
+    """
+    (경로 수, 기간) 수익률 행렬의 경로별 최대 낙폭 (음수, 시작 자산 1 포함). 기간이 0이면 0입니다.
+    """
+    if returns.shape[1] == 0:
+        return np.zeros(returns.shape[0])
+    equity = np.cumprod(1.0 + returns, axis=1)
+    running_max = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    return (equity / running_max - 1.0).min(axis=1)
+
+
+class MonteCarloSimulator:
+    """
+    백테스트 수익률을 리샘플링해 수익률/낙폭 분포를 추정하는 몬테카를로 시뮬레이터.
+
+    - bootstrap: 수익률을 독립적으로 복원 추출
+    - block_bootstrap: 길이 block_size의 연속 구간을 복원 추출 (변동성 군집 등 자기상관 유지, 순환 방식)
+    - permutation: 같은 수익률의 순서만 섞음 (총수익률은 같고 낙폭 분포만 달라짐)
+    - randomized_entry: 실제 거래와 같은 보유 기간을 무작위 시점에 배치 (진입 시점 선택 능력 검증)
+
+    경로는 chunk 단위로 생성/집계하므로 메모리 사용량은 max_memory_mb로 제한되고,
+    경로 수에 비례해 남는 것은 경로별 통계값뿐입니다.
+    난수는 경로 번호로 위치를 정하는 카운터 기반 생성기(Philox)에서 경로마다 같은 개수만큼 뽑으므로,
+    결과는 chunk 크기(max_memory_mb)와 무관하게 시드로만 결정됩니다.
+    """
+
+    def __init__(self, n_paths=10_000, method='block_bootstrap', block_size=20, seed=0, max_memory_mb=256,
+                 percentiles=(1, 5, 25, 50, 75, 95, 99)):
+        """
+        :param n_paths: 생성할 경로 수
+        :param method: 리샘플링 방법 (METHODS 중 하나)
+        :param block_size: block_bootstrap 블록 길이
+        :param seed: 난수 시드 (같은 시드면 max_memory_mb와 무관하게 같은 결과)
+        :param max_memory_mb: chunk 하나의 작업 배열 메모리 상한
+        :param percentiles: 보고할 백분위수
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unsupported method: {method}")
+        if block_size <= 0:
+            raise ValueError(f"Invalid block_size: {block_size}")
+        self.n_paths = n_paths
+        self.method = method
+        self.block_size = block_size
+        self.seed = seed
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.percentiles = percentiles
+        self.logger = logger
+
+    def chunk_size(self, horizon):
+        """
+        chunk 하나의 경로 수. 인덱스(int64)와 수익률/자산/고점(float64) 배열을 합쳐 경로당 약 4 x 8 x horizon bytes를 사용합니다.
+        """
+        return int(max(1, min(self.n_paths, self.max_memory_bytes // (32 * max(horizon, 1)))))
+
+    def run(self, returns, horizon=None, holding_periods=None, candle_returns=None, trade_cost=0.0):
+        """
+        시뮬레이션을 실행합니다.
+
+        :param returns: 1차원 수익률 배열 (거래별 또는 캔들별). randomized_entry에서는 사용하지 않음
+        :param horizon: 경로 길이 (기본값: len(returns), randomized_entry는 거래 수)
+        :param holding_periods: randomized_entry용 거래별 보유 캔들 수
+        :param candle_returns: randomized_entry용 캔들별 가격 수익률
+        :param trade_cost: randomized_entry에서 거래마다 차감할 왕복 비용 비율 (수수료 + 슬리피지)
+        :return: {'method', 'n_paths', 'horizon', 'total_return': {백분위: 값}, 'max_drawdown': {...},
+                  'mean_return', 'probability_of_loss', 'drawdown_exceedance': {임계값: 확률}}
+        """
+        if self.method == 'randomized_entry':
+            if holding_periods is None or candle_returns is None:
+                raise ValueError("randomized_entry requires holding_periods and candle_returns")
+            holding_periods = np.asarray(holding_periods, dtype=np.int64)
+            log_price = np.concatenate(([0.0], np.cumsum(np.log1p(np.asarray(candle_returns, dtype=np.float64)))))
+            horizon = len(holding_periods)
+            sampler = lambda offset, size: (
+                (1.0 + self._randomized_entry(self._uniforms(offset, size, horizon), log_price, holding_periods))
+                * (1.0 - trade_cost) - 1.0
+            )
+        else:
+            returns = np.asarray(returns, dtype=np.float64)
+            returns = returns[~np.isnan(returns)]
+            if len(returns) == 0:
+                raise ValueError("No returns to resample")
+            horizon = len(returns) if horizon is None else horizon
+            if self.method == 'permutation' and horizon != len(returns):
+                raise ValueError("permutation keeps the original horizon")
+            sampler = lambda offset, size: returns[self._indices(offset, size, len(returns), horizon)]
+
+        total_returns = np.empty(self.n_paths)
+        drawdowns = np.empty(self.n_paths)
+        chunk = self.chunk_size(horizon)
+        for offset in range(0, self.n_paths, chunk):
+            size = min(chunk, self.n_paths - offset)
+            paths = sampler(offset, size)
+            total_returns[offset:offset + size] = np.prod(1.0 + paths, axis=1) - 1.0
+            drawdowns[offset:offset + size] = max_drawdowns(paths)
+
+        return self.summarize(total_returns, drawdowns, horizon)
+
+    def _uniforms(self, offset, size, width):
+        """
+        경로 offset ~ offset + size의 (size, width) 균등 난수. 경로마다 Philox 카운터 ceil(width / 4)개
+        (카운터 하나에 64비트 난수 4개)를 사용하므로, 경로 offset의 난수는 앞선 chunk 구성과 무관합니다.
+        """
+        counters = -(-width // 4)
+        bit_generator = np.random.Philox(self.seed)
+        bit_generator.advance(offset * counters)
+        return np.random.Generator(bit_generator).random((size, counters * 4))[:, :width]
+
+    def _indices(self, offset, size, n, horizon):
+        """
+        (size, horizon) 리샘플 인덱스를 만듭니다.
+        """
+        if self.method == 'bootstrap':
+            return (self._uniforms(offset, size, horizon) * n).astype(np.int64)
+        if self.method == 'permutation':
+            # 균등 난수의 정렬 순서는 균등한 무작위 순열
+            return self._uniforms(offset, size, n).argsort(axis=1)
+        n_blocks = -(-horizon // self.block_size)
+        starts = (self._uniforms(offset, size, n_blocks) * n).astype(np.int64)
+        indices = (starts[:, :, None] + np.arange(self.block_size)) % n
+        return indices.reshape(size, -1)[:, :horizon]
+
+    @staticmethod
+    def _randomized_entry(uniforms, log_price, holding_periods):
+        """
+        거래별 보유 기간을 무작위 진입 시점에 배치한 (경로 수, 거래 수) 수익률 행렬.
+        보유 구간 수익률은 누적 로그수익률의 차로 계산합니다.
+
+        :param uniforms: (경로 수, 거래 수) 균등 난수
+        """
+        n_candles = len(log_price) - 1
+        if holding_periods.max(initial=0) > n_candles:
+            raise ValueError("Holding period longer than candle history")
+        starts = (uniforms * (n_candles - holding_periods + 1)).astype(np.int64)
+        return np.expm1(log_price[starts + holding_periods] - log_price[starts])
+
+    def summarize(self, total_returns, drawdowns, horizon, drawdown_thresholds=(0.1, 0.2, 0.3, 0.5)):
+        """
+        경로별 총수익률/최대 낙폭을 백분위 통계로 요약합니다.
+        """
+        def percentile_table(values):
+            return {p: float(v) for p, v in zip(self.percentiles, np.percentile(values, self.percentiles))}
+
+        return {
+            'method': self.method,
+            'n_paths': len(total_returns),
+            'horizon': horizon,
+            'total_return': percentile_table(total_returns),
+            'max_drawdown': percentile_table(drawdowns),
+            'mean_return': float(total_returns.mean()),
+            'probability_of_loss': float(np.mean(total_returns < 0)),
+            'drawdown_exceedance': {
+                threshold: float(np.mean(drawdowns <= -threshold)) for threshold in drawdown_thresholds
+            },
+        }
+
+    def run_backtest(self, result, candle_returns=None, trade_cost=0.0):
+        """
+        Simulator.run 결과로 시뮬레이션을 실행합니다.
+        randomized_entry는 거래별 보유 기간과 캔들 수익률(candle_returns)을, 그 외에는 거래 수익률을 사용합니다.
+        """
+        if self.method == 'randomized_entry':
+            trades = result['trades']
+            holding_periods = (trades['exit_index'] - trades['entry_index']).to_numpy()
+            return self.run(
+                None, holding_periods=holding_periods, candle_returns=candle_returns, trade_cost=trade_cost
+            )
+        return self.run(returns_from_backtest(result, 'trades'))
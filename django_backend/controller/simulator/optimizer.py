@@ -0,0 +1,325 @@
+# django_backend/controller/simulator/optimizer.py
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from django.utils.module_loading import import_string
+
+from django_backend.analyzer.arrays import to_frame
+from django_backend.controller.simulator.simulator import Simulator
+
+logger = logging.getLogger(__name__)
+
+# 프로세스별로 연 메모리 맵 캔들 배열 ((경로, 수정 시각) -> 배열)
+_candles = {}
+
+
+def parameter_grid(grid):
+    """
+    {'fast_period': [5, 10], 'slow_period': [20, 40]} 형태의 그리드를 파라미터 dict 리스트로 펼칩니다.
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def walk_forward_folds(n, train_size, test_size, step=None, anchored=False):
+    """
+    캔들 n개를 학습/검증 구간으로 나눕니다.
+
+    :param step: 다음 폴드로 이동할 캔들 수 (기본값: test_size, 검증 구간이 겹치지 않음)
+    :param anchored: True면 학습 구간 시작을 0으로 고정하고 길이를 늘려 나감
+    :return: [(train_start, train_end, test_start, test_end), ...] (end는 포함하지 않음)
+    """
+    step = test_size if step is None else step
+    folds = []
+    train_start = 0
+    while train_start + train_size + test_size <= n:
+        train_end = train_start + train_size
+        folds.append((0 if anchored else train_start, train_end, train_end, train_end + test_size))
+        train_start += step
+    return folds
+
+
+def _open_candles(path):
+    stat = os.stat(path)
+    key = (path, stat.st_ino, stat.st_mtime_ns)
+    if key not in _candles:
+        _candles[key] = np.load(path, mmap_mode='r')
+    return _candles[key]
+
+
+def evaluate_params(strategy_path, params_list, data_path, start, timeframe, window, simulator_kwargs):
+    """
+    메모리 맵 캔들 배열의 한 구간에서 여러 파라미터 세트를 백테스트합니다.
+    프로세스 풀 작업과 Celery 작업이 같은 함수를 사용하므로 인자는 모두 JSON으로 직렬화할 수 있는 값입니다.
+
+    :param strategy_path: VectorizedStrategy 클래스 경로
+    :param params_list: 파라미터 dict 리스트
+    :param data_path: np.save로 저장한 (len(FIELDS), n) 캔들 배열 경로
+    :param start: 배열 첫 캔들 시각 (ISO 문자열)
+    :param window: [구간 시작, 구간 끝) 캔들 번호
+    :return: 파라미터 세트별 성과 지표 dict 리스트
+    """
+    candles = _open_candles(data_path)
+    strategy_class = import_string(strategy_path)
+    simulator = Simulator(timeframe=timeframe, **simulator_kwargs)
+    window_start, window_end = window
+
+    results = []
+    for params in params_list:
+        strategy = strategy_class(**params)
+        # 구간 시작 시점에 신호를 낼 수 있도록 lookback만큼 앞선 캔들부터 신호를 계산
+        warmup_start = max(window_start - strategy.lookback + 1, 0)
+        history = np.asarray(candles[:, warmup_start:window_end])
+        frame = to_frame(
+            history, np.datetime64(start, 'm') + warmup_start * timeframe * np.timedelta64(1, 'm'), timeframe
+        )
+        signals = strategy.compute_signals(frame)[window_start - warmup_start:]
+        results.append(simulator.run(history[:, window_start - warmup_start:], signals)['metrics'])
+    return results
+
+
+class WalkForwardOptimizer:
+    """
+    파라미터 그리드 x 워크포워드 폴드 백테스트를 병렬로 실행하는 최적화기.
+
+    폴드마다 모든 (남은) 파라미터 세트를 학습 구간에서 백테스트해 가장 좋은 세트를 고르고,
+    그 세트를 바로 뒤 검증 구간에서 평가합니다 (표본 외 성과).
+
+    - 캔들 배열은 작업 디렉터리에 .npy로 한 번 저장하고 워커는 메모리 맵으로 읽으므로 복사되지 않습니다
+    - prune_after개 폴드 이후부터는 학습 점수 평균이 하위 prune_fraction인 세트를 다음 폴드에서 제외합니다
+    - 완료된 백테스트는 체크포인트(JSON lines)에 기록되어 중단 후 다시 실행하면 이어서 진행합니다
+    - executor='celery'이면 settings.BACKTEST_QUEUE 큐의 Celery 워커에 작업을 분산합니다
+      (워커가 같은 작업 디렉터리를 볼 수 있어야 합니다)
+    """
+
+    def __init__(self, strategy_path, param_grid, train_size, test_size, step=None, anchored=False,
+                 metric='sharpe', maximize=True, simulator_kwargs=None, timeframe=1, prune_after=2,
+                 prune_fraction=0.5, min_candidates=4, workers=None, chunk_size=8, executor='process',
+                 work_dir=None):
+        """
+        :param strategy_path: VectorizedStrategy 클래스 경로 (예: 'django_backend.strategy.strategies.sma_cross.SmaCrossStrategy')
+        :param param_grid: 파라미터 그리드 dict 또는 파라미터 dict 리스트
+        :param train_size: 학습 구간 캔들 수
+        :param test_size: 검증 구간 캔들 수
+        :param metric: 파라미터 선택 기준 지표 (Simulator.compute_metrics 키)
+        :param prune_after: 가지치기를 시작할 완료 폴드 수 (0이면 가지치기 안 함)
+        :param prune_fraction: 가지치기 때 제외할 비율
+        :param min_candidates: 가지치기 후 남길 최소 파라미터 세트 수
+        :param workers: 프로세스 수 (1이면 현재 프로세스에서 순차 실행)
+        :param chunk_size: 작업 하나에 묶을 파라미터 세트 수
+        :param work_dir: 캔들 배열과 체크포인트를 저장할 디렉터리 (기본값: 임시 디렉터리)
+        """
+        self.strategy_path = strategy_path
+        self.params = parameter_grid(param_grid) if isinstance(param_grid, dict) else list(param_grid)
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step
+        self.anchored = anchored
+        self.metric = metric
+        self.maximize = maximize
+        self.simulator_kwargs = simulator_kwargs or {}
+        self.timeframe = timeframe
+        self.prune_after = prune_after
+        self.prune_fraction = prune_fraction
+        self.min_candidates = min_candidates
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        if executor not in ('process', 'celery'):
+            raise ValueError(f"Unsupported executor: {executor}")
+        self.executor = executor
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='walk_forward_')
+        self.logger = logger
+        self._results = {}  # (param_index, fold, segment) -> metrics
+
+    def score(self, metrics):
+        """
+        지표 dict에서 선택 기준 점수를 계산합니다. 값이 없으면(거래 없음 등) 최하위 점수입니다.
+        """
+        value = metrics.get(self.metric)
+        if value is None or np.isnan(value):
+            return -np.inf
+        return value if self.maximize else -value
+
+    def run(self, candles, start):
+        """
+        워크포워드 최적화를 실행합니다.
+
+        :param candles: (len(FIELDS), n) 캔들 배열 (timeframe분봉, NULL 보정 전후 모두 가능)
+        :param start: 첫 캔들 시각 (numpy datetime64[m])
+        :return: {
+            'params': 파라미터 리스트,
+            'folds': [{'fold', 'train', 'test', 'best_index', 'best_params', 'train_score', 'test_metrics'}],
+            'pruned': {파라미터 번호: 제외된 폴드},
+            'out_of_sample': {'mean_score', 'compounded_return'}
+        }
+        """
+        candles = np.asarray(candles, dtype=np.float64)
+        start = str(np.datetime64(start, 'm'))
+        folds = walk_forward_folds(candles.shape[1], self.train_size, self.test_size, self.step, self.anchored)
+        if not folds:
+            raise ValueError("History is shorter than one train/test fold")
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        data_path = os.path.join(self.work_dir, 'candles.npy')
+        fingerprint = self._fingerprint(candles, start, folds)
+        self._load_checkpoint(fingerprint)
+        # 체크포인트 지문은 메모리의 candles로 계산하므로, 작업 디렉터리에 남아 있는 이전 실행의 배열을 재사용하지 않고
+        # 항상 새로 저장합니다 (교체 방식이라 이전 파일을 메모리 맵으로 읽는 중인 프로세스에는 영향 없음)
+        temp_path = os.path.join(self.work_dir, f'candles.{os.getpid()}.tmp.npy')
+        np.save(temp_path, candles)
+        os.replace(temp_path, data_path)
+        context = (data_path, start)
+
+        active = list(range(len(self.params)))
+        pruned = {}
+        fold_reports = []
+        pool = self._make_pool()
+        try:
+            for fold_index, (train_start, train_end, test_start, test_end) in enumerate(folds):
+                self._evaluate(pool, context, active, fold_index, 'train', (train_start, train_end))
+                scores = {i: self.score(self._results[(i, fold_index, 'train')]) for i in active}
+                best = max(active, key=lambda i: (scores[i], -i))
+
+                self._evaluate(pool, context, [best], fold_index, 'test', (test_start, test_end))
+                fold_reports.append({
+                    'fold': fold_index,
+                    'train': (train_start, train_end),
+                    'test': (test_start, test_end),
+                    'best_index': best,
+                    'best_params': self.params[best],
+                    'train_score': scores[best],
+                    'test_metrics': self._results[(best, fold_index, 'test')],
+                })
+
+                if self.prune_after and fold_index + 1 >= self.prune_after:
+                    for i in self._prune(active, fold_index):
+                        pruned[i] = fold_index
+                    active = [i for i in active if i not in pruned]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        test_scores = [self.score(report['test_metrics']) for report in fold_reports]
+        returns = [report['test_metrics']['total_return'] for report in fold_reports]
+        return {
+            'params': self.params,
+            'folds': fold_reports,
+            'pruned': pruned,
+            'out_of_sample': {
+                'mean_score': float(np.mean(test_scores)),
+                'compounded_return': float(np.prod(1 + np.array(returns)) - 1),
+            },
+        }
+
+    def _prune(self, active, fold_index):
+        """
+        지금까지의 학습 점수 평균이 하위 prune_fraction인 파라미터 번호를 반환합니다.
+        """
+        keep = max(self.min_candidates, int(np.ceil(len(active) * (1 - self.prune_fraction))))
+        if keep >= len(active):
+            return []
+        mean_scores = {
+            i: np.mean([self.score(self._results[(i, fold, 'train')]) for fold in range(fold_index + 1)])
+            for i in active
+        }
+        ranked = sorted(active, key=lambda i: (mean_scores[i], -i), reverse=True)
+        return ranked[keep:]
+
+    def _make_pool(self):
+        if self.executor != 'process' or self.workers == 1:
+            return None
+        # NOTE: Celery prefork 워커(daemon 프로세스) 안에서는 자식 프로세스를 만들 수 없으므로
+        # 작업 안에서 실행할 때는 workers=1 또는 executor='celery'를 사용해야 합니다.
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('fork'))
+
+    def _evaluate(self, pool, context, param_indices, fold_index, segment, window):
+        """
+        체크포인트에 없는 (파라미터, 폴드, 구간) 백테스트를 실행하고 결과를 기록합니다.
+        """
+        pending = [i for i in param_indices if (i, fold_index, segment) not in self._results]
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+        if not chunks:
+            return
+        data_path, start = context
+
+        def arguments(chunk):
+            return (
+                self.strategy_path, [self.params[i] for i in chunk], data_path, start, self.timeframe,
+                list(window), self.simulator_kwargs,
+            )
+
+        if self.executor == 'celery':
+            from django.conf import settings
+            from django_backend.strategy.tasks import run_backtest_chunk_task
+
+            async_results = [
+                (chunk, run_backtest_chunk_task.apply_async(args=arguments(chunk), queue=settings.BACKTEST_QUEUE))
+                for chunk in chunks
+            ]
+            for chunk, async_result in async_results:
+                self._record(chunk, fold_index, segment, async_result.get())
+        elif pool is None:
+            for chunk in chunks:
+                self._record(chunk, fold_index, segment, evaluate_params(*arguments(chunk)))
+        else:
+            futures = {pool.submit(evaluate_params, *arguments(chunk)): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                self._record(futures[future], fold_index, segment, future.result())
+
+    def _record(self, chunk, fold_index, segment, metrics_list):
+        with open(self._checkpoint_path, 'a') as f:
+            for i, metrics in zip(chunk, metrics_list):
+                self._results[(i, fold_index, segment)] = metrics
+                f.write(json.dumps({'param': i, 'fold': fold_index, 'segment': segment, 'metrics': metrics}) + '\n')
+
+    @property
+    def _checkpoint_path(self):
+        return os.path.join(self.work_dir, 'checkpoint.jsonl')
+
+    def _fingerprint(self, candles, start, folds):
+        """
+        입력 데이터와 설정이 같은 실행인지 확인하기 위한 해시.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(candles).tobytes())
+        digest.update(json.dumps({
+            'strategy': self.strategy_path,
+            'params': self.params,
+            'folds': folds,
+            'start': start,
+            'timeframe': self.timeframe,
+            'metric': self.metric,
+            'maximize': self.maximize,
+            'simulator': self.simulator_kwargs,
+        }, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _load_checkpoint(self, fingerprint):
+        """
+        체크포인트에서 완료된 결과를 읽습니다. 체크포인트가 없으면 새로 만듭니다.
+        """
+        self._results = {}
+        if not os.path.exists(self._checkpoint_path):
+            with open(self._checkpoint_path, 'w') as f:
+                f.write(json.dumps({'fingerprint': fingerprint}) + '\n')
+            return
+
+        with open(self._checkpoint_path) as f:
+            header = json.loads(f.readline())
+            if header.get('fingerprint') != fingerprint:
+                raise ValueError(f"Checkpoint in {self.work_dir} belongs to a different run")
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 중단 시점에 기록 중이던 줄
+                    continue
+                self._results[(record['param'], record['fold'], record['segment'])] = record['metrics']
+        self.logger.info(f"체크포인트에서 백테스트 결과 {len(self._results)}개를 불러왔습니다.")
@@ -1 +1,243 @@
-   # django_backend/controller/simulator/simulator.py
\ No newline at end of file
+# django_backend/controller/simulator/simulator.py
+import logging
+import time as t
+
+import numpy as np
+import pandas as pd
+
+from django_backend.analyzer.arrays import CLOSE, FIELDS, OPEN, fill_missing_candles, forward_fill, resample, to_frame
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_YEAR = 365 * 24 * 60  # 암호화폐는 24시간 거래
+
+
+class Simulator:
+    """
+    벡터 연산 기반 백테스트 엔진.
+
+    캔들 배열과 전략 신호 배열(VectorizedStrategy.compute_signals 결과, BUY=1 / HOLD=0 / SELL=-1)로
+    포지션, 체결, 자산 곡선, 성과 지표를 계산합니다.
+
+    - 롱 온리 현물 매매: BUY 신호 이후 보유, SELL 신호 이후 미보유
+    - 신호는 캔들 마감 시점에 생성되므로 delay개 뒤 캔들의 시가에 체결 (기본 1, 미래 데이터 참조 방지)
+    - 매수 금액은 현금 x position_size이며, 수수료는 주문 금액에 별도로 부과됩니다 (업비트 KRW 마켓 방식)
+    - 주문 금액이 min_price(최소 주문 금액) 미만이면 주문하지 않습니다
+
+    신호 배열 전체는 벡터 연산으로 처리하고, 현금이 이전 체결에 의존하는 체결 계산만 포지션이 바뀌는 지점
+    (캔들 수가 아닌 체결 수)에 대해 순차적으로 수행합니다.
+    """
+
+    def __init__(self, budget=1_000_000, min_price=5000, fee_rate=0.0005, slippage=0.0, position_size=1.0,
+                 delay=1, timeframe=1):
+        """
+        :param budget: 초기 현금 (KRW)
+        :param min_price: 최소 주문 금액 (KRW)
+        :param fee_rate: 거래 수수료율 (업비트 KRW 마켓 0.05%)
+        :param slippage: 체결 가격 불리 폭 (비율, 매수는 위로 매도는 아래로)
+        :param position_size: 매수 시 사용할 현금 비율 (0 ~ 1)
+        :param delay: 신호 캔들로부터 체결 캔들까지의 거리
+        :param timeframe: 캔들 분봉 단위 (연율화 지표 계산에 사용)
+        """
+        if not 0 < position_size <= 1:
+            raise ValueError(f"Invalid position_size: {position_size}")
+        if delay < 0:
+            raise ValueError(f"Invalid delay: {delay}")
+        self.budget = budget
+        self.min_price = min_price
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.position_size = position_size
+        self.delay = delay
+        self.timeframe = timeframe
+        self.logger = logger
+
+    def target_positions(self, signals):
+        """
+        신호 배열을 캔들별 목표 보유 여부(bool)로 변환합니다. 체결 지연(delay)이 반영됩니다.
+        """
+        signals = np.asarray(signals)
+        # 마지막으로 나온 BUY/SELL 신호를 유지
+        last = np.where(signals != 0, np.arange(len(signals)), -1)
+        np.maximum.accumulate(last, out=last)
+        holding = (last >= 0) & (signals[np.maximum(last, 0)] > 0)
+        shifted = np.zeros(len(signals), dtype=bool)
+        # delay가 신호 길이보다 길면(짧은 워크포워드 구간) 모든 캔들에서 미보유
+        delay = min(self.delay, len(signals))
+        shifted[delay:] = holding[:len(signals) - delay]
+        return shifted
+
+    def run(self, ohlcv, signals):
+        """
+        백테스트를 실행합니다.
+
+        :param ohlcv: (len(FIELDS), n) 캔들 배열. NULL 캔들은 직전 종가로 보정됩니다
+                      (np.load(..., mmap_mode='r')로 연 아카이브도 사용 가능)
+        :param signals: 길이 n의 신호 배열
+        :return: {
+            'equity': 캔들별 평가 자산, 'cash': 현금, 'quantity': 보유 수량,
+            'fills': 체결 DataFrame, 'trades': 왕복 거래 DataFrame, 'metrics': 성과 지표 dict
+        }
+        """
+        started = t.perf_counter()
+        ohlcv = np.asarray(ohlcv, dtype=np.float64)
+        n = ohlcv.shape[1]
+        if len(signals) != n:
+            raise ValueError(f"signals length {len(signals)} does not match {n} candles")
+        if np.isnan(ohlcv[[OPEN, CLOSE]]).any():
+            ohlcv = fill_missing_candles(ohlcv)
+        open_, close = ohlcv[OPEN], ohlcv[CLOSE]
+
+        target = self.target_positions(signals)
+        # 첫 유효 가격 이전에는 체결할 수 없음
+        target &= ~np.isnan(open_)
+        changes = np.flatnonzero(np.diff(target.astype(np.int8), prepend=0))
+        fills = self._execute(changes, target, open_)
+
+        equity, cash, quantity = self._mark_to_market(fills, close)
+        result = {
+            'equity': equity,
+            'cash': cash,
+            'quantity': quantity,
+            'fills': fills,
+            'trades': self._round_trips(fills),
+        }
+        result['metrics'] = self.compute_metrics(equity, quantity, fills, result['trades'])
+        self.logger.debug(f"백테스트 완료: 캔들 {n}개, 체결 {len(fills)}건, {t.perf_counter() - started:.3f}초")
+        return result
+
+    def run_frame(self, df, signals):
+        """
+        DataFrame(open, high, low, close, volume, value) 입력으로 백테스트를 실행합니다.
+        """
+        return self.run(df[list(FIELDS)].to_numpy(dtype=np.float64, na_value=np.nan).T, signals)
+
+    def run_strategy(self, strategy, ohlcv, start):
+        """
+        VectorizedStrategy의 전체 이력 신호로 백테스트를 실행합니다.
+
+        :param ohlcv: (len(FIELDS), n) 1분봉 배열 (start는 timeframe 경계에 맞춰져 있어야 함)
+        :param start: 첫 캔들 시각 (numpy datetime64[m])
+        """
+        candles = resample(fill_missing_candles(np.asarray(ohlcv, dtype=np.float64)), self.timeframe)
+        signals = strategy.compute_signals(to_frame(candles, start, self.timeframe))
+        return self.run(candles, signals)
+
+    def _execute(self, changes, target, open_):
+        """
+        포지션 변경 지점을 순서대로 체결합니다. 매수/매도 방향은 변경 지점의 목표 포지션으로 정합니다.
+        최소 주문 금액 미달로 주문하지 못하면 현재 포지션을 유지하므로, 매수하지 못한 뒤의 매도와
+        매도하지 못한 뒤의 매수는 건너뜁니다 (체결은 항상 매수/매도가 번갈아 나옴).
+        """
+        records = []
+        cash, quantity = float(self.budget), 0.0
+        for index in changes:
+            price = open_[index]
+            if target[index]:
+                if quantity > 0:
+                    continue
+                amount = cash * self.position_size / (1 + self.fee_rate)
+                if amount < self.min_price:
+                    continue
+                price = price * (1 + self.slippage)
+                fee = amount * self.fee_rate
+                quantity = amount / price
+                cash -= amount + fee
+                records.append((index, 1, price, quantity, amount, fee, cash, quantity))
+            elif quantity > 0:
+                price = price * (1 - self.slippage)
+                amount = quantity * price
+                if amount < self.min_price:
+                    continue
+                fee = amount * self.fee_rate
+                cash += amount - fee
+                records.append((index, -1, price, quantity, amount, fee, cash, 0.0))
+                quantity = 0.0
+
+        return pd.DataFrame.from_records(
+            records, columns=['index', 'side', 'price', 'quantity', 'amount', 'fee', 'cash_after', 'quantity_after']
+        ).astype({'index': np.int64, 'side': np.int8})
+
+    def _mark_to_market(self, fills, close):
+        """
+        체결 사이 구간마다 현금/수량이 일정하다는 점을 이용해 캔들별 평가 자산을 계산합니다.
+        """
+        n = len(close)
+        fill_index = fills['index'].to_numpy()
+        # 캔들 i 시점에 마지막으로 적용된 체결 번호 (체결은 캔들 시가에 발생하므로 같은 캔들 종가에 반영)
+        segment = np.searchsorted(fill_index, np.arange(n), side='right')
+        cash = np.concatenate(([float(self.budget)], fills['cash_after'].to_numpy()))[segment]
+        quantity = np.concatenate(([0.0], fills['quantity_after'].to_numpy()))[segment]
+        mark = forward_fill(close)
+        equity = cash + quantity * np.nan_to_num(mark)
+        return equity, cash, quantity
+
+    @staticmethod
+    def _round_trips(fills):
+        """
+        매수-매도 쌍을 왕복 거래로 묶습니다. 마지막 미청산 매수는 제외합니다.
+        """
+        buys = fills[fills['side'] == 1].reset_index(drop=True)
+        sells = fills[fills['side'] == -1].reset_index(drop=True)
+        count = len(sells)
+        buys = buys.iloc[:count]
+        cost = buys['amount'].to_numpy() + buys['fee'].to_numpy()
+        proceeds = sells['amount'].to_numpy() - sells['fee'].to_numpy()
+        return pd.DataFrame({
+            'entry_index': buys['index'].to_numpy(),
+            'exit_index': sells['index'].to_numpy(),
+            'entry_price': buys['price'].to_numpy(),
+            'exit_price': sells['price'].to_numpy(),
+            'pnl': proceeds - cost,
+            'return': proceeds / cost - 1 if count else np.empty(0),
+        })
+
+    def compute_metrics(self, equity, quantity, fills, trades):
+        """
+        자산 곡선과 거래 내역으로 표준 성과 지표를 계산합니다.
+        """
+        periods_per_year = MINUTES_PER_YEAR / self.timeframe
+        n = len(equity)
+        returns = np.diff(equity) / equity[:-1] if n > 1 else np.empty(0)
+        running_max = np.maximum.accumulate(equity) if n else equity
+        drawdown = equity / running_max - 1 if n else equity
+
+        total_return = equity[-1] / self.budget - 1 if n else 0.0
+        years = n / periods_per_year
+        volatility = returns.std(ddof=1) if len(returns) > 1 else 0.0
+        downside = returns[returns < 0]
+        downside_deviation = np.sqrt(np.mean(downside ** 2)) if len(downside) else 0.0
+        wins = trades['pnl'] > 0
+        gross_loss = -trades.loc[~wins, 'pnl'].sum()
+
+        return {
+            'final_equity': float(equity[-1]) if n else float(self.budget),
+            'total_return': float(total_return),
+            'cagr': float((1 + total_return) ** (1 / years) - 1) if years > 0 and total_return > -1 else None,
+            'volatility': float(volatility * np.sqrt(periods_per_year)),
+            'sharpe': float(returns.mean() / volatility * np.sqrt(periods_per_year)) if volatility > 0 else None,
+            'sortino': (
+                float(returns.mean() / downside_deviation * np.sqrt(periods_per_year)) if downside_deviation > 0 else None
+            ),
+            'max_drawdown': float(drawdown.min()) if n else 0.0,
+            'exposure': float(np.mean(quantity > 0)) if n else 0.0,
+            'fills': len(fills),
+            'trades': len(trades),
+            'win_rate': float(wins.mean()) if len(trades) else None,
+            'average_trade_return': float(trades['return'].mean()) if len(trades) else None,
+            'profit_factor': float(trades.loc[wins, 'pnl'].sum() / gross_loss) if gross_loss > 0 else None,
+            'fees': float(fills['fee'].sum()),
+            'turnover': float(fills['amount'].sum() / self.budget),
+        }
+
+
+def load_candles(market, minutes, to=None):
+    """
+    UpbitData에서 한 종목의 1분봉을 백테스트 입력 배열로 로드합니다.
+
+    :return: ((len(FIELDS), 분 개수) 배열, 첫 분 시각)
+    """
+    from django_backend.analyzer.services import TechnicalAnalyzer
+
+    block, start = TechnicalAnalyzer.load_market_block([market], minutes, to=to)
+    return block[0], start
@@ -0,0 +1,131 @@
+# django_backend/data_provider/ingestion.py
+import json
+import logging
+import time as t
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+def last_closed_minute(now=None):
+    """
+    now(KST) 기준으로 가장 최근에 마감된 1분봉의 시작 시각 (KST naive datetime).
+    """
+    now = now or datetime.now(KST).replace(tzinfo=None)
+    return now.replace(second=0, microsecond=0) - timedelta(minutes=1)
+
+
+class CandleLagRecorder:
+    """
+    캔들 마감부터 업비트 API에서 조회되기까지의 지연(availability lag)을 종목별로 Redis 리스트에 기록합니다.
+
+    lag_ms는 캔들을 처음 받은 시각 기준이므로 실제 반영 시각의 상한이고, missed_ms(마지막으로 조회에 실패한 시각)는
+    하한입니다. 첫 조회에서 대부분 받는다면 INGESTION_OFFSET_SECONDS를 줄여도 되고,
+    재시도가 잦다면 오프셋을 lag 분포에 맞춰 늘리면 요청 수를 줄일 수 있습니다.
+    """
+
+    KEY_PREFIX = "ingestion:lag"
+
+    def __init__(self, redis_client=None, history=None):
+        self.logger = logger
+        self.redis_client = redis_client or redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.history = history or settings.INGESTION_LAG_HISTORY
+
+    def key(self, market):
+        return f"{self.KEY_PREFIX}:{market}"
+
+    def record(self, market, candle_time, lag_ms, missed_ms, attempts):
+        """
+        :param lag_ms: 캔들 마감 ~ 캔들을 받은 시각 (ms). 받지 못했으면 None
+        :param missed_ms: 캔들 마감 ~ 마지막으로 조회에 실패한 시각 (ms). 첫 조회에 받았으면 None
+        """
+        entry = {
+            "candle_time": candle_time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "lag_ms": lag_ms,
+            "missed_ms": missed_ms,
+            "attempts": attempts,
+        }
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.lpush(self.key(market), json.dumps(entry))
+            pipe.ltrim(self.key(market), 0, self.history - 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            self.logger.warning(f"캔들 지연 기록 실패: {e}")
+        return entry
+
+    def entries(self, market, count=None):
+        """
+        최근 기록 (최신순).
+        """
+        raw = self.redis_client.lrange(self.key(market), 0, (count or self.history) - 1)
+        return [json.loads(value) for value in raw]
+
+    def stats(self, market, count=None):
+        """
+        최근 기록의 지연 백분위수(ms), 첫 조회 성공 비율, 받지 못한 캔들 수를 반환합니다.
+        """
+        entries = self.entries(market, count)
+        received = [entry for entry in entries if entry["lag_ms"] is not None]
+        stats = {
+            "count": len(entries),
+            "missing": len(entries) - len(received),
+            "first_attempt_ratio": (
+                sum(1 for entry in received if entry["attempts"] == 1) / len(received) if received else None
+            ),
+            "mean_attempts": float(np.mean([entry["attempts"] for entry in entries])) if entries else None,
+        }
+        if received:
+            p50, p95, p99 = np.percentile([entry["lag_ms"] for entry in received], [50, 95, 99])
+            stats["lag_ms"] = {"p50": p50, "p95": p95, "p99": p99}
+        return stats
+
+
+def ingest_closed_candle(provider, market, candle_time, recorder=None, retry_interval=None, deadline=None):
+    """
+    마감된 1분봉을 업비트에 반영될 때까지 짧은 간격으로 다시 조회해 저장합니다.
+
+    :param provider: UpbitDataProvider
+    :param candle_time: 캔들 시작 시각 (KST naive datetime)
+    :param retry_interval: 재조회 간격 (초, 기본값: settings.INGESTION_RETRY_INTERVAL)
+    :param deadline: 캔들 마감 후 이 시간(초)까지 받지 못하면 포기 (기본값: settings.INGESTION_DEADLINE_SECONDS).
+                     받지 못한 캔들은 fetch_missing_upbit_data 백필이 채웁니다
+    :return: (저장된 개수, 캔들 데이터 리스트 또는 None, 지연 기록)
+    """
+    retry_interval = settings.INGESTION_RETRY_INTERVAL if retry_interval is None else retry_interval
+    deadline = settings.INGESTION_DEADLINE_SECONDS if deadline is None else deadline
+    closed_at = KST.localize(candle_time + timedelta(minutes=1)).timestamp()
+
+    attempts, missed_ms = 0, None
+    while True:
+        attempts += 1
+        saved_count, data = provider.get_closed_candle(candle_time, market=market)
+        elapsed_ms = (t.time() - closed_at) * 1000
+        if data is not None:
+            lag_ms = elapsed_ms
+            break
+        missed_ms = elapsed_ms
+        if elapsed_ms / 1000 + retry_interval > deadline:
+            logger.warning(f"{market} {candle_time} 캔들을 마감 후 {deadline}초 안에 받지 못했습니다 ({attempts}회 조회).")
+            lag_ms = None
+            break
+        t.sleep(retry_interval)
+
+    entry = {"candle_time": candle_time, "lag_ms": lag_ms, "missed_ms": missed_ms, "attempts": attempts}
+    if recorder is not None:
+        entry = recorder.record(market, **entry)
+    if lag_ms is not None and attempts > 1:
+        logger.info(f"{market} {candle_time} 캔들 수신: 마감 후 {lag_ms:.0f}ms, {attempts}회 조회")
+    return saved_count, data, entry
@@ -0,0 +1,367 @@
+# django_backend/data_provider/orderbook.py
+import logging
+import os
+import struct
+import time as t
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import requests
+from django.conf import settings
+
+from django_backend.config.rate_limiter import PRIORITY_LIVE, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# 파일 헤더: 매직(4) + 버전(2) + 호가 깊이(2) + 예약(8)
+HEADER = struct.Struct('<4sHH8x')
+MAGIC = b'UPOB'
+VERSION = 1
+DAY_MS = 24 * 60 * 60 * 1000
+KST_OFFSET_MS = 9 * 60 * 60 * 1000
+
+
+def orderbook_dtype(depth):
+    """
+    호가 스냅샷 하나의 고정 길이 레코드 형식.
+    가격은 float64, 잔량은 float32로 저장해 깊이 15 기준 스냅샷당 368바이트를 사용합니다.
+    호가가 depth보다 얕으면 남는 단계의 가격은 NaN, 잔량은 0입니다.
+    """
+    return np.dtype([
+        ('timestamp', '<i8'),  # 업비트 호가 생성 시각 (UTC epoch ms)
+        ('ask_price', '<f8', (depth,)),
+        ('ask_size', '<f4', (depth,)),
+        ('bid_price', '<f8', (depth,)),
+        ('bid_size', '<f4', (depth,)),
+    ])
+
+
+def kst_day(timestamp_ms):
+    """
+    epoch ms 배열을 KST 날짜 번호(1970-01-01부터의 일 수)로 변환합니다.
+    """
+    return (np.asarray(timestamp_ms, dtype=np.int64) + KST_OFFSET_MS) // DAY_MS
+
+
+def to_records(snapshots, depth):
+    """
+    업비트 호가 응답(dict) 리스트를 레코드 배열로 변환합니다.
+    """
+    records = np.zeros(len(snapshots), dtype=orderbook_dtype(depth))
+    records['ask_price'] = np.nan
+    records['bid_price'] = np.nan
+    for record, snapshot in zip(records, snapshots):
+        units = snapshot['orderbook_units'][:depth]
+        record['timestamp'] = snapshot['timestamp']
+        n = len(units)
+        record['ask_price'][:n] = [unit['ask_price'] for unit in units]
+        record['ask_size'][:n] = [unit['ask_size'] for unit in units]
+        record['bid_price'][:n] = [unit['bid_price'] for unit in units]
+        record['bid_size'][:n] = [unit['bid_size'] for unit in units]
+    return records
+
+
+def to_orderbook_units(record):
+    """
+    레코드 하나를 업비트 orderbook_units 형식으로 되돌립니다 (SimulatedTrader.on_orderbook 입력).
+    """
+    return [
+        {'ask_price': ask_price, 'ask_size': ask_size, 'bid_price': bid_price, 'bid_size': bid_size}
+        for ask_price, ask_size, bid_price, bid_size in zip(
+            record['ask_price'].tolist(), record['ask_size'].tolist(),
+            record['bid_price'].tolist(), record['bid_size'].tolist(),
+        )
+        if ask_price == ask_price or bid_price == bid_price  # 둘 다 NaN인 빈 단계 제외
+    ]
+
+
+class OrderbookWriter:
+    """
+    호가 레코드를 종목/일(KST) 단위 파일에 추가 기록합니다.
+
+    파일 경로: {base_dir}/{market}/{YYYY-MM-DD}.obk
+    파일은 HEADER 뒤에 고정 길이 레코드가 시간순으로 이어진 형태이므로 np.memmap으로 바로 읽을 수 있습니다.
+    """
+
+    def __init__(self, base_dir=None, depth=None):
+        self.base_dir = str(base_dir or settings.ORDERBOOK_DATA_DIR)
+        self.depth = depth or settings.ORDERBOOK_DEPTH
+        self.dtype = orderbook_dtype(self.depth)
+
+    def path(self, market, day):
+        return os.path.join(self.base_dir, market, f"{day.isoformat()}.obk")
+
+    def append(self, market, records):
+        """
+        같은 종목의 레코드 배열을 날짜별 파일에 나누어 추가합니다.
+
+        :return: 기록한 레코드 수
+        """
+        if len(records) == 0:
+            return 0
+        days = kst_day(records['timestamp'])
+        for day_number in np.unique(days):
+            path = self.path(market, date(1970, 1, 1) + timedelta(days=int(day_number)))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, 'ab') as f:
+                if new_file:
+                    f.write(HEADER.pack(MAGIC, VERSION, self.depth))
+                f.write(records[days == day_number].tobytes())
+        return len(records)
+
+
+class OrderbookReader:
+    """
+    OrderbookWriter가 기록한 파일을 메모리 맵으로 읽는 리더.
+    날짜별 파일은 timestamp 오름차순이므로 구간 조회는 이진 탐색으로 잘라낸 뷰를 반환합니다.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = str(base_dir or settings.ORDERBOOK_DATA_DIR)
+
+    def days(self, market):
+        directory = os.path.join(self.base_dir, market)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(date.fromisoformat(name[:-4]) for name in os.listdir(directory) if name.endswith('.obk'))
+
+    def open_day(self, market, day):
+        """
+        하루치 레코드를 읽기 전용 memmap으로 엽니다. 파일이 없으면 빈 배열을 반환합니다.
+        """
+        path = os.path.join(self.base_dir, market, f"{day.isoformat()}.obk")
+        if not os.path.exists(path):
+            return np.empty(0, dtype=orderbook_dtype(settings.ORDERBOOK_DEPTH))
+        with open(path, 'rb') as f:
+            magic, version, depth = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Invalid orderbook file: {path}")
+        dtype = orderbook_dtype(depth)
+        # 기록 중 중단되어 잘린 마지막 레코드는 제외
+        count = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', offset=HEADER.size, shape=(count,))
+
+    def iter_range(self, market, start_ms, end_ms):
+        """
+        [start_ms, end_ms) 구간 레코드를 날짜별 memmap 뷰로 순서대로 반환합니다 (전체를 메모리에 올리지 않음).
+        """
+        first, last = int(kst_day(start_ms)), int(kst_day(end_ms - 1))
+        for day in self.days(market):
+            day_number = (day - date(1970, 1, 1)).days
+            if day_number < first or day_number > last:
+                continue
+            records = self.open_day(market, day)
+            timestamps = records['timestamp']
+            lo, hi = np.searchsorted(timestamps, [start_ms, end_ms])
+            if hi > lo:
+                yield records[lo:hi]
+
+    def read(self, market, start_ms, end_ms):
+        """
+        [start_ms, end_ms) 구간 레코드를 하나의 배열로 반환합니다.
+        """
+        chunks = list(self.iter_range(market, start_ms, end_ms))
+        if not chunks:
+            return np.empty(0, dtype=orderbook_dtype(settings.ORDERBOOK_DEPTH))
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+    def snapshot_at(self, market, timestamp_ms, lookback_days=1):
+        """
+        timestamp_ms 시점(이하)의 가장 최근 스냅샷. 없으면 None.
+        """
+        start = timestamp_ms - (lookback_days + 1) * DAY_MS
+        latest = None
+        for records in self.iter_range(market, start, timestamp_ms + 1):
+            latest = records[-1]
+        return latest
+
+
+def estimate_fill_prices(records, side, volume=None, amount=None):
+    """
+    호가 스냅샷들에 대해 시장가 주문의 체결 결과를 벡터 연산으로 추정합니다.
+
+    :param records: 레코드 배열 (스냅샷 수 R)
+    :param side: 'bid'(매수, 매도 호가 소진) 또는 'ask'(매도, 매수 호가 소진)
+    :param volume: 주문 수량 (시장가 매도 / 수량 기준 매수)
+    :param amount: 주문 총액 KRW (시장가 매수, ord_type='price')
+    :return: {'avg_price', 'filled_volume', 'filled_amount', 'unfilled', 'slippage'} - 각 길이 R 배열.
+             slippage는 최우선 호가 대비 불리한 방향의 비율이며, unfilled는 호가 부족으로 남은 수량(또는 총액)입니다.
+    """
+    if (volume is None) == (amount is None):
+        raise ValueError("Specify exactly one of volume or amount")
+    prefix = 'ask' if side == 'bid' else 'bid'
+    prices = np.nan_to_num(np.asarray(records[f'{prefix}_price'], dtype=np.float64))
+    sizes = np.asarray(records[f'{prefix}_size'], dtype=np.float64)
+    values = prices * sizes
+
+    if volume is not None:
+        before = np.cumsum(sizes, axis=1) - sizes
+        filled_sizes = np.clip(volume - before, 0, sizes)
+        filled_values = filled_sizes * prices
+        unfilled = volume - filled_sizes.sum(axis=1)
+    else:
+        before = np.cumsum(values, axis=1) - values
+        filled_values = np.clip(amount - before, 0, values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            filled_sizes = np.where(prices > 0, filled_values / prices, 0.0)
+        unfilled = amount - filled_values.sum(axis=1)
+
+    filled_volume = filled_sizes.sum(axis=1)
+    filled_amount = filled_values.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_price = filled_amount / filled_volume
+        best = records[f'{prefix}_price'][:, 0]
+        slippage = (avg_price / best - 1) if side == 'bid' else (1 - avg_price / best)
+    return {
+        'avg_price': avg_price,
+        'filled_volume': filled_volume,
+        'filled_amount': filled_amount,
+        'unfilled': np.clip(unfilled, 0, None),
+        'slippage': slippage,
+    }
+
+
+class UpbitOrderbookSource:
+    """
+    업비트 REST 호가 조회 (여러 종목을 한 번의 요청으로 조회).
+    """
+
+    URL = "https://api.upbit.com/v1/orderbook"
+
+    def __init__(self, timeout=3):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.rate_limiter = get_rate_limiter()
+
+    def fetch(self, markets):
+        self.rate_limiter.acquire("orderbook", PRIORITY_LIVE)
+        response = self.session.get(self.URL, params={"markets": ",".join(markets)}, timeout=self.timeout)
+        self.rate_limiter.observe(response, "orderbook")
+        response.raise_for_status()
+        return response.json()
+
+
+class SyntheticOrderbookSource:
+    """
+    업비트 호가 응답 형식의 합성 호가를 만드는 로컬 대체 소스 (테스트/오프라인 개발용).
+    중간 가격은 랜덤 워크를 따르고, 잔량은 단계가 멀어질수록 커지는 지수분포입니다.
+    """
+
+    def __init__(self, seed=0, start_price=50_000_000.0, tick=1000.0, depth=15, interval_ms=1000, start_ms=None):
+        self.rng = np.random.default_rng(seed)
+        self.tick = tick
+        self.depth = depth
+        self.interval_ms = interval_ms
+        self.timestamp = int(t.time() * 1000) if start_ms is None else start_ms
+        self.mid = defaultdict(lambda: start_price)
+
+    def fetch(self, markets):
+        snapshots = []
+        levels = np.arange(self.depth)
+        for market in markets:
+            self.mid[market] = max(self.mid[market] + self.tick * self.rng.integers(-2, 3), self.tick * 2)
+            best_ask = self.mid[market] + self.tick
+            best_bid = self.mid[market] - self.tick
+            ask_sizes = self.rng.exponential(0.05 * (1 + levels))
+            bid_sizes = self.rng.exponential(0.05 * (1 + levels))
+            units = [
+                {
+                    "ask_price": best_ask + i * self.tick,
+                    "bid_price": best_bid - i * self.tick,
+                    "ask_size": float(ask_sizes[i]),
+                    "bid_size": float(bid_sizes[i]),
+                }
+                for i in levels
+            ]
+            snapshots.append({
+                "market": market,
+                "timestamp": self.timestamp,
+                "total_ask_size": float(ask_sizes.sum()),
+                "total_bid_size": float(bid_sizes.sum()),
+                "orderbook_units": units,
+            })
+        self.timestamp += self.interval_ms
+        return snapshots
+
+
+class OrderbookCollector:
+    """
+    호가 스냅샷을 주기적으로 조회해 OrderbookWriter로 저장하는 수집기.
+    조회 결과는 flush_size개씩 모아 종목별로 한 번에 기록합니다.
+    """
+
+    def __init__(self, markets=None, source=None, writer=None, flush_size=60):
+        self.markets = markets or settings.ORDERBOOK_MARKETS
+        self.source = source or UpbitOrderbookSource()
+        self.writer = writer or OrderbookWriter()
+        self.flush_size = flush_size
+        self.logger = logger
+        self._buffer = defaultdict(list)
+        self._last_timestamp = {}
+
+    def collect_once(self):
+        """
+        모든 종목의 호가를 한 번 조회해 버퍼에 넣습니다. 이전과 같은 시각의 스냅샷(호가 변동 없음)은 건너뜁니다.
+
+        :return: 버퍼에 추가된 스냅샷 수
+        """
+        added = 0
+        for snapshot in self.source.fetch(self.markets):
+            market = snapshot['market']
+            if self._last_timestamp.get(market, -1) >= snapshot['timestamp']:
+                continue
+            self._last_timestamp[market] = snapshot['timestamp']
+            self._buffer[market].append(snapshot)
+            added += 1
+            if len(self._buffer[market]) >= self.flush_size:
+                self._flush_market(market)
+        return added
+
+    def _flush_market(self, market):
+        snapshots, self._buffer[market] = self._buffer[market], []
+        return self.writer.append(market, to_records(snapshots, self.writer.depth))
+
+    def flush(self):
+        """
+        버퍼에 남은 스냅샷을 모두 기록합니다.
+        """
+        return sum(self._flush_market(market) for market in list(self._buffer))
+
+    def run(self, duration, interval=None):
+        """
+        duration초 동안 interval초 간격으로 수집합니다. 조회 오류는 기록하고 다음 주기에 다시 시도합니다.
+
+        :return: 수집한 스냅샷 수
+        """
+        interval = settings.ORDERBOOK_POLL_INTERVAL if interval is None else interval
+        deadline = t.monotonic() + duration
+        collected = 0
+        try:
+            while t.monotonic() < deadline:
+                started = t.monotonic()
+                try:
+                    collected += self.collect_once()
+                except requests.exceptions.RequestException as e:
+                    self.logger.error(f"호가 조회 실패: {e}")
+                t.sleep(max(0.0, interval - (t.monotonic() - started)))
+        finally:
+            self.flush()
+        return collected
+
+
+def kst_datetime_to_ms(value):
+    """
+    naive KST datetime(DB 시각 기준)을 UTC epoch ms로 변환합니다.
+    """
+    return int((value - datetime(1970, 1, 1)).total_seconds() * 1000) - KST_OFFSET_MS
+
+
+def ms_to_kst_datetime(timestamp_ms):
+    """
+    UTC epoch ms를 naive KST datetime으로 변환합니다.
+    """
+    return datetime(1970, 1, 1) + timedelta(milliseconds=int(timestamp_ms) + KST_OFFSET_MS)
@@ -10,7 +10,8 @@ from django.conf import settings
 import json
 import os
 import redis
-from django_backend.config.utils import generate_redis_key
+from django_backend.config.utils import generate_redis_key, generate_last_candle_key
+from django_backend.config.rate_limiter import PRIORITY_LIVE, get_rate_limiter
 
 
 class UpbitDataProvider:
@@ -28,12 +29,17 @@ class UpbitDataProvider:
         "DOGE": "KRW-DOGE",
     }
 
-    def __init__(self, currency="BTC"):
+    def __init__(self, currency="BTC", priority=PRIORITY_LIVE):
+        """
+        :param priority: 요청 제한기 우선순위 (실시간 수집은 PRIORITY_LIVE, 누락 데이터 백필은 PRIORITY_BACKFILL)
+        """
         if currency not in self.AVAILABLE_CURRENCY:
             raise ValueError(f"Unsupported currency: {currency}")
         self.query_string = {"market": self.AVAILABLE_CURRENCY[currency], "count": 1}
         self.kst = pytz.timezone('Asia/Seoul')
         self.logger = logging.getLogger(__name__)
+        self.priority = priority
+        self.rate_limiter = get_rate_limiter()
 
         self.redis_client = redis.StrictRedis(
             host=settings.REDIS_HOST,
@@ -52,14 +58,39 @@ class UpbitDataProvider:
         NOTE: 현재는 market 인자를 직접 받아옵니다.
         TODO: 다양한 데이터 제공자를 지원할 수 있도록 파라미터 구조를 확장해야 합니다.
         """
-        # to_time이 None이면 현재 시간을 기본값으로 설정
+        # to_time이 None이면 직전 분(이미 마감된 캔들)을 기본값으로 설정
         if to_time is None:
-            to_time = datetime.now(self.kst).replace(second=10).strftime('%Y-%m-%dT%H:%M:%S%z')    
+            to_time = (datetime.now(self.kst) - timedelta(minutes=1)).replace(second=10).strftime('%Y-%m-%dT%H:%M:%S%z')    
             to_time = to_time[:-2] + ':' + to_time[-2:]  # NOTE: 문자열 포맷이 필요해서 수정하는 부분입니다. 최적화 가능성 검토 필요.
 
         data = self.__get_data_from_upbit(market, to_time, count)
         saved_count = self.__save_data_to_db(data, to_time, count)
+        self._update_last_candle(data)
+
+        return saved_count, data
+
+    def get_closed_candle(self, candle_time, market="KRW-BTC"):
+        """
+        candle_time 1분봉이 업비트에 반영되었으면 DB에 저장하고 반환합니다.
+        get_info와 달리 캔들이 아직 없으면 빈 값(None)으로 저장하지 않으므로, 반영될 때까지 다시 호출할 수 있습니다.
+        이미 저장된 캔들은 다시 저장하지 않으므로, 저장 후 Redis 단계에서 실패한 작업을 재시도해도 안전합니다.
 
+        :param candle_time: 캔들 시작 시각 (KST naive datetime, 분 단위)
+        :return: (저장된 개수, 캔들 데이터 리스트). 아직 반영되지 않았으면 (0, None)
+        """
+        candle_time = candle_time.replace(second=0, microsecond=0)
+        to_time = (candle_time + timedelta(minutes=1)).strftime('%Y-%m-%dT%H:%M:%S+09:00')
+        try:
+            data = self.__get_data_from_upbit(market, to_time, 1)
+        except ValueError:
+            return 0, None
+        if data[0]["candle_date_time_kst"] != candle_time.strftime("%Y-%m-%dT%H:%M:%S"):
+            return 0, None
+        if UpbitData.objects.filter(market=market, date_time=candle_time).exists():
+            saved_count = 0
+        else:
+            saved_count = self.__save_data_to_db(data, candle_time.strftime('%Y-%m-%dT%H:%M:%S+09:00'), 1)
+        self._update_last_candle(data)
         return saved_count, data
 
     def __get_data_from_upbit(self, market="KRW-BTC", to_time=None, count=1):
@@ -74,7 +105,9 @@ class UpbitDataProvider:
         self.query_string["count"] = count
         self.query_string["to"] = to_time
 
+        self.rate_limiter.acquire("candle", self.priority)
         response = requests.get(self.URL, params=self.query_string)
+        self.rate_limiter.observe(response, "candle")
         response.raise_for_status()
         data = response.json()
 
@@ -136,6 +169,63 @@ class UpbitDataProvider:
         created_objects = UpbitData.objects.bulk_create([UpbitData(**data) for data in new_data])
         return len(created_objects)
 
+    # 기존 값보다 새로운 경우에만 갱신 (과거 누락 데이터 수집 시 되돌아가지 않도록)
+    UPDATE_LAST_CANDLE_SCRIPT = """
+    local current = redis.call('GET', KEYS[1])
+    if not current or tonumber(ARGV[1]) > tonumber(current) then
+        redis.call('SET', KEYS[1], ARGV[1])
+        return 1
+    end
+    return 0
+    """
+
+    def _update_last_candle(self, data):
+        """
+        수집된 캔들 중 가장 최근 시각을 Redis에 기록하는 함수
+        
+        NOTE: analyzer의 지표 캐시는 이 값이 바뀌면 해당 종목의 캐시를 무효화합니다.
+        """
+        if not data:
+            return
+        latest = max(candle["candle_date_time_kst"] for candle in data)
+        score = int(self.kst.localize(datetime.strptime(latest, "%Y-%m-%dT%H:%M:%S")).timestamp())
+        redis_key = generate_last_candle_key('upbit', self.query_string['market'])
+        try:
+            self.redis_client.eval(self.UPDATE_LAST_CANDLE_SCRIPT, 1, redis_key, score)
+        except redis.RedisError as e:
+            self.logger.warning(f"마지막 캔들 시각을 Redis에 기록하지 못했습니다: {e}")
+
+    def _publish_candle_closed(self, data):
+        """
+        마감된 캔들에 대해 '캔들 마감' 이벤트를 Redis Stream에 발행하는 함수
+        
+        NOTE: 전략 런타임(strategy.services.StrategyRuntime)이 이 스트림을 구독합니다.
+        아직 진행 중인 캔들(마감 시각이 현재 이후)은 발행하지 않습니다.
+        """
+        now = datetime.now(self.kst)
+        published = 0
+        for candle in sorted(data, key=lambda candle: candle["candle_date_time_kst"]):
+            candle_time = self.kst.localize(datetime.strptime(candle["candle_date_time_kst"], "%Y-%m-%dT%H:%M:%S"))
+            closed_at = candle_time + timedelta(minutes=1)
+            if closed_at > now:
+                continue
+            event = {
+                "market": self.query_string["market"],
+                "timeframe": 1,
+                "candle_time": candle["candle_date_time_kst"],
+                "closed_at_ms": int(closed_at.timestamp() * 1000),
+                "published_at_ms": int(t.time() * 1000),
+            }
+            try:
+                self.redis_client.xadd(
+                    settings.CANDLE_CLOSED_STREAM, event,
+                    maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True
+                )
+                published += 1
+            except redis.RedisError as e:
+                self.logger.error(f"캔들 마감 이벤트 발행 실패: {e}")
+        return published
+
     def _get_column_data_from_db(self, column_name=None):
         """
         데이터베이스에서 컬럼 데이터를 가져오는 함수
@@ -1,11 +1,15 @@
 # django_backend/data_provider/tasks.py
 from celery import shared_task
 from django_backend.data_provider.services import UpbitDataProvider 
+from django_backend.config.rate_limiter import PRIORITY_BACKFILL
+from django_backend.data_provider.ingestion import CandleLagRecorder, ingest_closed_candle, last_closed_minute
+from django_backend.data_provider.orderbook import OrderbookCollector
+from django_backend.data_provider.ticks import TickCollector
 import logging
 import redis
 from django.conf import settings
 import requests
-import time as t
+from datetime import datetime
 from django.db import IntegrityError
 
 logger = logging.getLogger(__name__)
@@ -28,24 +32,42 @@ def set_lock_expiry():
     redis_client.expire(LOCK_KEY, LOCK_EXPIRE)
 
 @shared_task(bind=True, max_retries=3)
-def fetch_upbit_data(self):
+def fetch_upbit_data(self, candle_time=None):
+    """
+    직전 분에 마감된 1분봉을 수집하는 Celery 작업 (분 경계 + INGESTION_OFFSET_SECONDS마다 실행).
+    캔들이 아직 조회되지 않으면 같은 분 안에서 짧은 간격으로 다시 조회하고, 마감 후 조회까지의 지연을 기록합니다.
+
+    :param candle_time: 수집할 캔들 시작 시각 (KST, '%Y-%m-%dT%H:%M:%S'). 기본값은 실행 시점 직전 분
+    """
     if not redis_client.exists(LOCK_KEY):  # 락이 걸려있지 않은 경우에만 실행
         provider = UpbitDataProvider(currency="BTC")
+        if candle_time is None:
+            candle_time = last_closed_minute()
+        elif isinstance(candle_time, str):
+            candle_time = datetime.strptime(candle_time, "%Y-%m-%dT%H:%M:%S")
         try:
-            # upbit에서 데이터 가져오기 및 db저장
-            saved_count, data = provider.get_info()
+            # upbit에서 데이터 가져오기 및 db저장 (재시도해도 같은 캔들을 수집하도록 캔들 시각을 고정)
+            saved_count, data, lag = ingest_closed_candle(
+                provider, provider.AVAILABLE_CURRENCY["BTC"], candle_time, recorder=CandleLagRecorder()
+            )
+            if data is None:
+                return lag
 
             # Redis에 데이터 저장
             provider._save_to_redis(data)
 
+            # 전략 런타임에 캔들 마감 알림
+            provider._publish_candle_closed(data)
+
             logger.info(f"Data가 db와 Redis에 저장되었습니다.")
 
         except requests.exceptions.RequestException as e:
             logger.error(f"네트워크 오류로 인해 Celery 태스크에서 데이터를 가져오지 못했습니다: {e}\n")
-            raise self.retry(exc=e, countdown=10)  # 10초 후 재시도
+            raise self.retry(exc=e, countdown=1, kwargs={"candle_time": candle_time.strftime("%Y-%m-%dT%H:%M:%S")})
         except Exception as e:
             logger.error(f"예상치 못한 오류로 인해 Celery 태스크에서 데이터를 가져오지 못했습니다: {e}\n")
-            raise self.retry(exc=e, countdown=10)  # 10초 후 재시도
+            raise self.retry(exc=e, countdown=1, kwargs={"candle_time": candle_time.strftime("%Y-%m-%dT%H:%M:%S")})
+        return lag
     else:
         logger.info("fetch_upbit_data 태스크가 fetch_missing_upbit_data가 완료되기를 기다리고 있습니다.\n")
 
@@ -55,7 +77,8 @@ def fetch_missing_upbit_data(self):
         try:
             set_lock_expiry()
             logger.info("fetch_missing_upbit_data 태스크를 시작합니다...\n")
-            provider = UpbitDataProvider(currency="BTC")
+            # 백필은 공유 요청 제한기의 가장 낮은 우선순위로 실행 (실시간 수집과 주문의 요청 여유를 남김)
+            provider = UpbitDataProvider(currency="BTC", priority=PRIORITY_BACKFILL)
             missing_time_groups = provider._get_missing_time_intervals()
             print(f"count missing_time_groups: {len(missing_time_groups)}")
 
@@ -73,7 +96,6 @@ def fetch_missing_upbit_data(self):
                 except Exception as e:
                     logger.error(f"예상치 못한 오류로 인해 데이터를 가져오지 못했습니다: {e}")
                     raise self.retry(exc=e, countdown=10)  # 10초 후 재시도
-                t.sleep(1)
 
             try:
                 provider._sync_data_to_redis()
@@ -90,3 +112,23 @@ def fetch_missing_upbit_data(self):
             release_lock()
     else:
         logger.info("fetch_missing_upbit_data 태스크가 이미 실행 중입니다.\n")
+
+
+@shared_task
+def collect_orderbook_snapshots(duration=55):
+    """
+    duration초 동안 호가 스냅샷을 수집해 종목/일 단위 파일에 저장하는 작업 (1분마다 실행).
+    """
+    collected = OrderbookCollector().run(duration)
+    logger.info(f"호가 스냅샷 {collected}개를 저장했습니다.")
+    return collected
+
+
+@shared_task
+def collect_trade_ticks(duration=55):
+    """
+    duration초 동안 신규 체결을 수집해 종목/일 단위 압축 파일에 저장하는 작업 (1분마다 실행).
+    """
+    collected = TickCollector().run(duration)
+    logger.info(f"체결 {collected}건을 저장했습니다.")
+    return collected
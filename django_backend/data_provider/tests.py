@@ -4,10 +4,24 @@ from django_backend.data_provider.services import UpbitDataProvider
 from unittest.mock import patch, MagicMock
 from django_backend.data_provider.models import UpbitData
 import pytz
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import time as t
 import json
 import redis
+import os
+import shutil
+import tempfile
+import numpy as np
+from django_backend.config.schedules import minute_offset
+from django_backend.data_provider.ingestion import CandleLagRecorder, ingest_closed_candle, last_closed_minute
+from django_backend.data_provider.tasks import fetch_upbit_data
+from django_backend.data_provider.orderbook import (
+    OrderbookCollector, OrderbookReader, OrderbookWriter, SyntheticOrderbookSource,
+    estimate_fill_prices, kst_datetime_to_ms, to_orderbook_units,
+)
+from django_backend.data_provider.ticks import (
+    SyntheticTickSource, TickCollector, TickReader, TickWriter, encode_block, to_ticks,
+)
 
 class UpbitDataProviderTest(TestCase):
     
@@ -146,3 +160,327 @@ class UpbitDataProviderRedisTest(TestCase):
 
             # Redis의 Sorted Set에 데이터 추가
         self.redis_client.zadd(key, {value: score})
+
+
+class OrderbookStorageTestCase(TestCase):
+    """
+    호가 스냅샷 파일 저장/조회 테스트 (합성 호가 사용, 외부 API 호출 없음).
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        # 2024-10-19 23:59:00 KST부터 1초 간격
+        self.start_ms = kst_datetime_to_ms(datetime(2024, 10, 19, 23, 59))
+        self.source = SyntheticOrderbookSource(seed=1, depth=15, start_ms=self.start_ms)
+        self.writer = OrderbookWriter(self.tmpdir, depth=15)
+        self.reader = OrderbookReader(self.tmpdir)
+
+    def collect(self, count, markets=("KRW-BTC",)):
+        collector = OrderbookCollector(list(markets), self.source, self.writer, flush_size=50)
+        for _ in range(count):
+            collector.collect_once()
+        collector.flush()
+        return collector
+
+    def test_round_trip_and_day_partition(self):
+        snapshots = SyntheticOrderbookSource(seed=1, depth=15, start_ms=self.start_ms).fetch(["KRW-BTC"])
+        self.collect(120)
+
+        self.assertEqual(self.reader.days("KRW-BTC"), [date(2024, 10, 19), date(2024, 10, 20)])
+        first_day = self.reader.open_day("KRW-BTC", date(2024, 10, 19))
+        self.assertEqual(len(first_day), 60)
+        self.assertEqual(first_day.dtype.itemsize, 368)
+
+        records = self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 120_000)
+        self.assertEqual(len(records), 120)
+        self.assertTrue(np.all(np.diff(records['timestamp']) == 1000))
+        units = to_orderbook_units(records[0])
+        self.assertEqual(len(units), 15)
+        self.assertEqual(units[0]['ask_price'], snapshots[0]['orderbook_units'][0]['ask_price'])
+        self.assertAlmostEqual(units[3]['bid_size'], snapshots[0]['orderbook_units'][3]['bid_size'], places=6)
+
+    def test_range_read_and_snapshot_at(self):
+        self.collect(120)
+
+        records = self.reader.read("KRW-BTC", self.start_ms + 30_500, self.start_ms + 90_000)
+        self.assertEqual(records['timestamp'][0], self.start_ms + 31_000)
+        self.assertEqual(records['timestamp'][-1], self.start_ms + 89_000)
+        self.assertEqual(sum(len(chunk) for chunk in self.reader.iter_range("KRW-BTC", self.start_ms, self.start_ms + 120_000)), 120)
+
+        snapshot = self.reader.snapshot_at("KRW-BTC", self.start_ms + 61_500)
+        self.assertEqual(snapshot['timestamp'], self.start_ms + 61_000)
+        self.assertIsNone(self.reader.snapshot_at("KRW-BTC", self.start_ms - 1))
+
+    def test_estimate_fill_prices(self):
+        self.collect(10)
+        records = self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 10_000)
+        volume = 0.3
+
+        result = estimate_fill_prices(records, 'bid', volume=volume)
+        for i, record in enumerate(records):
+            remaining, cost = volume, 0.0
+            for price, size in zip(record['ask_price'], record['ask_size'].astype(np.float64)):
+                quantity = min(remaining, size)
+                cost += quantity * price
+                remaining -= quantity
+            self.assertAlmostEqual(result['avg_price'][i], cost / (volume - remaining), places=4)
+            self.assertGreaterEqual(result['slippage'][i], 0)
+
+        amount = 1_000_000
+        result = estimate_fill_prices(records, 'bid', amount=amount)
+        np.testing.assert_allclose(result['filled_amount'] + result['unfilled'], amount)
+
+    def test_truncated_file_ignores_partial_record(self):
+        self.collect(5)
+        path = self.writer.path("KRW-BTC", date(2024, 10, 19))
+        with open(path, 'ab') as f:
+            f.write(b'\x00' * 100)
+
+        self.assertEqual(len(self.reader.open_day("KRW-BTC", date(2024, 10, 19))), 5)
+
+    def test_collector_skips_duplicate_timestamps(self):
+        collector = OrderbookCollector(["KRW-BTC", "KRW-ETH"], self.source, self.writer, flush_size=50)
+        self.assertEqual(collector.collect_once(), 2)
+        self.source.timestamp -= self.source.interval_ms  # 호가 변동 없이 같은 시각 응답
+        self.assertEqual(collector.collect_once(), 0)
+        self.assertEqual(collector.flush(), 2)
+        self.assertEqual(len(self.reader.read("KRW-ETH", self.start_ms, self.start_ms + 1000)), 1)
+
+
+class TickStorageTestCase(TestCase):
+    """
+    압축 체결 파일 저장/조회 테스트 (합성 체결 사용, 외부 API 호출 없음).
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        # 2024-10-19 23:59:00 KST부터 조회 1회당 1초, 500건
+        self.start_ms = kst_datetime_to_ms(datetime(2024, 10, 19, 23, 59))
+        self.writer = TickWriter(self.tmpdir, block_size=256, decimals=4)
+        self.reader = TickReader(self.tmpdir)
+
+    def make_ticks(self, seconds, rate=500):
+        source = SyntheticTickSource(seed=2, rate=rate, start_ms=self.start_ms)
+        return np.concatenate([to_ticks(source.fetch("KRW-BTC")) for _ in range(seconds)])
+
+    def test_round_trip_and_day_partition(self):
+        ticks = self.make_ticks(120)
+        self.writer.append("KRW-BTC", ticks)
+
+        self.assertEqual(self.reader.days("KRW-BTC"), [date(2024, 10, 19), date(2024, 10, 20)])
+        self.assertTrue(np.array_equal(self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 120_000), ticks))
+        size = sum(os.path.getsize(self.writer.path("KRW-BTC", day)) for day in self.reader.days("KRW-BTC"))
+        self.assertLess(size, ticks.nbytes / 2)
+
+    def test_unscalable_prices_are_stored_raw(self):
+        ticks = self.make_ticks(2)
+        ticks['price'] += 1 / 3
+        self.writer.append("KRW-BTC", ticks)
+
+        self.assertTrue(np.array_equal(self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 2000), ticks))
+
+    def test_range_read_streams_blocks(self):
+        ticks = self.make_ticks(30)
+        self.writer.append("KRW-BTC", ticks)
+        start, end = self.start_ms + 10_250, self.start_ms + 20_000
+
+        chunks = list(self.reader.iter_range("KRW-BTC", start, end))
+        self.assertTrue(all(len(chunk) <= 256 for chunk in chunks))
+        expected = ticks[(ticks['timestamp'] >= start) & (ticks['timestamp'] < end)]
+        self.assertTrue(np.array_equal(np.concatenate(chunks), expected))
+
+    def test_truncated_file_ignores_partial_block(self):
+        ticks = self.make_ticks(2)
+        self.writer.append("KRW-BTC", ticks)
+        path = self.writer.path("KRW-BTC", date(2024, 10, 19))
+        with open(path, 'ab') as f:
+            f.write(encode_block(ticks[:100], 4)[:-10])
+
+        self.assertEqual(len(self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 60_000)), len(ticks))
+
+    def test_aggregate_ticks_to_seconds(self):
+        ticks = self.make_ticks(5)
+        self.writer.append("KRW-BTC", ticks)
+
+        bars = self.reader.aggregate("KRW-BTC", self.start_ms, self.start_ms + 5000, interval_ms=1000)
+        self.assertEqual(len(bars), 5)
+        second = ticks[(ticks['timestamp'] >= self.start_ms + 1000) & (ticks['timestamp'] < self.start_ms + 2000)]
+        bar = bars.iloc[1]
+        self.assertEqual(bar['timestamp'], self.start_ms + 1000)
+        self.assertEqual(bar['open'], second['price'][0])
+        self.assertEqual(bar['close'], second['price'][-1])
+        self.assertEqual(bar['high'], second['price'].max())
+        self.assertEqual(bar['trades'], len(second))
+        self.assertAlmostEqual(bar['buy_volume'], second['volume'][second['side'] > 0].sum())
+
+    def test_collector_skips_seen_ticks(self):
+        source = SyntheticTickSource(seed=2, rate=100, start_ms=self.start_ms)
+        collector = TickCollector(["KRW-BTC"], source, self.writer, flush_interval=60)
+        self.assertEqual(collector.collect_once(), 100)
+
+        trades = source.fetch("KRW-BTC")
+        source.fetch = lambda market, after_id=None: trades + trades  # 이전 조회와 겹치는 응답
+        self.assertEqual(collector.collect_once(), 100)
+        self.assertEqual(collector.collect_once(), 0)
+        self.assertEqual(collector.flush(), 200)
+        stored = self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 60_000)
+        self.assertTrue(np.all(np.diff(stored['sequential_id']) > 0))
+
+    def test_new_collector_resumes_after_stored_ticks(self):
+        source = SyntheticTickSource(seed=2, rate=100, start_ms=self.start_ms)
+        first_page, second_page = source.fetch("KRW-BTC"), source.fetch("KRW-BTC")
+        # 다음 실행의 첫 조회(after_id 없음)는 이전 실행이 저장한 체결과 겹침
+        pages = iter([first_page, second_page + first_page])
+        source.fetch = lambda market, after_id=None: next(pages)
+
+        first_run = TickCollector(["KRW-BTC"], source, self.writer, flush_interval=60)
+        first_run.collect_once()
+        first_run.flush()
+        self.assertEqual(self.reader.last_sequential_id("KRW-BTC"), first_page[0]['sequential_id'])
+
+        second_run = TickCollector(["KRW-BTC"], source, self.writer, flush_interval=60)
+        self.assertEqual(second_run.collect_once(), 100)
+        second_run.flush()
+
+        stored = self.reader.read("KRW-BTC", self.start_ms, self.start_ms + 60_000)
+        self.assertEqual(len(stored), 200)
+        self.assertTrue(np.all(np.diff(stored['sequential_id']) > 0))
+
+        # 잘린 마지막 블록은 무시
+        partial = to_ticks(second_page)
+        partial['sequential_id'] += 1000
+        with open(self.writer.path("KRW-BTC", date(2024, 10, 19)), 'ab') as f:
+            f.write(encode_block(partial, 4)[:-10])
+        self.assertEqual(self.reader.last_sequential_id("KRW-BTC"), second_page[0]['sequential_id'])
+        self.assertIsNone(self.reader.last_sequential_id("KRW-ETH"))
+
+
+class FakeListRedis:
+    """
+    CandleLagRecorder가 사용하는 Redis 리스트 명령만 흉내 내는 클라이언트.
+    """
+
+    def __init__(self):
+        self.lists = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1]
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+
+class MinuteIngestionTestCase(TestCase):
+    """
+    분 경계 정렬 수집 스케줄과 캔들 재조회/지연 기록 테스트.
+    """
+
+    KST = pytz.timezone('Asia/Seoul')
+
+    def candle(self, candle_time):
+        return {"candle_date_time_kst": candle_time.strftime("%Y-%m-%dT%H:%M:%S"), "trade_price": 100.0}
+
+    def test_schedule_fires_at_offset_after_minute_boundary(self):
+        now = [self.KST.localize(datetime(2024, 10, 20, 12, 0, 1))]
+        schedule = minute_offset(2.0, nowfun=lambda: now[0])
+
+        # beat가 12:00:01에 시작 -> 12:00:02까지 대기
+        state = schedule.is_due(now[0])
+        self.assertFalse(state.is_due)
+        self.assertAlmostEqual(state.next, 1.0)
+
+        # 실행이 0.7초 늦어도 다음 실행은 12:01:02
+        now[0] = self.KST.localize(datetime(2024, 10, 20, 12, 0, 2, 700000))
+        state = schedule.is_due(self.KST.localize(datetime(2024, 10, 20, 12, 0, 1)))
+        self.assertTrue(state.is_due)
+        self.assertAlmostEqual(state.next, 59.3)
+        self.assertFalse(schedule.is_due(now[0]).is_due)
+        self.assertEqual(schedule, minute_offset(2.0))
+        with self.assertRaises(ValueError):
+            minute_offset(60)
+
+    def test_retries_until_candle_is_available(self):
+        candle_time = last_closed_minute()
+        provider = MagicMock()
+        provider.get_closed_candle.side_effect = [(0, None), (0, None), (1, [self.candle(candle_time)])]
+        recorder = CandleLagRecorder(redis_client=FakeListRedis(), history=10)
+
+        saved_count, data, lag = ingest_closed_candle(
+            provider, "KRW-BTC", candle_time, recorder=recorder, retry_interval=0.01, deadline=120
+        )
+
+        self.assertEqual(saved_count, 1)
+        self.assertEqual(lag["attempts"], 3)
+        self.assertGreater(lag["lag_ms"], lag["missed_ms"])
+        provider.get_closed_candle.assert_called_with(candle_time, market="KRW-BTC")
+        stats = recorder.stats("KRW-BTC")
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(stats["first_attempt_ratio"], 0.0)
+
+    def test_gives_up_after_deadline(self):
+        provider = MagicMock()
+        provider.get_closed_candle.return_value = (0, None)
+        recorder = CandleLagRecorder(redis_client=FakeListRedis(), history=2)
+        candle_time = last_closed_minute() - timedelta(minutes=5)
+
+        for _ in range(3):
+            _, data, lag = ingest_closed_candle(provider, "KRW-BTC", candle_time, recorder=recorder, deadline=45)
+            self.assertIsNone(data)
+            self.assertIsNone(lag["lag_ms"])
+            self.assertEqual(lag["attempts"], 1)
+
+        stats = recorder.stats("KRW-BTC")
+        self.assertEqual(stats["count"], 2)  # history 개수만 보관
+        self.assertEqual(stats["missing"], 2)
+
+    @patch.object(UpbitDataProvider, "_update_last_candle")
+    @patch.object(UpbitDataProvider, "_UpbitDataProvider__save_data_to_db", return_value=1)
+    @patch.object(UpbitDataProvider, "_UpbitDataProvider__get_data_from_upbit")
+    def test_get_closed_candle_skips_unfinished_candle(self, get_data, save_data, update_last_candle):
+        provider = UpbitDataProvider(currency="BTC")
+        candle_time = datetime(2024, 10, 20, 12, 0)
+
+        # 아직 직전 캔들만 조회됨 -> 빈 캔들을 저장하지 않음
+        get_data.return_value = [self.candle(candle_time - timedelta(minutes=1))]
+        self.assertEqual(provider.get_closed_candle(candle_time, market="KRW-BTC"), (0, None))
+        save_data.assert_not_called()
+        get_data.assert_called_with("KRW-BTC", "2024-10-20T12:01:00+09:00", 1)
+
+        get_data.return_value = [self.candle(candle_time)]
+        saved_count, data = provider.get_closed_candle(candle_time, market="KRW-BTC")
+        self.assertEqual(saved_count, 1)
+        save_data.assert_called_once_with(data, "2024-10-20T12:00:00+09:00", 1)
+
+    @patch("django_backend.data_provider.tasks.CandleLagRecorder")
+    @patch("django_backend.data_provider.tasks.redis_client")
+    @patch.object(UpbitDataProvider, "_publish_candle_closed", side_effect=[redis.ConnectionError("down"), None])
+    @patch.object(UpbitDataProvider, "_save_to_redis")
+    @patch.object(UpbitDataProvider, "_update_last_candle")
+    @patch.object(UpbitDataProvider, "_UpbitDataProvider__get_data_from_upbit")
+    def test_fetch_retry_publishes_stored_candle(self, get_data, update_last_candle, save_to_redis, publish,
+                                                 lock_client, recorder):
+        lock_client.exists.return_value = False
+        candle_time = datetime(2024, 10, 20, 12, 0)
+        get_data.return_value = [dict(
+            self.candle(candle_time), opening_price=99.0, high_price=101.0, low_price=98.0,
+            candle_acc_trade_price=1000.0, candle_acc_trade_volume=10.0,
+        )]
+
+        # DB 저장 후 캔들 마감 발행이 실패 -> 재시도는 저장을 건너뛰고 발행만 다시 실행
+        result = fetch_upbit_data.apply(kwargs={"candle_time": candle_time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+        self.assertEqual(result.state, "SUCCESS")
+        self.assertEqual(publish.call_count, 2)
+        self.assertEqual(save_to_redis.call_count, 2)
+        self.assertEqual(UpbitData.objects.filter(market="KRW-BTC").count(), 1)
@@ -0,0 +1,455 @@
+# django_backend/data_provider/ticks.py
+import logging
+import os
+import struct
+import time as t
+import zlib
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import requests
+from django.conf import settings
+
+from django_backend.config.rate_limiter import PRIORITY_LIVE, get_rate_limiter
+from django_backend.data_provider.orderbook import kst_day
+
+logger = logging.getLogger(__name__)
+
+# 파일 헤더: 매직(4) + 버전(2) + 가격 소수 자릿수(2) + 예약(8)
+HEADER = struct.Struct('<4sHH8x')
+MAGIC = b'UPTK'
+VERSION = 1
+# 블록 헤더: 체결 수, 압축 데이터 길이, 첫/마지막 체결 시각(ms), 가격 인코딩 방식
+BLOCK = struct.Struct('<IIqqB7x')
+PRICE_SCALED = 0  # 가격 x 10^decimals 정수의 차분
+PRICE_RAW = 1  # 정수로 표현할 수 없는 가격이 있는 블록은 float64 그대로 저장
+
+TICK_DTYPE = np.dtype([
+    ('timestamp', '<i8'),  # 체결 시각 (UTC epoch ms)
+    ('price', '<f8'),
+    ('volume', '<f8'),
+    ('side', 'i1'),  # 1: 매수 체결(BID), -1: 매도 체결(ASK)
+    ('sequential_id', '<i8'),  # 업비트 체결 번호 (중복 제거용)
+])
+
+
+def _shuffle(values):
+    """
+    값의 바이트를 자리별로 모읍니다 (byte shuffle). 상위 바이트가 비슷한 값들이 이어져 압축률이 높아집니다.
+    """
+    return values.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(buffer, dtype, count):
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(dtype.itemsize, count).T.copy().view(dtype).ravel()
+
+
+def encode_block(ticks, decimals, level=1):
+    """
+    시간순 체결 배열을 압축 블록(헤더 + 데이터)으로 인코딩합니다.
+
+    - timestamp, sequential_id: 직전 값과의 차분 (대부분 작은 값이라 잘 압축됨)
+    - price: 10^decimals를 곱한 정수의 차분. 정수로 정확히 표현되지 않으면 float64 원본
+    - volume: float64 원본, side: int8
+    모든 열은 byte shuffle 후 하나의 zlib 스트림으로 압축합니다.
+    """
+    count = len(ticks)
+    timestamps = ticks['timestamp'].astype(np.int64)
+    prices = ticks['price'].astype(np.float64)
+    scaled = np.rint(prices * 10 ** decimals)
+    if np.array_equal(scaled / 10 ** decimals, prices) and np.abs(scaled).max(initial=0) < 2 ** 53:
+        price_mode = PRICE_SCALED
+        price_column = np.diff(scaled.astype(np.int64), prepend=0)
+    else:
+        price_mode = PRICE_RAW
+        price_column = prices
+    payload = zlib.compress(b''.join((
+        _shuffle(np.diff(timestamps, prepend=0)),
+        _shuffle(price_column),
+        _shuffle(ticks['volume'].astype(np.float64)),
+        ticks['side'].astype(np.int8).tobytes(),
+        _shuffle(np.diff(ticks['sequential_id'].astype(np.int64), prepend=0)),
+    )), level)
+    header = BLOCK.pack(count, len(payload), int(timestamps[0]), int(timestamps[-1]), price_mode)
+    return header + payload
+
+
+def decode_block(count, payload, price_mode, decimals):
+    """
+    encode_block의 역변환. TICK_DTYPE 배열을 반환합니다.
+    """
+    buffer = zlib.decompress(payload)
+    column = 8 * count
+    ticks = np.empty(count, dtype=TICK_DTYPE)
+    ticks['timestamp'] = np.cumsum(_unshuffle(buffer[:column], np.dtype('<i8'), count))
+    if price_mode == PRICE_SCALED:
+        ticks['price'] = np.cumsum(_unshuffle(buffer[column:2 * column], np.dtype('<i8'), count)) / 10 ** decimals
+    else:
+        ticks['price'] = _unshuffle(buffer[column:2 * column], np.dtype('<f8'), count)
+    ticks['volume'] = _unshuffle(buffer[2 * column:3 * column], np.dtype('<f8'), count)
+    ticks['side'] = np.frombuffer(buffer, dtype=np.int8, count=count, offset=3 * column)
+    ticks['sequential_id'] = np.cumsum(_unshuffle(buffer[3 * column + count:], np.dtype('<i8'), count))
+    return ticks
+
+
+def to_ticks(trades):
+    """
+    업비트 체결 응답(dict) 리스트를 TICK_DTYPE 배열로 변환합니다 (체결 번호순 정렬, 페이지 간 중복 제거).
+    """
+    ticks = np.empty(len(trades), dtype=TICK_DTYPE)
+    ticks['timestamp'] = [trade['timestamp'] for trade in trades]
+    ticks['price'] = [trade['trade_price'] for trade in trades]
+    ticks['volume'] = [trade['trade_volume'] for trade in trades]
+    ticks['side'] = [1 if trade['ask_bid'] == 'BID' else -1 for trade in trades]
+    ticks['sequential_id'] = [trade['sequential_id'] for trade in trades]
+    _, index = np.unique(ticks['sequential_id'], return_index=True)
+    return ticks[index]
+
+
+class TickWriter:
+    """
+    체결 데이터를 종목/일(KST) 단위 파일에 압축 블록으로 추가 기록합니다.
+
+    파일 경로: {base_dir}/{market}/{YYYY-MM-DD}.tck
+    파일은 HEADER 뒤에 (BLOCK 헤더 + 압축 데이터) 블록이 시간순으로 이어진 append-only 형식입니다.
+    """
+
+    def __init__(self, base_dir=None, block_size=None, decimals=None):
+        self.base_dir = str(base_dir or settings.TICK_DATA_DIR)
+        self.block_size = block_size or settings.TICK_BLOCK_SIZE
+        self.decimals = settings.TICK_PRICE_DECIMALS if decimals is None else decimals
+
+    def path(self, market, day):
+        return os.path.join(self.base_dir, market, f"{day.isoformat()}.tck")
+
+    def append(self, market, ticks):
+        """
+        같은 종목의 시간순 체결 배열을 날짜별 파일에 block_size개 단위 블록으로 나누어 추가합니다.
+
+        :return: 기록한 체결 수
+        """
+        if len(ticks) == 0:
+            return 0
+        days = kst_day(ticks['timestamp'])
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for day_ticks in np.split(ticks, boundaries):
+            day = date(1970, 1, 1) + timedelta(days=int(kst_day(day_ticks['timestamp'][0])))
+            path = self.path(market, day)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, 'ab') as f:
+                if new_file:
+                    f.write(HEADER.pack(MAGIC, VERSION, self.decimals))
+                for offset in range(0, len(day_ticks), self.block_size):
+                    f.write(encode_block(day_ticks[offset:offset + self.block_size], self.decimals))
+        return len(ticks)
+
+
+class TickReader:
+    """
+    TickWriter가 기록한 파일을 블록 단위로 스트리밍하는 리더.
+    블록 헤더의 시각 범위로 조회 구간 밖의 블록은 압축을 풀지 않고 건너뛰므로,
+    메모리에는 한 번에 블록 하나만 올라갑니다.
+    """
+
+    def __init__(self, base_dir=None):
+        self.base_dir = str(base_dir or settings.TICK_DATA_DIR)
+
+    def days(self, market):
+        directory = os.path.join(self.base_dir, market)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(date.fromisoformat(name[:-4]) for name in os.listdir(directory) if name.endswith('.tck'))
+
+    def iter_blocks(self, path, start_ms=None, end_ms=None):
+        """
+        파일의 블록을 순서대로 디코딩해 [start_ms, end_ms) 구간에 해당하는 부분만 반환합니다.
+        기록 중 중단되어 잘린 마지막 블록은 무시합니다.
+        """
+        with open(path, 'rb') as f:
+            magic, version, decimals = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Invalid tick file: {path}")
+            while True:
+                header = f.read(BLOCK.size)
+                if len(header) < BLOCK.size:
+                    return
+                count, size, first, last, price_mode = BLOCK.unpack(header)
+                if start_ms is not None and last < start_ms:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                if end_ms is not None and first >= end_ms:
+                    return
+                payload = f.read(size)
+                if len(payload) < size:
+                    return
+                ticks = decode_block(count, payload, price_mode, decimals)
+                lo = 0 if start_ms is None else np.searchsorted(ticks['timestamp'], start_ms)
+                hi = count if end_ms is None else np.searchsorted(ticks['timestamp'], end_ms)
+                if hi > lo:
+                    yield ticks[lo:hi]
+
+    def iter_range(self, market, start_ms, end_ms):
+        """
+        [start_ms, end_ms) 구간 체결을 블록 크기 배열로 순서대로 반환합니다.
+        """
+        first, last = int(kst_day(start_ms)), int(kst_day(end_ms - 1))
+        for day in self.days(market):
+            day_number = (day - date(1970, 1, 1)).days
+            if first <= day_number <= last:
+                yield from self.iter_blocks(self.path(market, day), start_ms, end_ms)
+
+    def path(self, market, day):
+        return os.path.join(self.base_dir, market, f"{day.isoformat()}.tck")
+
+    def last_sequential_id(self, market):
+        """
+        저장된 마지막 체결 번호. 가장 최근 파일의 마지막 완전한 블록만 디코딩합니다.
+
+        :return: 체결 번호. 저장된 체결이 없으면 None
+        """
+        for day in reversed(self.days(market)):
+            last_block = None
+            with open(self.path(market, day), 'rb') as f:
+                magic, version, decimals = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    raise ValueError(f"Invalid tick file: {self.path(market, day)}")
+                while True:
+                    header = f.read(BLOCK.size)
+                    if len(header) < BLOCK.size:
+                        break
+                    count, size, _, _, price_mode = BLOCK.unpack(header)
+                    position = f.tell()
+                    if f.seek(size, os.SEEK_CUR) > os.fstat(f.fileno()).st_size:
+                        break  # 기록 중 잘린 블록
+                    last_block = (position, count, size, price_mode)
+                if last_block is not None:
+                    position, count, size, price_mode = last_block
+                    f.seek(position)
+                    ticks = decode_block(count, f.read(size), price_mode, decimals)
+                    return int(ticks['sequential_id'].max())
+        return None
+
+    def read(self, market, start_ms, end_ms):
+        """
+        [start_ms, end_ms) 구간 체결을 하나의 배열로 반환합니다. 긴 구간은 iter_range를 사용하세요.
+        """
+        chunks = list(self.iter_range(market, start_ms, end_ms))
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=TICK_DTYPE)
+
+    def aggregate(self, market, start_ms, end_ms, interval_ms=1000):
+        """
+        [start_ms, end_ms) 구간 체결을 interval_ms 단위 봉으로 집계합니다 (블록 단위로 스트리밍 집계).
+        """
+        bars = [aggregate_ticks(ticks, interval_ms) for ticks in self.iter_range(market, start_ms, end_ms)]
+        if not bars:
+            return aggregate_ticks(np.empty(0, dtype=TICK_DTYPE), interval_ms)
+        # 블록 경계에 걸친 봉을 합침
+        return merge_bars(pd.concat(bars, ignore_index=True))
+
+
+BAR_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'value', 'buy_volume', 'trades')
+
+
+def _reduce_bars(keys, open_, high, low, close, volume, value, buy_volume, trades):
+    """
+    정렬된 키가 같은 연속 구간을 하나의 봉으로 합칩니다.
+    """
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1))
+    ends = np.append(starts[1:], len(keys)) - 1
+    return pd.DataFrame({
+        'timestamp': keys[starts],
+        'open': open_[starts],
+        'high': np.maximum.reduceat(high, starts),
+        'low': np.minimum.reduceat(low, starts),
+        'close': close[ends],
+        'volume': np.add.reduceat(volume, starts),
+        'value': np.add.reduceat(value, starts),
+        'buy_volume': np.add.reduceat(buy_volume, starts),
+        'trades': np.add.reduceat(trades, starts),
+    })
+
+
+def aggregate_ticks(ticks, interval_ms=1000):
+    """
+    시간순 체결 배열을 interval_ms 단위 봉(초봉 등)으로 집계합니다. 체결이 없는 구간의 봉은 만들지 않습니다.
+
+    :return: DataFrame(timestamp(봉 시작 epoch ms), open, high, low, close, volume, value, buy_volume, trades)
+             buy_volume은 매수 체결(BID) 거래량으로, volume - buy_volume이 매도 체결 거래량입니다.
+    """
+    if len(ticks) == 0:
+        return pd.DataFrame({column: np.empty(0) for column in BAR_COLUMNS})
+    keys = ticks['timestamp'] // interval_ms * interval_ms
+    price = ticks['price']
+    volume = ticks['volume']
+    return _reduce_bars(
+        keys, price, price, price, price, volume, price * volume, volume * (ticks['side'] > 0),
+        np.ones(len(ticks), dtype=np.int64),
+    )
+
+
+def merge_bars(bars):
+    """
+    같은 timestamp의 연속된 봉을 합칩니다 (블록별로 집계한 결과를 이을 때 사용).
+    """
+    return _reduce_bars(*(bars[column].to_numpy() for column in BAR_COLUMNS))
+
+
+class UpbitTickSource:
+    """
+    업비트 REST 최근 체결 조회. 직전 조회 이후 체결이 count개를 넘으면 cursor로 이전 페이지를 이어서 조회합니다.
+    """
+
+    URL = "https://api.upbit.com/v1/trades/ticks"
+
+    def __init__(self, count=500, max_pages=5, timeout=3):
+        self.count = count
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.rate_limiter = get_rate_limiter()
+
+    def fetch(self, market, after_id=None):
+        """
+        :param after_id: 이 체결 번호 이후의 체결만 필요함 (None이면 최근 count개)
+        :return: 업비트 체결 응답 리스트 (최신순)
+        """
+        trades, cursor = [], None
+        for _ in range(self.max_pages):
+            params = {"market": market, "count": self.count}
+            if cursor is not None:
+                params["cursor"] = cursor
+            self.rate_limiter.acquire("trade", PRIORITY_LIVE)
+            response = self.session.get(self.URL, params=params, timeout=self.timeout)
+            self.rate_limiter.observe(response, "trade")
+            response.raise_for_status()
+            page = response.json()
+            trades.extend(page)
+            if after_id is None or len(page) < self.count or page[-1]['sequential_id'] <= after_id:
+                break
+            cursor = page[-1]['sequential_id']
+        return trades
+
+
+class SyntheticTickSource:
+    """
+    업비트 체결 응답 형식의 합성 체결을 만드는 로컬 대체 소스 (테스트/처리량 측정용).
+    """
+
+    def __init__(self, seed=0, start_price=50_000_000.0, tick=1000.0, rate=1000, start_ms=None):
+        """
+        :param rate: 조회 1회당 생성할 체결 수
+        """
+        self.rng = np.random.default_rng(seed)
+        self.tick = tick
+        self.rate = rate
+        self.timestamp = int(t.time() * 1000) if start_ms is None else start_ms
+        self.price = defaultdict(lambda: start_price)
+        self.sequential_id = defaultdict(lambda: self.timestamp * 1000)
+
+    def fetch(self, market, after_id=None):
+        steps = self.rng.integers(-1, 2, self.rate)
+        prices = np.maximum(self.price[market] + np.cumsum(steps) * self.tick, self.tick)
+        self.price[market] = float(prices[-1])
+        timestamps = self.timestamp + np.sort(self.rng.integers(0, 1000, self.rate))
+        volumes = np.round(self.rng.exponential(0.01, self.rate), 8)
+        sides = self.rng.random(self.rate) < 0.5
+        start_id = self.sequential_id[market]
+        self.sequential_id[market] += self.rate
+        trades = [
+            {
+                "market": market,
+                "timestamp": int(timestamp),
+                "trade_price": float(price),
+                "trade_volume": float(volume),
+                "ask_bid": "BID" if side else "ASK",
+                "sequential_id": start_id + i + 1,
+            }
+            for i, (timestamp, price, volume, side) in enumerate(zip(timestamps, prices, volumes, sides))
+        ]
+        self.timestamp += 1000
+        return trades[::-1]
+
+
+class TickCollector:
+    """
+    종목별 최근 체결을 주기적으로 조회해 TickWriter로 저장하는 수집기.
+    마지막으로 저장한 체결 번호 이후의 체결만 버퍼에 넣고, 블록 크기만큼 모이거나 flush_interval초가 지나면 기록합니다.
+    수집기를 새로 만들면(예: 매분 실행되는 Celery 작업) 종목별 첫 조회 전에 저장된 파일의 마지막 체결 번호를 읽어
+    이전 실행이 이미 저장한 체결을 다시 기록하지 않습니다.
+    """
+
+    def __init__(self, markets=None, source=None, writer=None, flush_interval=10.0):
+        self.markets = markets or settings.TICK_MARKETS
+        self.source = source or UpbitTickSource()
+        self.writer = writer or TickWriter()
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self._buffer = defaultdict(list)
+        self._buffered = defaultdict(int)
+        self._last_id = {}
+        self._last_flush = t.monotonic()
+        self.reader = TickReader(self.writer.base_dir)
+
+    def collect_once(self):
+        """
+        모든 종목의 신규 체결을 한 번 조회해 버퍼에 넣습니다.
+
+        :return: 버퍼에 추가된 체결 수
+        """
+        added = 0
+        for market in self.markets:
+            if market not in self._last_id:
+                self._last_id[market] = self.reader.last_sequential_id(market)
+            last_id = self._last_id[market]
+            ticks = to_ticks(self.source.fetch(market, after_id=last_id))
+            if last_id is not None:
+                ticks = ticks[ticks['sequential_id'] > last_id]
+            if len(ticks) == 0:
+                continue
+            self._last_id[market] = int(ticks['sequential_id'][-1])
+            self._buffer[market].append(ticks)
+            self._buffered[market] += len(ticks)
+            added += len(ticks)
+            if self._buffered[market] >= self.writer.block_size:
+                self._flush_market(market)
+        if t.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        return added
+
+    def _flush_market(self, market):
+        chunks, self._buffer[market] = self._buffer[market], []
+        self._buffered[market] = 0
+        if not chunks:
+            return 0
+        return self.writer.append(market, np.concatenate(chunks))
+
+    def flush(self):
+        """
+        버퍼에 남은 체결을 모두 기록합니다.
+        """
+        self._last_flush = t.monotonic()
+        return sum(self._flush_market(market) for market in list(self._buffer))
+
+    def run(self, duration, interval=None):
+        """
+        duration초 동안 interval초 간격으로 수집합니다. 조회 오류는 기록하고 다음 주기에 다시 시도합니다.
+
+        :return: 수집한 체결 수
+        """
+        interval = settings.TICK_POLL_INTERVAL if interval is None else interval
+        deadline = t.monotonic() + duration
+        collected = 0
+        try:
+            while t.monotonic() < deadline:
+                started = t.monotonic()
+                try:
+                    collected += self.collect_once()
+                except requests.exceptions.RequestException as e:
+                    self.logger.error(f"체결 조회 실패: {e}")
+                t.sleep(max(0.0, interval - (t.monotonic() - started)))
+        finally:
+            self.flush()
+        return collected
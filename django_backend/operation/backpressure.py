@@ -0,0 +1,233 @@
+# django_backend/operation/backpressure.py
+import logging
+import threading
+import time as t
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 처리 결과 (TickGate.claim/check/admit의 반환값)
+ACCEPTED = "ok"
+STALE = "stale"  # 캔들 마감 후 max_age_ms가 지남
+SUPERSEDED = "superseded"  # 같은 종목의 더 새로운 틱이 이미 요청/처리 중
+DUPLICATE = "duplicate"  # 같은 캔들을 다른 작업이 이미 처리 중
+
+COUNTERS = ("submitted", "processed", "dropped_stale", "dropped_superseded", "dropped_duplicate")
+
+# 종목별 상태 해시(KEYS[1]: submitted, claimed)와 카운터 해시(KEYS[2])를 한 번에 갱신합니다.
+# ARGV: 동작(submit/admit/claim/check), 틱 시각(ms), 최대 허용 지연(ms)
+# submit: 요청 시각을 기록 / admit: 가장 최근 요청인지 확인
+# claim: 캔들 처리를 시작 (같거나 오래된 캔들이면 거절) / check: 주문 직전에 여전히 최신이고 신선한지 확인
+GATE_SCRIPT = """
+local action = ARGV[1]
+local tick = tonumber(ARGV[2])
+local max_age = tonumber(ARGV[3])
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local result = 'ok'
+if action == 'submit' then
+    local submitted = tonumber(redis.call('HGET', KEYS[1], 'submitted')) or 0
+    if tick > submitted then
+        redis.call('HSET', KEYS[1], 'submitted', tick)
+    end
+    redis.call('HINCRBY', KEYS[2], 'submitted', 1)
+    return result
+elseif action == 'admit' then
+    local submitted = tonumber(redis.call('HGET', KEYS[1], 'submitted')) or 0
+    if tick < submitted then
+        result = 'superseded'
+    end
+else
+    local claimed = tonumber(redis.call('HGET', KEYS[1], 'claimed')) or 0
+    if now_ms - tick > max_age then
+        result = 'stale'
+    elseif tick < claimed then
+        result = 'superseded'
+    elseif action == 'claim' and tick == claimed then
+        result = 'duplicate'
+    elseif action == 'claim' then
+        redis.call('HSET', KEYS[1], 'claimed', tick)
+    end
+end
+if result ~= 'ok' then
+    redis.call('HINCRBY', KEYS[2], 'dropped_' .. result, 1)
+end
+return result
+"""
+
+
+class TickGate:
+    """
+    운영 파이프라인의 종목별 역압(backpressure) 제어기. 모든 워커가 Redis 상태를 공유합니다.
+
+    분석/전략이 캔들 주기보다 느려 틱이 밀리면 오래된 데이터로 주문하게 되므로,
+    - 요청이 쌓인 종목은 가장 최근에 요청된 틱만 처리하고 이전 요청은 버립니다 (admit)
+    - 같은 캔들은 한 번만 처리하고, 더 새로운 캔들이 처리 중이면 이전 캔들을 버립니다 (claim)
+    - 캔들 마감 후 settings.OPERATION_MAX_TICK_AGE_MS가 지난 틱은 처리/주문하지 않습니다 (claim, check)
+    - 요청/처리/버린 틱 수를 종목별로 기록합니다 (stats)
+
+    Redis에 연결할 수 없으면 틱 나이만 확인하고 통과시킵니다.
+    """
+
+    KEY_PREFIX = "operation:tick"
+
+    def __init__(self, redis_client=None, max_age_ms=None):
+        self.logger = logger
+        self.redis_client = redis_client or redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.max_age_ms = max_age_ms or settings.OPERATION_MAX_TICK_AGE_MS
+        self._script = None
+
+    def state_key(self, market):
+        return f"{self.KEY_PREFIX}:state:{market}"
+
+    def stats_key(self, market):
+        return f"{self.KEY_PREFIX}:stats:{market}"
+
+    def _run(self, action, market, tick_ms):
+        if self._script is None:
+            self._script = self.redis_client.register_script(GATE_SCRIPT)
+        result = self._script(
+            keys=[self.state_key(market), self.stats_key(market)], args=[action, int(tick_ms), self.max_age_ms]
+        )
+        return result.decode() if isinstance(result, bytes) else result
+
+    def _call(self, action, market, tick_ms):
+        try:
+            result = self._run(action, market, tick_ms)
+        except redis.RedisError as e:
+            self.logger.warning(f"틱 게이트 Redis 오류, 나이만 확인합니다: {e}")
+            result = STALE if action in ("claim", "check") and t.time() * 1000 - tick_ms > self.max_age_ms \
+                else ACCEPTED
+        if result != ACCEPTED:
+            self.logger.warning(f"{market} 틱({int(tick_ms)})을 버립니다: {result}")
+        return result
+
+    def submit(self, market, submitted_ms=None):
+        """
+        틱 처리 요청을 기록합니다.
+
+        :return: 요청 시각 (ms). admit에 그대로 전달합니다
+        """
+        submitted_ms = int(t.time() * 1000) if submitted_ms is None else submitted_ms
+        self._call("submit", market, submitted_ms)
+        return submitted_ms
+
+    def admit(self, market, submitted_ms):
+        """
+        밀려 있던 요청이 실행될 때, 그 사이 같은 종목의 새 요청이 있었는지 확인합니다.
+        """
+        return self._call("admit", market, submitted_ms)
+
+    def claim(self, event):
+        """
+        캔들 마감 이벤트의 처리를 시작합니다 (데이터 단계 직후).
+        """
+        return self._call("claim", event["market"], event["closed_at_ms"])
+
+    def check(self, event):
+        """
+        주문 직전에 틱이 여전히 최신이고 max_age_ms 안인지 확인합니다.
+        """
+        return self._call("check", event["market"], event["closed_at_ms"])
+
+    def complete(self, market):
+        """
+        틱 처리 완료를 기록합니다.
+        """
+        try:
+            self.redis_client.hincrby(self.stats_key(market), "processed", 1)
+        except redis.RedisError as e:
+            self.logger.warning(f"틱 처리 완료 기록 실패: {e}")
+
+    def counters(self, market):
+        try:
+            raw = self.redis_client.hgetall(self.stats_key(market))
+        except redis.RedisError as e:
+            self.logger.warning(f"틱 통계 조회 실패: {e}")
+            raw = {}
+        return {name: int(raw.get(name, 0)) for name in COUNTERS}
+
+    def stats(self, markets):
+        """
+        종목별 카운터와 대기 중인 틱 수(요청 - 처리 - 버림)를 반환합니다.
+
+        :return: {market: {'submitted', 'processed', 'dropped_stale', 'dropped_superseded', 'dropped_duplicate', 'pending'}}
+        """
+        stats = {}
+        for market in markets:
+            counters = self.counters(market)
+            finished = sum(value for name, value in counters.items() if name != "submitted")
+            stats[market] = dict(counters, pending=max(0, counters["submitted"] - finished))
+        return stats
+
+
+class LocalTickGate(TickGate):
+    """
+    TickGate와 같은 규칙을 프로세스 메모리에서 적용하는 게이트 (단일 프로세스 실행/테스트용).
+    """
+
+    def __init__(self, max_age_ms=None):
+        self.logger = logger
+        self.max_age_ms = max_age_ms or settings.OPERATION_MAX_TICK_AGE_MS
+        self._state = defaultdict(lambda: {"submitted": 0, "claimed": 0})
+        self._counters = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        self._lock = threading.Lock()
+
+    def _run(self, action, market, tick_ms):
+        with self._lock:
+            state, counters = self._state[market], self._counters[market]
+            if action == "submit":
+                state["submitted"] = max(state["submitted"], tick_ms)
+                counters["submitted"] += 1
+                return ACCEPTED
+            if action == "admit":
+                result = SUPERSEDED if tick_ms < state["submitted"] else ACCEPTED
+            elif t.time() * 1000 - tick_ms > self.max_age_ms:
+                result = STALE
+            elif tick_ms < state["claimed"]:
+                result = SUPERSEDED
+            elif action == "claim" and tick_ms == state["claimed"]:
+                result = DUPLICATE
+            else:
+                if action == "claim":
+                    state["claimed"] = tick_ms
+                result = ACCEPTED
+            if result != ACCEPTED:
+                counters[f"dropped_{result}"] += 1
+            return result
+
+    def complete(self, market):
+        with self._lock:
+            self._counters[market]["processed"] += 1
+
+    def counters(self, market):
+        with self._lock:
+            return dict(self._counters[market])
+
+
+def broker_queue_depths(queues=None):
+    """
+    Celery 브로커 큐별 대기 메시지 수. 조회할 수 없는 큐는 None입니다.
+
+    :param queues: 큐 이름 리스트 (기본값: settings.OPERATION_MONITORED_QUEUES)
+    """
+    from django_backend.config.celery import app
+
+    depths = {}
+    with app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in queues or settings.OPERATION_MONITORED_QUEUES:
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except Exception as e:
+                logger.warning(f"{queue} 큐 길이 조회 실패: {e}")
+                depths[queue] = None
+    return depths
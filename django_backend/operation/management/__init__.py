@@ -0,0 +1 @@
+# django_backend/operation/management/__init__.py
@@ -0,0 +1 @@
+# django_backend/operation/management/commands/__init__.py
@@ -0,0 +1,64 @@
+# django_backend/operation/management/commands/celery_load_test.py
+import json
+import time as t
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from django_backend.operation.tasks import latency_probe_task
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(values), "p50": p50, "p95": p95, "p99": p99, "max": values.max()}
+
+
+class Command(BaseCommand):
+    help = (
+        "주문 큐의 작업 대기 시간을 부하 없이, 그리고 백필 큐에 긴 작업을 채운 상태에서 측정해 비교합니다. "
+        "실행 중인 Celery 워커가 필요합니다 (--load-queue를 --probe-queue와 같게 주면 단일 워커 풀 구성을 재현)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--probe-queue", default="orders", help="지연 시간을 측정할 큐")
+        parser.add_argument("--load-queue", default="bulk", help="부하 작업을 보낼 큐")
+        parser.add_argument("--probes", type=int, default=50, help="단계별 측정 작업 수")
+        parser.add_argument("--interval", type=float, default=0.1, help="측정 작업 전송 간격 (초)")
+        parser.add_argument("--load-tasks", type=int, default=20, help="부하 작업 수")
+        parser.add_argument("--load-seconds", type=float, default=5.0, help="부하 작업 하나의 실행 시간 (초)")
+        parser.add_argument("--timeout", type=float, default=120.0, help="측정 작업 결과 대기 시간 (초)")
+
+    def probe(self, options):
+        results = []
+        for _ in range(options["probes"]):
+            results.append(latency_probe_task.apply_async(args=[t.time()], queue=options["probe_queue"]))
+            t.sleep(options["interval"])
+        return [result.get(timeout=options["timeout"])["queue_ms"] for result in results]
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"기준 측정: {options['probes']}개 -> {options['probe_queue']}")
+        baseline = summarize(self.probe(options))
+
+        self.stdout.write(
+            f"부하 전송: {options['load_tasks']}개 x {options['load_seconds']}초 -> {options['load_queue']}"
+        )
+        load = [
+            latency_probe_task.apply_async(args=[t.time(), options["load_seconds"]], queue=options["load_queue"])
+            for _ in range(options["load_tasks"])
+        ]
+        t.sleep(0.5)  # 부하 작업이 워커에 배정될 시간
+        under_load = summarize(self.probe(options))
+        pending_load = sum(1 for result in load if not result.ready())
+
+        report = {
+            "probe_queue": options["probe_queue"],
+            "load_queue": options["load_queue"],
+            "baseline_ms": baseline,
+            "under_load_ms": under_load,
+            "load_tasks_still_running": pending_load,
+            "p95_ratio": under_load["p95"] / baseline["p95"] if baseline["p95"] else None,
+        }
+        self.stdout.write(json.dumps(report, indent=2, default=float))
@@ -1 +1,259 @@
- # django_backend/operation/operation.py
\ No newline at end of file
+# django_backend/operation/operation.py
+import logging
+import time as t
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytz
+from django.conf import settings
+
+from django_backend.data_provider.ingestion import last_closed_minute
+from django_backend.data_provider.models import UpbitData
+from django_backend.operation.backpressure import ACCEPTED, TickGate
+from django_backend.strategy.services import build_runtime
+from django_backend.trader.execution import InstrumentedTrader
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("data", "analysis", "strategy", "order")
+KST = pytz.timezone('Asia/Seoul')
+
+
+def candle_event(market, candle):
+    """
+    업비트 캔들 응답 하나로 캔들 마감 이벤트(StrategyRuntime.dispatch 형식)를 만듭니다.
+    """
+    candle_time = candle["candle_date_time_kst"]
+    closed_at = KST.localize(datetime.strptime(candle_time, "%Y-%m-%dT%H:%M:%S")) + timedelta(minutes=1)
+    return {
+        "market": market,
+        "timeframe": 1,
+        "candle_time": candle_time,
+        "closed_at_ms": int(closed_at.timestamp() * 1000),
+        "published_at_ms": int(t.time() * 1000),
+        "reference_price": candle["trade_price"],
+    }
+
+
+class OperationPipeline:
+    """
+    한 틱(1분봉 마감)의 데이터 수집 -> 분석 -> 전략 -> 주문을 한 프로세스에서 순서대로 실행하는 운영 파이프라인.
+
+    단계 사이에 브로커/스트림을 거치지 않으므로 틱 전체 지연은 각 단계 실행 시간의 합입니다.
+    단계별 시간은 settings.OPERATION_STAGE_BUDGETS_MS, 틱 전체 시간은 settings.OPERATION_TICK_BUDGET_MS와 비교해
+    초과하면 경고를 남깁니다. 여러 워커에 나눠 실행해야 할 때는 operation.tasks의 Celery 체인이 같은 단계를 사용합니다.
+
+    - data: 수집기(fetch_upbit_data)가 DB에 저장한 직전 1분봉을 읽음 (파이프라인은 캔들을 저장하지 않음)
+    - analysis: 마감된 분봉별 캔들 스냅샷 준비 (StrategyRuntime.prepare)
+    - strategy: 등록된 전략 실행 (StrategyRuntime.evaluate)
+    - order: 매수/매도 신호를 주문으로 전송 (InstrumentedTrader로 신호~체결 지연 기록)
+
+    처리가 밀리면 종목별로 가장 최근 틱만 처리하고 오래된 틱으로는 주문하지 않습니다 (operation.backpressure.TickGate).
+
+    NOTE: 신호는 SIGNAL_STREAM에 발행하지 않고 바로 주문으로 전송합니다.
+    """
+
+    LATENCY_HISTORY = 1000  # 지연 시간 통계에 사용할 최근 기록 수
+
+    def __init__(self, runtime=None, trader=None, state_store=None, gate=None, tick_budget_ms=None,
+                 stage_budgets_ms=None):
+        """
+        :param runtime: 전략이 등록된 StrategyRuntime (기본값: settings.STRATEGY_REGISTRY로 생성)
+        :param trader: 주문에 사용할 AbstractTrader (기본값: InstrumentedTrader(UpbitTrader()))
+        :param state_store: 매도 수량을 읽을 계좌 상태 저장소 (기본값: AccountStateStore)
+        :param gate: 종목별 틱 역압 제어기 (기본값: 워커 간 공유 TickGate)
+        """
+        self.logger = logger
+        self.gate = gate or TickGate()
+        self._runtime = runtime
+        self._trader = trader
+        self._state_store = state_store
+        self.tick_budget_ms = tick_budget_ms or settings.OPERATION_TICK_BUDGET_MS
+        self.stage_budgets_ms = stage_budgets_ms or settings.OPERATION_STAGE_BUDGETS_MS
+        self._records = deque(maxlen=self.LATENCY_HISTORY)
+
+    # 구성 요소는 처음 사용할 때 생성 (분산 실행 시 단계마다 필요한 것만 초기화)
+    @property
+    def runtime(self):
+        if self._runtime is None:
+            self._runtime = build_runtime()
+        return self._runtime
+
+    @property
+    def trader(self):
+        if self._trader is None:
+            from django_backend.trader.services import UpbitTrader
+
+            self._trader = InstrumentedTrader(UpbitTrader())
+        return self._trader
+
+    @property
+    def state_store(self):
+        if self._state_store is None:
+            from django_backend.trader.state import AccountStateStore
+
+            self._state_store = AccountStateStore()
+        return self._state_store
+
+    # ------------------------------------------------------------------
+    # 단계
+    # ------------------------------------------------------------------
+
+    def collect(self, market):
+        """
+        데이터 단계: 수집기가 저장한 직전 1분봉을 읽어 캔들 마감 이벤트를 반환합니다.
+        아직 저장되지 않았으면 settings.INGESTION_RETRY_INTERVAL 간격으로 다시 읽고,
+        틱이 gate.max_age_ms를 넘길 때까지 저장되지 않으면 reference_price가 None인 이벤트를 반환합니다
+        (TickGate.claim이 오래된 틱으로 버림).
+        """
+        candle_time = last_closed_minute()
+        deadline = KST.localize(candle_time + timedelta(minutes=1)).timestamp() + self.gate.max_age_ms / 1000
+        while True:
+            candle = UpbitData.objects.filter(
+                market=market, date_time=candle_time, closing_price__isnull=False
+            ).first()
+            if candle is not None or t.time() > deadline:
+                break
+            t.sleep(min(settings.INGESTION_RETRY_INTERVAL, max(deadline - t.time(), 0) + 0.001))
+        if candle is None:
+            self.logger.warning(f"{market} {candle_time} 캔들이 틱 유효 시간 안에 저장되지 않았습니다.")
+        return candle_event(market, {
+            "candle_date_time_kst": candle_time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "trade_price": candle.closing_price if candle is not None else None,
+        })
+
+    def analyze(self, event):
+        """
+        분석 단계: 마감된 분봉별 캔들 스냅샷을 준비합니다.
+        """
+        return self.runtime.prepare(event["market"], event["candle_time"])
+
+    def evaluate(self, event, prepared):
+        """
+        전략 단계: 등록된 전략을 실행해 신호 리스트를 반환합니다.
+        """
+        return self.runtime.evaluate(event["market"], event["candle_time"], prepared)
+
+    def build_order(self, signal):
+        """
+        신호 하나를 send_request 인자로 변환합니다.
+        매수는 settings.OPERATION_ORDER_AMOUNT 원 시장가 매수, 매도는 보유 수량 전체 시장가 매도입니다.
+
+        :return: send_request 인자 dict. 주문하지 않으면 None
+        """
+        action = signal["signal"].get("action") if isinstance(signal["signal"], dict) else None
+        if action == "buy":
+            return {"market": signal["market"], "side": "bid", "price": settings.OPERATION_ORDER_AMOUNT,
+                    "ord_type": "price", "time_in_force": None}
+        if action == "sell":
+            volume = self.state_store.balance(signal["market"].split("-", 1)[1])
+            if volume <= 0:
+                return None
+            return {"market": signal["market"], "side": "ask", "volume": volume,
+                    "ord_type": "market", "time_in_force": None}
+        return None
+
+    def place_orders(self, signals, reference_price=None, signal_time=None):
+        """
+        주문 단계: 신호를 주문으로 전송합니다.
+
+        :param signal_time: 신호 생성 시각 (epoch 초). 주문 실행 기록의 signal_to_submit 기준
+        :return: 주문 응답 리스트
+        """
+        signal_time = t.time() if signal_time is None else signal_time
+        responses = []
+        for signal in signals:
+            order = self.build_order(signal)
+            if order is None:
+                continue
+            if isinstance(self.trader, InstrumentedTrader):
+                order.update(signal_time=signal_time, reference_price=reference_price)
+            responses.append(self.trader.send_request(**order))
+        return responses
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run_tick(self, market):
+        """
+        한 종목의 한 틱을 모든 단계에 걸쳐 실행합니다.
+        같은 캔들을 이미 처리했거나, 분석/전략이 밀려 주문 직전에 틱이 오래되었으면 주문하지 않습니다 (TickGate).
+
+        :return: {'event', 'signals', 'orders', 'dropped'(버린 이유 또는 None),
+                  'timings': {단계: ms}, 'total_ms', 'over_budget': [단계, ...]}
+        """
+        timings = {}
+        started = t.perf_counter()
+        self.gate.submit(market)
+        signals, orders = [], []
+
+        stage_started = t.perf_counter()
+        event = self.collect(market)
+        timings["data"] = (t.perf_counter() - stage_started) * 1000
+
+        dropped = self.gate.claim(event)
+        if dropped == ACCEPTED:
+            stage_started = t.perf_counter()
+            prepared = self.analyze(event)
+            timings["analysis"] = (t.perf_counter() - stage_started) * 1000
+
+            stage_started = t.perf_counter()
+            signals = self.evaluate(event, prepared)
+            timings["strategy"] = (t.perf_counter() - stage_started) * 1000
+            signal_time = t.time()
+
+            dropped = self.gate.check(event) if signals else ACCEPTED
+            if dropped == ACCEPTED:
+                stage_started = t.perf_counter()
+                orders = self.place_orders(signals, event.get("reference_price"), signal_time)
+                timings["order"] = (t.perf_counter() - stage_started) * 1000
+                self.gate.complete(market)
+
+        record = self.record(event, timings, total_ms=(t.perf_counter() - started) * 1000)
+        return dict(
+            record, event=event, signals=signals, orders=orders, dropped=None if dropped == ACCEPTED else dropped
+        )
+
+    def record(self, event, timings, total_ms=None):
+        """
+        단계별 시간을 예산과 비교해 기록하고, 초과한 단계를 경고합니다.
+
+        :param total_ms: 틱 전체 시간 (기본값: 단계 시간의 합. 분산 실행에서는 브로커 대기 시간을 포함해 전달)
+        :return: {'timings', 'total_ms', 'over_budget'}
+        """
+        total_ms = sum(timings.values()) if total_ms is None else total_ms
+        over_budget = [
+            stage for stage in STAGES
+            if stage in timings and timings[stage] > self.stage_budgets_ms.get(stage, float("inf"))
+        ]
+        if total_ms > self.tick_budget_ms:
+            over_budget.append("total")
+        if over_budget:
+            detail = ", ".join(f"{stage} {timings[stage]:.1f}ms" for stage in STAGES if stage in timings)
+            self.logger.warning(
+                f"{event['market']} {event['candle_time']} 틱이 지연 예산을 초과했습니다 ({', '.join(over_budget)}): "
+                f"{detail}, 전체 {total_ms:.1f}ms / 예산 {self.tick_budget_ms}ms"
+            )
+        record = {"timings": timings, "total_ms": total_ms, "over_budget": over_budget}
+        self._records.append(record)
+        return record
+
+    def latency_stats(self):
+        """
+        최근 틱의 단계별/전체 지연 시간 백분위수(ms)와 예산 초과 비율을 반환합니다.
+        """
+        stats = {"count": len(self._records)}
+        if not self._records:
+            return stats
+        for stage in STAGES + ("total",):
+            values = np.array([
+                record["total_ms"] if stage == "total" else record["timings"][stage]
+                for record in self._records if stage == "total" or stage in record["timings"]
+            ])
+            if len(values):
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                stats[stage] = {"p50": p50, "p95": p95, "p99": p99, "max": values.max()}
+        stats["over_budget_ratio"] = sum(1 for record in self._records if record["over_budget"]) / len(self._records)
+        return stats
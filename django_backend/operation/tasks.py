@@ -1 +1,139 @@
- # django_backend/operation/tasks.py
\ No newline at end of file
+# django_backend/operation/tasks.py
+import time as t
+
+from celery import chain, shared_task
+from django.conf import settings
+
+from django_backend.operation.backpressure import ACCEPTED, broker_queue_depths
+from django_backend.operation.operation import OperationPipeline
+
+# 워커 프로세스별 파이프라인 (처음 호출 시 생성, 전략 상태와 스냅샷을 틱 사이에 유지)
+_pipeline = None
+
+
+def get_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = OperationPipeline()
+    return _pipeline
+
+
+@shared_task
+def run_operation_tick(markets=None):
+    """
+    운영 대상 종목의 한 틱(데이터 -> 분석 -> 전략 -> 주문)을 실행하는 Celery 작업 (1분마다 실행).
+
+    settings.OPERATION_DISTRIBUTED가 False이면 이 워커 안에서 모든 단계를 실행하고,
+    True이면 단계별 작업을 Celery 체인으로 나눠 다른 워커에서 실행합니다 (단계 사이에 브로커를 거침).
+    분산 실행에서 체인이 밀려 쌓이면 종목별로 가장 최근에 요청된 체인만 진행하고 나머지는 버립니다.
+
+    :param markets: 종목 코드 리스트 (기본값: settings.OPERATION_MARKETS)
+    """
+    markets = settings.OPERATION_MARKETS if markets is None else markets
+    if settings.OPERATION_DISTRIBUTED:
+        gate = get_pipeline().gate
+        for market in markets:
+            chain(
+                collect_stage_task.s(market, gate.submit(market)),
+                strategy_stage_task.s(),
+                order_stage_task.s(),
+            ).apply_async()
+        return {"dispatched": len(markets)}
+
+    pipeline = get_pipeline()
+    results = {}
+    for market in markets:
+        result = pipeline.run_tick(market)
+        results[market] = {
+            "signals": len(result["signals"]),
+            "orders": len(result["orders"]),
+            "total_ms": result["total_ms"],
+            "over_budget": result["over_budget"],
+            "dropped": result["dropped"],
+        }
+    return results
+
+
+@shared_task
+def collect_stage_task(market, submitted_ms):
+    """
+    분산 실행의 데이터 단계. 그 사이 같은 종목의 새 체인이 요청되었거나 같은 캔들이 이미 처리 중이면 버립니다.
+
+    :param submitted_ms: 체인을 요청한 시각 (TickGate.submit)
+    :return: 다음 단계로 전달할 {'event', 'timings', 'started_at'}. 버리면 None
+    """
+    pipeline = get_pipeline()
+    if pipeline.gate.admit(market, submitted_ms) != ACCEPTED:
+        return None
+    stage_started = t.perf_counter()
+    event = pipeline.collect(market)
+    timings = {"data": (t.perf_counter() - stage_started) * 1000}
+    if pipeline.gate.claim(event) != ACCEPTED:
+        return None
+    return {"event": event, "timings": timings, "started_at": submitted_ms / 1000}
+
+
+@shared_task
+def strategy_stage_task(payload):
+    """
+    분산 실행의 분석 + 전략 단계 (스냅샷은 같은 프로세스의 전략이 공유해야 하므로 한 작업에서 실행).
+    큐에서 기다리는 동안 틱이 오래되었거나 더 새로운 틱이 처리 중이면 버립니다.
+    """
+    pipeline = get_pipeline()
+    if payload is None or pipeline.gate.check(payload["event"]) != ACCEPTED:
+        return None
+    stage_started = t.perf_counter()
+    prepared = pipeline.analyze(payload["event"])
+    payload["timings"]["analysis"] = (t.perf_counter() - stage_started) * 1000
+
+    stage_started = t.perf_counter()
+    payload["signals"] = pipeline.evaluate(payload["event"], prepared)
+    payload["timings"]["strategy"] = (t.perf_counter() - stage_started) * 1000
+    payload["signal_time"] = t.time()
+    return payload
+
+
+@shared_task
+def order_stage_task(payload):
+    """
+    분산 실행의 주문 단계. 틱 전체 시간(요청부터, 단계 사이 브로커 대기 포함)을 예산과 비교해 기록합니다.
+    주문 직전에 틱이 오래되었으면 주문하지 않습니다.
+    """
+    if payload is None:
+        return None
+    pipeline = get_pipeline()
+    event = payload["event"]
+    orders = []
+    if payload["signals"]:
+        if pipeline.gate.check(event) != ACCEPTED:
+            return None
+        stage_started = t.perf_counter()
+        orders = pipeline.place_orders(payload["signals"], event.get("reference_price"), payload["signal_time"])
+        payload["timings"]["order"] = (t.perf_counter() - stage_started) * 1000
+    pipeline.gate.complete(event["market"])
+
+    record = pipeline.record(event, payload["timings"], total_ms=(t.time() - payload["started_at"]) * 1000)
+    return dict(record, orders=len(orders))
+
+
+@shared_task
+def operation_backpressure_stats_task(markets=None):
+    """
+    종목별 틱 요청/처리/버림 카운터와 브로커 큐 길이를 반환하는 Celery 작업.
+    """
+    markets = settings.OPERATION_MARKETS if markets is None else markets
+    return {"ticks": get_pipeline().gate.stats(markets), "queues": broker_queue_depths()}
+
+
+@shared_task
+def latency_probe_task(sent_at, work_seconds=0.0):
+    """
+    큐 대기 시간을 측정하는 진단 작업 (celery_load_test). work_seconds 동안 워커 슬롯을 차지해 부하로도 사용합니다.
+
+    :param sent_at: 작업을 보낸 시각 (epoch 초)
+    :return: {'queue_ms': 전송 ~ 실행 시작, 'hostname'}
+    """
+    queue_ms = (t.time() - sent_at) * 1000
+    if work_seconds:
+        t.sleep(work_seconds)
+    return {"queue_ms": queue_ms, "hostname": latency_probe_task.request.hostname}
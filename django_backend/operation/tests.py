@@ -0,0 +1,268 @@
+# django_backend/operation/tests.py
+from unittest.mock import MagicMock, patch
+
+import redis
+from django.conf import settings
+from django.test import TestCase
+
+from django_backend.config.schedules import minute_offset
+from django_backend.data_provider.ingestion import last_closed_minute
+from django_backend.data_provider.models import UpbitData
+from django_backend.operation import tasks
+from django_backend.operation.backpressure import (
+    ACCEPTED, DUPLICATE, STALE, SUPERSEDED, LocalTickGate, TickGate,
+)
+from django_backend.operation.operation import OperationPipeline
+
+
+class TickGateTestCase(TestCase):
+
+    def setUp(self):
+        self.now_ms = 1_700_000_000_000
+        self.gate = LocalTickGate(max_age_ms=20000)
+        patcher = patch("django_backend.operation.backpressure.t.time", side_effect=lambda: self.now_ms / 1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def event(self, closed_at_ms, market="KRW-BTC"):
+        return {"market": market, "closed_at_ms": closed_at_ms}
+
+    def test_admit_keeps_only_latest_request(self):
+        first = self.gate.submit("KRW-BTC", 1000)
+        second = self.gate.submit("KRW-BTC", 2000)
+        # 밀려 있던 요청이 나중에 실행되어도 최신 요청은 되돌리지 않음
+        self.gate.submit("KRW-BTC", 1500)
+
+        self.assertEqual(self.gate.admit("KRW-BTC", first), SUPERSEDED)
+        self.assertEqual(self.gate.admit("KRW-BTC", second), ACCEPTED)
+        self.assertEqual(self.gate.admit("KRW-ETH", first), ACCEPTED)
+        counters = self.gate.counters("KRW-BTC")
+        self.assertEqual(counters["submitted"], 3)
+        self.assertEqual(counters["dropped_superseded"], 1)
+
+    def test_submit_defaults_to_now(self):
+        self.assertEqual(self.gate.submit("KRW-BTC"), self.now_ms)
+
+    def test_claim_rejects_duplicate_and_older_candles(self):
+        tick = self.now_ms - 1000
+        self.assertEqual(self.gate.claim(self.event(tick)), ACCEPTED)
+        self.assertEqual(self.gate.claim(self.event(tick)), DUPLICATE)
+        self.assertEqual(self.gate.claim(self.event(tick - 10000)), SUPERSEDED)
+        self.assertEqual(self.gate.check(self.event(tick)), ACCEPTED)
+
+        # 더 새로운 캔들을 처리하기 시작하면 이전 캔들로는 주문하지 않음
+        self.assertEqual(self.gate.claim(self.event(tick + 500)), ACCEPTED)
+        self.assertEqual(self.gate.check(self.event(tick)), SUPERSEDED)
+        self.assertEqual(self.gate.check(self.event(tick + 500)), ACCEPTED)
+
+        counters = self.gate.counters("KRW-BTC")
+        self.assertEqual(counters["dropped_duplicate"], 1)
+        self.assertEqual(counters["dropped_superseded"], 2)
+        self.assertEqual(counters["dropped_stale"], 0)
+
+    def test_stale_ticks_are_dropped(self):
+        self.assertEqual(self.gate.claim(self.event(self.now_ms - 20001)), STALE)
+
+        tick = self.now_ms - 1000
+        self.assertEqual(self.gate.claim(self.event(tick)), ACCEPTED)
+        self.now_ms += 19000
+        self.assertEqual(self.gate.check(self.event(tick)), ACCEPTED)
+        # 분석/전략이 밀려 주문 직전에 max_age_ms를 넘김
+        self.now_ms += 1
+        self.assertEqual(self.gate.check(self.event(tick)), STALE)
+        self.assertEqual(self.gate.counters("KRW-BTC")["dropped_stale"], 2)
+
+    def test_stats_counts_pending_ticks(self):
+        for submitted_ms in (1000, 2000, 3000):
+            self.gate.submit("KRW-BTC", submitted_ms)
+        self.gate.submit("KRW-ETH", 1000)
+        self.gate.admit("KRW-BTC", 1000)
+        self.gate.complete("KRW-BTC")
+
+        stats = self.gate.stats(["KRW-BTC", "KRW-ETH", "KRW-XRP"])
+        self.assertEqual(stats["KRW-BTC"], {
+            "submitted": 3, "processed": 1, "dropped_stale": 0, "dropped_superseded": 1, "dropped_duplicate": 0,
+            "pending": 1,
+        })
+        self.assertEqual(stats["KRW-ETH"]["pending"], 1)
+        self.assertEqual(stats["KRW-XRP"]["pending"], 0)
+
+    def test_redis_errors_only_check_tick_age(self):
+        client = MagicMock()
+        client.register_script.side_effect = redis.ConnectionError("down")
+        client.hgetall.side_effect = redis.ConnectionError("down")
+        gate = TickGate(redis_client=client, max_age_ms=20000)
+
+        self.assertEqual(gate.admit("KRW-BTC", 1000), ACCEPTED)
+        self.assertEqual(gate.claim(self.event(self.now_ms - 1000)), ACCEPTED)
+        self.assertEqual(gate.claim(self.event(self.now_ms - 1000)), ACCEPTED)
+        self.assertEqual(gate.check(self.event(self.now_ms - 20001)), STALE)
+        self.assertEqual(gate.stats(["KRW-BTC"])["KRW-BTC"]["pending"], 0)
+
+    def test_operation_tick_runs_after_ingestion(self):
+        schedule = settings.CELERY_BEAT_SCHEDULE["run-operation-tick-every-minute"]["schedule"]
+        self.assertIsInstance(schedule, minute_offset)
+        self.assertGreater(schedule.offset, settings.INGESTION_OFFSET_SECONDS)
+        self.assertLess(schedule.offset * 1000, settings.OPERATION_MAX_TICK_AGE_MS)
+
+
+class OperationTestBase(TestCase):
+
+    def setUp(self):
+        self.market = "KRW-BTC"
+        self.candle_time = last_closed_minute()
+        patcher = patch("django_backend.operation.operation.last_closed_minute", return_value=self.candle_time)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.runtime = MagicMock()
+        self.runtime.prepare.return_value = "prepared"
+        self.runtime.evaluate.return_value = [
+            {"market": self.market, "signal": {"action": "buy"}},
+            {"market": self.market, "signal": {"action": "hold"}},
+        ]
+        self.trader = MagicMock()
+        self.trader.send_request.return_value = {"uuid": "order-1"}
+        self.state_store = MagicMock()
+        self.state_store.balance.return_value = 0.5
+        # 캔들 마감 후 최대 1분이 지나므로 max_age_ms를 넉넉하게 설정
+        self.gate = LocalTickGate(max_age_ms=120000)
+        self.pipeline = self.build_pipeline(self.gate)
+
+    def build_pipeline(self, gate, **kwargs):
+        return OperationPipeline(
+            runtime=self.runtime, trader=self.trader, state_store=self.state_store, gate=gate, **kwargs
+        )
+
+    def store_candle(self):
+        return UpbitData.objects.create(
+            market=self.market, date_time=self.candle_time, opening_price=100.0, high_price=110.0,
+            low_price=90.0, closing_price=105.0, acc_price=1000.0, acc_volume=10.0,
+        )
+
+
+class OperationPipelineTestCase(OperationTestBase):
+
+    def test_collect_reads_ingested_candle(self):
+        self.store_candle()
+        event = self.pipeline.collect(self.market)
+
+        self.assertEqual(event["candle_time"], self.candle_time.strftime("%Y-%m-%dT%H:%M:%S"))
+        self.assertEqual(event["reference_price"], 105.0)
+        self.assertEqual(event["closed_at_ms"] % 60000, 0)
+        # 파이프라인은 캔들을 저장하지 않음 (수집기의 저장과 충돌하지 않음)
+        self.assertEqual(UpbitData.objects.count(), 1)
+
+    def test_collect_waits_for_ingestion(self):
+        with patch("django_backend.operation.operation.t.sleep", side_effect=lambda _: self.store_candle()) as sleep:
+            event = self.pipeline.collect(self.market)
+
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(event["reference_price"], 105.0)
+
+    def test_missing_candle_is_dropped_as_stale(self):
+        gate = LocalTickGate(max_age_ms=1)
+        result = self.build_pipeline(gate).run_tick(self.market)
+
+        self.assertEqual(result["dropped"], STALE)
+        self.assertIsNone(result["event"]["reference_price"])
+        self.runtime.prepare.assert_not_called()
+        self.trader.send_request.assert_not_called()
+        self.assertEqual(gate.stats([self.market])[self.market]["pending"], 0)
+
+    def test_run_tick_places_orders_once_per_candle(self):
+        self.store_candle()
+        result = self.pipeline.run_tick(self.market)
+
+        self.assertIsNone(result["dropped"])
+        self.assertEqual(len(result["signals"]), 2)
+        self.assertEqual(result["orders"], [{"uuid": "order-1"}])
+        self.assertEqual(set(result["timings"]), {"data", "analysis", "strategy", "order"})
+        self.runtime.prepare.assert_called_once_with(self.market, result["event"]["candle_time"])
+        self.runtime.evaluate.assert_called_once_with(self.market, result["event"]["candle_time"], "prepared")
+        self.trader.send_request.assert_called_once_with(
+            market=self.market, side="bid", price=settings.OPERATION_ORDER_AMOUNT, ord_type="price",
+            time_in_force=None,
+        )
+
+        # 같은 캔들로 다시 실행되면 주문하지 않음
+        self.assertEqual(self.pipeline.run_tick(self.market)["dropped"], DUPLICATE)
+        self.assertEqual(self.trader.send_request.call_count, 1)
+        stats = self.gate.stats([self.market])[self.market]
+        self.assertEqual((stats["processed"], stats["dropped_duplicate"], stats["pending"]), (1, 1, 0))
+        self.assertEqual(self.pipeline.latency_stats()["count"], 2)
+
+    def test_build_order(self):
+        sell = {"market": self.market, "signal": {"action": "sell"}}
+        self.assertEqual(self.pipeline.build_order(sell), {
+            "market": self.market, "side": "ask", "volume": 0.5, "ord_type": "market", "time_in_force": None,
+        })
+        self.state_store.balance.assert_called_with("BTC")
+
+        self.state_store.balance.return_value = 0
+        self.assertIsNone(self.pipeline.build_order(sell))
+        self.assertIsNone(self.pipeline.build_order({"market": self.market, "signal": {"action": "hold"}}))
+        self.assertIsNone(self.pipeline.build_order({"market": self.market, "signal": 1}))
+
+    def test_record_flags_stages_over_budget(self):
+        pipeline = self.build_pipeline(self.gate, tick_budget_ms=10, stage_budgets_ms={"data": 1, "analysis": 5})
+        event = {"market": self.market, "candle_time": "2024-10-19T05:10:00"}
+
+        record = pipeline.record(event, {"data": 2.0, "analysis": 1.0}, total_ms=20.0)
+        self.assertEqual(record["over_budget"], ["data", "total"])
+        self.assertEqual(pipeline.record(event, {"data": 0.5, "analysis": 1.0})["over_budget"], [])
+
+        stats = pipeline.latency_stats()
+        self.assertEqual(stats["count"], 2)
+        self.assertEqual(stats["over_budget_ratio"], 0.5)
+        self.assertNotIn("order", stats)
+
+
+class OperationTasksTestCase(OperationTestBase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(tasks, "_pipeline", self.pipeline)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_distributed_chain_places_orders(self):
+        self.store_candle()
+        payload = tasks.collect_stage_task(self.market, self.gate.submit(self.market))
+        payload = tasks.strategy_stage_task(payload)
+        self.assertEqual(set(payload["timings"]), {"data", "analysis", "strategy"})
+
+        result = tasks.order_stage_task(payload)
+        self.assertEqual(result["orders"], 1)
+        self.assertIn("order", result["timings"])
+        self.assertEqual(self.gate.stats([self.market])[self.market]["pending"], 0)
+
+    def test_superseded_chain_is_dropped(self):
+        self.store_candle()
+        first = self.gate.submit(self.market, 1000)
+        self.gate.submit(self.market, 2000)
+
+        payload = tasks.collect_stage_task(self.market, first)
+        self.assertIsNone(payload)
+        self.assertIsNone(tasks.order_stage_task(tasks.strategy_stage_task(payload)))
+        self.runtime.prepare.assert_not_called()
+        self.trader.send_request.assert_not_called()
+
+    def test_stale_chain_does_not_order(self):
+        self.store_candle()
+        payload = tasks.strategy_stage_task(tasks.collect_stage_task(self.market, self.gate.submit(self.market)))
+        # 주문 작업이 큐에서 기다리는 동안 틱이 오래됨
+        self.gate.max_age_ms = 1
+        self.assertIsNone(tasks.order_stage_task(payload))
+        self.trader.send_request.assert_not_called()
+
+    def test_run_operation_tick(self):
+        self.store_candle()
+        with self.settings(OPERATION_DISTRIBUTED=False):
+            result = tasks.run_operation_tick(markets=[self.market])
+        self.assertEqual(result[self.market]["orders"], 1)
+        self.assertIsNone(result[self.market]["dropped"])
+
+        with self.settings(OPERATION_DISTRIBUTED=True), patch.object(tasks, "chain") as chain:
+            self.assertEqual(tasks.run_operation_tick(markets=[self.market, "KRW-ETH"]), {"dispatched": 2})
+        self.assertEqual(chain.return_value.apply_async.call_count, 2)
@@ -0,0 +1,8 @@
+# django_backend/operation/urls.py
+from django.urls import path
+
+from django_backend.operation import views
+
+urlpatterns = [
+    path("backpressure/", views.backpressure_stats, name="backpressure-stats"),
+]
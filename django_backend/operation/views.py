@@ -0,0 +1,18 @@
+# django_backend/operation/views.py
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from django_backend.operation.backpressure import TickGate, broker_queue_depths
+
+
+@require_GET
+def backpressure_stats(request):
+    """
+    운영 파이프라인의 종목별 틱 카운터(요청/처리/버림/대기)와 Celery 브로커 큐 길이를 반환합니다.
+
+    쿼리 파라미터:
+        - market (선택, 여러 번 가능): 종목 코드 (기본값: settings.OPERATION_MARKETS)
+    """
+    markets = request.GET.getlist("market") or settings.OPERATION_MARKETS
+    return JsonResponse({"ticks": TickGate().stats(markets), "queues": broker_queue_depths()})
@@ -28,3 +28,19 @@ class TimeSeriesModel(ABC):
     def interpret_results(self, results):
         """예측 결과를 매매 신호 등으로 해석"""
         pass
+
+    def predict_batch(self, batch):
+        """
+        여러 입력(종목)에 대한 예측을 한 번에 수행합니다.
+        기본 구현은 predict를 반복 호출하므로, 벡터화가 가능한 모델은 재정의하여 한 번의 호출로 처리합니다.
+
+        :param batch: preprocess_data 결과 리스트
+        :return: 입력 순서와 같은 예측 결과 리스트
+        """
+        return [self.predict(data) for data in batch]
+
+    def memory_usage(self):
+        """
+        모델이 차지하는 메모리(bytes) 추정값. None이면 레지스트리가 속성을 기준으로 추정합니다.
+        """
+        return None
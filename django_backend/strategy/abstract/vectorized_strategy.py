@@ -0,0 +1,42 @@
+# django_backend/strategy/abstract/vectorized_strategy.py
+from abc import ABC, abstractmethod
+
+# 신호 값
+BUY, HOLD, SELL = 1, 0, -1
+
+
+class VectorizedStrategy(ABC):
+    """
+    전체 캔들 이력에 대한 신호를 한 번에 계산하는 전략을 위한 추상 클래스.
+
+    compute_signals는 각 캔들 시점에 그 캔들까지의 데이터만 사용해 신호를 계산해야 합니다.
+    이 조건을 지키면 같은 전략을 백테스트(전체 이력 한 번)와 실시간(strategy.signals.LiveSignalAdapter)에서
+    동일한 신호로 실행할 수 있으며, strategy.signals.check_signal_consistency로 검증할 수 있습니다.
+    """
+
+    # 마지막 캔들의 신호를 계산하는 데 필요한 캔들 개수 (실시간 실행 시 유지할 캔들 수)
+    lookback = 1
+
+    def initialize_strategy(self):
+        """전략 초기화 설정"""
+        pass
+
+    @abstractmethod
+    def compute_signals(self, data):
+        """
+        캔들 이력 전체의 신호를 계산합니다.
+
+        :param data: 시간 오름차순 캔들 DataFrame (date_time, open, high, low, close, volume, value)
+        :return: len(data) 길이의 int8 배열 (BUY=1, HOLD=0, SELL=-1)
+        """
+        pass
+
+    def interpret_signal(self, signal):
+        """
+        캔들 하나의 신호를 매매 정보로 변환합니다. HOLD이면 None을 반환합니다.
+        """
+        if signal == BUY:
+            return {"action": "buy"}
+        if signal == SELL:
+            return {"action": "sell"}
+        return None
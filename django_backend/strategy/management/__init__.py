@@ -0,0 +1 @@
+# django_backend/strategy/management/__init__.py
@@ -0,0 +1 @@
+# django_backend/strategy/management/commands/__init__.py
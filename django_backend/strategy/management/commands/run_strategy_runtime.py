@@ -0,0 +1,21 @@
+# django_backend/strategy/management/commands/run_strategy_runtime.py
+from django.core.management.base import BaseCommand
+
+from django_backend.strategy.services import build_runtime
+
+
+class Command(BaseCommand):
+    help = "캔들 마감 이벤트를 구독해 등록된 전략을 실행하는 전략 런타임을 시작합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from-id", default="$", help="읽기 시작할 스트림 이벤트 ID ('0'이면 처음부터)")
+
+    def handle(self, *args, **options):
+        runtime = build_runtime()
+        try:
+            runtime.run_forever(last_id=options["from_id"])
+        except KeyboardInterrupt:
+            runtime.stop()
+        finally:
+            runtime.close()
+        self.stdout.write(str(runtime.latency_stats()))
@@ -0,0 +1,253 @@
+# django_backend/strategy/model_registry.py
+import logging
+import sys
+import threading
+import time as t
+from collections import OrderedDict, defaultdict, deque
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_memory(model):
+    """
+    모델이 차지하는 메모리(bytes)를 추정합니다.
+    model.memory_usage()가 값을 반환하면 그 값을, 아니면 인스턴스 속성의 배열/DataFrame 크기 합을 사용합니다.
+    """
+    reported = model.memory_usage() if hasattr(model, 'memory_usage') else None
+    if reported is not None:
+        return int(reported)
+
+    total = sys.getsizeof(model)
+    for value in vars(model).values():
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+        elif isinstance(value, (pd.DataFrame, pd.Series)):
+            total += int(np.sum(value.memory_usage(deep=True)))
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+
+class ModelRegistry:
+    """
+    워커 프로세스별 TimeSeriesModel 레지스트리.
+
+    모델은 처음 사용될 때 한 번만 생성/초기화(initialize_model)되어 프로세스에 상주하며,
+    상주 모델 수(max_models)나 추정 메모리 합계(max_memory_mb)를 넘으면 가장 오래 사용하지 않은 모델부터 내립니다.
+
+    여러 종목의 예측 요청은 submit으로 모아 두었다가 flush에서 모델별로 한 번의 predict_batch 호출로 처리합니다.
+    모델별 로드 시간, 배치 지연 시간, 처리량을 stats()로 확인할 수 있습니다.
+    """
+
+    LATENCY_HISTORY = 1000  # 지연 시간 통계에 사용할 최근 배치 수
+
+    def __init__(self, max_models=None, max_memory_mb=None, definitions=None):
+        """
+        :param max_models: 동시에 상주할 최대 모델 수
+        :param max_memory_mb: 상주 모델의 추정 메모리 합계 상한 (MB)
+        :param definitions: {이름: {'class': 경로, 'kwargs': {...}}} (기본값: settings.MODEL_REGISTRY)
+        """
+        self.max_models = settings.MODEL_REGISTRY_MAX_MODELS if max_models is None else max_models
+        self.max_memory_bytes = (
+            settings.MODEL_REGISTRY_MAX_MEMORY_MB if max_memory_mb is None else max_memory_mb
+        ) * 1024 * 1024
+        self.logger = logger
+
+        self._factories = {}  # 이름 -> 모델 생성 함수
+        self._models = OrderedDict()  # 이름 -> (모델, 추정 메모리). LRU 순서
+        self._pending = defaultdict(OrderedDict)  # 이름 -> {요청 키: 데이터}
+        self._lock = threading.RLock()
+        self._stats = defaultdict(lambda: {
+            "loads": 0,
+            "load_seconds": 0.0,
+            "evictions": 0,
+            "batches": 0,
+            "items": 0,
+            "errors": 0,
+            "predict_seconds": 0.0,
+            "batch_ms": deque(maxlen=self.LATENCY_HISTORY),
+        })
+
+        for name, definition in (settings.MODEL_REGISTRY if definitions is None else definitions).items():
+            self.register(name, definition["class"], **definition.get("kwargs", {}))
+
+    def register(self, name, factory, **kwargs):
+        """
+        모델 생성 방법을 등록합니다. 모델은 실제로 사용될 때 생성됩니다.
+
+        :param name: 모델 이름
+        :param factory: TimeSeriesModel 클래스, 생성 함수 또는 클래스 경로 문자열
+        :param kwargs: 생성 인자
+        """
+        with self._lock:
+            if name in self._models:
+                self.unload(name)
+            self._factories[name] = (factory, kwargs)
+
+    def get(self, name):
+        """
+        이름에 해당하는 초기화된 모델을 반환합니다. 상주하지 않으면 생성 후 상주시킵니다.
+        """
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                return self._models[name][0]
+            return self._load(name)
+
+    def _load(self, name):
+        if name not in self._factories:
+            raise ValueError(f"Unregistered model: {name}")
+        factory, kwargs = self._factories[name]
+        if isinstance(factory, str):
+            factory = import_string(factory)
+
+        started = t.perf_counter()
+        model = factory(**kwargs)
+        model.initialize_model()
+        elapsed = t.perf_counter() - started
+
+        memory = estimate_memory(model)
+        self._models[name] = (model, memory)
+        stats = self._stats[name]
+        stats["loads"] += 1
+        stats["load_seconds"] += elapsed
+        self.logger.info(f"모델 로드: {name} ({elapsed:.2f}초, 약 {memory / 1024 / 1024:.1f}MB)")
+        self._evict(keep=name)
+        return model
+
+    def _evict(self, keep):
+        """
+        상한을 넘는 동안 가장 오래 사용하지 않은 모델을 내립니다. 방금 로드한 모델(keep)은 유지합니다.
+        """
+        while len(self._models) > 1 and (
+            len(self._models) > self.max_models or self.memory_usage() > self.max_memory_bytes
+        ):
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            self.unload(oldest)
+            self._stats[oldest]["evictions"] += 1
+
+        if self.memory_usage() > self.max_memory_bytes:
+            self.logger.warning(
+                f"모델 {keep}의 추정 메모리가 상한 {self.max_memory_bytes / 1024 / 1024:.0f}MB를 초과합니다."
+            )
+
+    def unload(self, name):
+        """
+        상주 중인 모델을 내립니다.
+        """
+        with self._lock:
+            if self._models.pop(name, None) is not None:
+                self.logger.info(f"모델 해제: {name}")
+
+    def loaded(self):
+        """
+        상주 중인 모델 이름 목록 (오래 사용하지 않은 순).
+        """
+        return list(self._models)
+
+    def memory_usage(self):
+        """
+        상주 모델의 추정 메모리 합계 (bytes).
+        """
+        return sum(memory for _, memory in self._models.values())
+
+    def predict(self, name, data):
+        """
+        단일 입력 예측. preprocess_data -> predict -> postprocess_results -> interpret_results 순으로 실행합니다.
+        """
+        return self.predict_batch(name, {None: data})[None]
+
+    def predict_batch(self, name, inputs):
+        """
+        여러 입력을 모델의 predict_batch 한 번으로 예측합니다.
+
+        :param name: 모델 이름
+        :param inputs: {요청 키(예: 종목 코드): 원본 데이터}
+        :return: {요청 키: 해석된 예측 결과}. 전처리나 후처리에 실패한 키는 결과에서 제외됩니다.
+        """
+        model = self.get(name)
+        stats = self._stats[name]
+
+        keys, batch = [], []
+        for key, data in inputs.items():
+            try:
+                batch.append(model.preprocess_data(data))
+                keys.append(key)
+            except Exception as e:
+                stats["errors"] += 1
+                self.logger.error(f"전처리 오류 ({name}, {key}): {e}")
+        if not batch:
+            return {}
+
+        started = t.perf_counter()
+        predictions = model.predict_batch(batch)
+        elapsed = t.perf_counter() - started
+        stats["batches"] += 1
+        stats["items"] += len(batch)
+        stats["predict_seconds"] += elapsed
+        stats["batch_ms"].append(elapsed * 1000)
+
+        results = {}
+        for key, prediction in zip(keys, predictions):
+            try:
+                results[key] = model.interpret_results(model.postprocess_results(prediction))
+            except Exception as e:
+                stats["errors"] += 1
+                self.logger.error(f"후처리 오류 ({name}, {key}): {e}")
+        return results
+
+    def submit(self, name, key, data):
+        """
+        예측 요청을 대기열에 넣습니다. 같은 (모델, 키) 요청이 이미 있으면 최신 데이터로 교체합니다.
+        """
+        with self._lock:
+            self._pending[name][key] = data
+
+    def flush(self):
+        """
+        대기 중인 요청을 모델별로 묶어 예측합니다.
+
+        :return: {모델 이름: {요청 키: 결과}}
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(OrderedDict)
+
+        results = {}
+        for name, inputs in pending.items():
+            try:
+                results[name] = self.predict_batch(name, inputs)
+            except Exception as e:
+                self._stats[name]["errors"] += 1
+                self.logger.error(f"배치 예측 오류 ({name}): {e}")
+                results[name] = {}
+        return results
+
+    def stats(self):
+        """
+        모델별 로드/예측 통계를 반환합니다.
+        """
+        report = {}
+        for name, stats in self._stats.items():
+            batch_ms = np.array(stats["batch_ms"])
+            entry = {key: value for key, value in stats.items() if key != "batch_ms"}
+            entry["resident"] = name in self._models
+            entry["memory_mb"] = self._models[name][1] / 1024 / 1024 if name in self._models else 0.0
+            entry["mean_batch_size"] = stats["items"] / stats["batches"] if stats["batches"] else 0.0
+            entry["items_per_second"] = (
+                stats["items"] / stats["predict_seconds"] if stats["predict_seconds"] else None
+            )
+            if len(batch_ms):
+                entry["batch_ms_p50"], entry["batch_ms_p95"] = np.percentile(batch_ms, [50, 95])
+            report[name] = entry
+        return report
+
+
+# 워커 프로세스별 모델 레지스트리 (Celery prefork 워커는 fork 이후 처음 사용할 때 모델을 로드)
+model_registry = ModelRegistry()
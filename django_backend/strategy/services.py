@@ -1 +1,259 @@
-# django_backend/strategy/services.py
\ No newline at end of file
+# django_backend/strategy/services.py
+import json
+import logging
+import time as t
+from collections import defaultdict, deque
+from datetime import datetime
+
+import numpy as np
+import redis
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_backend.analyzer.services import TechnicalAnalyzer
+from django_backend.strategy.abstract.vectorized_strategy import VectorizedStrategy
+from django_backend.strategy.signals import LiveSignalAdapter
+from django_backend.strategy.snapshot import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+class StrategyRuntime:
+    """
+    '캔들 마감' 이벤트를 구독해 해당 종목/분봉에 등록된 전략을 즉시 실행하는 런타임.
+
+    데이터 수집기가 1분봉을 저장하면 settings.CANDLE_CLOSED_STREAM에 이벤트가 발행되고,
+    런타임은 그 분에 마감된 모든 분봉(1분, 5분, ...)의 전략을 실행합니다.
+    같은 (종목, 분봉, 틱)의 캔들 데이터는 한 번만 로드해 공유 메모리 스냅샷(strategy.snapshot)으로 만들고,
+    모든 전략은 같은 메모리를 가리키는 읽기 전용 DataFrame을 받습니다.
+    다른 프로세스의 전략은 latest_snapshot이 반환하는 descriptor로 같은 스냅샷에 연결할 수 있습니다.
+
+    생성된 신호는 settings.SIGNAL_STREAM에 발행되며, 캔들 마감부터 신호 생성까지의 지연 시간을 기록합니다.
+    """
+
+    LATENCY_HISTORY = 1000  # 지연 시간 통계에 사용할 최근 기록 수
+
+    def __init__(self, redis_client=None, latency_target_ms=None):
+        self.logger = logger
+        self.redis_client = redis_client or redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.latency_target_ms = latency_target_ms or settings.STRATEGY_LATENCY_TARGET_MS
+        self._registry = defaultdict(lambda: defaultdict(list))  # market -> timeframe -> [등록 정보]
+        self._latencies = deque(maxlen=self.LATENCY_HISTORY)
+        self._strategy_seconds = defaultdict(lambda: deque(maxlen=self.LATENCY_HISTORY))
+        self.snapshots = SnapshotStore()
+        self._running = False
+
+    def register(self, strategy, market, timeframe=1, candle_count=200, name=None):
+        """
+        전략을 등록하고 초기화합니다.
+
+        :param strategy: TradingStrategy 구현체
+        :param market: 종목 코드 (예: 'KRW-BTC')
+        :param timeframe: 전략이 사용하는 분봉 단위
+        :param candle_count: 전략에 전달할 캔들 개수
+        :param name: 신호와 통계에 사용할 이름 (기본값: 클래스 이름)
+        """
+        strategy.initialize_strategy()
+        self._registry[market][timeframe].append({
+            "strategy": strategy,
+            "name": name or type(strategy).__name__,
+            "candle_count": candle_count,
+        })
+        self.logger.info(f"전략 등록: {name or type(strategy).__name__} ({market}, {timeframe}분봉)")
+
+    def due_timeframes(self, market, candle_time):
+        """
+        candle_time 1분봉이 마감되면서 함께 마감된 등록 분봉 목록을 반환합니다.
+        """
+        closed_minute = int(np.datetime64(candle_time, 'm').astype(np.int64)) + 1
+        return [timeframe for timeframe in self._registry.get(market, {}) if closed_minute % timeframe == 0]
+
+    def load_candles(self, market, timeframe, candle_count):
+        """
+        전략에 전달할 캔들 데이터를 로드합니다.
+        """
+        return TechnicalAnalyzer(market=market).load_timeframe_data(timeframe=timeframe, period=candle_count)
+
+    def latest_snapshot(self, market, timeframe):
+        """
+        (종목, 분봉)의 최근 스냅샷 descriptor. 다른 프로세스에서 MarketSnapshot.attach로 연결합니다.
+        """
+        return self.snapshots.latest(market, timeframe)
+
+    def prepare(self, market, candle_time):
+        """
+        candle_time 1분봉 마감으로 함께 마감된 분봉마다 캔들 스냅샷을 준비합니다 (분석 단계).
+
+        :param candle_time: 마감된 1분봉 시각 문자열 (KST, '%Y-%m-%dT%H:%M:%S')
+        :return: [(분봉 단위, 스냅샷), ...]
+        """
+        prepared = []
+        for timeframe in self.due_timeframes(market, datetime.strptime(candle_time, "%Y-%m-%dT%H:%M:%S")):
+            registrations = self._registry[market][timeframe]
+            candle_count = max(reg["candle_count"] for reg in registrations)
+            snapshot = self.snapshots.get_or_build(
+                market, timeframe, candle_time,
+                lambda: self.load_candles(market, timeframe, candle_count)
+            )
+            prepared.append((timeframe, snapshot))
+        return prepared
+
+    def evaluate(self, market, candle_time, prepared):
+        """
+        준비된 스냅샷으로 등록된 전략을 실행합니다 (전략 단계).
+
+        :param prepared: prepare의 반환값
+        :return: 생성된 신호 리스트
+        """
+        results = []
+        for timeframe, snapshot in prepared:
+            for registration in self._registry[market][timeframe]:
+                result = self._run_strategy(registration, snapshot.as_frame())
+                if result is not None:
+                    results.append({
+                        "market": market,
+                        "timeframe": timeframe,
+                        "strategy": registration["name"],
+                        "candle_time": candle_time,
+                        "signal": result,
+                    })
+        return results
+
+    def dispatch(self, event):
+        """
+        캔들 마감 이벤트 하나를 처리합니다.
+
+        :param event: {'market', 'candle_time', 'closed_at_ms', 'published_at_ms'}
+        :return: 생성된 신호 리스트
+        """
+        received_at = t.time()
+        prepared = self.prepare(event["market"], event["candle_time"])
+        results = self.evaluate(event["market"], event["candle_time"], prepared)
+
+        if results:
+            self._publish_signals(results)
+        if prepared:
+            self._record_latency(event, received_at, len(results))
+        return results
+
+    def _run_strategy(self, registration, data):
+        """
+        TradingStrategy의 단계를 순서대로 실행합니다. 한 전략의 오류가 다른 전략 실행을 막지 않습니다.
+        """
+        strategy = registration["strategy"]
+        started = t.perf_counter()
+        try:
+            prepared = strategy.prepare_data(data)
+            if not strategy.evaluate_conditions(prepared):
+                return None
+            return strategy.interpret_signals(strategy.generate_signals(prepared))
+        except Exception as e:
+            self.logger.error(f"전략 실행 오류 ({registration['name']}): {e}")
+            return None
+        finally:
+            self._strategy_seconds[registration["name"]].append(t.perf_counter() - started)
+
+    def _publish_signals(self, results):
+        now_ms = int(t.time() * 1000)
+        for result in results:
+            fields = dict(result, signal=json.dumps(result["signal"], default=str), created_at_ms=now_ms)
+            try:
+                self.redis_client.xadd(
+                    settings.SIGNAL_STREAM, fields,
+                    maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True
+                )
+            except redis.RedisError as e:
+                self.logger.error(f"신호 발행 실패: {e}")
+
+    def _record_latency(self, event, received_at, signal_count):
+        """
+        캔들 마감 -> 신호 생성, 이벤트 발행 -> 신호 생성 지연 시간을 기록합니다.
+        """
+        now_ms = t.time() * 1000
+        record = {
+            "close_to_signal_ms": now_ms - float(event["closed_at_ms"]),
+            "publish_to_signal_ms": now_ms - float(event["published_at_ms"]),
+            "dispatch_ms": now_ms - received_at * 1000,
+            "signals": signal_count,
+        }
+        self._latencies.append(record)
+        if record["publish_to_signal_ms"] > self.latency_target_ms:
+            self.logger.warning(
+                f"신호 생성 지연 {record['publish_to_signal_ms']:.1f}ms가 목표 {self.latency_target_ms}ms를 초과했습니다 "
+                f"({event['market']} {event['candle_time']})"
+            )
+
+    def latency_stats(self):
+        """
+        최근 지연 시간 백분위수(ms)와 전략별 평균 실행 시간을 반환합니다.
+        """
+        stats = {"count": len(self._latencies)}
+        for key in ("close_to_signal_ms", "publish_to_signal_ms", "dispatch_ms"):
+            values = np.array([record[key] for record in self._latencies])
+            if len(values):
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                stats[key] = {"p50": p50, "p95": p95, "p99": p99, "max": values.max()}
+        stats["strategy_ms"] = {
+            name: 1000 * float(np.mean(seconds)) for name, seconds in self._strategy_seconds.items() if seconds
+        }
+        stats["snapshots"] = self.snapshots.stats()
+        return stats
+
+    def run_forever(self, block_ms=1000, last_id="$"):
+        """
+        캔들 마감 스트림을 구독하며 이벤트마다 dispatch를 호출합니다.
+
+        :param block_ms: XREAD 대기 시간 (stop 호출 후 종료까지 최대 대기 시간)
+        :param last_id: 읽기 시작할 이벤트 ID ('$'는 실행 이후 발행된 이벤트부터)
+        """
+        self._running = True
+        self.logger.info(f"전략 런타임 시작: {settings.CANDLE_CLOSED_STREAM}")
+        while self._running:
+            try:
+                response = self.redis_client.xread({settings.CANDLE_CLOSED_STREAM: last_id}, count=100, block=block_ms)
+            except redis.RedisError as e:
+                self.logger.error(f"캔들 마감 스트림 읽기 실패: {e}")
+                t.sleep(1)
+                continue
+            for _, messages in response or []:
+                for message_id, fields in messages:
+                    last_id = message_id
+                    try:
+                        self.dispatch(fields)
+                    except Exception:
+                        # 데이터 로드/DB 오류가 있어도 상주 루프는 다음 이벤트를 계속 처리
+                        self.logger.exception(f"캔들 마감 이벤트 처리 실패: {message_id} {fields}")
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        """
+        런타임이 소유한 공유 메모리 스냅샷을 해제합니다.
+        """
+        self.snapshots.close()
+
+
+def build_runtime(registry=None):
+    """
+    settings.STRATEGY_REGISTRY 항목으로 전략을 생성해 등록한 런타임을 반환합니다.
+    VectorizedStrategy는 LiveSignalAdapter로 감싸 캔들 단위로 실행합니다.
+    """
+    runtime = StrategyRuntime()
+    for entry in registry if registry is not None else settings.STRATEGY_REGISTRY:
+        strategy = import_string(entry["class"])(**entry.get("kwargs", {}))
+        if isinstance(strategy, VectorizedStrategy):
+            strategy = LiveSignalAdapter(strategy)
+        runtime.register(
+            strategy,
+            market=entry["market"],
+            timeframe=entry.get("timeframe", 1),
+            candle_count=entry.get("candle_count", 200),
+            name=entry.get("name") or entry["class"].rsplit(".", 1)[-1],
+        )
+    return runtime
@@ -0,0 +1,108 @@
+# django_backend/strategy/signals.py
+import logging
+
+import numpy as np
+import pandas as pd
+
+from django_backend.strategy.abstract.trading_strategy import TradingStrategy
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSignalAdapter(TradingStrategy):
+    """
+    VectorizedStrategy를 실시간(캔들 단위)으로 실행하는 TradingStrategy 어댑터.
+
+    새로 들어온 캔들만 내부 버퍼에 이어 붙이고 최근 lookback개 캔들에 대해서만 compute_signals를 호출하므로,
+    캔들마다의 계산량은 이력 길이와 무관합니다. StrategyRuntime에 TradingStrategy로 등록할 수 있습니다.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.lookback = strategy.lookback
+        self._window = None
+        self.last_signal = None
+
+    def initialize_strategy(self):
+        self.strategy.initialize_strategy()
+        self._window = None
+        self.last_signal = None
+
+    def update(self, candles):
+        """
+        새 캔들을 버퍼에 추가합니다. 이미 받은 시각의 캔들은 무시합니다.
+
+        :param candles: 시간 오름차순 캔들 DataFrame (이전 캔들이 겹쳐도 됨)
+        :return: 최근 lookback개 캔들 DataFrame
+        """
+        if self._window is not None and len(self._window):
+            candles = candles[candles['date_time'] > self._window['date_time'].iloc[-1]]
+            candles = pd.concat([self._window, candles], ignore_index=True)
+        self._window = candles.iloc[-self.lookback:].reset_index(drop=True)
+        return self._window
+
+    def prepare_data(self, data):
+        return self.update(data)
+
+    def evaluate_conditions(self, data):
+        return len(data) >= self.lookback
+
+    def generate_signals(self, data):
+        self.last_signal = int(self.strategy.compute_signals(data)[-1])
+        return self.last_signal
+
+    def interpret_signals(self, signals):
+        return self.strategy.interpret_signal(signals)
+
+    def step(self, candles):
+        """
+        캔들을 추가하고 마지막 캔들의 신호를 반환합니다. 캔들이 lookback개 미만이면 0(HOLD)입니다.
+        """
+        window = self.update(candles)
+        if not self.evaluate_conditions(window):
+            return 0
+        return self.generate_signals(window)
+
+
+def check_signal_consistency(strategy, history, start=None, max_mismatches=20):
+    """
+    전체 이력에 대한 벡터 신호와, 같은 이력을 캔들 하나씩 실시간 어댑터에 넣어 얻은 신호를 비교합니다.
+    불일치는 미래 데이터 참조(look-ahead)나 lookback보다 긴 이력에 의존하는 계산을 뜻합니다.
+
+    :param strategy: VectorizedStrategy 구현체
+    :param history: 시간 오름차순 캔들 DataFrame
+    :param start: 비교를 시작할 행 번호 (기본값: strategy.lookback - 1, 이전 행은 실시간 신호가 항상 HOLD)
+    :param max_mismatches: 결과에 담을 최대 불일치 개수
+    :return: {'checked': 비교한 캔들 수, 'mismatch_count', 'mismatches': [{'index', 'date_time', 'vectorized', 'live'}], 'consistent'}
+    """
+    history = history.reset_index(drop=True)
+    vectorized = np.asarray(strategy.compute_signals(history))
+    if len(vectorized) != len(history):
+        raise ValueError(f"compute_signals returned {len(vectorized)} signals for {len(history)} candles")
+
+    start = strategy.lookback - 1 if start is None else start
+    adapter = LiveSignalAdapter(strategy)
+    adapter.initialize_strategy()
+
+    live = np.zeros(len(history), dtype=np.int8)
+    for i in range(len(history)):
+        live[i] = adapter.step(history.iloc[i:i + 1])
+
+    mismatch_index = np.flatnonzero(vectorized[start:] != live[start:]) + start
+    mismatches = [
+        {
+            'index': int(i),
+            'date_time': history['date_time'].iloc[i],
+            'vectorized': int(vectorized[i]),
+            'live': int(live[i]),
+        }
+        for i in mismatch_index[:max_mismatches]
+    ]
+    if len(mismatch_index):
+        logger.warning(f"{type(strategy).__name__}: 실시간/벡터 신호 불일치 {len(mismatch_index)}건")
+    return {
+        'checked': max(len(history) - start, 0),
+        'mismatch_count': len(mismatch_index),
+        'mismatches': mismatches,
+        'consistent': len(mismatch_index) == 0,
+    }
@@ -0,0 +1,196 @@
+# django_backend/strategy/snapshot.py
+import ctypes
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from django_backend.analyzer.arrays import FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class MarketSnapshot:
+    """
+    (종목, 분봉, 틱) 단위의 변경 불가능한 열 기반 캔들 스냅샷.
+
+    캔들 데이터를 공유 메모리 한 블록에 [시각(int64, ns) | FIELDS 순서의 float64 열] 형태로 저장하고,
+    모든 전략에 같은 메모리를 가리키는 읽기 전용 NumPy 뷰를 전달합니다.
+    다른 프로세스는 descriptor(직렬화 가능한 dict)로 attach해 복사 없이 같은 데이터를 읽습니다.
+
+    NOTE: 스냅샷을 만든 프로세스(owner)만 unlink할 수 있으며, attach한 쪽은 사용 후 close만 호출합니다.
+    unlink 후에도 매핑은 close 전까지 유효하고, close는 as_frame/column으로 받은 뷰가 남아 있으면 매핑을 닫지 않습니다.
+    """
+
+    def __init__(self, shm, market, timeframe, tick, n_rows, owner=False):
+        self._shm = shm
+        self.market = market
+        self.timeframe = timeframe
+        self.tick = tick
+        self.n_rows = n_rows
+        self.owner = owner
+
+        # NumPy 배열은 버퍼를 export한 채로 두지 않으므로 shm.buf에 직접 만든 뷰가 남아 있어도 shm.close()가 매핑을 해제해
+        # 해제된 메모리를 읽게 됩니다. ctypes 배열은 버퍼 export를 유지하므로, 이를 base로 한 뷰가 하나라도 남아 있으면
+        # shm.close()가 BufferError로 실패하고 매핑이 유지됩니다.
+        buf = (ctypes.c_char * len(shm.buf)).from_buffer(shm.buf)
+        self.times = np.ndarray((n_rows,), dtype='datetime64[ns]', buffer=buf)
+        self.values = np.ndarray((len(FIELDS), n_rows), dtype=np.float64, buffer=buf, offset=8 * n_rows)
+        self.times.flags.writeable = False
+        self.values.flags.writeable = False
+
+    @classmethod
+    def create(cls, frame, market, timeframe, tick, time_column=None):
+        """
+        load_timeframe_data 형식의 DataFrame으로 공유 메모리 스냅샷을 만듭니다.
+
+        :param frame: 시각 열과 FIELDS 열을 가진 DataFrame
+        :param time_column: 시각 열 이름 (기본값: 'date_time', 없으면 'bucket_time')
+        """
+        if time_column is None:
+            time_column = 'date_time' if 'date_time' in frame else 'bucket_time'
+        n_rows = len(frame)
+        # 크기 0인 공유 메모리는 만들 수 없으므로 최소 1바이트 할당
+        shm = shared_memory.SharedMemory(create=True, size=max(8 * n_rows * (1 + len(FIELDS)), 1))
+        try:
+            times = np.ndarray((n_rows,), dtype='datetime64[ns]', buffer=shm.buf)
+            values = np.ndarray((len(FIELDS), n_rows), dtype=np.float64, buffer=shm.buf, offset=8 * n_rows)
+            times[:] = pd.to_datetime(frame[time_column]).to_numpy(dtype='datetime64[ns]')
+            values[:] = frame[list(FIELDS)].to_numpy(dtype=np.float64, na_value=np.nan).T
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, market, timeframe, tick, n_rows, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        다른 프로세스에서 만든 스냅샷에 연결합니다.
+        """
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+        return cls(shm, descriptor['market'], descriptor['timeframe'], descriptor['tick'], descriptor['n_rows'])
+
+    @property
+    def descriptor(self):
+        return {
+            'name': self._shm.name,
+            'market': self.market,
+            'timeframe': self.timeframe,
+            'tick': self.tick,
+            'n_rows': self.n_rows,
+        }
+
+    def column(self, name):
+        """
+        FIELDS 열 하나의 읽기 전용 뷰.
+        """
+        return self.values[FIELDS.index(name)]
+
+    def as_frame(self):
+        """
+        스냅샷을 가리키는 DataFrame(date_time, open, high, low, close, volume, value)을 반환합니다.
+        가격 열은 공유 메모리를 그대로 사용하며 읽기 전용이므로, 값을 바꾸려면 copy() 후 수정해야 합니다.
+        """
+        frame = pd.DataFrame(self.values.T, columns=list(FIELDS), copy=False)
+        frame.insert(0, 'date_time', pd.DatetimeIndex(self.times, copy=False))
+        return frame
+
+    def close(self):
+        """
+        매핑을 닫습니다. 이후 스냅샷의 times/values는 사용할 수 없습니다.
+
+        :return: 닫았으면 True. 밖에서 받은 뷰(DataFrame 등)가 아직 남아 있으면 False이며,
+                 뷰가 모두 해제된 뒤 다시 호출해야 합니다
+        """
+        self.times = self.values = None
+        try:
+            self._shm.close()
+        except BufferError:
+            return False
+        return True
+
+    def unlink(self):
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotStore:
+    """
+    런타임 프로세스가 소유하는 스냅샷 저장소.
+
+    같은 (종목, 분봉, 틱)에 대해 데이터를 한 번만 로드해 스냅샷을 만들고,
+    (종목, 분봉)별로 최근 keep개 틱의 스냅샷만 유지합니다.
+    이전 틱을 바로 해제하지 않는 것은 다른 프로세스가 아직 attach 중일 수 있기 때문입니다.
+    해제된 틱의 DataFrame을 전략이 아직 들고 있으면 이름만 unlink하고, 매핑은 참조가 사라진 뒤 닫습니다.
+    """
+
+    def __init__(self, keep=2):
+        self.keep = keep
+        self.logger = logger
+        self._snapshots = defaultdict(OrderedDict)  # (market, timeframe) -> {tick: MarketSnapshot}
+        self._retired = []  # unlink했지만 뷰가 남아 있어 아직 닫지 못한 스냅샷
+        self._lock = threading.Lock()
+        self._stats = {"builds": 0, "hits": 0, "released": 0}
+
+    def get_or_build(self, market, timeframe, tick, loader):
+        """
+        스냅샷을 반환합니다. 없으면 loader()가 반환한 DataFrame으로 만듭니다.
+        """
+        with self._lock:
+            ticks = self._snapshots[(market, timeframe)]
+            if tick in ticks:
+                self._stats["hits"] += 1
+                return ticks[tick]
+
+            self._close_retired()
+            snapshot = MarketSnapshot.create(loader(), market, timeframe, tick)
+            ticks[tick] = snapshot
+            self._stats["builds"] += 1
+            while len(ticks) > self.keep:
+                _, old = ticks.popitem(last=False)
+                self._release(old)
+            return snapshot
+
+    def latest(self, market, timeframe):
+        """
+        (종목, 분봉)의 가장 최근 스냅샷 descriptor. 없으면 None.
+        """
+        ticks = self._snapshots.get((market, timeframe))
+        if not ticks:
+            return None
+        return next(reversed(ticks.values())).descriptor
+
+    def _release(self, snapshot):
+        snapshot.unlink()
+        if not snapshot.close():
+            self._retired.append(snapshot)
+        self._stats["released"] += 1
+
+    def _close_retired(self):
+        self._retired = [snapshot for snapshot in self._retired if not snapshot.close()]
+
+    def close(self):
+        """
+        모든 스냅샷을 해제합니다.
+        """
+        with self._lock:
+            for ticks in self._snapshots.values():
+                for snapshot in ticks.values():
+                    self._release(snapshot)
+            self._snapshots.clear()
+            self._close_retired()
+
+    def stats(self):
+        return dict(
+            self._stats, resident=sum(len(ticks) for ticks in self._snapshots.values()), retired=len(self._retired)
+        )
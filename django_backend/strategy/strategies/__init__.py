@@ -0,0 +1 @@
+# django_backend/strategy/strategies/__init__.py
@@ -0,0 +1,33 @@
+# django_backend/strategy/strategies/sma_cross.py
+import numpy as np
+
+from django_backend.analyzer.indicators import sma_sweep
+from django_backend.strategy.abstract.vectorized_strategy import BUY, SELL, VectorizedStrategy
+
+
+class SmaCrossStrategy(VectorizedStrategy):
+    """
+    단기/장기 단순 이동평균 교차 전략.
+    단기선이 장기선을 상향 돌파하면 매수, 하향 돌파하면 매도 신호를 냅니다.
+    """
+
+    def __init__(self, fast_period=5, slow_period=20):
+        if fast_period >= slow_period:
+            raise ValueError(f"Invalid periods: fast={fast_period}, slow={slow_period}")
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        # 직전 캔들의 장기선까지 필요
+        self.lookback = slow_period + 1
+
+    def compute_signals(self, data):
+        fast, slow = sma_sweep(data['close'].to_numpy(dtype=np.float64), [self.fast_period, self.slow_period]).T
+        valid = ~np.isnan(slow)
+        above = fast > slow
+        prev_above = np.concatenate(([False], above[:-1]))
+        prev_valid = np.concatenate(([False], valid[:-1]))
+
+        signals = np.zeros(len(data), dtype=np.int8)
+        both_valid = valid & prev_valid
+        signals[both_valid & above & ~prev_above] = BUY
+        signals[both_valid & ~above & prev_above] = SELL
+        return signals
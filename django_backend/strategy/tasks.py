@@ -1 +1,48 @@
-# django_backend/strategy/tasks.py
\ No newline at end of file
+# django_backend/strategy/tasks.py
+from celery import shared_task
+
+from django_backend.analyzer.services import TechnicalAnalyzer
+from django_backend.controller.simulator.optimizer import evaluate_params
+from django_backend.strategy.model_registry import model_registry
+from django_backend.strategy.services import build_runtime
+
+# 워커 프로세스별 런타임 (처음 호출 시 생성)
+_runtime = None
+
+
+@shared_task
+def dispatch_candle_closed_task(event):
+    """
+    캔들 마감 이벤트 하나를 Celery 워커에서 처리하는 작업.
+
+    NOTE: 평상시에는 run_strategy_runtime 프로세스가 스트림을 직접 구독하므로 브로커를 거치지 않습니다.
+    이 작업은 과거 이벤트 재처리나 런타임 프로세스가 없는 환경을 위한 경로입니다.
+    """
+    global _runtime
+    if _runtime is None:
+        _runtime = build_runtime()
+    return _runtime.dispatch(event)
+
+
+@shared_task
+def predict_markets_task(model_name, markets, timeframe=1, candle_count=200):
+    """
+    여러 종목에 대해 등록된 예측 모델을 한 번의 배치로 실행하는 작업.
+    모델은 워커 프로세스별 model_registry에 상주하므로 처음 호출될 때만 로드됩니다.
+
+    :return: {종목 코드: 해석된 예측 결과}
+    """
+    inputs = {
+        market: TechnicalAnalyzer(market=market).load_timeframe_data(timeframe=timeframe, period=candle_count)
+        for market in markets
+    }
+    return model_registry.predict_batch(model_name, inputs)
+
+
+@shared_task
+def run_backtest_chunk_task(strategy_path, params_list, data_path, start, timeframe, window, simulator_kwargs):
+    """
+    워크포워드 최적화의 백테스트 묶음 하나를 실행하는 작업 (settings.BACKTEST_QUEUE 큐).
+    인자는 controller.simulator.optimizer.evaluate_params와 같습니다.
+    """
+    return evaluate_params(strategy_path, params_list, data_path, start, timeframe, window, simulator_kwargs)
@@ -1,4 +1,586 @@
 # django_backend/strategy/tests.py
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time as t
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import redis
 from django.test import TestCase
 
-# Create your tests here.
+from django_backend.analyzer.arrays import CLOSE, FIELDS, OPEN, fill_missing_candles, to_frame
+from django_backend.analyzer.synthetic import generate_frame, generate_ohlcv, to_model_rows
+from django_backend.controller.simulator.monte_carlo import METHODS, MonteCarloSimulator
+from django_backend.controller.simulator.optimizer import (
+    WalkForwardOptimizer, evaluate_params, parameter_grid, walk_forward_folds,
+)
+from django_backend.controller.simulator.simulator import Simulator
+from django_backend.data_provider.models import UpbitData
+from django_backend.strategy.abstract.time_series_model import TimeSeriesModel
+from django_backend.strategy.abstract.trading_strategy import TradingStrategy
+from django_backend.strategy.abstract.vectorized_strategy import VectorizedStrategy
+from django_backend.strategy.model_registry import ModelRegistry
+from django_backend.strategy.services import StrategyRuntime, build_runtime
+from django_backend.strategy.signals import LiveSignalAdapter, check_signal_consistency
+from django_backend.strategy.snapshot import MarketSnapshot, SnapshotStore
+from django_backend.strategy.strategies.sma_cross import SmaCrossStrategy
+
+
+class LastCloseStrategy(TradingStrategy):
+    """마지막 종가를 신호로 반환하는 테스트용 전략"""
+
+    def initialize_strategy(self):
+        self.initialized = True
+
+    def prepare_data(self, data):
+        return data
+
+    def evaluate_conditions(self, data):
+        return not data.empty
+
+    def generate_signals(self, data):
+        return {"close": float(data['close'].iloc[-1]), "count": len(data)}
+
+    def interpret_signals(self, signals):
+        return signals
+
+
+class FailingStrategy(LastCloseStrategy):
+    def generate_signals(self, data):
+        raise RuntimeError("전략 오류")
+
+
+class StrategyRuntimeTestCase(TestCase):
+    def setUp(self):
+        self.market = "KRW-SYN"
+        start = np.datetime64('2024-01-01T09:00', 'm')
+        UpbitData.objects.bulk_create(
+            [UpbitData(**row) for row in to_model_rows(generate_ohlcv(60, seed=1), start, [self.market])]
+        )
+        self.redis_client = mock.MagicMock()
+        self.runtime = StrategyRuntime(redis_client=self.redis_client, latency_target_ms=1000)
+
+    def tearDown(self):
+        self.runtime.close()
+
+    def make_event(self, candle_time):
+        now_ms = int(t.time() * 1000)
+        return {
+            "market": self.market,
+            "timeframe": "1",
+            "candle_time": candle_time,
+            "closed_at_ms": str(now_ms),
+            "published_at_ms": str(now_ms),
+        }
+
+    def test_due_timeframes(self):
+        for timeframe in (1, 5, 15):
+            self.runtime.register(LastCloseStrategy(), self.market, timeframe=timeframe)
+
+        self.assertEqual(self.runtime.due_timeframes(self.market, datetime(2024, 1, 1, 9, 3)), [1])
+        # 09:14 1분봉이 마감되면 09:10 5분봉과 09:00 15분봉도 함께 마감
+        self.assertEqual(self.runtime.due_timeframes(self.market, datetime(2024, 1, 1, 9, 14)), [1, 5, 15])
+        self.assertEqual(self.runtime.due_timeframes("KRW-NONE", datetime(2024, 1, 1, 9, 14)), [])
+
+    def test_dispatch_loads_data_once_per_timeframe(self):
+        strategy = LastCloseStrategy()
+        self.runtime.register(strategy, self.market, timeframe=1, candle_count=30)
+        self.runtime.register(LastCloseStrategy(), self.market, timeframe=1, candle_count=20, name="short")
+        self.assertTrue(strategy.initialized)
+
+        with mock.patch.object(self.runtime, 'load_candles', wraps=self.runtime.load_candles) as load_candles:
+            results = self.runtime.dispatch(self.make_event("2024-01-01T09:59:00"))
+            self.assertEqual(self.redis_client.xadd.call_count, 2)
+            # 같은 틱의 재전송 이벤트는 스냅샷을 재사용
+            self.runtime.dispatch(self.make_event("2024-01-01T09:59:00"))
+        load_candles.assert_called_once_with(self.market, 1, 30)
+        self.assertEqual([r["strategy"] for r in results], ["LastCloseStrategy", "short"])
+        self.assertEqual(results[0]["signal"]["count"], 30)
+        self.assertEqual(self.runtime.latency_stats()["snapshots"]["hits"], 1)
+
+    def test_dispatch_runs_closed_timeframes_only(self):
+        self.runtime.register(LastCloseStrategy(), self.market, timeframe=1)
+        self.runtime.register(LastCloseStrategy(), self.market, timeframe=5, name="five")
+        frame = generate_frame(10).drop(columns='market')
+
+        with mock.patch.object(self.runtime, 'load_candles', return_value=frame):
+            results = self.runtime.dispatch(self.make_event("2024-01-01T09:59:00"))
+            self.assertEqual([(r["strategy"], r["timeframe"]) for r in results], [("LastCloseStrategy", 1), ("five", 5)])
+
+            # 5분봉이 마감되지 않은 분에는 1분봉 전략만 실행
+            results = self.runtime.dispatch(self.make_event("2024-01-01T09:57:00"))
+            self.assertEqual([r["strategy"] for r in results], ["LastCloseStrategy"])
+
+    def test_failing_strategy_does_not_block_others(self):
+        self.runtime.register(FailingStrategy(), self.market)
+        self.runtime.register(LastCloseStrategy(), self.market)
+
+        results = self.runtime.dispatch(self.make_event("2024-01-01T09:59:00"))
+        self.assertEqual([r["strategy"] for r in results], ["LastCloseStrategy"])
+
+    def test_latency_recorded_when_publish_fails(self):
+        self.redis_client.xadd.side_effect = redis.ConnectionError("down")
+        self.runtime.register(LastCloseStrategy(), self.market)
+
+        self.runtime.dispatch(self.make_event("2024-01-01T09:59:00"))
+        stats = self.runtime.latency_stats()
+        self.assertEqual(stats["count"], 1)
+        self.assertGreaterEqual(stats["dispatch_ms"]["p50"], 0)
+        self.assertIn("LastCloseStrategy", stats["strategy_ms"])
+
+    def test_run_forever_survives_dispatch_errors(self):
+        events = [self.make_event("2024-01-01T09:58:00"), self.make_event("2024-01-01T09:59:00")]
+        self.redis_client.xread.return_value = [("stream", [("1-0", events[0]), ("2-0", events[1])])]
+        handled = []
+
+        def dispatch(fields):
+            handled.append(fields["candle_time"])
+            if len(handled) == 1:
+                raise RuntimeError("db down")
+            self.runtime.stop()
+
+        with mock.patch.object(self.runtime, 'dispatch', side_effect=dispatch):
+            self.runtime.run_forever(block_ms=1)
+        self.assertEqual(handled, ["2024-01-01T09:58:00", "2024-01-01T09:59:00"])
+
+    def test_build_runtime_from_registry(self):
+        runtime = build_runtime([
+            {"class": "django_backend.strategy.tests.LastCloseStrategy", "market": self.market},
+            {"class": "django_backend.strategy.strategies.sma_cross.SmaCrossStrategy", "market": self.market,
+             "timeframe": 5, "candle_count": 50, "kwargs": {"fast_period": 3}, "name": "sma"},
+        ])
+        self.addCleanup(runtime.close)
+
+        first, = runtime._registry[self.market][1]
+        self.assertIsInstance(first["strategy"], LastCloseStrategy)
+        self.assertEqual((first["name"], first["candle_count"]), ("LastCloseStrategy", 200))
+        second, = runtime._registry[self.market][5]
+        self.assertIsInstance(second["strategy"], LiveSignalAdapter)
+        self.assertEqual((second["name"], second["candle_count"]), ("sma", 50))
+
+
+
+def _attached_close_sum(descriptor):
+    with MarketSnapshot.attach(descriptor) as snapshot:
+        return float(np.nansum(snapshot.column('close')))
+
+
+class MarketSnapshotTestCase(TestCase):
+    def setUp(self):
+        self.frame = generate_frame(100, seed=3, null_probability=0.05).drop(columns='market')
+        self.store = SnapshotStore(keep=2)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_snapshot_is_read_only_view(self):
+        snapshot = self.store.get_or_build("KRW-SYN", 1, "t0", lambda: self.frame)
+        frame = snapshot.as_frame()
+        np.testing.assert_array_equal(frame['close'].to_numpy(), self.frame['close'].to_numpy())
+        self.assertTrue((frame['date_time'] == self.frame['date_time']).all())
+        self.assertTrue(np.shares_memory(frame['close'].to_numpy(), snapshot.values))
+        with self.assertRaises(ValueError):
+            snapshot.column('close')[0] = 0
+
+    def test_store_builds_once_per_tick_and_releases_old_ticks(self):
+        loader = mock.Mock(return_value=self.frame)
+        first = self.store.get_or_build("KRW-SYN", 1, "t0", loader)
+        self.assertIs(self.store.get_or_build("KRW-SYN", 1, "t0", loader), first)
+        self.store.get_or_build("KRW-SYN", 1, "t1", loader)
+        self.store.get_or_build("KRW-SYN", 1, "t2", loader)
+
+        self.assertEqual(loader.call_count, 3)
+        self.assertEqual(self.store.stats(), {"builds": 3, "hits": 1, "released": 1, "resident": 2, "retired": 0})
+        self.assertEqual(self.store.latest("KRW-SYN", 1)["tick"], "t2")
+        with self.assertRaises(FileNotFoundError):
+            MarketSnapshot.attach(first.descriptor)
+
+    def test_evicted_frame_stays_readable(self):
+        kept = self.store.get_or_build("KRW-SYN", 1, "t0", lambda: self.frame).as_frame()
+        self.store.get_or_build("KRW-SYN", 1, "t1", lambda: self.frame)
+        self.store.get_or_build("KRW-SYN", 1, "t2", lambda: self.frame)
+
+        # 이름은 unlink되었지만 전략이 들고 있는 DataFrame은 계속 읽을 수 있음
+        self.assertAlmostEqual(kept['close'].sum(), self.frame['close'].sum())
+        self.assertEqual(self.store.stats()["retired"], 1)
+
+        del kept
+        self.store.get_or_build("KRW-SYN", 1, "t3", lambda: self.frame)
+        self.assertEqual(self.store.stats()["retired"], 0)
+
+    def test_attach_from_other_process(self):
+        snapshot = self.store.get_or_build("KRW-SYN", 1, "t0", lambda: self.frame)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as pool:
+            result = pool.submit(_attached_close_sum, snapshot.descriptor).result()
+        self.assertAlmostEqual(result, float(np.nansum(self.frame['close'])))
+
+
+class MeanReversionModel(TimeSeriesModel):
+    """최근 평균 대비 괴리율을 예측값으로 반환하는 테스트용 모델"""
+
+    instances = 0
+
+    def __init__(self, window=5, size=0):
+        self.window = window
+        self.weights = np.zeros(size)
+        self.batch_sizes = []
+
+    def initialize_model(self):
+        MeanReversionModel.instances += 1
+
+    def preprocess_data(self, data):
+        return np.asarray(data, dtype=float)[-self.window:]
+
+    def predict(self, data):
+        return data.mean() / data[-1] - 1
+
+    def predict_batch(self, batch):
+        self.batch_sizes.append(len(batch))
+        stacked = np.vstack(batch)
+        return list(stacked.mean(axis=1) / stacked[:, -1] - 1)
+
+    def postprocess_results(self, results):
+        return float(results)
+
+    def interpret_results(self, results):
+        return "buy" if results > 0 else "sell"
+
+
+class ModelRegistryTestCase(TestCase):
+    def setUp(self):
+        MeanReversionModel.instances = 0
+        self.registry = ModelRegistry(max_models=2, max_memory_mb=1, definitions={})
+
+    def test_model_loaded_once(self):
+        self.registry.register("mr", MeanReversionModel, window=3)
+        self.assertEqual(self.registry.loaded(), [])
+        self.assertEqual(self.registry.predict("mr", [10, 9, 8]), "buy")
+        self.assertEqual(self.registry.predict("mr", [8, 9, 10]), "sell")
+        self.assertEqual(MeanReversionModel.instances, 1)
+        self.assertEqual(self.registry.stats()["mr"]["loads"], 1)
+
+    def test_lru_eviction_by_count_and_memory(self):
+        for name in ("a", "b", "c"):
+            self.registry.register(name, MeanReversionModel)
+        self.registry.get("a")
+        self.registry.get("b")
+        self.registry.get("a")
+        self.registry.get("c")
+        self.assertEqual(self.registry.loaded(), ["a", "c"])
+        self.assertEqual(self.registry.stats()["b"]["evictions"], 1)
+
+        # 약 0.8MB 모델 두 개는 1MB 상한을 넘으므로 하나만 상주
+        self.registry.register("big1", MeanReversionModel, size=100_000)
+        self.registry.register("big2", MeanReversionModel, size=100_000)
+        self.registry.get("big1")
+        self.registry.get("big2")
+        self.assertEqual(self.registry.loaded(), ["big2"])
+
+    def test_submitted_requests_batched_per_model(self):
+        self.registry.register("mr", MeanReversionModel, window=3)
+        self.registry.submit("mr", "KRW-BTC", [10, 9, 8])
+        self.registry.submit("mr", "KRW-ETH", [8, 9, 10])
+        self.registry.submit("mr", "KRW-XRP", [1, 2, 3])
+        self.registry.submit("mr", "KRW-XRP", [1, 1, 1])  # 같은 키는 최신 요청으로 교체
+        self.registry.submit("missing", "KRW-BTC", [1, 2, 3])
+
+        results = self.registry.flush()
+        self.assertEqual(results["mr"], {"KRW-BTC": "buy", "KRW-ETH": "sell", "KRW-XRP": "sell"})
+        self.assertEqual(results["missing"], {})
+        self.assertEqual(self.registry.get("mr").batch_sizes, [3])
+        self.assertEqual(self.registry.flush(), {})
+
+        stats = self.registry.stats()["mr"]
+        self.assertEqual((stats["batches"], stats["items"], stats["mean_batch_size"]), (1, 3, 3.0))
+        self.assertIsNotNone(stats["items_per_second"])
+
+
+class LookAheadStrategy(VectorizedStrategy):
+    """다음 캔들 종가를 참조하는 잘못된 전략 (불일치 검출 확인용)"""
+
+    lookback = 2
+
+    def compute_signals(self, data):
+        close = data['close'].to_numpy()
+        signals = np.zeros(len(close), dtype=np.int8)
+        signals[:-1] = np.sign(close[1:] - close[:-1])
+        return signals
+
+
+class VectorizedSignalTestCase(TestCase):
+    def setUp(self):
+        self.history = generate_frame(1500, seed=7, null_probability=0).drop(columns='market')
+
+    def test_sma_cross_signals(self):
+        signals = SmaCrossStrategy(fast_period=5, slow_period=20).compute_signals(self.history)
+        self.assertEqual(len(signals), len(self.history))
+        self.assertTrue((signals[:20] == 0).all())
+        # 매수/매도 신호는 번갈아 나타남
+        crosses = signals[signals != 0]
+        self.assertGreater(len(crosses), 10)
+        self.assertTrue((crosses[1:] != crosses[:-1]).all())
+
+    def test_live_adapter_matches_vectorized(self):
+        report = check_signal_consistency(SmaCrossStrategy(fast_period=5, slow_period=20), self.history)
+        self.assertTrue(report["consistent"], report["mismatches"])
+        self.assertEqual(report["checked"], len(self.history) - 20)
+
+    def test_look_ahead_detected(self):
+        report = check_signal_consistency(LookAheadStrategy(), self.history, max_mismatches=5)
+        self.assertFalse(report["consistent"])
+        self.assertGreater(report["mismatch_count"], 500)
+        self.assertEqual(len(report["mismatches"]), 5)
+
+    def test_adapter_ignores_overlapping_candles(self):
+        adapter = LiveSignalAdapter(SmaCrossStrategy(fast_period=2, slow_period=3))
+        adapter.initialize_strategy()
+        adapter.update(self.history.iloc[:10])
+        window = adapter.update(self.history.iloc[5:12])
+        self.assertEqual(len(window), adapter.lookback)
+        self.assertEqual(window['date_time'].iloc[-1], self.history['date_time'].iloc[11])
+        self.assertTrue(window['date_time'].is_monotonic_increasing)
+
+
+def reference_backtest(simulator, ohlcv, signals):
+    """캔들마다 순서대로 체결/평가하는 단순 백테스트 (Simulator 벡터 연산 결과 검증용)"""
+    open_, close = ohlcv[OPEN], ohlcv[CLOSE]
+    cash, quantity, holding, mark = float(simulator.budget), 0.0, False, 0.0
+    equity, sides = [], []
+    for i in range(ohlcv.shape[1]):
+        j = i - simulator.delay
+        wanted = holding if j < 0 or signals[j] == 0 else signals[j] > 0
+        if wanted != holding:
+            holding = wanted
+            if wanted and quantity == 0:
+                amount = cash * simulator.position_size / (1 + simulator.fee_rate)
+                if amount >= simulator.min_price:
+                    quantity = amount / (open_[i] * (1 + simulator.slippage))
+                    cash -= amount * (1 + simulator.fee_rate)
+                    sides.append(1)
+            elif not wanted and quantity > 0:
+                amount = quantity * open_[i] * (1 - simulator.slippage)
+                if amount >= simulator.min_price:
+                    cash += amount * (1 - simulator.fee_rate)
+                    quantity = 0.0
+                    sides.append(-1)
+        mark = close[i]
+        equity.append(cash + quantity * mark)
+    return np.array(equity), sides
+
+
+class SimulatorTestCase(TestCase):
+    def setUp(self):
+        self.ohlcv = generate_ohlcv(2000, seed=11, null_probability=0.01)[0]  # NULL 캔들 포함
+        rng = np.random.default_rng(5)
+        self.signals = rng.choice([-1, 0, 0, 0, 1], size=2000).astype(np.int8)
+
+    def test_matches_reference_loop(self):
+        for kwargs in ({}, {"delay": 2, "slippage": 0.001, "position_size": 0.5}, {"delay": 0, "fee_rate": 0.0}):
+            simulator = Simulator(**kwargs)
+            result = simulator.run(self.ohlcv, self.signals)
+            equity, sides = reference_backtest(simulator, fill_missing_candles(self.ohlcv), self.signals)
+
+            np.testing.assert_allclose(result['equity'], equity, rtol=1e-8)
+            self.assertEqual(result['fills']['side'].tolist(), sides)
+            self.assertEqual(result['metrics']['trades'], sides.count(-1))
+
+    def test_fee_charged_on_order_amount(self):
+        ohlcv = np.full((len(FIELDS), 4), 100.0)
+        result = Simulator(budget=1_000_000, fee_rate=0.001).run(ohlcv, np.array([1, -1, 0, 0]))
+
+        buy, sell = result['fills'].itertuples()
+        self.assertAlmostEqual(buy.amount + buy.fee, 1_000_000)
+        self.assertAlmostEqual(buy.fee, buy.amount * 0.001)
+        self.assertAlmostEqual(result['equity'][-1], buy.amount * (1 - 0.001))
+        self.assertAlmostEqual(result['metrics']['fees'], buy.fee + sell.fee)
+
+    def test_delay_longer_than_signals(self):
+        simulator = Simulator(delay=6)
+        self.assertEqual(simulator.target_positions(np.array([1, 0, -1, 0])).tolist(), [False] * 4)
+        self.assertEqual(simulator.target_positions(np.array([1] + [0] * 6)).tolist(), [False] * 6 + [True])
+
+        result = simulator.run(np.full((len(FIELDS), 4), 100.0), np.array([1, 0, -1, 0]))
+        self.assertTrue(result['fills'].empty)
+        self.assertEqual(result['equity'].tolist(), [simulator.budget] * 4)
+
+    def test_skipped_sell_keeps_position_until_next_sell(self):
+        # 매수 후 가격이 폭락해 매도 금액이 최소 주문 금액 미만 -> 가격이 회복된 뒤의 매수 신호에서 매도하지 않고 보유 유지
+        ohlcv = np.full((len(FIELDS), 8), 100.0)
+        ohlcv[:, 2:4] = 0.01
+        signals = np.array([1, -1, 0, 1, 0, -1, 0, 0])
+        result = Simulator(budget=10_000, min_price=5000, fee_rate=0.0).run(ohlcv, signals)
+
+        fills = result['fills']
+        self.assertEqual(fills['side'].tolist(), [1, -1])
+        self.assertEqual(fills['index'].tolist(), [1, 6])
+        self.assertTrue((result['quantity'][1:6] > 0).all())
+        self.assertAlmostEqual(result['equity'][-1], 10_000)
+
+    def test_buy_below_min_price_skips_following_sell(self):
+        ohlcv = np.full((len(FIELDS), 5), 100.0)
+        result = Simulator(budget=4000, min_price=5000).run(ohlcv, np.array([1, 0, -1, 0, 0]))
+
+        self.assertEqual(len(result['fills']), 0)
+        self.assertTrue((result['equity'] == 4000).all())
+        self.assertEqual(result['metrics']['exposure'], 0.0)
+
+
+class WalkForwardOptimizerTestCase(TestCase):
+    STRATEGY = 'django_backend.strategy.strategies.sma_cross.SmaCrossStrategy'
+
+    def setUp(self):
+        self.candles = generate_ohlcv(3000, seed=13)[0]
+        self.start = np.datetime64('2024-01-01T00:00', 'm')
+        self.grid = {'fast_period': [3, 5, 8], 'slow_period': [20, 40]}
+        self.work_dir = tempfile.mkdtemp(prefix='walk_forward_test_')
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+
+    def make_optimizer(self, work_dir=None, **kwargs):
+        options = dict(train_size=800, test_size=400, prune_after=0, workers=1, chunk_size=4,
+                       work_dir=work_dir or self.work_dir)
+        options.update(kwargs)
+        return WalkForwardOptimizer(self.STRATEGY, self.grid, **options)
+
+    def test_folds_and_grid(self):
+        self.assertEqual(walk_forward_folds(10, 4, 2), [(0, 4, 4, 6), (2, 6, 6, 8), (4, 8, 8, 10)])
+        self.assertEqual(walk_forward_folds(10, 4, 2, anchored=True)[-1], (0, 8, 8, 10))
+        self.assertEqual(len(parameter_grid(self.grid)), 6)
+        self.assertEqual(parameter_grid(self.grid)[0], {'fast_period': 3, 'slow_period': 20})
+
+    def test_evaluate_params_uses_warmup_history(self):
+        path = os.path.join(self.work_dir, 'candles.npy')
+        np.save(path, self.candles)
+        params = {'fast_period': 5, 'slow_period': 20}
+
+        [metrics] = evaluate_params(self.STRATEGY, [params], path, str(self.start), 1, [1000, 1500], {})
+
+        # 구간 앞 lookback 캔들로 계산한 신호를 구간에만 적용한 결과와 같음
+        strategy = SmaCrossStrategy(**params)
+        warmup = 1000 - strategy.lookback + 1
+        signals = strategy.compute_signals(to_frame(self.candles[:, warmup:1500], self.start + warmup, 1))
+        expected = Simulator().run(self.candles[:, 1000:1500], signals[1000 - warmup:])['metrics']
+        self.assertEqual(metrics, expected)
+
+    def test_selects_best_train_params_per_fold(self):
+        result = self.make_optimizer().run(self.candles, self.start)
+
+        self.assertEqual(len(result['folds']), 5)
+        path = os.path.join(self.work_dir, 'candles.npy')
+        for report in result['folds']:
+            train = evaluate_params(self.STRATEGY, result['params'], path, str(self.start), 1, report['train'], {})
+            scores = [metrics['sharpe'] if metrics['sharpe'] is not None else -np.inf for metrics in train]
+            self.assertEqual(report['best_index'], int(np.argmax(scores)))
+            self.assertEqual(report['test'][0], report['train'][1])
+
+    def test_process_pool_matches_serial(self):
+        serial = self.make_optimizer().run(self.candles, self.start)
+        parallel = self.make_optimizer(work_dir=os.path.join(self.work_dir, 'pool'), workers=2).run(
+            self.candles, self.start
+        )
+        self.assertEqual(serial, parallel)
+
+    def test_resume_from_checkpoint(self):
+        first = self.make_optimizer().run(self.candles, self.start)
+        checkpoint = os.path.join(self.work_dir, 'checkpoint.jsonl')
+        with open(checkpoint) as f:
+            lines = f.readlines()
+        # 마지막 두 결과를 쓰다 중단된 상황 (마지막 줄은 일부만 기록)
+        with open(checkpoint, 'w') as f:
+            f.writelines(lines[:-2])
+            f.write(lines[-2][:10])
+
+        with mock.patch('django_backend.controller.simulator.optimizer.evaluate_params',
+                        wraps=evaluate_params) as evaluate:
+            resumed = self.make_optimizer().run(self.candles, self.start)
+        self.assertEqual(resumed, first)
+        self.assertEqual(sum(len(call.args[1]) for call in evaluate.call_args_list), 2)
+
+        with self.assertRaises(ValueError):
+            self.make_optimizer(metric='sortino').run(self.candles, self.start)
+
+    def test_stale_candles_file_is_replaced(self):
+        np.save(os.path.join(self.work_dir, 'candles.npy'), self.candles[:, ::-1] * 2)
+
+        stale_dir = self.make_optimizer().run(self.candles, self.start)
+        clean = self.make_optimizer(work_dir=os.path.join(self.work_dir, 'clean')).run(self.candles, self.start)
+        self.assertEqual(stale_dir, clean)
+
+    def test_pruning_drops_weak_params(self):
+        optimizer = self.make_optimizer(prune_after=1, prune_fraction=0.5, min_candidates=2)
+        result = optimizer.run(self.candles, self.start)
+
+        # 첫 폴드 후 6개 중 3개, 다음 폴드 후 남은 3개 중 1개 제외 (min_candidates=2 아래로는 줄이지 않음)
+        self.assertEqual(sorted(result['pruned'].values()), [0, 0, 0, 1])
+        for i, fold in result['pruned'].items():
+            self.assertNotIn((i, fold + 1, 'train'), optimizer._results)
+        scores = {i: optimizer.score(optimizer._results[(i, 0, 'train')]) for i in range(6)}
+        weakest = sorted(scores, key=lambda i: (scores[i], -i))[:3]
+        self.assertEqual(sorted(i for i, fold in result['pruned'].items() if fold == 0), sorted(weakest))
+        self.assertTrue(all(report['best_index'] not in result['pruned'] for report in result['folds'][2:]))
+
+
+class MonteCarloSimulatorTestCase(TestCase):
+    def setUp(self):
+        self.returns = np.random.default_rng(3).normal(0.001, 0.02, 300)
+        self.candle_returns = np.random.default_rng(4).normal(0, 0.001, 5000)
+        self.holding_periods = np.random.default_rng(5).integers(1, 200, 40)
+
+    def run_method(self, method, **kwargs):
+        simulator = MonteCarloSimulator(n_paths=500, method=method, block_size=10, seed=42, **kwargs)
+        if method == 'randomized_entry':
+            return simulator.run(None, holding_periods=self.holding_periods, candle_returns=self.candle_returns,
+                                 trade_cost=0.001)
+        return simulator.run(self.returns)
+
+    def test_seeded_results_do_not_depend_on_chunk_size(self):
+        for method in METHODS:
+            # 0.01MB면 chunk 하나가 수 개 경로
+            small_chunks = MonteCarloSimulator(n_paths=500, method=method, max_memory_mb=0.01)
+            self.assertLess(small_chunks.chunk_size(300), 500)
+            expected = self.run_method(method)
+            self.assertEqual(self.run_method(method, max_memory_mb=0.01), expected, method)
+            self.assertEqual(self.run_method(method), expected, method)
+
+        other_seed = MonteCarloSimulator(n_paths=500, method='bootstrap', seed=43).run(self.returns)
+        self.assertNotEqual(other_seed, self.run_method('bootstrap'))
+
+    def test_permutation_keeps_total_return(self):
+        result = self.run_method('permutation')
+        total = np.prod(1 + self.returns) - 1
+        for value in result['total_return'].values():
+            self.assertAlmostEqual(value, total)
+        self.assertLess(result['max_drawdown'][1], result['max_drawdown'][99])
+
+    def test_bootstrap_samples_from_returns(self):
+        constant = MonteCarloSimulator(n_paths=100, method='block_bootstrap', block_size=7).run(np.full(50, 0.01))
+        self.assertAlmostEqual(constant['total_return'][50], 1.01 ** 50 - 1)
+        self.assertEqual(constant['probability_of_loss'], 0.0)
+
+        result = self.run_method('bootstrap')
+        self.assertEqual(result['horizon'], 300)
+        self.assertLess(result['total_return'][5], result['total_return'][95])
+
+    def test_randomized_entry_uses_holding_periods(self):
+        flat = MonteCarloSimulator(n_paths=50, method='randomized_entry').run(
+            None, holding_periods=[10, 20], candle_returns=np.full(100, 0.001), trade_cost=0.002
+        )
+        expected = (1.001 ** 10 * 0.998) * (1.001 ** 20 * 0.998) - 1
+        self.assertAlmostEqual(flat['total_return'][50], expected)
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(method='randomized_entry').run(None, holding_periods=[200], candle_returns=np.zeros(10))
+
+    def test_empty_horizon(self):
+        no_trades = MonteCarloSimulator(n_paths=20, method='randomized_entry').run(
+            None, holding_periods=[], candle_returns=self.candle_returns
+        )
+        zero_horizon = MonteCarloSimulator(n_paths=20, method='bootstrap').run(self.returns, horizon=0)
+
+        for result in (no_trades, zero_horizon):
+            self.assertEqual(result['horizon'], 0)
+            self.assertEqual(result['total_return'][50], 0.0)
+            self.assertEqual(result['max_drawdown'][1], 0.0)
+            self.assertEqual(result['probability_of_loss'], 0.0)
@@ -0,0 +1,201 @@
+# django_backend/trader/execution.py
+import logging
+import time as t
+from datetime import datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+
+from django_backend.trader.abstract_trader import AbstractTrader
+from django_backend.trader.history import parse_time
+from django_backend.trader.models import OrderExecution
+from django_backend.trader.state import executed_funds
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = ("done", "cancel")
+LATENCY_FIELDS = ("signal_to_submit_ms", "submit_to_ack_ms", "ack_to_fill_ms")
+
+
+def slippage_bps(side, reference_price, fill_price):
+    """
+    기준 가격 대비 체결 가격 차이(bp). 매수는 비싸게, 매도는 싸게 체결될수록 양수(불리)입니다.
+    """
+    if not reference_price or fill_price is None:
+        return None
+    difference = fill_price - reference_price if side == "bid" else reference_price - fill_price
+    return difference / reference_price * 10_000
+
+
+def fill_time(order, observed_at):
+    """
+    주문의 체결 완료 시각(epoch 초). 체결 내역이 있으면 마지막 체결 시각, 없으면 조회 시각을 사용합니다.
+
+    NOTE: 업비트 체결 시각은 초 단위이므로 ack_to_fill은 1초 미만 오차가 있습니다.
+    """
+    trades = order.get("trades") or []
+    if not trades:
+        return observed_at
+    last_trade = max(parse_time(trade["created_at"]) for trade in trades)
+    return last_trade.timestamp()
+
+
+class InstrumentedTrader(AbstractTrader):
+    """
+    AbstractTrader 구현(UpbitTrader, SimulatedTrader 등)을 감싸 주문 실행 지연과 슬리피지를 기록하는 트레이더.
+
+    - send_request: 신호 ~ 전송(signal_to_submit), 전송 ~ 접수 응답(submit_to_ack)을 OrderExecution에 저장합니다
+    - get_order_info/poll_fills: 기록 중인 주문이 종료되면 접수 ~ 체결(ack_to_fill), 평균 체결 가격, 슬리피지를 채웁니다
+    - 그 밖의 메서드와 속성은 감싼 트레이더에 그대로 위임합니다
+
+    NOTE: 일괄 전송(send_requests)은 감싼 트레이더 안에서 send_request를 호출하므로 기록되지 않습니다.
+    """
+
+    def __init__(self, trader):
+        self.logger = logger
+        self.trader = trader
+
+    def __getattr__(self, name):
+        return getattr(self.trader, name)
+
+    def send_request(self, market, side, price=None, volume=None, ord_type='best', time_in_force='ioc',
+                     signal_time=None, reference_price=None):
+        """
+        주문을 전송하고 실행 지연을 기록합니다. 나머지 파라미터와 응답은 감싼 트레이더의 send_request와 같습니다.
+
+        :param signal_time: 주문 신호가 발생한 시각 (epoch 초, time.time())
+        :param reference_price: 슬리피지 기준 가격. 없으면 지정가 주문의 price를 사용합니다
+        """
+        submitted_at = t.time()
+        started = t.perf_counter()
+        response = self.trader.send_request(market, side, price, volume, ord_type, time_in_force)
+        submit_to_ack_ms = (t.perf_counter() - started) * 1000
+        if not isinstance(response, dict) or "uuid" not in response:
+            self.logger.warning(f"주문 접수 실패, 실행 기록을 남기지 않습니다: {response}")
+            return response
+
+        if reference_price is None and ord_type == "limit":
+            reference_price = price
+        execution = OrderExecution.objects.create(
+            uuid=response["uuid"],
+            market=market,
+            side=side,
+            ord_type=ord_type,
+            submitted_at=datetime.fromtimestamp(submitted_at),
+            signal_to_submit_ms=(submitted_at - signal_time) * 1000 if signal_time is not None else None,
+            submit_to_ack_ms=submit_to_ack_ms,
+            reference_price=float(reference_price) if reference_price is not None else None,
+            state=response.get("state", "wait"),
+        )
+        # 모의 거래소 등은 접수 응답에 이미 체결 결과가 담겨 있음
+        self.record_fill(response, execution=execution, observed_at=submitted_at + submit_to_ack_ms / 1000)
+        return response
+
+    def record_fill(self, order, execution=None, observed_at=None):
+        """
+        종료된 주문 응답으로 체결 지연, 평균 체결 가격, 슬리피지를 기록합니다.
+
+        :param order: 주문 응답 (get_order_info 결과)
+        :return: 갱신한 OrderExecution. 기록 대상이 아니거나 아직 종료되지 않았으면 None
+        """
+        if not isinstance(order, dict) or order.get("state") not in TERMINAL_STATES:
+            return None
+        if execution is None:
+            execution = OrderExecution.objects.filter(uuid=order.get("uuid"), ack_to_fill_ms__isnull=True).first()
+            if execution is None:
+                return None
+        observed_at = t.time() if observed_at is None else observed_at
+
+        execution.state = order["state"]
+        volume = float(order.get("executed_volume") or 0.0)
+        if volume > 0:
+            execution.fill_price = executed_funds(order) / volume
+            execution.slippage_bps = slippage_bps(execution.side, execution.reference_price, execution.fill_price)
+            acked_at = execution.submitted_at.timestamp() + execution.submit_to_ack_ms / 1000
+            execution.ack_to_fill_ms = max(0.0, (fill_time(order, observed_at) - acked_at) * 1000)
+        execution.save(update_fields=["state", "fill_price", "slippage_bps", "ack_to_fill_ms"])
+        return execution
+
+    def poll_fills(self, max_age=None):
+        """
+        체결 기록이 없는 최근 주문을 조회해 종료된 주문의 체결 결과를 기록합니다.
+
+        :param max_age: 이 시간(초)보다 오래된 주문은 조회하지 않음 (기본값: settings.ORDER_EXECUTION_FILL_TIMEOUT)
+        :return: 기록한 주문 수
+        """
+        max_age = settings.ORDER_EXECUTION_FILL_TIMEOUT if max_age is None else max_age
+        pending = OrderExecution.objects.filter(
+            state__in=("wait", "watch"), submitted_at__gte=datetime.now() - timedelta(seconds=max_age)
+        )
+        filled = 0
+        for execution in pending:
+            if self.record_fill(self.trader.get_order_info(execution.uuid), execution=execution) is not None:
+                filled += 1
+        return filled
+
+    # ------------------------------------------------------------------
+    # AbstractTrader
+    # ------------------------------------------------------------------
+
+    def get_order_info(self, order_id):
+        order = self.trader.get_order_info(order_id)
+        self.record_fill(order)
+        return order
+
+    def cancel_request(self, request_id):
+        return self.trader.cancel_request(request_id)
+
+    def cancel_all_requests(self, *args, **kwargs):
+        return self.trader.cancel_all_requests(*args, **kwargs)
+
+    def get_account_info(self):
+        return self.trader.get_account_info()
+
+    def get_open_orders(self, *args, **kwargs):
+        return self.trader.get_open_orders(*args, **kwargs)
+
+    def get_closed_orders(self, *args, **kwargs):
+        return self.trader.get_closed_orders(*args, **kwargs)
+
+
+def summarize_executions(queryset):
+    """
+    주문 실행 기록을 단계별 지연(ms)과 슬리피지(bp) 히스토그램으로 요약합니다.
+    구간 경계는 settings.ORDER_LATENCY_BUCKETS_MS, settings.ORDER_SLIPPAGE_BUCKETS_BPS를 사용하며,
+    양 끝 구간은 범위 밖의 값을 포함합니다.
+
+    :return: {'count', 'latency': {단계: 요약}, 'slippage_bps': 요약}
+             요약은 {'count', 'mean', 'p50', 'p90', 'p99', 'max', 'buckets': [{'le', 'count'}, ...]}
+    """
+    rows = np.array(
+        list(queryset.values_list(*LATENCY_FIELDS, "slippage_bps")), dtype=float
+    ).reshape(-1, len(LATENCY_FIELDS) + 1)
+    latency = {
+        field: _histogram(rows[:, i], settings.ORDER_LATENCY_BUCKETS_MS) for i, field in enumerate(LATENCY_FIELDS)
+    }
+    return {
+        "count": len(rows),
+        "latency": latency,
+        "slippage_bps": _histogram(rows[:, -1], settings.ORDER_SLIPPAGE_BUCKETS_BPS),
+    }
+
+
+def _histogram(values, edges):
+    values = values[~np.isnan(values)]  # null(미체결, 신호 시각 없음)은 제외
+    edges = np.asarray(edges, dtype=float)
+    # 구간 i는 (edges[i-1], edges[i]], 마지막 구간은 edges[-1] 초과
+    counts = np.bincount(np.searchsorted(edges, values, side="left"), minlength=len(edges) + 1)
+    buckets = [{"le": float(edge), "count": int(count)} for edge, count in zip(edges, counts)]
+    buckets.append({"le": None, "count": int(counts[-1])})
+    if not len(values):
+        return {"count": 0, "mean": None, "p50": None, "p90": None, "p99": None, "max": None, "buckets": buckets}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "max": float(values.max()),
+        "buckets": buckets,
+    }
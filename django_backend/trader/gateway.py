@@ -0,0 +1,298 @@
+# django_backend/trader/gateway.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time as t
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlencode
+
+import jwt
+import numpy as np
+import redis
+import redis.asyncio as aioredis
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from django_backend.config.rate_limiter import PRIORITY_ORDER, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+ORDER_FIELDS = ("market", "side", "volume", "price", "ord_type", "time_in_force", "identifier")
+STAGES = ("queue_ms", "sign_ms", "rate_limit_ms", "http_ms", "parse_ms", "overhead_ms", "total_ms")
+
+
+def submit_order(redis_client, market, side, price=None, volume=None, ord_type='best', time_in_force='ioc',
+                 identifier=None, source=None):
+    """
+    주문 게이트웨이에 주문을 전달합니다 (settings.ORDER_REQUEST_STREAM에 XADD).
+    파라미터는 UpbitTrader.send_request와 같고, 결과는 settings.ORDER_RESULT_STREAM에 request_id로 발행됩니다.
+
+    :param identifier: 업비트 주문 식별자 (중복 불가). 없으면 게이트웨이가 생성해 재전송 시 중복 주문을 막습니다
+    :return: request_id (스트림 메시지 ID)
+    """
+    fields = {
+        "market": market, "side": side, "price": price, "volume": volume, "ord_type": ord_type,
+        "time_in_force": time_in_force, "identifier": identifier, "source": source,
+        "created_at_ms": int(t.time() * 1000),
+    }
+    return redis_client.xadd(
+        settings.ORDER_REQUEST_STREAM, {key: value for key, value in fields.items() if value is not None},
+        maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True
+    )
+
+
+class OrderGateway:
+    """
+    Redis 스트림으로 주문 요청을 받아 업비트에 바로 전송하는 상주 주문 게이트웨이 (asyncio).
+
+    send_order_task는 호출마다 UpbitTrader를 만들고 Celery 브로커를 거치므로 큐 대기, 워커 prefetch,
+    새 HTTP 연결 비용이 주문 지연에 포함됩니다. 게이트웨이는
+
+    - 인증 정보와 keep-alive HTTP 세션을 유지하고, 유휴 상태에서도 주기적으로 연결을 데워 둡니다
+    - settings.ORDER_REQUEST_STREAM을 consumer group으로 읽어 도착 즉시 서명/전송합니다
+    - 주문마다 단계별 시간(queue, sign, rate_limit, http, parse)을 측정해 결과와 함께 settings.ORDER_RESULT_STREAM에 발행합니다
+    - 요청 후 max_age_ms가 지난 주문(재시작 후 남은 요청 등)은 전송하지 않고 expired로 처리합니다
+    - 주문에 identifier를 붙여 같은 요청이 다시 전달되어도 업비트에서 중복 주문이 거부되게 합니다
+
+    NOTE: 프로젝트 의존성에 비동기 HTTP 클라이언트가 없어, HTTP 요청은 연결 풀을 공유하는
+    requests.Session을 스레드 풀(workers개)에서 실행합니다. 이벤트 루프는 스트림 읽기와 결과 발행만 담당합니다.
+    """
+
+    LATENCY_HISTORY = 1000  # 지연 시간 통계에 사용할 최근 기록 수
+
+    def __init__(self, redis_client=None, session=None, access_key=None, secret_key=None, workers=None,
+                 max_age_ms=None, consumer=None, rate_limiter=None):
+        self.logger = logger
+        self.redis_client = redis_client or aioredis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.access_key = access_key or os.environ.get("UPBIT_OPEN_API_ACCESS_KEY")
+        self.secret_key = secret_key or os.environ.get("UPBIT_OPEN_API_SECRET_KEY")
+        self.server_url = "https://api.upbit.com/v1/"
+        self.workers = workers or settings.ORDER_GATEWAY_WORKERS
+        self.max_age_ms = max_age_ms or settings.ORDER_GATEWAY_MAX_AGE_MS
+        # 재시작 후 미확인 요청을 이어받을 수 있도록 고정된 consumer 이름 사용
+        self.consumer = consumer or settings.ORDER_GATEWAY_CONSUMER
+        self.session = session or self._create_session()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="order-gateway")
+        self._timings = deque(maxlen=self.LATENCY_HISTORY)
+        self._counts = {"sent": 0, "rejected": 0, "failed": 0, "unknown": 0, "expired": 0}
+        self._last_http = 0.0
+        self._running = False
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        session.mount("https://", adapter)
+        return session
+
+    # ------------------------------------------------------------------
+    # 서명/전송
+    # ------------------------------------------------------------------
+
+    def sign(self, params):
+        """
+        주문 파라미터로 업비트 인증 헤더를 만듭니다 (query_hash 포함 JWT).
+        """
+        query_string = unquote(urlencode(params, doseq=True)).encode()
+        payload = {
+            "access_key": self.access_key,
+            "nonce": str(uuid.uuid4()),
+            "query_hash": hashlib.sha512(query_string).hexdigest(),
+            "query_hash_alg": "SHA512",
+        }
+        return {"Authorization": f"Bearer {jwt.encode(payload, self.secret_key)}"}
+
+    def _post_order(self, params, headers):
+        """
+        스레드 풀에서 실행되는 주문 전송. 응답 객체, 요청 제한 대기 시간, HTTP 구간 시간을 반환합니다.
+        """
+        waited = self.rate_limiter.acquire("order", PRIORITY_ORDER)
+        started = t.perf_counter()
+        response = self.session.post(
+            self.server_url + "orders", json=params, headers=headers, timeout=settings.ORDER_GATEWAY_TIMEOUT
+        )
+        http_seconds = t.perf_counter() - started
+        self.rate_limiter.observe(response, "order")
+        return response, waited, http_seconds
+
+    def warm_up(self):
+        """
+        공개 API를 호출해 keep-alive 연결을 열어 둡니다 (TLS 핸드셰이크를 주문 경로에서 제외).
+        """
+        try:
+            self.session.get(self.server_url + "ticker", params={"markets": "KRW-BTC"}, timeout=3)
+            self._last_http = t.monotonic()
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"주문 게이트웨이 연결 예열 실패: {e}")
+
+    async def handle(self, request_id, fields, received_at=None):
+        """
+        주문 요청 하나를 서명/전송하고 결과를 발행합니다.
+
+        :param received_at: 스트림에서 읽은 시각 (time.time())
+        :return: 발행한 결과 dict
+        """
+        received_at = received_at or t.time()
+        started = t.perf_counter()
+        created_at_ms = float(fields.get("created_at_ms", received_at * 1000))
+        timing = {"queue_ms": received_at * 1000 - created_at_ms}
+        result = {"request_id": request_id, "market": fields.get("market"), "source": fields.get("source", "")}
+
+        if timing["queue_ms"] > self.max_age_ms:
+            self.logger.warning(f"오래된 주문 요청 폐기: {request_id} ({timing['queue_ms']:.0f}ms 경과)")
+            return await self._publish_result(dict(result, status="expired"), timing)
+
+        params = {key: fields[key] for key in ORDER_FIELDS if fields.get(key) not in (None, "")}
+        params.setdefault("identifier", f"gw-{request_id}")
+        result["identifier"] = params["identifier"]
+
+        stage = t.perf_counter()
+        headers = self.sign(params)
+        timing["sign_ms"] = (t.perf_counter() - stage) * 1000
+
+        loop = asyncio.get_running_loop()
+        try:
+            response, waited, http_seconds = await loop.run_in_executor(
+                self._executor, self._post_order, params, headers
+            )
+        except requests.exceptions.Timeout as e:
+            # 요청이 거래소에 도달했을 수 있으므로 실패로 단정하지 않음 (identifier로 조회해 확인 필요)
+            self.logger.error(f"주문 전송 시간 초과: {request_id} {e}")
+            return await self._publish_result(dict(result, status="unknown", error=str(e)), timing, started)
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"주문 전송 실패: {request_id} {e}")
+            return await self._publish_result(dict(result, status="failed", error=str(e)), timing, started)
+        self._last_http = t.monotonic()
+        timing["rate_limit_ms"] = waited * 1000
+        timing["http_ms"] = http_seconds * 1000
+
+        stage = t.perf_counter()
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"error": {"name": "invalid_response", "message": response.text[:200]}}
+        timing["parse_ms"] = (t.perf_counter() - stage) * 1000
+
+        status = "sent" if response.ok else "rejected"
+        result.update(status=status, http_status=response.status_code, response=body)
+        if not response.ok:
+            self.logger.error(f"주문 거부: {request_id} {body}")
+        return await self._publish_result(result, timing, started)
+
+    async def _publish_result(self, result, timing, started=None):
+        if started is not None:
+            timing["total_ms"] = (t.perf_counter() - started) * 1000
+            timing["overhead_ms"] = timing["total_ms"] - timing.get("http_ms", 0.0) - timing.get("rate_limit_ms", 0.0)
+            if timing["overhead_ms"] > settings.ORDER_GATEWAY_OVERHEAD_TARGET_MS:
+                self.logger.warning(
+                    f"주문 게이트웨이 내부 처리 {timing['overhead_ms']:.1f}ms가 "
+                    f"목표 {settings.ORDER_GATEWAY_OVERHEAD_TARGET_MS}ms를 초과했습니다 ({result['request_id']})"
+                )
+        self._counts[result["status"]] += 1
+        self._timings.append(timing)
+        fields = {
+            key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+            for key, value in result.items() if value is not None
+        }
+        fields["timing"] = json.dumps(timing)
+        fields["published_at_ms"] = int(t.time() * 1000)
+        try:
+            await self.redis_client.xadd(
+                settings.ORDER_RESULT_STREAM, fields, maxlen=settings.EVENT_STREAM_MAXLEN, approximate=True
+            )
+        except redis.RedisError as e:
+            self.logger.error(f"주문 결과 발행 실패: {result['request_id']} {e}")
+        return dict(result, timing=timing)
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    async def _ensure_group(self):
+        try:
+            await self.redis_client.xgroup_create(
+                settings.ORDER_REQUEST_STREAM, settings.ORDER_GATEWAY_GROUP, id="$", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _process(self, request_id, fields, received_at):
+        try:
+            await self.handle(request_id, fields, received_at)
+        except Exception as e:
+            self.logger.exception(f"주문 처리 중 오류: {request_id} {e}")
+        finally:
+            await self.redis_client.xack(settings.ORDER_REQUEST_STREAM, settings.ORDER_GATEWAY_GROUP, request_id)
+
+    async def _keep_alive(self):
+        loop = asyncio.get_running_loop()
+        while self._running:
+            await asyncio.sleep(1)
+            if t.monotonic() - self._last_http >= settings.ORDER_GATEWAY_KEEPALIVE_SECONDS:
+                await loop.run_in_executor(self._executor, self.warm_up)
+
+    async def run(self, block_ms=1000):
+        """
+        주문 요청 스트림을 구독합니다. 요청마다 태스크를 만들어 동시에 처리하고(전송은 스레드 풀 크기만큼 동시 실행),
+        이전 실행에서 확인(ACK)되지 않은 요청을 먼저 처리합니다 (오래된 요청은 expired).
+        """
+        self._running = True
+        await self._ensure_group()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.warm_up)
+        keep_alive = asyncio.create_task(self._keep_alive())
+        pending = set()
+        last_id = "0"  # 미확인 요청부터 처리한 뒤 새 요청('>')으로 전환
+        self.logger.info(f"주문 게이트웨이 시작: {settings.ORDER_REQUEST_STREAM} ({self.consumer})")
+        try:
+            while self._running:
+                try:
+                    response = await self.redis_client.xreadgroup(
+                        settings.ORDER_GATEWAY_GROUP, self.consumer, {settings.ORDER_REQUEST_STREAM: last_id},
+                        count=100, block=block_ms
+                    )
+                except redis.RedisError as e:
+                    self.logger.error(f"주문 요청 스트림 읽기 실패: {e}")
+                    await asyncio.sleep(1)
+                    continue
+                received_at = t.time()
+                messages = [message for _, stream_messages in response or [] for message in stream_messages]
+                if last_id != ">":
+                    last_id = messages[-1][0] if messages else ">"
+                for request_id, fields in messages:
+                    task = asyncio.create_task(self._process(request_id, fields, received_at))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+        finally:
+            keep_alive.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stop(self):
+        self._running = False
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def latency_stats(self):
+        """
+        최근 주문의 단계별 지연 시간 백분위수(ms)와 상태별 건수를 반환합니다.
+        """
+        stats = {"count": len(self._timings), "status": dict(self._counts)}
+        for key in STAGES:
+            values = np.array([timing[key] for timing in self._timings if key in timing])
+            if len(values):
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                stats[key] = {"p50": p50, "p95": p95, "p99": p99, "max": values.max()}
+        return stats
@@ -0,0 +1,193 @@
+# django_backend/trader/history.py
+import logging
+from datetime import datetime, timedelta
+
+import pytz
+from django.conf import settings
+from django.db import transaction
+
+from django_backend.trader.models import OrderSyncState, UpbitOrder, UpbitTrade
+
+logger = logging.getLogger(__name__)
+
+KST = pytz.timezone('Asia/Seoul')
+ORDER_UPDATE_FIELDS = [
+    'state', 'price', 'volume', 'remaining_volume', 'executed_volume', 'executed_funds', 'paid_fee',
+    'trades_count', 'identifier', 'synced_at',
+]
+TRADE_UPDATE_FIELDS = ['price', 'volume', 'funds']
+
+
+def parse_time(value):
+    """
+    업비트 ISO 8601 시각을 naive KST datetime(DB 기준, USE_TZ=False)으로 변환합니다.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(KST).replace(tzinfo=None)
+    return parsed
+
+
+def format_time(value):
+    """
+    naive KST datetime을 업비트 조회 파라미터 형식(ISO 8601, +09:00)으로 변환합니다.
+    """
+    return KST.localize(value).isoformat(timespec='seconds')
+
+
+def _number(value):
+    return float(value) if value not in (None, "") else None
+
+
+def to_order(order):
+    """
+    업비트 주문 응답을 UpbitOrder로 변환합니다.
+    """
+    return UpbitOrder(
+        uuid=order['uuid'],
+        market=order['market'],
+        side=order['side'],
+        ord_type=order['ord_type'],
+        state=order['state'],
+        price=_number(order.get('price')),
+        volume=_number(order.get('volume')),
+        remaining_volume=_number(order.get('remaining_volume')),
+        executed_volume=_number(order.get('executed_volume')) or 0.0,
+        executed_funds=_number(order.get('executed_funds')),
+        paid_fee=_number(order.get('paid_fee')) or 0.0,
+        trades_count=int(order.get('trades_count') or 0),
+        identifier=order.get('identifier'),
+        created_at=parse_time(order['created_at']),
+    )
+
+
+def to_trades(order):
+    """
+    업비트 개별 주문 조회 응답의 체결 내역(trades)을 UpbitTrade 리스트로 변환합니다.
+    """
+    return [
+        UpbitTrade(
+            uuid=trade['uuid'],
+            order_id=order['uuid'],
+            market=trade['market'],
+            side=trade['side'],
+            price=float(trade['price']),
+            volume=float(trade['volume']),
+            funds=float(trade['funds']),
+            created_at=parse_time(trade['created_at']),
+        )
+        for trade in order.get('trades', [])
+    ]
+
+
+class OrderHistorySync:
+    """
+    완료/취소된 주문과 체결 내역을 저장된 기준 시각(high-water mark)부터 증분 동기화해 DB에 저장하는 서비스.
+
+    - 기준 시각 - ORDER_SYNC_OVERLAP부터 현재까지를 업비트 조회 제한(최대 7일)에 맞춘 구간으로 나눕니다
+      (겹치는 구간은 기준 시각 이전에 생성되어 이후에 종료된 주문을 위한 것이며, upsert로 중복 없이 반영됩니다)
+    - 구간마다 최신순 페이지(limit개)를 받아 바로 bulk upsert하고 다음 페이지로 넘어가므로,
+      메모리에는 한 페이지만 유지됩니다
+    - 체결 내역은 새로 생겼거나 체결 건수가 바뀐 주문만 개별 조회(동시 실행)해 저장합니다
+    - 구간을 마칠 때마다 기준 시각을 저장하므로 중간에 중단되어도 이어서 동기화합니다
+    """
+
+    WINDOW = timedelta(days=7)  # 업비트 종료 주문 조회 최대 구간
+
+    def __init__(self, trader=None, page_size=1000, name='ALL'):
+        from django_backend.trader.services import UpbitTrader
+
+        self.logger = logger
+        self.trader = trader or UpbitTrader()
+        self.page_size = page_size
+        self.name = name
+        self.requests = 0
+
+    def high_water_mark(self):
+        state = OrderSyncState.objects.filter(name=self.name).first()
+        if state is not None:
+            return state.high_water_mark
+        return datetime.now() - timedelta(days=settings.ORDER_SYNC_INITIAL_DAYS)
+
+    def iter_pages(self, start, end):
+        """
+        [start, end] 구간의 종료 주문을 최신순 페이지 단위로 반환합니다.
+        한 페이지가 가득 차면 그 페이지에서 가장 오래된 주문 시각을 다음 조회의 end로 사용합니다.
+        """
+        cursor = end
+        while True:
+            page = self.trader.get_closed_orders(
+                start_time=format_time(start), end_time=format_time(cursor), limit=self.page_size
+            )
+            self.requests += 1
+            if isinstance(page, dict):
+                raise RuntimeError(f"종료 주문 조회 실패: {page.get('error')}")
+            if page:
+                yield page
+            if len(page) < self.page_size:
+                return
+            oldest = min(parse_time(order['created_at']) for order in page)
+            if oldest >= cursor:
+                # 같은 시각에 page_size개 이상 주문이 몰린 경우 더 진행할 수 없음
+                self.logger.warning(f"{cursor} 시각의 주문이 {self.page_size}개 이상이라 일부를 건너뜁니다.")
+                return
+            cursor = oldest
+
+    def save_page(self, page):
+        """
+        주문 페이지를 upsert하고, 체결 내역이 바뀐 주문의 체결을 조회해 저장합니다.
+
+        :return: (저장한 주문 수, 저장한 체결 수)
+        """
+        orders = {order['uuid']: to_order(order) for order in page}
+        known = dict(
+            UpbitOrder.objects.filter(uuid__in=list(orders)).values_list('uuid', 'trades_count')
+        )
+        need_trades = [
+            request_id for request_id, order in orders.items()
+            if order.trades_count > 0 and known.get(request_id) != order.trades_count
+        ]
+        trades = []
+        if need_trades:
+            details = self.trader.get_orders_info(need_trades)
+            self.requests += len(need_trades)
+            for detail in details['results']:
+                if isinstance(detail, dict) and 'error' not in detail:
+                    trades.extend(to_trades(detail))
+
+        with transaction.atomic():
+            UpbitOrder.objects.bulk_create(
+                orders.values(), update_conflicts=True, unique_fields=['uuid'], update_fields=ORDER_UPDATE_FIELDS
+            )
+            if trades:
+                UpbitTrade.objects.bulk_create(
+                    trades, update_conflicts=True, unique_fields=['uuid'], update_fields=TRADE_UPDATE_FIELDS
+                )
+        return len(orders), len(trades)
+
+    def sync(self, until=None):
+        """
+        기준 시각부터 until(기본값: 현재)까지 동기화합니다.
+
+        :return: {'orders', 'trades', 'requests', 'high_water_mark'}
+        """
+        until = until or datetime.now()
+        start = self.high_water_mark() - timedelta(hours=settings.ORDER_SYNC_OVERLAP_HOURS)
+        saved_orders = saved_trades = 0
+        while start < until:
+            end = min(start + self.WINDOW, until)
+            for page in self.iter_pages(start, end):
+                orders, trades = self.save_page(page)
+                saved_orders += orders
+                saved_trades += trades
+            OrderSyncState.objects.update_or_create(name=self.name, defaults={'high_water_mark': end})
+            start = end
+        self.logger.info(
+            f"주문 내역 동기화 완료: 주문 {saved_orders}건, 체결 {saved_trades}건, 요청 {self.requests}회 (~{until})"
+        )
+        return {
+            'orders': saved_orders,
+            'trades': saved_trades,
+            'requests': self.requests,
+            'high_water_mark': until,
+        }
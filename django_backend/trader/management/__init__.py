@@ -0,0 +1 @@
+# django_backend/trader/management/__init__.py
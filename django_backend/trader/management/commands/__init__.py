@@ -0,0 +1 @@
+# django_backend/trader/management/commands/__init__.py
@@ -0,0 +1,23 @@
+# django_backend/trader/management/commands/run_order_gateway.py
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from django_backend.trader.gateway import OrderGateway
+
+
+class Command(BaseCommand):
+    help = "주문 요청 스트림을 구독해 업비트에 바로 전송하는 주문 게이트웨이를 시작합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="동시에 전송할 수 있는 주문 수")
+
+    def handle(self, *args, **options):
+        gateway = OrderGateway(workers=options["workers"])
+        try:
+            asyncio.run(gateway.run())
+        except KeyboardInterrupt:
+            gateway.stop()
+        finally:
+            gateway.close()
+        self.stdout.write(str(gateway.latency_stats()))
@@ -0,0 +1,19 @@
+# django_backend/trader/management/commands/run_order_state_sync.py
+from django.core.management.base import BaseCommand
+
+from django_backend.trader.state import OrderStateSyncer
+
+
+class Command(BaseCommand):
+    help = "미체결 주문 조회와 주문 게이트웨이 결과로 계좌/주문 상태 저장소를 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from-id", default="$", help="읽기 시작할 주문 결과 스트림 ID")
+
+    def handle(self, *args, **options):
+        syncer = OrderStateSyncer()
+        try:
+            syncer.run_forever(last_id=options["from_id"])
+        except KeyboardInterrupt:
+            syncer.stop()
+        self.stdout.write(f"거래소 요청 {syncer.requests}회")
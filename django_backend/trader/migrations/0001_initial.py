@@ -0,0 +1,69 @@
+# Generated by Django 4.1 on 2026-10-19 08:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True)),
+                ('high_water_mark', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UpbitOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.CharField(max_length=36, unique=True)),
+                ('market', models.CharField(max_length=20)),
+                ('side', models.CharField(max_length=3)),
+                ('ord_type', models.CharField(max_length=10)),
+                ('state', models.CharField(max_length=10)),
+                ('price', models.FloatField(null=True)),
+                ('volume', models.FloatField(null=True)),
+                ('remaining_volume', models.FloatField(null=True)),
+                ('executed_volume', models.FloatField(default=0)),
+                ('executed_funds', models.FloatField(null=True)),
+                ('paid_fee', models.FloatField(default=0)),
+                ('trades_count', models.IntegerField(default=0)),
+                ('identifier', models.CharField(max_length=64, null=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('synced_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UpbitTrade',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.CharField(max_length=36, unique=True)),
+                ('market', models.CharField(max_length=20)),
+                ('side', models.CharField(max_length=3)),
+                ('price', models.FloatField()),
+                ('volume', models.FloatField()),
+                ('funds', models.FloatField()),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trades', to='trader.upbitorder', to_field='uuid')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='upbitorder',
+            index=models.Index(fields=['market', 'created_at'], name='trader_upbi_market_d99d1f_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1 on 2026-10-19 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trader', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderExecution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.CharField(max_length=36, unique=True)),
+                ('market', models.CharField(max_length=20)),
+                ('side', models.CharField(max_length=3)),
+                ('ord_type', models.CharField(max_length=10)),
+                ('submitted_at', models.DateTimeField()),
+                ('signal_to_submit_ms', models.FloatField(null=True)),
+                ('submit_to_ack_ms', models.FloatField()),
+                ('ack_to_fill_ms', models.FloatField(null=True)),
+                ('reference_price', models.FloatField(null=True)),
+                ('fill_price', models.FloatField(null=True)),
+                ('slippage_bps', models.FloatField(null=True)),
+                ('state', models.CharField(max_length=10)),
+            ],
+            options={
+                'ordering': ['submitted_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='orderexecution',
+            index=models.Index(fields=['market', 'submitted_at'], name='trader_orde_market_6091cc_idx'),
+        ),
+    ]
@@ -0,0 +1,119 @@
+# django_backend/trader/models.py
+from django.db import models
+
+
+class UpbitOrder(models.Model):
+    # 업비트 주문 UUID
+    uuid = models.CharField(max_length=36, unique=True)
+    # 종목 코드 (예: KRW-BTC)
+    market = models.CharField(max_length=20)
+    # 주문 종류 (매수: bid, 매도: ask)
+    side = models.CharField(max_length=3)
+    # 주문 방식 (limit, price, market, best)
+    ord_type = models.CharField(max_length=10)
+    # 주문 상태 (done, cancel)
+    state = models.CharField(max_length=10)
+    # 주문 가격 (시장가 매수는 주문 총액)
+    price = models.FloatField(null=True)
+    # 주문 수량 (시장가 매수는 없음)
+    volume = models.FloatField(null=True)
+    # 남은 주문 수량
+    remaining_volume = models.FloatField(null=True)
+    # 체결된 수량
+    executed_volume = models.FloatField(default=0)
+    # 체결된 금액
+    executed_funds = models.FloatField(null=True)
+    # 지불한 수수료
+    paid_fee = models.FloatField(default=0)
+    # 체결 건수
+    trades_count = models.IntegerField(default=0)
+    # 사용자 지정 주문 식별자
+    identifier = models.CharField(max_length=64, null=True)
+    # 주문 생성 시각 (KST)
+    created_at = models.DateTimeField(db_index=True)
+    # 마지막 동기화 시각
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['market', 'created_at'])]
+        app_label = 'trader'
+
+    def __str__(self):
+        return f"{self.market} {self.side} {self.uuid} ({self.state})"
+
+
+class UpbitTrade(models.Model):
+    # 체결 UUID
+    uuid = models.CharField(max_length=36, unique=True)
+    # 체결된 주문
+    order = models.ForeignKey(UpbitOrder, to_field='uuid', on_delete=models.CASCADE, related_name='trades')
+    # 종목 코드
+    market = models.CharField(max_length=20)
+    # 체결 종류 (bid, ask)
+    side = models.CharField(max_length=3)
+    # 체결 가격
+    price = models.FloatField()
+    # 체결 수량
+    volume = models.FloatField()
+    # 체결 금액
+    funds = models.FloatField()
+    # 체결 시각 (KST)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['created_at']
+        app_label = 'trader'
+
+    def __str__(self):
+        return f"{self.market} {self.side} {self.volume}@{self.price}"
+
+
+class OrderSyncState(models.Model):
+    # 동기화 대상 이름 (종목 코드 또는 전체 종목 'ALL')
+    name = models.CharField(max_length=20, unique=True)
+    # 이 시각(KST)까지 생성된 주문은 동기화 완료
+    high_water_mark = models.DateTimeField()
+    # 마지막 동기화 시각
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'trader'
+
+    def __str__(self):
+        return f"{self.name} synced until {self.high_water_mark}"
+
+
+class OrderExecution(models.Model):
+    # 주문 UUID
+    uuid = models.CharField(max_length=36, unique=True)
+    # 종목 코드
+    market = models.CharField(max_length=20)
+    # 주문 종류 (bid, ask)
+    side = models.CharField(max_length=3)
+    # 주문 방식 (limit, price, market, best)
+    ord_type = models.CharField(max_length=10)
+    # 주문 전송 시각 (KST)
+    submitted_at = models.DateTimeField()
+    # 신호 발생 ~ 주문 전송 (ms, 신호 시각이 없으면 null)
+    signal_to_submit_ms = models.FloatField(null=True)
+    # 주문 전송 ~ 거래소 접수 응답 (ms)
+    submit_to_ack_ms = models.FloatField()
+    # 접수 응답 ~ 체결 완료 (ms, 미체결이면 null)
+    ack_to_fill_ms = models.FloatField(null=True)
+    # 기준 가격 (신호 시점 가격)
+    reference_price = models.FloatField(null=True)
+    # 평균 체결 가격
+    fill_price = models.FloatField(null=True)
+    # 슬리피지 (bp, 양수면 불리한 체결)
+    slippage_bps = models.FloatField(null=True)
+    # 주문 상태 (wait, done, cancel, rejected)
+    state = models.CharField(max_length=10)
+
+    class Meta:
+        ordering = ['submitted_at']
+        indexes = [models.Index(fields=['market', 'submitted_at'])]
+        app_label = 'trader'
+
+    def __str__(self):
+        return f"{self.market} {self.side} {self.uuid} ack {self.submit_to_ack_ms:.0f}ms"
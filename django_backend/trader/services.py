@@ -7,11 +7,17 @@ import hashlib
 import jwt
 import requests
 import logging
+import time as t
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django_backend.config.rate_limiter import PRIORITY_LIVE, PRIORITY_ORDER, get_rate_limiter
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode, unquote
 
 # .env 파일 로드
 load_dotenv()
 
+
 class UpbitTrader(AbstractTrader):
     """
     업비트 거래소의 거래 요청을 처리하는 클래스
@@ -28,13 +34,19 @@ class UpbitTrader(AbstractTrader):
         "DOGE": "KRW-DOGE",
     }
 
-    def __init__(self):
+    def __init__(self, session=None, rate_limiter=None):
         self.logger = logging.getLogger(__name__)   
         # 환경 변수에서 API 키 가져오기
         self.access_key = os.environ.get("UPBIT_OPEN_API_ACCESS_KEY")
         self.secret_key = os.environ.get("UPBIT_OPEN_API_SECRET_KEY")
         self.server_url = "https://api.upbit.com/v1/"
 
+        # 일괄 요청이 연결을 재사용하도록 세션을 유지하고, 요청 제한은 모든 워커가 공유하는 버킷을 따름
+        self.session = session or requests.Session()
+        if session is None:
+            self.session.mount("https://", HTTPAdapter(pool_maxsize=settings.UPBIT_MAX_CONCURRENT_REQUESTS))
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
         # FIXME: 환경 변수 로드 실패 시 기본값 설정이나 오류 처리 로직 필요.
         # TODO: 여러 거래소를 지원할 수 있도록 서버 URL이나 인증 키를 동적으로 설정하는 로직 추가 필요.
 
@@ -57,11 +69,7 @@ class UpbitTrader(AbstractTrader):
            "unit_currency": 평단가 기준 화폐
          }
         """
-        jwt_token = self._create_jwt_token()
-        authorization = 'Bearer {0}'.format(jwt_token)
-        headers = {"Authorization": authorization}
-
-        return self._request_get(self.server_url + "accounts", headers=headers)        
+        return self._request("GET", "accounts")
 
 
     def send_request(self, market, side, price = None, volume = None, ord_type = 'best', time_in_force = 'ioc'):
@@ -117,14 +125,19 @@ class UpbitTrader(AbstractTrader):
             "ord_type": ord_type,
             "time_in_force": time_in_force,
         }
+        # 값이 없는 파라미터는 전송/서명에서 제외 (시장가 주문의 time_in_force 등)
+        params = {key: value for key, value in params.items() if value is not None}
 
-        query_string = unquote(urlencode(params, doseq=True))
-        
-        jwt_token = self._create_jwt_token(query_string)
-        authorization = 'Bearer {}'.format(jwt_token)
-        headers = {"Authorization": authorization}
+        return self._request("POST", "orders", body=params, group="order", priority=PRIORITY_ORDER)
 
-        return self._request_get(self.server_url + "orders", json=params, headers=headers)
+    def send_requests(self, orders):
+        """
+        여러 주문을 요청 제한(order 그룹) 안에서 동시에 전송합니다.
+
+        :param orders: send_request 인자 dict 리스트 (예: [{'market': 'KRW-BTC', 'side': 'bid', ...}, ...])
+        :return: _run_batch 결과 (results는 orders와 같은 순서)
+        """
+        return self._run_batch([lambda order=order: self.send_request(**order) for order in orders])
 
     def cancel_request(self, request_id):
         """
@@ -137,40 +150,147 @@ class UpbitTrader(AbstractTrader):
             "uuid": request_id,
         }
 
-        query_string = unquote(urlencode(params, doseq=True))
+        return self._request("DELETE", "order", params=params, priority=PRIORITY_ORDER)
 
-        jwt_token = self._create_jwt_token(query_string)
-        authorization = 'Bearer {}'.format(jwt_token)
-        headers = {"Authorization": authorization}
+    def cancel_requests(self, request_ids):
+        """
+        여러 주문을 요청 제한(default 그룹) 안에서 동시에 취소합니다.
 
-        return requests.delete(self.server_url + "orders", params=params, headers=headers).json()
+        :return: _run_batch 결과 (results는 request_ids와 같은 순서)
+        """
+        return self._run_batch([lambda request_id=request_id: self.cancel_request(request_id) for request_id in request_ids])
 
-    def cancel_all_requests(self):
+    def cancel_all_requests(self, market=None):
         """
-        TODO: 현재 미구현 상태. 모든 미체결 주문을 취소하는 기능 추가 필요.
-        NOTE: 여러 주문을 일괄 취소하는 로직이 필요할 수 있음.
+        대기 중인 모든 주문(또는 한 종목의 주문)을 조회해 동시에 취소합니다.
+
+        NOTE: 조회 이후 새로 접수된 주문은 취소되지 않습니다.
         """
-        pass
+        open_orders = self.get_open_orders(market)
+        if isinstance(open_orders, dict):  # 조회 실패
+            return {"results": [], "succeeded": 0, "failed": 0, "elapsed_ms": 0.0, "error": open_orders.get("error")}
+        return self.cancel_requests([order["uuid"] for order in open_orders])
 
     def get_order_info(self, order_id):
         """
-        TODO: 특정 주문 정보를 조회하는 기능 구현 필요.
-        NOTE: 주문 조회 시 응답 데이터의 표준화 필요.
+        주문 UUID로 개별 주문(체결 내역 포함)을 조회합니다.
+        """
+        return self._request("GET", "order", params={"uuid": order_id})
+
+    def get_orders_info(self, request_ids):
+        """
+        여러 주문의 개별 조회(체결 내역 포함)를 요청 제한 안에서 동시에 실행합니다.
+
+        :return: _run_batch 결과 (results는 request_ids와 같은 순서)
+        """
+        return self._run_batch([lambda request_id=request_id: self.get_order_info(request_id) for request_id in request_ids])
+
+    def get_orders_by_uuids(self, request_ids):
+        """
+        여러 주문을 UUID로 한 번에 조회합니다 (요청당 최대 100개, 체결 내역 미포함).
+
+        :return: 주문 리스트. 조회 실패 시 {'error': ...}
+        """
+        orders = []
+        for offset in range(0, len(request_ids), 100):
+            result = self._request("GET", "orders/uuids", params={"uuids[]": list(request_ids[offset:offset + 100])})
+            if isinstance(result, dict):
+                return result
+            orders.extend(result)
+        return orders
+
+    def get_open_orders(self, market=None, limit=100):
         """
-        pass
+        체결 대기(wait/watch) 주문을 모두 조회합니다 (limit개 단위로 페이지 조회).
 
-    def get_open_orders(self):
+        :return: 주문 리스트. 조회 실패 시 {'error': ...}
         """
-        TODO: 현재 미구현 상태. 열려 있는 모든 주문을 조회하는 기능 추가 필요.
+        orders, page = [], 1
+        while True:
+            params = {"states[]": ["wait", "watch"], "page": page, "limit": limit}
+            if market is not None:
+                params = dict(market=market, **params)
+            result = self._request("GET", "orders/open", params=params)
+            if isinstance(result, dict):
+                return result
+            orders.extend(result)
+            if len(result) < limit:
+                return orders
+            page += 1
+
+    def get_closed_orders(self, market=None, start_time=None, end_time=None, limit=1000):
         """
-        pass
+        완료(done)/취소(cancel)된 주문을 조회합니다.
 
-    def get_closed_orders(self):
+        :param start_time: 조회 시작 시각 (ISO 8601, 업비트는 최대 7일 구간만 허용)
+        :param end_time: 조회 종료 시각 (ISO 8601)
+        :return: 주문 리스트 (최신순). 조회 실패 시 {'error': ...}
         """
-        TODO: 현재 미구현 상태. 완료된 모든 주문을 조회하는 기능 추가 필요.
+        params = {"states[]": ["done", "cancel"], "limit": limit, "order_by": "desc"}
+        for key, value in (("market", market), ("start_time", start_time), ("end_time", end_time)):
+            if value is not None:
+                params[key] = value
+        return self._request("GET", "orders/closed", params=params)
+
+    def _run_batch(self, calls):
         """
-        pass
+        요청 함수들을 스레드 풀에서 동시에 실행하고 결과를 모읍니다.
+        각 요청은 _request에서 요청 그룹의 제한을 따르므로, 전체 시간은 대략
+        왕복 시간 1회 + 속도 제한 대기 시간입니다.
 
+        :return: {'results': 요청 순서대로의 응답(실패 시 {'error': ...}), 'succeeded', 'failed', 'elapsed_ms'}
+        """
+        started = t.perf_counter()
+        if calls:
+            workers = min(len(calls), settings.UPBIT_MAX_CONCURRENT_REQUESTS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upbit-batch") as executor:
+                results = list(executor.map(lambda call: call(), calls))
+        else:
+            results = []
+        failed = sum(1 for result in results if isinstance(result, dict) and "error" in result)
+        elapsed_ms = (t.perf_counter() - started) * 1000
+        if failed:
+            self.logger.warning(f"일괄 요청 {len(results)}건 중 {failed}건 실패 ({elapsed_ms:.0f}ms)")
+        return {"results": results, "succeeded": len(results) - failed, "failed": failed, "elapsed_ms": elapsed_ms}
+
+    def _request(self, method, endpoint, params=None, body=None, group="default", priority=PRIORITY_LIVE, retries=2):
+        """
+        인증이 필요한 Exchange API를 호출합니다.
+
+        GET/DELETE는 params를 쿼리 문자열로, POST는 body를 JSON으로 전송하며 같은 파라미터로 query_hash를 만듭니다.
+        요청 전에 공유 요청 제한기(그룹 order/default, 우선순위 priority)를 따르고, 응답 헤더로 제한기를 갱신합니다.
+        429 응답은 retries번까지 다시 시도합니다.
+
+        :return: JSON 응답. 실패 시 업비트 오류 형식 {'error': {'name', 'message'}}
+        """
+        query = params if params is not None else body
+        query_string = unquote(urlencode(query, doseq=True)) if query else None
+        for attempt in range(retries + 1):
+            self.rate_limiter.acquire(group, priority)
+            headers = {"Authorization": 'Bearer {}'.format(self._create_jwt_token(query_string))}
+            try:
+                response = self.session.request(
+                    method, self.server_url + endpoint, params=params, json=body, headers=headers,
+                    timeout=settings.UPBIT_REQUEST_TIMEOUT
+                )
+            except requests.exceptions.RequestException as msg:
+                self.logger.error(f"Request exception: {msg}")
+                return {"error": {"name": "request_exception", "message": str(msg)}}
+            self.rate_limiter.observe(response, group)
+            if response.status_code == 429 and attempt < retries:
+                self.logger.warning(f"요청 제한 초과(429), 재시도합니다: {method} {endpoint}")
+                t.sleep(0.1 * (attempt + 1))
+                continue
+            try:
+                result = response.json()
+            except ValueError as err:
+                self.logger.error(f"Invalid data from server: {err}")
+                return {"error": {"name": "invalid_response", "message": response.text[:200]}}
+            if not response.ok:
+                self.logger.error(f"HTTP error occurred: {response.status_code} {result}")
+                if not (isinstance(result, dict) and "error" in result):
+                    result = {"error": {"name": f"http_{response.status_code}", "message": str(result)}}
+            return result
 
     def _create_jwt_token(self, query_string = None):
         """
@@ -187,40 +307,9 @@ class UpbitTrader(AbstractTrader):
         # 주문 취소의 경우 사용
         if query_string is not None:
             msg = hashlib.sha512()
-            msg.update(query_string)
+            msg.update(query_string.encode())
             query_hash = msg.hexdigest()
             payload["query_hash"] = query_hash
             payload["query_hash_alg"] = "SHA512"
         
         return jwt.encode(payload, self.secret_key)
-    
-    def _request_get(self, url: str, headers: dict = None, params: dict = None) -> dict:
-        """
-        HTTP GET 요청을 수행하고 JSON 응답을 반환합니다.
-
-        :param url: 요청할 URL
-        :param headers: 요청에 사용할 헤더
-        :param params: 요청에 사용할 파라미터
-        :return: JSON 응답 데이터 또는 None
-        
-        NOTE: 에러 처리 로직이 간단하게 구성되어 있음. 응답 코드에 따른 추가 처리 로직 필요.
-        TODO: 여러 거래소 지원 시 재사용성을 높이기 위해 인터페이스화 필요.
-        """
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            result = response.json()
-        except ValueError as err:
-            self.logger.error(f"Invalid data from server: {err}")
-            return None
-        except requests.exceptions.HTTPError as msg:
-            self.logger.error(f"HTTP error occurred: {msg}")
-            return None
-        except requests.exceptions.RequestException as msg:
-            self.logger.error(f"Request exception: {msg}")
-            return None
-
-        return result
-
-
-
@@ -0,0 +1,379 @@
+# django_backend/trader/state.py
+import json
+import logging
+import time as t
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATES = ("wait", "watch")
+BALANCES_KEY = "trader:state:balances"  # currency -> {'balance', 'locked', 'avg_buy_price'}
+ORDERS_KEY = "trader:state:orders"  # uuid -> 마지막으로 반영한 주문 응답
+OPEN_ORDERS_KEY = "trader:state:open_orders"  # 미체결 주문 uuid -> 다음 조회 시각(epoch 초)
+POLL_INTERVAL_KEY = "trader:state:poll_interval"  # 미체결 주문 uuid -> 현재 조회 간격(초)
+UPDATED_AT_KEY = "trader:state:updated_at"
+
+
+def _number(value):
+    return float(value) if value not in (None, "") else 0.0
+
+
+def executed_funds(order):
+    """
+    주문 응답의 누적 체결 금액. executed_funds가 없으면 체결 내역(trades) 합계, 그것도 없으면 평균가 x 체결량.
+    """
+    if order.get("executed_funds") not in (None, ""):
+        return float(order["executed_funds"])
+    if order.get("trades"):
+        return sum(float(trade["funds"]) for trade in order["trades"])
+    # 시장가 매수(price)의 price는 주문 총액이므로 체결 가격으로 사용할 수 없음
+    price = order.get("avg_price") or (order.get("price") if order.get("ord_type") == "limit" else None)
+    return _number(price) * _number(order.get("executed_volume"))
+
+
+class AccountStateStore:
+    """
+    잔고와 미체결 주문을 Redis에 보관하는 트레이더 측 상태 저장소.
+
+    주문 응답(전송/조회/게이트웨이 결과)이 들어올 때마다 이전에 반영한 값과의 차이
+    (체결량, 체결 금액, 수수료, 잠금 금액)만큼 잔고를 갱신하므로, 전략은 GET /accounts 없이 계좌 상태를 읽을 수 있습니다.
+    잔고는 OrderStateSyncer가 주기적으로 GET /accounts 결과로 덮어써 누적 오차를 바로잡습니다.
+
+    - 읽기는 max_staleness초 동안 프로세스 내부 사본을 사용합니다 (반복 조회는 Redis 왕복 없이 마이크로초 단위)
+    - 쓰기는 주문 상태를 갱신하는 프로세스 하나(OrderStateSyncer)에서만 수행한다고 가정합니다
+
+    NOTE: 잔고 단위는 업비트 계좌 조회와 같이 balance(주문 가능)와 locked(주문 중 잠금)로 나뉩니다.
+    """
+
+    def __init__(self, redis_client=None, max_staleness=None):
+        self.logger = logger
+        self.redis_client = redis_client or redis.StrictRedis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+        self.max_staleness = settings.ACCOUNT_STATE_MAX_STALENESS if max_staleness is None else max_staleness
+        self._balances = None
+        self._loaded_at = 0.0
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def balances(self):
+        """
+        {currency: {'balance', 'locked', 'avg_buy_price'}}
+        """
+        if self._balances is None or t.monotonic() - self._loaded_at > self.max_staleness:
+            raw = self.redis_client.hgetall(BALANCES_KEY)
+            self._balances = {currency: json.loads(value) for currency, value in raw.items()}
+            self._loaded_at = t.monotonic()
+        return self._balances
+
+    def balance(self, currency):
+        """
+        한 통화의 주문 가능 잔고.
+        """
+        return self.balances().get(currency, {}).get("balance", 0.0)
+
+    def positions(self, unit_currency="KRW"):
+        """
+        보유 코인 포지션. {market: {'volume'(주문 중 잠금 포함), 'avg_buy_price'}}
+        """
+        return {
+            f"{unit_currency}-{currency}": {
+                "volume": state["balance"] + state["locked"],
+                "avg_buy_price": state["avg_buy_price"],
+            }
+            for currency, state in self.balances().items()
+            if currency != unit_currency and state["balance"] + state["locked"] > 0
+        }
+
+    def order(self, request_id):
+        raw = self.redis_client.hget(ORDERS_KEY, request_id)
+        return json.loads(raw) if raw else None
+
+    def open_orders(self, market=None):
+        """
+        미체결 주문 응답 리스트.
+        """
+        request_ids = self.redis_client.zrange(OPEN_ORDERS_KEY, 0, -1)
+        if not request_ids:
+            return []
+        orders = [json.loads(raw) for raw in self.redis_client.hmget(ORDERS_KEY, request_ids) if raw]
+        return [order for order in orders if market is None or order["market"] == market]
+
+    def due_orders(self, now=None, limit=None):
+        """
+        다음 조회 시각이 지난 미체결 주문 uuid (limit개까지).
+        """
+        now = t.time() if now is None else now
+        if limit is None:
+            return self.redis_client.zrangebyscore(OPEN_ORDERS_KEY, "-inf", now)
+        return self.redis_client.zrangebyscore(OPEN_ORDERS_KEY, "-inf", now, start=0, num=limit)
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def replace_balances(self, accounts):
+        """
+        GET /accounts 응답으로 잔고 전체를 교체합니다.
+        """
+        balances = {
+            account["currency"]: {
+                "balance": _number(account["balance"]),
+                "locked": _number(account["locked"]),
+                "avg_buy_price": _number(account["avg_buy_price"]),
+            }
+            for account in accounts
+        }
+        pipe = self.redis_client.pipeline()
+        pipe.delete(BALANCES_KEY)
+        if balances:
+            pipe.hset(BALANCES_KEY, mapping={currency: json.dumps(state) for currency, state in balances.items()})
+        pipe.set(UPDATED_AT_KEY, t.time())
+        pipe.execute()
+        self._set_local(balances)
+
+    @staticmethod
+    def is_stale(order, previous):
+        """
+        이미 반영한 응답보다 오래된 응답인지 확인합니다.
+        체결량은 줄지 않고 종료된 주문은 다시 미체결이 되지 않으므로, 체결량이 더 작거나
+        같은 체결량에서 종료 -> 미체결로 돌아간 응답은 늦게 도착한 이전 응답입니다
+        (예: 조회/reconcile이 체결을 반영한 뒤 도착한 게이트웨이의 주문 접수 응답).
+        """
+        if not previous:
+            return False
+        volume, previous_volume = _number(order.get("executed_volume")), _number(previous.get("executed_volume"))
+        if volume != previous_volume:
+            return volume < previous_volume
+        return order.get("state") in OPEN_STATES and previous.get("state") not in OPEN_STATES
+
+    def apply_order(self, order, poll_interval=None):
+        """
+        주문 응답을 반영합니다. 이전에 반영한 응답과의 차이만큼 잔고를 갱신하고,
+        미체결 주문은 다음 조회 시각과 함께 조회 대상에 둡니다. 이전 응답보다 오래된 응답은 무시합니다.
+
+        :param order: 업비트 주문 응답 (send_request, get_order_info, 게이트웨이 결과의 response)
+        :param poll_interval: 다음 조회까지의 간격 (초). None이면 설정 최소값
+        :return: 체결량이 늘었는지 여부
+        """
+        if not order or "uuid" not in order:
+            return False
+        previous = self.order(order["uuid"]) or {}
+        if self.is_stale(order, previous):
+            self.logger.info(
+                f"오래된 주문 응답을 무시합니다: {order['uuid']} "
+                f"({order.get('state')} {order.get('executed_volume')} < {previous.get('state')} "
+                f"{previous.get('executed_volume')})"
+            )
+            return False
+        quote, base = order["market"].split("-")
+        delta_volume = _number(order.get("executed_volume")) - _number(previous.get("executed_volume"))
+        delta_funds = executed_funds(order) - (executed_funds(previous) if previous else 0.0)
+        delta_fee = _number(order.get("paid_fee")) - _number(previous.get("paid_fee"))
+        delta_locked = _number(order.get("locked")) - _number(previous.get("locked"))
+
+        balances = {currency: dict(state) for currency, state in self.balances().items()}
+        zero = {"balance": 0.0, "locked": 0.0, "avg_buy_price": 0.0}
+        quote_state = balances.setdefault(quote, dict(zero))
+        base_state = balances.setdefault(base, dict(zero))
+        if order["side"] == "bid":
+            # 잠금 금액 변화 + 체결 대금/수수료 지출, 코인 증가
+            quote_state["locked"] += delta_locked
+            quote_state["balance"] -= delta_locked + delta_funds + delta_fee
+            held = base_state["balance"] + base_state["locked"]
+            if delta_volume > 0:
+                base_state["avg_buy_price"] = (base_state["avg_buy_price"] * held + delta_funds) / (held + delta_volume)
+            base_state["balance"] += delta_volume
+        else:
+            # 잠금 수량 변화 + 체결 수량 감소, 체결 대금 - 수수료 입금
+            base_state["locked"] += delta_locked
+            base_state["balance"] -= delta_locked + delta_volume
+            quote_state["balance"] += delta_funds - delta_fee
+
+        pipe = self.redis_client.pipeline()
+        pipe.hset(ORDERS_KEY, order["uuid"], json.dumps(order))
+        pipe.hset(BALANCES_KEY, mapping={currency: json.dumps(balances[currency]) for currency in (quote, base)})
+        if order.get("state") in OPEN_STATES:
+            interval = poll_interval or settings.ORDER_POLL_MIN_INTERVAL
+            pipe.zadd(OPEN_ORDERS_KEY, {order["uuid"]: t.time() + interval})
+            pipe.hset(POLL_INTERVAL_KEY, order["uuid"], interval)
+        else:
+            pipe.zrem(OPEN_ORDERS_KEY, order["uuid"])
+            pipe.hdel(POLL_INTERVAL_KEY, order["uuid"])
+        pipe.set(UPDATED_AT_KEY, t.time())
+        pipe.execute()
+        self._set_local(balances)
+        return delta_volume > 0
+
+    def track_order(self, order):
+        """
+        잔고를 바꾸지 않고 주문 응답을 기준값으로 저장합니다 (이미 잔고에 반영된 주문).
+        """
+        pipe = self.redis_client.pipeline()
+        pipe.hset(ORDERS_KEY, order["uuid"], json.dumps(order))
+        if order.get("state") in OPEN_STATES:
+            pipe.zadd(OPEN_ORDERS_KEY, {order["uuid"]: t.time() + settings.ORDER_POLL_MIN_INTERVAL})
+            pipe.hset(POLL_INTERVAL_KEY, order["uuid"], settings.ORDER_POLL_MIN_INTERVAL)
+        pipe.execute()
+
+    def reschedule(self, request_id, interval):
+        """
+        미체결 주문의 다음 조회 시각을 interval초 뒤로 미룹니다.
+        """
+        pipe = self.redis_client.pipeline()
+        pipe.zadd(OPEN_ORDERS_KEY, {request_id: t.time() + interval}, xx=True)
+        pipe.hset(POLL_INTERVAL_KEY, request_id, interval)
+        pipe.execute()
+
+    def poll_interval(self, request_id):
+        value = self.redis_client.hget(POLL_INTERVAL_KEY, request_id)
+        return float(value) if value else settings.ORDER_POLL_MIN_INTERVAL
+
+    def prune_closed_orders(self, keep=1000):
+        """
+        종료된 주문 응답을 최근 keep개만 남기고 삭제합니다.
+        """
+        open_ids = set(self.redis_client.zrange(OPEN_ORDERS_KEY, 0, -1))
+        closed = []
+        for request_id, raw in self.redis_client.hscan_iter(ORDERS_KEY):
+            if request_id not in open_ids:
+                closed.append((json.loads(raw).get("created_at", ""), request_id))
+        closed.sort()
+        stale = [request_id for _, request_id in closed[:max(0, len(closed) - keep)]]
+        if stale:
+            self.redis_client.hdel(ORDERS_KEY, *stale)
+        return len(stale)
+
+    def _set_local(self, balances):
+        self._balances = balances
+        self._loaded_at = t.monotonic()
+
+
+class OrderStateSyncer:
+    """
+    AccountStateStore를 최신 상태로 유지하는 동기화 루프.
+
+    - 미체결 주문만 조회합니다. 조회 간격은 ORDER_POLL_MIN_INTERVAL에서 시작해 상태 변화가 없으면 두 배씩
+      늘어나 UpbitTrader.RESULT_CHECK_INTERVAL까지 커지고, 체결이 생기면 다시 최소값으로 돌아갑니다
+    - 조회 시각이 된 주문은 GET /orders/uuids로 최대 100개씩 한 번에 조회합니다
+    - 주문 게이트웨이 결과 스트림(settings.ORDER_RESULT_STREAM)의 주문 응답을 즉시 반영합니다
+    - ACCOUNT_RECONCILE_INTERVAL초마다 GET /accounts로 잔고를 다시 맞춥니다
+    """
+
+    def __init__(self, trader=None, store=None):
+        from django_backend.trader.services import UpbitTrader
+
+        self.logger = logger
+        self.trader = trader or UpbitTrader()
+        self.store = store or AccountStateStore()
+        self.max_interval = self.trader.RESULT_CHECK_INTERVAL
+        self._last_reconcile = None
+        self._running = False
+        self.requests = 0
+
+    def reconcile(self):
+        """
+        GET /accounts 결과로 잔고를 교체하고, 미체결 주문의 기준값을 같은 시점의 조회 결과로 다시 맞춥니다.
+        다른 경로(Celery 작업 등)로 접수되어 아직 모르는 미체결 주문도 이때 추가됩니다.
+
+        NOTE: 추적 중인 주문을 먼저 모두 반영한 뒤 계좌를 조회하므로, 두 조회 사이의 짧은 구간에 생긴 체결만
+        다음 reconcile까지 잔고에 늦게 반영될 수 있습니다.
+        """
+        self._last_reconcile = t.monotonic()
+        self.poll_open_orders(now=float("inf"))
+        accounts = self.trader.get_account_info()
+        open_orders = self.trader.get_open_orders()
+        self.requests += 2
+        if not isinstance(accounts, list):
+            self.logger.error(f"계좌 조회 실패: {accounts}")
+            return False
+        self.store.replace_balances(accounts)
+        if isinstance(open_orders, list):
+            for order in open_orders:
+                # 계좌 조회 결과에 이미 반영된 상태이므로 잔고 변경 없이 기준값으로만 저장
+                self.store.track_order(order)
+        return True
+
+    def poll_open_orders(self, now=None):
+        """
+        조회 시각이 된 미체결 주문을 조회해 반영합니다.
+
+        :return: 조회한 주문 수
+        """
+        request_ids = self.store.due_orders(now)
+        if not request_ids:
+            return 0
+        orders = self.trader.get_orders_by_uuids(request_ids)
+        self.requests += 1
+        if isinstance(orders, dict):
+            self.logger.error(f"미체결 주문 조회 실패: {orders}")
+            return 0
+        returned = set()
+        for order in orders:
+            returned.add(order["uuid"])
+            previous = self.store.order(order["uuid"]) or {}
+            changed = (
+                order.get("state") != previous.get("state")
+                or order.get("executed_volume") != previous.get("executed_volume")
+            )
+            interval = (
+                settings.ORDER_POLL_MIN_INTERVAL if changed
+                else min(self.store.poll_interval(order["uuid"]) * 2, self.max_interval)
+            )
+            self.store.apply_order(order, poll_interval=interval)
+        for request_id in set(request_ids) - returned:
+            # 일괄 조회 응답에 없는 주문은 개별 조회로 확인하고, 실패하면 최대 간격 뒤에 다시 시도
+            order = self.trader.get_order_info(request_id)
+            self.requests += 1
+            if not self.store.apply_order(order) and not (isinstance(order, dict) and "uuid" in order):
+                self.store.reschedule(request_id, self.max_interval)
+        return len(request_ids)
+
+    def apply_gateway_result(self, fields):
+        """
+        주문 게이트웨이 결과 스트림 메시지를 반영합니다.
+        """
+        if fields.get("status") != "sent" or not fields.get("response"):
+            return False
+        self.store.apply_order(json.loads(fields["response"]))
+        return True
+
+    def run_forever(self, tick=0.2, last_id="$"):
+        """
+        tick초마다 미체결 주문을 조회하고, 그 사이에는 게이트웨이 결과 스트림을 기다립니다.
+        """
+        self._running = True
+        self.logger.info("주문 상태 동기화 시작")
+        while self._running:
+            try:
+                if self._last_reconcile is None or t.monotonic() - self._last_reconcile >= settings.ACCOUNT_RECONCILE_INTERVAL:
+                    self.reconcile()
+                self.poll_open_orders()
+            except Exception:
+                # Redis/HTTP 오류가 있어도 동기화 루프는 다음 주기에 다시 시도
+                self.logger.exception("주문 상태 동기화 실패")
+            try:
+                response = self.store.redis_client.xread(
+                    {settings.ORDER_RESULT_STREAM: last_id}, count=100, block=int(tick * 1000)
+                )
+            except redis.RedisError as e:
+                self.logger.error(f"주문 결과 스트림 읽기 실패: {e}")
+                t.sleep(tick)
+                continue
+            for _, messages in response or []:
+                for message_id, fields in messages:
+                    last_id = message_id
+                    try:
+                        self.apply_gateway_result(fields)
+                    except Exception:
+                        self.logger.exception(f"주문 결과 반영 실패: {message_id}")
+
+    def stop(self):
+        self._running = False
@@ -25,3 +25,50 @@ def cancel_order_task(request_id):
     """
     trader = UpbitTrader()
     return trader.cancel_request(request_id)
+
+@shared_task
+def send_orders_task(orders):
+    """
+    여러 주문을 동시에 전송하는 Celery 작업.
+    """
+    trader = UpbitTrader()
+    return trader.send_requests(orders)
+
+@shared_task
+def cancel_all_orders_task(market=None):
+    """
+    대기 중인 모든 주문(또는 한 종목의 주문)을 동시에 취소하는 Celery 작업.
+    """
+    trader = UpbitTrader()
+    return trader.cancel_all_requests(market)
+
+@shared_task
+def sync_order_history_task():
+    """
+    완료/취소된 주문과 체결 내역을 마지막 동기화 시점부터 DB에 저장하는 Celery 작업 (매일 실행).
+    """
+    from django_backend.trader.history import OrderHistorySync
+
+    result = OrderHistorySync().sync()
+    result['high_water_mark'] = result['high_water_mark'].isoformat()
+    return result
+
+@shared_task
+def send_instrumented_order_task(market, side, price=None, volume=None, ord_type='best', time_in_force='ioc',
+                                 signal_time=None, reference_price=None):
+    """
+    주문을 전송하고 신호~전송~접수 지연과 기준 가격을 기록하는 Celery 작업.
+    """
+    from django_backend.trader.execution import InstrumentedTrader
+
+    trader = InstrumentedTrader(UpbitTrader())
+    return trader.send_request(market, side, price, volume, ord_type, time_in_force, signal_time, reference_price)
+
+@shared_task
+def poll_order_fills_task():
+    """
+    실행 기록 중 아직 종료되지 않은 주문을 조회해 체결 지연과 슬리피지를 기록하는 Celery 작업.
+    """
+    from django_backend.trader.execution import InstrumentedTrader
+
+    return InstrumentedTrader(UpbitTrader()).poll_fills()
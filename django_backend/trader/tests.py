@@ -1,6 +1,26 @@
 # django_backend/trader/tests.py
-from django.test import TestCase
+import asyncio
+import hashlib
+import json
+import time as t
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
+import numpy as np
+import requests
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django_backend.controller.simulator.exchange import SimulatedTrader
+from django_backend.trader.execution import InstrumentedTrader, _histogram
+from django_backend.trader.gateway import OrderGateway
+from django_backend.trader.history import OrderHistorySync, format_time, parse_time
+from django_backend.trader.models import OrderExecution, OrderSyncState, UpbitOrder, UpbitTrade
+from django_backend.config.rate_limiter import (
+    PRIORITY_BACKFILL, PRIORITY_LIVE, PRIORITY_ORDER, LocalRateLimiter, RateLimitTimeout, parse_remaining_req,
+)
 from django_backend.trader.services import UpbitTrader
+from django_backend.trader.state import AccountStateStore, OrderStateSyncer
 
 
 class UpbitTraderTestCase(TestCase):
@@ -29,3 +49,636 @@ class UpbitTraderTestCase(TestCase):
         def test_cancel_order(self):
             pass
             
+
+
+class OrderGatewayTestCase(TestCase):
+    """
+    주문 게이트웨이 테스트 (HTTP 세션과 Redis는 모의 객체, 외부 API 호출 없음).
+    """
+
+    SECRET_KEY = "order-gateway-test-secret-key-0123456789"
+
+    def setUp(self):
+        self.redis_client = MagicMock()
+        self.redis_client.xadd = AsyncMock()
+        self.session = MagicMock()
+        self.session.post.return_value = self.make_response(201, {"uuid": "order-1", "state": "wait"})
+        self.gateway = OrderGateway(
+            redis_client=self.redis_client, session=self.session, access_key="access", secret_key=self.SECRET_KEY,
+            workers=2, max_age_ms=1000, rate_limiter=LocalRateLimiter(),
+        )
+        self.addCleanup(self.gateway.close)
+
+    @staticmethod
+    def make_response(status_code, body):
+        response = MagicMock()
+        response.status_code = status_code
+        response.ok = status_code < 400
+        response.json.return_value = body
+        response.headers = {}
+        return response
+
+    def request(self, **fields):
+        fields = dict({
+            "market": "KRW-BTC", "side": "bid", "price": "10000", "ord_type": "price",
+            "created_at_ms": str(int(t.time() * 1000)),
+        }, **fields)
+        return asyncio.run(self.gateway.handle("1-0", fields))
+
+    def test_sign_includes_query_hash(self):
+        params = {"market": "KRW-BTC", "side": "bid", "price": "10000", "ord_type": "price"}
+        token = self.gateway.sign(params)["Authorization"].split(" ")[1]
+        payload = jwt.decode(token, self.SECRET_KEY, algorithms=["HS256"])
+
+        expected = hashlib.sha512(b"market=KRW-BTC&side=bid&price=10000&ord_type=price").hexdigest()
+        self.assertEqual(payload["query_hash"], expected)
+        self.assertEqual(payload["access_key"], "access")
+
+    def test_send_order_publishes_result_with_timing(self):
+        result = self.request()
+
+        self.assertEqual(result["status"], "sent")
+        _, kwargs = self.session.post.call_args
+        self.assertEqual(kwargs["json"]["identifier"], "gw-1-0")
+        self.assertNotIn("volume", kwargs["json"])
+        for stage in ("queue_ms", "sign_ms", "rate_limit_ms", "http_ms", "parse_ms", "overhead_ms", "total_ms"):
+            self.assertIn(stage, result["timing"])
+        stream, fields = self.redis_client.xadd.call_args[0]
+        self.assertEqual(stream, settings.ORDER_RESULT_STREAM)
+        self.assertEqual(json.loads(fields["response"])["uuid"], "order-1")
+        self.assertEqual(self.gateway.latency_stats()["status"]["sent"], 1)
+
+    def test_rejected_and_failed_orders(self):
+        self.session.post.return_value = self.make_response(400, {"error": {"name": "under_min_total_bid"}})
+        self.assertEqual(self.request()["status"], "rejected")
+
+        self.session.post.side_effect = requests.exceptions.Timeout("timeout")
+        self.assertEqual(self.request()["status"], "unknown")
+
+        self.session.post.side_effect = requests.exceptions.ConnectionError("refused")
+        self.assertEqual(self.request()["status"], "failed")
+
+    def test_stale_order_is_not_sent(self):
+        result = self.request(created_at_ms=str(int(t.time() * 1000) - 5000))
+
+        self.assertEqual(result["status"], "expired")
+        self.session.post.assert_not_called()
+
+
+class UpbitTraderBatchTestCase(TestCase):
+    """
+    일괄 주문/취소 테스트 (HTTP 세션은 모의 객체, 외부 API 호출 없음).
+    """
+
+    ROUND_TRIP = 0.05  # 모의 요청 1회 왕복 시간 (초)
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.request.side_effect = self.fake_request
+        self.trader = UpbitTrader(session=self.session, rate_limiter=LocalRateLimiter())
+        self.trader.secret_key = "upbit-trader-test-secret-key-0123456789"
+        self.failing = set()
+
+    def fake_request(self, method, url, params=None, json=None, headers=None, timeout=None):
+        t.sleep(self.ROUND_TRIP)
+        response = MagicMock()
+        response.headers = {}
+        request_id = (params or {}).get("uuid")
+        if request_id in self.failing:
+            response.status_code, response.ok = 404, False
+            response.json.return_value = {"error": {"name": "order_not_found", "message": "주문을 찾지 못했습니다."}}
+        elif url.endswith("orders/open"):
+            response.status_code, response.ok = 200, True
+            response.json.return_value = [{"uuid": f"order-{i}", "state": "wait"} for i in range(25)]
+        else:
+            response.status_code, response.ok = 200, True
+            response.json.return_value = {"uuid": request_id or "new-order", "state": "wait"}
+        return response
+
+    def test_cancel_requests_run_concurrently(self):
+        request_ids = [f"order-{i}" for i in range(20)]
+        self.failing = {"order-3", "order-7"}
+
+        started = t.perf_counter()
+        result = self.trader.cancel_requests(request_ids)
+        elapsed = t.perf_counter() - started
+
+        self.assertLess(elapsed, self.ROUND_TRIP * 20 / 4)
+        self.assertEqual(result["succeeded"], 18)
+        self.assertEqual(result["failed"], 2)
+        self.assertEqual(result["results"][0]["uuid"], "order-0")
+        self.assertEqual(result["results"][3]["error"]["name"], "order_not_found")
+        for call in self.session.request.call_args_list:
+            self.assertEqual(call.args[:2], ("DELETE", "https://api.upbit.com/v1/order"))
+
+    def test_cancel_all_requests_cancels_open_orders(self):
+        result = self.trader.cancel_all_requests("KRW-BTC")
+
+        self.assertEqual(result["succeeded"], 25)
+        first_call = self.session.request.call_args_list[0]
+        self.assertEqual(first_call.kwargs["params"]["market"], "KRW-BTC")
+
+    def test_send_requests_follow_order_rate_limit(self):
+        self.trader.rate_limiter = LocalRateLimiter(limits={"order": 10, "default": 30})
+        orders = [{"market": "KRW-BTC", "side": "bid", "price": 10000, "ord_type": "price", "time_in_force": None}] * 12
+
+        started = t.perf_counter()
+        result = self.trader.send_requests(orders)
+        elapsed = t.perf_counter() - started
+
+        self.assertEqual(result["succeeded"], 12)
+        self.assertGreaterEqual(elapsed, 2 / 10)  # 초당 10개 이후 2개는 1/10초 간격
+        _, kwargs = self.session.request.call_args
+        self.assertNotIn("time_in_force", kwargs["json"])
+
+
+class InMemoryRedis:
+    """
+    AccountStateStore 테스트용 최소 Redis 대체 객체 (해시, 정렬 집합, 파이프라인).
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+    def set(self, key, value):
+        self.data[key] = str(value)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        values = self.data.setdefault(key, {})
+        if field is not None:
+            values[field] = str(value)
+        values.update({name: str(item) for name, item in (mapping or {}).items()})
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.data.get(key, {}).pop(field, None)
+
+    def hscan_iter(self, key):
+        return iter(list(self.data.get(key, {}).items()))
+
+    def zadd(self, key, mapping, xx=False):
+        scores = self.data.setdefault(key, {})
+        scores.update({member: score for member, score in mapping.items() if not xx or member in scores})
+
+    def zrem(self, key, member):
+        self.data.get(key, {}).pop(member, None)
+
+    def zrange(self, key, start, end):
+        return sorted(self.data.get(key, {}), key=self.data.get(key, {}).get)
+
+    def zrangebyscore(self, key, low, high, start=None, num=None):
+        members = [member for member in self.zrange(key, 0, -1) if self.data[key][member] <= float(high)]
+        return members if num is None else members[start:start + num]
+
+
+class AccountStateStoreTestCase(TestCase):
+    """
+    주문 응답 기반 잔고/미체결 주문 갱신과 적응형 조회 테스트.
+    """
+
+    def setUp(self):
+        self.store = AccountStateStore(redis_client=InMemoryRedis(), max_staleness=0)
+        self.store.replace_balances([
+            {"currency": "KRW", "balance": "1000000", "locked": "0", "avg_buy_price": "0"},
+        ])
+
+    @staticmethod
+    def bid_order(state="wait", executed_volume="0", executed_funds="0", paid_fee="0", locked="100050"):
+        return {
+            "uuid": "order-1", "market": "KRW-BTC", "side": "bid", "ord_type": "limit", "price": "50000000",
+            "volume": "0.002", "state": state, "executed_volume": executed_volume,
+            "executed_funds": executed_funds, "paid_fee": paid_fee, "locked": locked,
+        }
+
+    def test_bid_order_locks_and_fills(self):
+        self.store.apply_order(self.bid_order())
+        self.assertAlmostEqual(self.store.balance("KRW"), 899950)
+        self.assertAlmostEqual(self.store.balances()["KRW"]["locked"], 100050)
+        self.assertEqual([order["uuid"] for order in self.store.open_orders()], ["order-1"])
+
+        # 절반 체결
+        self.assertTrue(self.store.apply_order(self.bid_order(
+            executed_volume="0.001", executed_funds="50000", paid_fee="25", locked="50025"
+        )))
+        self.assertAlmostEqual(self.store.balance("KRW"), 899950)
+        self.assertAlmostEqual(self.store.balances()["KRW"]["locked"], 50025)
+        self.assertAlmostEqual(self.store.positions()["KRW-BTC"]["volume"], 0.001)
+
+        # 나머지는 취소: 잠금 해제
+        self.store.apply_order(self.bid_order(
+            state="cancel", executed_volume="0.001", executed_funds="50000", paid_fee="25", locked="0"
+        ))
+        self.assertAlmostEqual(self.store.balance("KRW"), 949975)
+        self.assertAlmostEqual(self.store.balances()["KRW"]["locked"], 0)
+        self.assertAlmostEqual(self.store.positions()["KRW-BTC"]["avg_buy_price"], 50_000_000)
+        self.assertEqual(self.store.open_orders(), [])
+
+    def test_ask_order_fill_credits_quote(self):
+        self.store.replace_balances([
+            {"currency": "KRW", "balance": "0", "locked": "0", "avg_buy_price": "0"},
+            {"currency": "BTC", "balance": "0.01", "locked": "0", "avg_buy_price": "40000000"},
+        ])
+        order = {
+            "uuid": "order-2", "market": "KRW-BTC", "side": "ask", "ord_type": "market", "state": "done",
+            "executed_volume": "0.01", "executed_funds": "500000", "paid_fee": "250", "locked": "0",
+        }
+        self.store.apply_order(order)
+
+        self.assertAlmostEqual(self.store.balance("KRW"), 499750)
+        self.assertNotIn("KRW-BTC", self.store.positions())
+        # 같은 응답을 다시 반영해도 잔고는 변하지 않음
+        self.store.apply_order(order)
+        self.assertAlmostEqual(self.store.balance("KRW"), 499750)
+
+    def test_syncer_backs_off_unchanged_orders(self):
+        trader = MagicMock()
+        trader.RESULT_CHECK_INTERVAL = UpbitTrader.RESULT_CHECK_INTERVAL
+        syncer = OrderStateSyncer(trader=trader, store=self.store)
+        self.store.apply_order(self.bid_order())
+
+        trader.get_orders_by_uuids.return_value = [self.bid_order()]
+        intervals = []
+        for _ in range(6):
+            syncer.poll_open_orders(now=float("inf"))
+            intervals.append(self.store.poll_interval("order-1"))
+        self.assertEqual(intervals, [1.0, 2.0, 4.0, 8.0, 10, 10])
+
+        trader.get_orders_by_uuids.return_value = [self.bid_order(
+            executed_volume="0.001", executed_funds="50000", paid_fee="25", locked="50025"
+        )]
+        syncer.poll_open_orders(now=float("inf"))
+        self.assertEqual(self.store.poll_interval("order-1"), settings.ORDER_POLL_MIN_INTERVAL)
+        self.assertEqual(self.store.due_orders(), [])
+        self.assertEqual(syncer.requests, 7)
+
+    def test_gateway_result_is_applied(self):
+        syncer = OrderStateSyncer(trader=MagicMock(RESULT_CHECK_INTERVAL=10), store=self.store)
+        applied = syncer.apply_gateway_result({"status": "sent", "response": json.dumps(self.bid_order())})
+
+        self.assertTrue(applied)
+        self.assertAlmostEqual(self.store.balance("KRW"), 899950)
+        self.assertFalse(syncer.apply_gateway_result({"status": "rejected", "response": "{}"}))
+
+    def test_stale_response_is_ignored(self):
+        filled = self.bid_order(state="done", executed_volume="0.002", executed_funds="100000", paid_fee="50", locked="0")
+        self.store.apply_order(filled)
+        balance = self.store.balance("KRW")
+
+        # 조회로 체결을 반영한 뒤 늦게 도착한 게이트웨이의 주문 접수 응답
+        self.assertFalse(self.store.apply_order(self.bid_order()))
+        self.assertAlmostEqual(self.store.balance("KRW"), balance)
+        self.assertAlmostEqual(self.store.balances()["KRW"]["locked"], 0)
+        self.assertAlmostEqual(self.store.positions()["KRW-BTC"]["volume"], 0.002)
+        self.assertEqual(self.store.open_orders(), [])
+        self.assertEqual(self.store.order("order-1")["state"], "done")
+
+        # 부분 체결 응답도 더 적은 체결량이면 무시
+        self.assertFalse(self.store.apply_order(self.bid_order(
+            executed_volume="0.001", executed_funds="50000", paid_fee="25", locked="50025"
+        )))
+        self.assertAlmostEqual(self.store.balance("KRW"), balance)
+
+    def test_syncer_loop_survives_errors(self):
+        trader = MagicMock(RESULT_CHECK_INTERVAL=10)
+        trader.get_account_info.side_effect = requests.exceptions.ConnectionError("down")
+        syncer = OrderStateSyncer(trader=trader, store=self.store)
+        messages = [
+            ("1-0", {"status": "sent", "response": "{broken"}),
+            ("2-0", {"status": "sent", "response": json.dumps(self.bid_order())}),
+        ]
+        reads = []
+
+        def xread(streams, count=None, block=None):
+            reads.append(streams)
+            if len(reads) == 2:
+                syncer.stop()
+                return []
+            return [(settings.ORDER_RESULT_STREAM, messages)]
+
+        self.store.redis_client.xread = xread
+        syncer.run_forever(tick=0.01)
+
+        self.assertEqual(len(reads), 2)
+        self.assertEqual(list(reads[1].values()), ["2-0"])
+        self.assertAlmostEqual(self.store.balance("KRW"), 899950)
+
+
+
+class RateLimiterTestCase(TestCase):
+    """
+    요청 제한기 규칙 테스트 (RateLimiter와 같은 규칙의 LocalRateLimiter 사용).
+    """
+
+    def setUp(self):
+        self.limiter = LocalRateLimiter(limits={"candle": 10, "order": 8})
+
+    def test_parse_remaining_req(self):
+        self.assertEqual(parse_remaining_req("group=default; min=1800; sec=29"), ("default", 29))
+        self.assertIsNone(parse_remaining_req(None))
+        self.assertIsNone(parse_remaining_req("min=1800"))
+
+    def test_backfill_leaves_headroom_for_higher_priorities(self):
+        acquired = 0
+        while True:
+            try:
+                self.limiter.acquire("candle", PRIORITY_BACKFILL, timeout=0)
+            except RateLimitTimeout:
+                break
+            acquired += 1
+        self.assertEqual(acquired, 5)  # 예약 비율 0.5
+
+        self.limiter.acquire("candle", PRIORITY_LIVE, timeout=0)
+        self.limiter.acquire("candle", PRIORITY_LIVE, timeout=0)
+        self.limiter.acquire("candle", PRIORITY_LIVE, timeout=0)
+        with self.assertRaises(RateLimitTimeout):
+            self.limiter.acquire("candle", PRIORITY_LIVE, timeout=0)
+        self.limiter.acquire("candle", PRIORITY_ORDER, timeout=0)
+
+    def test_remaining_req_and_429_feedback(self):
+        response = MagicMock(status_code=200, headers={"Remaining-Req": "group=order; min=100; sec=1"})
+        self.limiter.observe(response)
+        self.limiter.acquire("order", PRIORITY_ORDER, timeout=0)
+        with self.assertRaises(RateLimitTimeout):
+            self.limiter.acquire("order", PRIORITY_ORDER, timeout=0)
+
+        self.limiter.observe(MagicMock(status_code=429, headers={}), "candle")
+        started = t.perf_counter()
+        self.limiter.acquire("candle", PRIORITY_ORDER)
+        self.assertGreaterEqual(t.perf_counter() - started, 0.09)
+
+    def test_unknown_group(self):
+        with self.assertRaises(ValueError):
+            self.limiter.acquire("unknown")
+
+
+class FakeHistoryTrader:
+    """
+    종료 주문 조회 API를 흉내 내는 트레이더 (created_at 구간 필터, 최신순, limit).
+    """
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.page_sizes = []
+        self.detail_requests = 0
+
+    def get_closed_orders(self, start_time=None, end_time=None, limit=1000):
+        start, end = parse_time(start_time), parse_time(end_time)
+        page = [order for order in self.orders if start <= parse_time(order["created_at"]) <= end]
+        page = sorted(page, key=lambda order: order["created_at"], reverse=True)[:limit]
+        self.page_sizes.append(len(page))
+        return page
+
+    def get_orders_info(self, request_ids):
+        self.detail_requests += len(request_ids)
+        by_uuid = {order["uuid"]: order for order in self.orders}
+        results = []
+        for request_id in request_ids:
+            order = by_uuid[request_id]
+            results.append(dict(order, trades=[
+                {
+                    "uuid": f"{request_id}-trade-{i}", "market": order["market"], "side": order["side"],
+                    "price": "50000000", "volume": "0.001", "funds": "50000", "created_at": order["created_at"],
+                }
+                for i in range(order["trades_count"])
+            ]))
+        return {"results": results, "succeeded": len(results), "failed": 0, "elapsed_ms": 0.0}
+
+
+class OrderHistorySyncTestCase(TestCase):
+    """
+    종료 주문 증분 동기화 테스트.
+    """
+
+    def setUp(self):
+        self.now = datetime(2024, 10, 20, 0, 0)
+        orders = [self.make_order(i, self.now - timedelta(days=10) + timedelta(minutes=10 * i)) for i in range(1200)]
+        self.trader = FakeHistoryTrader(orders)
+        OrderSyncState.objects.create(name="ALL", high_water_mark=self.now - timedelta(days=11))
+
+    @staticmethod
+    def make_order(index, created_at, trades_count=1):
+        return {
+            "uuid": f"order-{index}", "market": "KRW-BTC", "side": "bid" if index % 2 else "ask",
+            "ord_type": "limit", "state": "done", "price": "50000000", "volume": "0.001",
+            "remaining_volume": "0", "executed_volume": "0.001", "paid_fee": "25", "trades_count": trades_count,
+            "created_at": format_time(created_at),
+        }
+
+    def test_initial_sync_pages_through_windows(self):
+        result = OrderHistorySync(trader=self.trader, page_size=500).sync(until=self.now)
+
+        self.assertEqual(UpbitOrder.objects.count(), 1200)
+        self.assertEqual(UpbitTrade.objects.count(), 1200)
+        self.assertTrue(all(size <= 500 for size in self.trader.page_sizes))
+        self.assertEqual(OrderSyncState.objects.get(name="ALL").high_water_mark, self.now)
+        # 페이지/구간 경계의 주문은 다시 upsert될 수 있음
+        self.assertGreaterEqual(result["orders"], 1200)
+
+    def test_incremental_sync_fetches_only_new_orders(self):
+        OrderHistorySync(trader=self.trader, page_size=500).sync(until=self.now)
+        self.trader.detail_requests = 0
+        self.trader.page_sizes = []
+
+        later = self.now + timedelta(hours=2)
+        self.trader.orders.append(self.make_order(5000, self.now + timedelta(hours=1), trades_count=2))
+        with override_settings(ORDER_SYNC_OVERLAP_HOURS=1):
+            OrderHistorySync(trader=self.trader, page_size=500).sync(until=later)
+
+        self.assertEqual(self.trader.detail_requests, 1)
+        self.assertEqual(len(self.trader.page_sizes), 1)
+        self.assertEqual(UpbitOrder.objects.count(), 1201)
+        self.assertEqual(UpbitOrder.objects.get(uuid="order-5000").trades.count(), 2)
+        self.assertEqual(OrderSyncState.objects.get(name="ALL").high_water_mark, later)
+
+    def test_parse_time_converts_to_kst(self):
+        self.assertEqual(parse_time("2024-10-19T05:10:00+09:00"), datetime(2024, 10, 19, 5, 10))
+        self.assertEqual(parse_time("2024-10-18T20:10:00+00:00"), datetime(2024, 10, 19, 5, 10))
+        self.assertEqual(format_time(datetime(2024, 10, 19, 5, 10)), "2024-10-19T05:10:00+09:00")
+
+
+class InstrumentedTraderTestCase(TestCase):
+    """
+    주문 실행 지연/슬리피지 기록 테스트 (모의 거래소 사용).
+    """
+
+    def setUp(self):
+        self.simulator = SimulatedTrader(balances={"KRW": 1_000_000})
+        self.set_orderbook()
+        self.trader = InstrumentedTrader(self.simulator)
+
+    def set_orderbook(self):
+        self.simulator.on_orderbook("KRW-BTC", [
+            {"ask_price": 100.0, "ask_size": 50.0, "bid_price": 99.0, "bid_size": 50.0},
+            {"ask_price": 101.0, "ask_size": 100.0, "bid_price": 98.0, "bid_size": 100.0},
+        ])
+
+    def test_immediate_fill_records_latency_and_slippage(self):
+        signal_time = t.time() - 0.05
+        response = self.trader.send_request(
+            "KRW-BTC", "bid", price=10_000, ord_type="price", time_in_force=None,
+            signal_time=signal_time, reference_price=100.0,
+        )
+
+        execution = OrderExecution.objects.get(uuid=response["uuid"])
+        self.assertEqual(execution.state, "done")
+        self.assertGreaterEqual(execution.signal_to_submit_ms, 50)
+        self.assertGreaterEqual(execution.submit_to_ack_ms, 0)
+        self.assertIsNotNone(execution.ack_to_fill_ms)
+        # 100원에 50개, 나머지 5000원은 101원에 체결 -> 평균가가 기준 가격보다 높음 (매수 불리)
+        self.assertAlmostEqual(execution.fill_price, float(response["avg_price"]))
+        self.assertGreater(execution.slippage_bps, 0)
+
+    def test_resting_order_filled_by_poll(self):
+        response = self.trader.send_request("KRW-BTC", "bid", price=95.0, volume=100.0, ord_type="limit",
+                                            time_in_force=None)
+        execution = OrderExecution.objects.get(uuid=response["uuid"])
+        self.assertEqual(execution.state, "wait")
+        self.assertEqual(execution.reference_price, 95.0)
+        self.assertEqual(self.trader.poll_fills(), 0)
+
+        self.simulator.on_candle("KRW-BTC", 97.0, 98.0, 94.0, 96.0, 1000.0)
+        self.assertEqual(self.trader.poll_fills(), 1)
+        execution.refresh_from_db()
+        self.assertEqual(execution.state, "done")
+        self.assertAlmostEqual(execution.slippage_bps, 0.0)
+        self.assertGreaterEqual(execution.ack_to_fill_ms, 0)
+
+    def test_rejected_order_is_not_recorded(self):
+        response = self.trader.send_request("KRW-BTC", "bid", price=1.0, volume=1.0, ord_type="limit",
+                                            time_in_force=None)
+        self.assertIn("error", response)
+        self.assertFalse(OrderExecution.objects.exists())
+
+    def test_histogram_buckets(self):
+        summary = _histogram(np.array([0.5, 1.0, 3.0, 70000.0, np.nan]), [1, 2, 5])
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual([bucket["count"] for bucket in summary["buckets"]], [2, 0, 1, 1])
+        self.assertIsNone(summary["buckets"][-1]["le"])
+
+    def test_stats_endpoint(self):
+        for _ in range(3):
+            self.set_orderbook()
+            self.trader.send_request("KRW-BTC", "bid", price=10_000, ord_type="price", time_in_force=None,
+                                     reference_price=100.0)
+        stats = self.client.get("/api/trader/executions/stats/", {"market": "KRW-BTC", "hours": 1}).json()
+
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["latency"]["submit_to_ack_ms"]["count"], 3)
+        self.assertEqual(stats["latency"]["signal_to_submit_ms"]["count"], 0)
+        self.assertEqual(sum(bucket["count"] for bucket in stats["slippage_bps"]["buckets"]), 3)
+        self.assertEqual(self.client.get("/api/trader/executions/stats/", {"hours": "x"}).status_code, 400)
+
+
+class SimulatedTraderTestCase(TestCase):
+    """
+    모의 거래소 매칭 엔진 테스트.
+    """
+
+    def setUp(self):
+        self.trader = SimulatedTrader(balances={"KRW": 1_000_000, "BTC": 10}, fee_rate=0.001, min_price=100)
+        self.trader.on_orderbook("KRW-BTC", [
+            {"ask_price": 1000.0, "ask_size": 1.0, "bid_price": 990.0, "bid_size": 1.0},
+            {"ask_price": 1010.0, "ask_size": 2.0, "bid_price": 980.0, "bid_size": 2.0},
+        ])
+
+    def balance(self, currency):
+        return self.trader.balances[currency], self.trader.locked[currency]
+
+    def test_limit_order_partially_fills_and_rests(self):
+        response = self.trader.send_request("KRW-BTC", "bid", price=1005, volume=3, ord_type="limit", time_in_force=None)
+
+        # 1000원 호가 1개만 지정가 이하 -> 1개 체결, 2개는 대기
+        self.assertEqual(response["state"], "wait")
+        self.assertAlmostEqual(float(response["executed_volume"]), 1.0)
+        self.assertAlmostEqual(float(response["avg_price"]), 1000.0)
+        self.assertAlmostEqual(float(response["remaining_volume"]), 2.0)
+        self.assertEqual(self.balance("BTC"), (11.0, 0.0))
+        krw, locked = self.balance("KRW")
+        self.assertAlmostEqual(locked, 2 * 1005 * 1.001)
+        self.assertAlmostEqual(krw, 1_000_000 - 1000 * 1.001 - locked)
+
+        # 이후 호가가 내려오면 대기 잔량은 자신의 지정가로 체결
+        self.trader.on_orderbook("KRW-BTC", [{"ask_price": 995.0, "ask_size": 5.0, "bid_price": 990.0, "bid_size": 1.0}])
+        order = self.trader.get_order_info(response["uuid"])
+        self.assertEqual(order["state"], "done")
+        self.assertAlmostEqual(float(order["avg_price"]), (1000 + 2 * 1005) / 3)
+        self.assertAlmostEqual(self.balance("KRW")[1], 0.0)
+
+    def test_resting_orders_match_by_price_then_time(self):
+        first = self.trader.send_request("KRW-BTC", "bid", price=950, volume=1, ord_type="limit", time_in_force=None)
+        second = self.trader.send_request("KRW-BTC", "bid", price=950, volume=1, ord_type="limit", time_in_force=None)
+        best = self.trader.send_request("KRW-BTC", "bid", price=960, volume=1, ord_type="limit", time_in_force=None)
+
+        self.trader.on_orderbook("KRW-BTC", [{"ask_price": 940.0, "ask_size": 1.5, "bid_price": 930.0, "bid_size": 1.0}])
+
+        # 높은 가격이 먼저, 같은 가격은 먼저 접수된 주문이 먼저 체결
+        self.assertEqual(self.trader.get_order_info(best["uuid"])["state"], "done")
+        self.assertAlmostEqual(float(self.trader.get_order_info(first["uuid"])["executed_volume"]), 0.5)
+        self.assertAlmostEqual(float(self.trader.get_order_info(second["uuid"])["executed_volume"]), 0.0)
+        self.assertEqual(len(self.trader.get_open_orders("KRW-BTC")), 2)
+
+    def test_ioc_cancels_unfilled_remainder(self):
+        response = self.trader.send_request("KRW-BTC", "bid", price=1000, volume=2, ord_type="limit", time_in_force="ioc")
+
+        self.assertEqual(response["state"], "cancel")
+        self.assertAlmostEqual(float(response["executed_volume"]), 1.0)
+        self.assertEqual(self.trader.get_open_orders(), [])
+        self.assertAlmostEqual(self.balance("KRW")[0], 1_000_000 - 1000 * 1.001)
+        self.assertAlmostEqual(self.balance("KRW")[1], 0.0)
+
+    def test_fok_fills_all_or_nothing(self):
+        rejected = self.trader.send_request("KRW-BTC", "ask", price=985, volume=2, ord_type="limit", time_in_force="fok")
+        self.assertEqual(rejected["state"], "cancel")
+        self.assertAlmostEqual(float(rejected["executed_volume"]), 0.0)
+        self.assertEqual(self.balance("BTC"), (10.0, 0.0))
+
+        filled = self.trader.send_request("KRW-BTC", "ask", price=980, volume=2, ord_type="limit", time_in_force="fok")
+        self.assertEqual(filled["state"], "done")
+        self.assertAlmostEqual(float(filled["avg_price"]), (990 + 980) / 2)
+        self.assertEqual(self.balance("BTC"), (8.0, 0.0))
+        self.assertAlmostEqual(self.balance("KRW")[0], 1_000_000 + (990 + 980) * 0.999)
+
+    def test_balance_locked_until_cancel(self):
+        bid = self.trader.send_request("KRW-BTC", "bid", price=900, volume=2, ord_type="limit", time_in_force=None)
+        ask = self.trader.send_request("KRW-BTC", "ask", price=1100, volume=3, ord_type="limit", time_in_force=None)
+
+        self.assertEqual(self.balance("KRW"), (1_000_000 - 1800 * 1.001, 1800 * 1.001))
+        self.assertEqual(self.balance("BTC"), (7.0, 3.0))
+        account = {row["currency"]: row for row in self.trader.get_account_info()}
+        self.assertAlmostEqual(float(account["BTC"]["locked"]), 3.0)
+
+        self.trader.cancel_request(bid["uuid"])
+        self.trader.cancel_all_requests("KRW-BTC")
+        self.assertAlmostEqual(self.balance("KRW")[0], 1_000_000)
+        self.assertAlmostEqual(self.balance("KRW")[1], 0.0)
+        self.assertEqual(self.balance("BTC"), (10.0, 0.0))
+        self.assertEqual(self.trader.get_order_info(ask["uuid"])["state"], "cancel")
+        self.assertEqual(self.trader.cancel_request(bid["uuid"])["error"]["name"], "order_not_found")
+
+    def test_rejected_orders_do_not_lock_funds(self):
+        too_large = self.trader.send_request("KRW-BTC", "bid", price=1000, volume=2000, ord_type="limit",
+                                             time_in_force=None)
+        too_small = self.trader.send_request("KRW-BTC", "bid", price=50, ord_type="price", time_in_force=None)
+
+        self.assertEqual(too_large["error"]["name"], "insufficient_funds_bid")
+        self.assertEqual(too_small["error"]["name"], "under_min_total_bid")
+        self.assertEqual(self.balance("KRW"), (1_000_000, 0.0))
+        self.assertEqual(self.trader.get_open_orders(), [])
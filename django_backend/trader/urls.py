@@ -0,0 +1,8 @@
+# django_backend/trader/urls.py
+from django.urls import path
+
+from django_backend.trader import views
+
+urlpatterns = [
+    path("executions/stats/", views.execution_stats, name="execution-stats"),
+]
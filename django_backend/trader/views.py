@@ -0,0 +1,34 @@
+# django_backend/trader/views.py
+from datetime import datetime, timedelta
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from django_backend.trader.execution import summarize_executions
+from django_backend.trader.models import OrderExecution
+
+
+@require_GET
+def execution_stats(request):
+    """
+    주문 실행 지연/슬리피지 히스토그램을 반환합니다.
+
+    쿼리 파라미터:
+        - market (선택): 종목 코드 (예: KRW-BTC)
+        - side (선택): bid / ask
+        - hours (선택): 최근 몇 시간의 주문을 요약할지 (기본값: 24)
+    """
+    try:
+        hours = float(request.GET.get("hours", 24))
+    except ValueError:
+        return JsonResponse({"error": "hours must be a number"}, status=400)
+
+    since = datetime.now() - timedelta(hours=hours)
+    queryset = OrderExecution.objects.filter(submitted_at__gte=since)
+    for field in ("market", "side"):
+        if request.GET.get(field):
+            queryset = queryset.filter(**{field: request.GET[field]})
+
+    summary = summarize_executions(queryset)
+    summary["since"] = since.isoformat(timespec="seconds")
+    return JsonResponse(summary)